@@ -17,6 +17,7 @@ from datetime import datetime
 from typing import Optional
 from config import get_settings
 from database import get_session
+from dispatcharr_catalog import get_catalog
 from models import (
     AutoCreationRule,
     AutoCreationExecution,
@@ -35,10 +36,14 @@ from auto_creation_executor import (
     ActionExecutor,
     ExecutionContext,
 )
+from stream_sort import parse_height, rank_channels
 
 
 logger = logging.getLogger(__name__)
 
+# EPG data fields used by ActionExecutor's assign_epg matching
+EPG_MATCH_FIELDS = ("id", "tvg_id", "name", "epg_source")
+
 
 class AutoCreationEngine:
     """
@@ -281,23 +286,13 @@ class AutoCreationEngine:
     # =========================================================================
 
     async def _load_existing_data(self):
-        """Load existing channels and groups from Dispatcharr."""
+        """Load existing channels and groups from the shared Dispatcharr catalogue."""
         try:
-            # get_channels() returns paginated dict {"count": N, "results": [...]}
-            # Fetch all pages
-            all_channels = []
-            page = 1
-            while True:
-                result = await self.client.get_channels(page=page, page_size=100)
-                channels = result.get("results", [])
-                all_channels.extend(channels)
-                if len(all_channels) >= result.get("count", 0) or not channels:
-                    break
-                page += 1
-            self._existing_channels = all_channels
-
-            # get_channel_groups() returns a flat list
-            self._existing_groups = await self.client.get_channel_groups() or []
+            catalog = get_catalog(self.client)
+            # Work on copies: the executor updates channel dicts in place. Channels
+            # are reloaded because the executor writes whole stream lists from them
+            self._existing_channels = [dict(c) for c in await catalog.get_channels(fresh=True)]
+            self._existing_groups = [dict(g) for g in await catalog.get_channel_groups()]
             logger.debug("[AUTO-CREATE-ENGINE] Loaded %s channels, %s groups", len(self._existing_channels), len(self._existing_groups))
         except Exception as e:
             logger.exception("[AUTO-CREATE-ENGINE] Failed to load existing data: %s", e)
@@ -345,6 +340,10 @@ class AutoCreationEngine:
         Returns:
             List of StreamContext objects
         """
+        catalog = get_catalog(self.client)
+        m3u_accounts = await catalog.get_m3u_accounts()
+        account_map = {a["id"]: a for a in m3u_accounts}
+
         # Determine which M3U accounts to fetch
         accounts_to_fetch = set()
 
@@ -356,18 +355,12 @@ class AutoCreationEngine:
                 if rule.m3u_account_id:
                     accounts_to_fetch.add(rule.m3u_account_id)
 
-            # If no specific accounts, fetch all
-            if not accounts_to_fetch:
-                m3u_accounts = await self.client.get_m3u_accounts() or []
-                accounts_to_fetch = {a["id"] for a in m3u_accounts}
-        else:
-            m3u_accounts = await self.client.get_m3u_accounts() or []
-            accounts_to_fetch = {a["id"] for a in m3u_accounts}
+        # If no specific accounts, fetch all
+        if not accounts_to_fetch:
+            accounts_to_fetch = set(account_map)
 
         # Fetch streams from each account
         all_streams = []
-        m3u_accounts = await self.client.get_m3u_accounts() or []
-        account_map = {a["id"]: a for a in m3u_accounts}
         logger.debug("[AUTO-CREATE-ENGINE] Accounts to fetch: %s", accounts_to_fetch)
 
         # Load stream stats for quality info
@@ -385,32 +378,21 @@ class AutoCreationEngine:
                 continue
 
             try:
-                # get_streams() returns paginated dict {"count": N, "results": [...]}
-                page = 1
-                fetched_for_account = 0
-                while True:
-                    result = await self.client.get_streams(
-                        page=page, page_size=100, m3u_account=account_id
+                streams = await catalog.get_streams(m3u_account_id=account_id)
+                for stream in streams:
+                    # Enrich with group name (API only returns numeric channel_group ID).
+                    # Copy first: catalogue dicts are shared with other consumers.
+                    group_id = stream.get("channel_group")
+                    if group_id and "channel_group_name" not in stream:
+                        stream = {**stream, "channel_group_name": group_name_map.get(group_id)}
+                    stats = self._stream_stats_cache.get(stream.get("id"))
+                    ctx = StreamContext.from_dispatcharr_stream(
+                        stream,
+                        m3u_account_id=account_id,
+                        m3u_account_name=account.get("name"),
+                        stream_stats=stats
                     )
-                    streams = result.get("results", [])
-                    for stream in streams:
-                        # Enrich with group name (API only returns numeric channel_group ID)
-                        group_id = stream.get("channel_group")
-                        if group_id and "channel_group_name" not in stream:
-                            stream["channel_group_name"] = group_name_map.get(group_id)
-                        stats = self._stream_stats_cache.get(stream.get("id"))
-                        ctx = StreamContext.from_dispatcharr_stream(
-                            stream,
-                            m3u_account_id=account_id,
-                            m3u_account_name=account.get("name"),
-                            stream_stats=stats
-                        )
-                        all_streams.append(ctx)
-                    fetched_for_account += len(streams)
-                    total = result.get("count", 0)
-                    if fetched_for_account >= total or not streams:
-                        break
-                    page += 1
+                    all_streams.append(ctx)
             except Exception as e:
                 logger.error("[AUTO-CREATE-ENGINE] Failed to fetch streams from M3U account %s: %s", str(account_id).replace('\n', ''), str(e).replace('\n', ''))
 
@@ -824,7 +806,11 @@ class AutoCreationEngine:
         )
         if needs_epg:
             try:
-                epg_data = await self.client.get_epg_data()
+                # Stream entries and keep only the fields EPG matching uses
+                epg_data = [
+                    {key: entry.get(key) for key in EPG_MATCH_FIELDS}
+                    async for entry in self.client.iter_epg_data()
+                ]
                 logger.debug("[AUTO-CREATE-ENGINE] Fetched %s EPG data entries for assign_epg resolution", len(epg_data))
             except Exception as e:
                 logger.warning("[AUTO-CREATE-ENGINE] Failed to fetch EPG data for assign_epg: %s", e)
@@ -1544,7 +1530,7 @@ def _smart_sort_streams(
     settings=None
 ) -> list[int]:
     """
-    Sort stream IDs using smart sort logic (mirrors stream_prober._smart_sort_streams).
+    Sort stream IDs using smart sort logic (same key as stream_prober.smart_sort_streams).
 
     Uses configurable sort priority and enabled criteria from settings.
     Falls back to resolution-only if settings are unavailable.
@@ -1560,14 +1546,7 @@ def _smart_sort_streams(
         # Fallback: resolution-only sort (descending)
         def fallback_key(sid):
             stats = stats_cache.get(sid)
-            if stats and stats.get("resolution"):
-                try:
-                    parts = stats["resolution"].split("x")
-                    if len(parts) == 2:
-                        return -int(parts[1])
-                except (ValueError, IndexError):
-                    logger.debug("[AUTO-CREATE] Non-numeric resolution %r, using default 0", stats.get("resolution"))
-            return 0
+            return -(parse_height(stats.get("resolution")) or 0) if stats else 0
         return sorted(stream_ids, key=fallback_key)
 
     # Get active sort criteria (enabled and in priority order)
@@ -1580,80 +1559,14 @@ def _smart_sort_streams(
 
     active_criteria = [c for c in sort_priority if sort_enabled.get(c, False)]
 
-    logger.info(
-        "[AUTO-CREATE-ENGINE] Channel '%s': smart sort with "
-        "active_criteria=%s, deprioritize_failed=%s",
-        channel_name, active_criteria, deprioritize_failed
+    sorted_ids = rank_channels(
+        [stream_ids], stats_cache, stream_m3u_map, active_criteria, m3u_priorities, deprioritize_failed,
+    )[0]
+    logger.debug(
+        "[AUTO-CREATE-ENGINE] Channel '%s': smart sort with active_criteria=%s, "
+        "deprioritize_failed=%s -> %s",
+        channel_name, active_criteria, deprioritize_failed, sorted_ids
     )
-
-    def get_sort_value(sid: int) -> tuple:
-        stats = stats_cache.get(sid)
-
-        # Deprioritize failed/missing streams
-        if deprioritize_failed:
-            if not stats or stats.get("probe_status") in ("failed", "timeout", "pending"):
-                return (1,) + tuple(0 for _ in active_criteria)
-
-        if not stats or stats.get("probe_status") != "success":
-            return (0,) + tuple(0 for _ in active_criteria)
-
-        sort_values = [0]  # 0 = successful stream
-
-        for criterion in active_criteria:
-            if criterion == "resolution":
-                resolution_value = 0
-                if stats.get("resolution"):
-                    try:
-                        parts = stats["resolution"].split("x")
-                        if len(parts) == 2:
-                            resolution_value = int(parts[1])
-                    except (ValueError, IndexError) as e:
-                        logger.debug("[AUTO-CREATE-ENGINE] Suppressed resolution parse error: %s", e)
-                sort_values.append(-resolution_value)
-
-            elif criterion == "bitrate":
-                bitrate_value = stats.get("video_bitrate") or stats.get("bitrate") or 0
-                sort_values.append(-bitrate_value)
-
-            elif criterion == "framerate":
-                framerate_value = 0
-                fps = stats.get("fps")
-                if fps:
-                    try:
-                        framerate_value = float(fps)
-                    except (ValueError, TypeError) as e:
-                        logger.debug("[AUTO-CREATE-ENGINE] Suppressed fps parse error: %s", e)
-                sort_values.append(-framerate_value)
-
-            elif criterion == "m3u_priority":
-                m3u_priority_value = 0
-                m3u_account_id = stream_m3u_map.get(sid)
-                if m3u_account_id is not None:
-                    m3u_priority_value = m3u_priorities.get(str(m3u_account_id), 0)
-                sort_values.append(-m3u_priority_value)
-
-            elif criterion == "audio_channels":
-                audio_ch = stats.get("audio_channels") or 0
-                sort_values.append(-audio_ch)
-
-        return tuple(sort_values)
-
-    # Log each stream's sort values
-    for sid in stream_ids:
-        stats = stats_cache.get(sid)
-        sname = stats.get("stream_name", f"Stream {sid}") if stats else f"Stream {sid}"
-        sv = get_sort_value(sid)
-        logger.debug("[AUTO-CREATE-ENGINE]   %s (id=%s): sort_tuple=%s", sname, sid, sv)
-
-    sorted_ids = sorted(stream_ids, key=get_sort_value)
-
-    logger.info("[AUTO-CREATE-ENGINE] Channel '%s' sorted order:", channel_name)
-    for idx, sid in enumerate(sorted_ids):
-        stats = stats_cache.get(sid)
-        sname = stats.get("stream_name", f"Stream {sid}") if stats else f"Stream {sid}"
-        res = stats.get("resolution", "?") if stats else "?"
-        logger.info("[AUTO-CREATE-ENGINE]   #%s: %s (id=%s, res=%s)", idx+1, sname, sid, res)
-
     return sorted_ids
 
 
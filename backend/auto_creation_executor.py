@@ -12,6 +12,7 @@ import re
 
 from auto_creation_schema import Action, ActionType, TemplateVariables
 from auto_creation_evaluator import StreamContext
+from dispatcharr_client import fetch_pages
 
 
 logger = logging.getLogger(__name__)
@@ -1821,15 +1822,7 @@ class ActionExecutor:
             group_name = group.get("name", f"ID:{group_id}")
 
             # Fetch current channels in the group
-            all_channels = []
-            page = 1
-            while True:
-                result = await self.client.get_channels(page=page, page_size=100)
-                channels = result.get("results", [])
-                all_channels.extend(channels)
-                if len(all_channels) >= result.get("count", 0) or not channels:
-                    break
-                page += 1
+            all_channels = await fetch_pages(self.client.get_channels, page_size=500)
 
             channels_in_group = [c for c in all_channels if c.get("channel_group") == group_id]
 
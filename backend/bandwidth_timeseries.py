@@ -0,0 +1,164 @@
+"""
+Bandwidth time series.
+
+BandwidthTracker records one Sample per poll for the all-channels total
+and for each active channel:
+
+- The most recent hour of samples stays in memory in a SampleRing, which
+  serves the "raw" (per-poll) resolution.
+- Every sample is also added to its 1-minute, 1-hour and 1-day buckets in
+  the bandwidth_samples table. Byte counters are summed and peaks keep the
+  larger value. This happens in the tracker's batched flush
+  (bandwidth_writer), so all coarser tiers are already downsampled when
+  written and no separate rollup job is needed.
+- purge_samples() drops buckets past their tier's retention. Storage stays
+  bounded to about 2 days of minutes, 90 days of hours and 5 years of days
+  per series.
+
+query_series() chooses the finest tier that covers the requested range in
+MAX_POINTS points or fewer, so query cost is bounded as well. Timestamps
+are naive UTC, like the rest of the models.
+"""
+import logging
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from database import get_session
+from models import BandwidthSample
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}  # Label -> bucket seconds
+RETENTION = {
+    60: timedelta(days=2),
+    3600: timedelta(days=90),
+    86400: timedelta(days=5 * 365),
+}
+RAW_RESOLUTION = "raw"
+RING_SECONDS = 3600  # Per-poll samples kept in memory
+MAX_POINTS = 2000  # Largest series a query may return
+PURGE_INTERVAL = 3600  # Seconds between retention purges
+TOTAL_SERIES = ""  # channel_id of the all-channels series
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def bucket_start(ts: datetime, resolution: int) -> datetime:
+    """Start of the bucket containing ``ts``."""
+    seconds = int((ts - _EPOCH).total_seconds())
+    return _EPOCH + timedelta(seconds=seconds - seconds % resolution)
+
+
+@dataclass
+class Sample:
+    """Throughput of one poll, for all channels or a single channel."""
+    timestamp: datetime
+    channel_id: str
+    bytes_in: int
+    bytes_out: int
+    bitrate_in: int
+    bitrate_out: int
+    clients: int
+    channels: int = 0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["timestamp"] = self.timestamp.isoformat() + "Z"
+        del data["channel_id"]
+        return data
+
+
+class SampleRing:
+    """Per-poll samples of the last ``seconds`` seconds."""
+
+    def __init__(self, poll_interval: int, seconds: int = RING_SECONDS):
+        self._polls: deque[list[Sample]] = deque(maxlen=max(1, seconds // max(1, poll_interval)))
+
+    def append(self, samples: list[Sample]) -> None:
+        """Add the samples of one poll."""
+        self._polls.append(samples)
+
+    def query(self, start: datetime, end: datetime, channel_id: str = TOTAL_SERIES) -> list[Sample]:
+        """Samples of a series within [start, end)."""
+        return [
+            sample
+            for poll in self._polls
+            for sample in poll
+            if sample.channel_id == channel_id and start <= sample.timestamp < end
+        ]
+
+
+def pick_resolution(start: datetime, end: datetime, now: Optional[datetime] = None) -> int:
+    """Finest stored resolution that still has ``start`` and fits the range in MAX_POINTS."""
+    now = now or datetime.utcnow()
+    span = (end - start).total_seconds()
+    for resolution in sorted(RETENTION):
+        if span / resolution <= MAX_POINTS and start >= now - RETENTION[resolution]:
+            return resolution
+    return max(RETENTION)
+
+
+def query_series(
+    start: datetime,
+    end: datetime,
+    resolution: Optional[int] = None,
+    channel_id: str = TOTAL_SERIES,
+) -> dict:
+    """
+    Stored buckets of a series between start and end.
+
+    Args:
+        start: Range start (UTC)
+        end: Range end (UTC)
+        resolution: Bucket seconds (one of RESOLUTIONS), or None to choose automatically
+        channel_id: Channel UUID, or TOTAL_SERIES for all channels
+
+    Raises:
+        ValueError: Unknown resolution or range too large for it
+    """
+    if resolution is None:
+        resolution = pick_resolution(start, end)
+    elif resolution not in RETENTION:
+        raise ValueError(f"Unknown resolution: {resolution}")
+    if (end - start).total_seconds() / resolution > MAX_POINTS:
+        raise ValueError(f"Range too large for {resolution}s resolution (max {MAX_POINTS} points)")
+
+    session = get_session()
+    try:
+        rows = session.query(BandwidthSample).filter(
+            BandwidthSample.resolution == resolution,
+            BandwidthSample.channel_id == channel_id,
+            BandwidthSample.bucket_start >= bucket_start(start, resolution),
+            BandwidthSample.bucket_start < end,
+        ).order_by(BandwidthSample.bucket_start.asc()).all()
+        return {
+            "resolution": resolution,
+            "channel_id": channel_id or None,
+            "points": [row.to_dict() for row in rows],
+        }
+    finally:
+        session.close()
+
+
+def purge_samples(now: Optional[datetime] = None) -> int:
+    """Delete buckets past their tier's retention. Returns the number of rows removed."""
+    now = now or datetime.utcnow()
+    session = get_session()
+    try:
+        deleted = 0
+        for resolution, keep in RETENTION.items():
+            deleted += session.query(BandwidthSample).filter(
+                BandwidthSample.resolution == resolution,
+                BandwidthSample.bucket_start < now - keep,
+            ).delete(synchronize_session=False)
+        session.commit()
+        if deleted > 0:
+            logger.info("[BANDWIDTH] Purged %s expired time series buckets", deleted)
+        return deleted
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
@@ -1,6 +1,7 @@
 """
 Background bandwidth tracking service.
-Polls Dispatcharr stats periodically and accumulates bandwidth data.
+Polls Dispatcharr stats periodically and accumulates bandwidth data in
+memory, writing it in one batched transaction every few polls.
 """
 import asyncio
 import logging
@@ -9,8 +10,14 @@ from datetime import datetime, date, timedelta, timezone
 from typing import Optional
 from zoneinfo import ZoneInfo
 
+from bandwidth_timeseries import PURGE_INTERVAL, TOTAL_SERIES, Sample, SampleRing, purge_samples
+from bandwidth_writer import DEFAULT_FLUSH_POLLS, BandwidthBatch, WatchSession, write_bandwidth_batch
 from database import get_session
+from dispatcharr_client import iter_pages
+from dispatcharr_limiter import Priority, request_priority
+from live_stats import get_live_stats
 from models import BandwidthDaily, ChannelWatchStats, UniqueClientConnection, ChannelBandwidth
+from stats_rollups import bandwidth_period_totals, unique_count, viewer_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -42,16 +49,24 @@ class BandwidthTracker:
     Polls Dispatcharr's stats endpoint and stores daily aggregates.
     """
 
-    def __init__(self, client, poll_interval: int = DEFAULT_POLL_INTERVAL):
+    def __init__(self, client, poll_interval: int = DEFAULT_POLL_INTERVAL, flush_polls: int = DEFAULT_FLUSH_POLLS):
         """
         Initialize the tracker.
 
         Args:
             client: DispatcharrClient instance for API calls
             poll_interval: Seconds between polls (default 10)
+            flush_polls: Polls accumulated in memory between database writes (default 6)
         """
         self.client = client
         self.poll_interval = poll_interval
+        self.flush_polls = max(1, flush_polls)
+        self._batch = BandwidthBatch()  # Stats not yet written to the database
+        self._polls_since_flush = 0
+        self._flush_lock = asyncio.Lock()
+        self._flushing: Optional[asyncio.Task] = None  # Current write; outlives a cancelled flush()
+        self.samples = SampleRing(poll_interval)  # Recent per-poll time series samples
+        self._last_purge = 0.0
         self._task: Optional[asyncio.Task] = None
         self._running = False
         self._last_bytes: dict[str, int] = {}  # Track per-channel bytes to compute deltas
@@ -62,8 +77,8 @@ class BandwidthTracker:
         self._channel_map_refresh_interval = 300  # Refresh channel map every 5 minutes
         self._last_channel_map_refresh = 0.0
         # Enhanced stats tracking (v0.11.0)
-        # Maps (channel_id, ip_address) -> connection_id in UniqueClientConnection table
-        self._active_connections: dict[tuple[str, str], int] = {}
+        # Active watch sessions by (channel_id, ip_address), written to UniqueClientConnection at flush
+        self._sessions: dict[tuple[str, str], WatchSession] = {}
         # Track last known clients per channel for detecting new/disconnected clients
         self._last_channel_clients: dict[str, set[str]] = {}  # channel_id -> set of IPs
 
@@ -80,7 +95,8 @@ class BandwidthTracker:
         self._cleanup_stale_connections()
 
         self._running = True
-        self._task = asyncio.create_task(self._poll_loop())
+        with request_priority(Priority.BACKGROUND):
+            self._task = asyncio.create_task(self._poll_loop())
         logger.info("[BANDWIDTH] BandwidthTracker started (polling every %ss)", self.poll_interval)
 
     async def stop(self):
@@ -93,6 +109,7 @@ class BandwidthTracker:
             except asyncio.CancelledError:
                 logger.debug("[BANDWIDTH] Polling task cancelled during shutdown")
             self._task = None
+        await self.flush()
         logger.info("[BANDWIDTH] BandwidthTracker stopped")
 
     async def _initialize_channel_maps(self):
@@ -104,25 +121,14 @@ class BandwidthTracker:
             # Fetch all channels from ECM (paginated)
             uuid_map: dict[str, str] = {}
             number_map: dict[int, str] = {}
-            page = 1
-            page_size = 500
-            while True:
-                result = await self.client.get_channels(page=page, page_size=page_size)
-                channels = result.get("results", [])
-                for ch in channels:
-                    uuid = ch.get("uuid")
-                    name = ch.get("name")
-                    channel_number = ch.get("channel_number")
-                    if uuid and name:
-                        uuid_map[uuid] = name
-                    if channel_number is not None and name:
-                        number_map[int(channel_number)] = name
-
-                if not result.get("next"):
-                    break
-                page += 1
-                if page > 20:
-                    break
+            async for ch in iter_pages(self.client.get_channels, page_size=500, page_limit=20):
+                uuid = ch.get("uuid")
+                name = ch.get("name")
+                channel_number = ch.get("channel_number")
+                if uuid and name:
+                    uuid_map[uuid] = name
+                if channel_number is not None and name:
+                    number_map[int(channel_number)] = name
 
             self._ecm_channel_map = uuid_map
             self._ecm_channel_number_map = number_map
@@ -239,28 +245,15 @@ class BandwidthTracker:
             # Fetch all channels from ECM (paginated)
             uuid_map: dict[str, str] = {}
             number_map: dict[int, str] = {}
-            page = 1
-            page_size = 500
-            while True:
-                result = await self.client.get_channels(page=page, page_size=page_size)
-                channels = result.get("results", [])
-                for ch in channels:
-                    uuid = ch.get("uuid")
-                    name = ch.get("name")
-                    channel_number = ch.get("channel_number")
-                    if uuid and name:
-                        uuid_map[uuid] = name
-                    if channel_number is not None and name:
-                        # channel_number can be float or int, convert to int for lookup
-                        number_map[int(channel_number)] = name
-
-                # Check if there are more pages
-                if not result.get("next"):
-                    break
-                page += 1
-                # Safety limit
-                if page > 20:
-                    break
+            async for ch in iter_pages(self.client.get_channels, page_size=500, page_limit=20):
+                uuid = ch.get("uuid")
+                name = ch.get("name")
+                channel_number = ch.get("channel_number")
+                if uuid and name:
+                    uuid_map[uuid] = name
+                if channel_number is not None and name:
+                    # channel_number can be float or int, convert to int for lookup
+                    number_map[int(channel_number)] = name
 
             self._ecm_channel_map = uuid_map
             self._ecm_channel_number_map = number_map
@@ -270,7 +263,7 @@ class BandwidthTracker:
             logger.debug("[BANDWIDTH] Failed to refresh channel map: %s", e)
 
     async def _collect_stats(self):
-        """Fetch stats from Dispatcharr and update daily totals."""
+        """Fetch stats from Dispatcharr and accumulate them for the next flush."""
         try:
             stats = await self.client.get_channel_stats()
         except Exception as e:
@@ -279,6 +272,8 @@ class BandwidthTracker:
 
         channels = stats.get("channels", [])
         logger.debug("[BANDWIDTH] Collected stats for %s active channels", len(channels))
+        # Browser tabs subscribed to live stats reuse this poll
+        get_live_stats().publish("channels", stats)
 
         # Calculate totals from all active channels
         total_bytes_delta = 0
@@ -296,6 +291,8 @@ class BandwidthTracker:
         still_active_channels: list[dict] = []
         # Per-channel bandwidth tracking (v0.11.0)
         channel_bandwidth_updates: list[dict] = []
+        sample_time = datetime.utcnow()
+        samples: list[Sample] = []
 
         for channel in channels:
             channel_id = str(channel.get("channel_id", ""))
@@ -351,11 +348,21 @@ class BandwidthTracker:
             if channel_id:
                 current_active_channels.add(channel_id)
                 self._channel_names[channel_id] = channel_name  # Cache name for stop events
-
-                # Detect new and continuing client connections
+                samples.append(Sample(
+                    timestamp=sample_time,
+                    channel_id=channel_id,
+                    bytes_in=channel_bytes_delta,
+                    bytes_out=channel_bytes_delta * max(client_count, 1),
+                    bitrate_in=channel_bitrate_bps,
+                    bitrate_out=channel_bitrate_bps * max(client_count, 1),
+                    clients=client_count,
+                ))
+
+                # Detect new, continuing and departed client connections
                 last_clients = self._last_channel_clients.get(channel_id, set())
                 new_clients = set(client_ips) - last_clients
                 continuing_clients = set(client_ips) & last_clients
+                disconnected_clients = last_clients - set(client_ips)
 
                 # Check if this channel just became active (wasn't in last poll)
                 if channel_id not in self._last_active_channels:
@@ -373,6 +380,7 @@ class BandwidthTracker:
                         "client_ips": client_ips,
                         "new_clients": list(new_clients),
                         "continuing_clients": list(continuing_clients),
+                        "disconnected_clients": list(disconnected_clients),
                         "client_count": client_count,
                     })
 
@@ -387,371 +395,209 @@ class BandwidthTracker:
 
         # Check for channels that stopped being watched
         stopped_channels = self._last_active_channels - current_active_channels
-        if stopped_channels:
-            self._log_watch_stop_events(stopped_channels)
-            self._close_client_connections(stopped_channels)
 
         # Update last bytes tracking
         self._last_bytes = current_bytes
         self._last_active_channels = current_active_channels
         self._last_channel_clients = current_channel_clients
 
+        today = get_current_date()
+        now = datetime.now(get_user_timezone())
+        batch = self._batch
+
+        # Time series: the all-channels total is sampled every poll, even when idle
+        samples.insert(0, Sample(
+            timestamp=sample_time,
+            channel_id=TOTAL_SERIES,
+            bytes_in=total_bytes_in_delta,
+            bytes_out=total_bytes_out_delta,
+            bitrate_in=current_bitrate_in,
+            bitrate_out=current_bitrate_out,
+            clients=total_clients,
+            channels=active_channels,
+        ))
+        self.samples.append(samples)
+        for sample in samples:
+            batch.add_sample(sample)
+
         # Only record if there's actual data transfer
         if total_bytes_delta > 0 or active_channels > 0:
-            self._update_daily_record(
-                total_bytes_delta,
-                active_channels,
-                total_clients,
-                bytes_in_delta=total_bytes_in_delta,
-                bytes_out_delta=total_bytes_out_delta,
-                current_bitrate_in=current_bitrate_in,
-                current_bitrate_out=current_bitrate_out,
+            batch.add_daily(
+                today,
+                bytes_transferred=total_bytes_delta,
+                bytes_in=total_bytes_in_delta,
+                bytes_out=total_bytes_out_delta,
+                peak_channels=active_channels,
+                peak_clients=total_clients,
+                peak_bitrate_in=current_bitrate_in,
+                peak_bitrate_out=current_bitrate_out,
             )
             if total_bytes_delta > 0:
                 bytes_mb = total_bytes_delta / (1024 * 1024)
                 logger.debug("[BANDWIDTH] Bandwidth delta: %.2f MB (in: %.2f, out: %.2f), active channels: %s, clients: %s", bytes_mb, total_bytes_in_delta / (1024*1024), total_bytes_out_delta / (1024*1024), active_channels, total_clients)
 
-        # Update per-channel bandwidth (v0.11.0)
-        if channel_bandwidth_updates:
-            self._update_channel_bandwidth(channel_bandwidth_updates)
+        # Per-channel bandwidth (v0.11.0) - each client adds poll_interval watch seconds
+        for upd in channel_bandwidth_updates:
+            batch.add_channel(
+                upd["channel_id"], upd["channel_name"], today,
+                bytes_delta=upd["bytes_delta"],
+                clients=upd["client_count"],
+                watch_seconds=self.poll_interval * upd["client_count"],
+            )
 
-        # Update watch counts for newly active channels (and log start events)
+        # Watch counts, connections started and watch sessions (written at the next flush)
+        for ch in newly_active_channels:
+            batch.add_watch(ch["channel_id"], ch["channel_name"], now, watch_count=1)
+            batch.add_channel(ch["channel_id"], ch["channel_name"], today, connections=len(ch["client_ips"]))
+            self._open_sessions(ch["channel_id"], ch["channel_name"], ch["client_ips"], now, today)
+        for ch in still_active_channels:
+            batch.add_watch(ch["channel_id"], ch["channel_name"], now, watch_seconds=self.poll_interval)
+            if ch["new_clients"]:
+                batch.add_channel(ch["channel_id"], ch["channel_name"], today, connections=len(ch["new_clients"]))
+            # Clients that joined or left a channel that keeps streaming
+            self._open_sessions(ch["channel_id"], ch["channel_name"], ch["new_clients"], now, today)
+            for ip in ch["continuing_clients"]:
+                watch_session = self._sessions.get((ch["channel_id"], ip))
+                if watch_session:
+                    watch_session.last_seen = now
+            self._close_sessions([(ch["channel_id"], ip) for ip in ch["disconnected_clients"]], now)
+        # All client sessions end when their channel stops
+        self._close_sessions([key for key in self._sessions if key[0] in stopped_channels], now)
+
+        # Journal entries are written as the events happen
         if newly_active_channels:
             logger.info("[BANDWIDTH] %s channel(s) started streaming", len(newly_active_channels))
-            self._update_watch_counts(newly_active_channels)
-
-        # Accumulate watch time for still-active channels
-        if still_active_channels:
-            self._update_watch_time(still_active_channels)
-
-        # Log stopped channels
         if stopped_channels:
             logger.info("[BANDWIDTH] %s channel(s) stopped streaming", len(stopped_channels))
+        if newly_active_channels or stopped_channels:
+            await asyncio.to_thread(self._log_watch_events, newly_active_channels, stopped_channels)
 
-    def _update_daily_record(
-        self,
-        bytes_delta: int,
-        active_channels: int,
-        total_clients: int,
-        bytes_in_delta: int = 0,
-        bytes_out_delta: int = 0,
-        current_bitrate_in: int = 0,
-        current_bitrate_out: int = 0,
-    ):
-        """Update today's bandwidth record in the database (using user's timezone)."""
-        today = get_current_date()
-
-        session = get_session()
-        try:
-            # Get or create today's record
-            record = session.query(BandwidthDaily).filter(
-                BandwidthDaily.date == today
-            ).first()
-
-            if record is None:
-                record = BandwidthDaily(
-                    date=today,
-                    bytes_transferred=0,
-                    bytes_in=0,
-                    bytes_out=0,
-                    peak_channels=0,
-                    peak_clients=0,
-                    peak_bitrate_in=0,
-                    peak_bitrate_out=0,
-                )
-                session.add(record)
-
-            # Update totals
-            record.bytes_transferred += bytes_delta
-            record.bytes_in += bytes_in_delta
-            record.bytes_out += bytes_out_delta
-            record.peak_channels = max(record.peak_channels, active_channels)
-            record.peak_clients = max(record.peak_clients, total_clients)
-            # Update peak bitrates (track highest seen during the day)
-            record.peak_bitrate_in = max(record.peak_bitrate_in, current_bitrate_in)
-            record.peak_bitrate_out = max(record.peak_bitrate_out, current_bitrate_out)
+        self._polls_since_flush += 1
+        if self._polls_since_flush >= self.flush_polls:
+            await self.flush()
 
-            session.commit()
-        except Exception as e:
-            logger.error("[BANDWIDTH] Failed to update bandwidth record: %s", e)
-            session.rollback()
-        finally:
-            session.close()
+    async def flush(self):
+        """
+        Write the accumulated stats in one transaction on a worker thread.
 
-    def _update_channel_bandwidth(self, updates: list[dict]):
-        """Update per-channel bandwidth records (v0.11.0)."""
-        today = get_current_date()
-        session = get_session()
+        Flushes run one at a time. Cancelling flush() does not stop the worker
+        thread, so the write keeps running as a task and the next flush waits
+        for it; otherwise open sessions would be inserted twice.
+        """
+        async with self._flush_lock:
+            if self._flushing is not None and not self._flushing.done():
+                await asyncio.wait([self._flushing])
+            self._flushing = asyncio.create_task(self._write_batch())
+            await asyncio.shield(self._flushing)
+
+    async def _write_batch(self):
+        self._polls_since_flush = 0
+        batch, self._batch = self._batch, BandwidthBatch()
+        if not batch and not self._sessions:
+            return
         try:
-            for upd in updates:
-                channel_id = upd["channel_id"]
-                channel_name = upd["channel_name"]
-                bytes_delta = upd["bytes_delta"]
-                client_count = upd["client_count"]
-
-                # Get or create today's record for this channel
-                record = session.query(ChannelBandwidth).filter(
-                    ChannelBandwidth.channel_id == channel_id,
-                    ChannelBandwidth.date == today
-                ).first()
-
-                if record is None:
-                    record = ChannelBandwidth(
-                        channel_id=channel_id,
-                        channel_name=channel_name,
-                        date=today,
-                        bytes_transferred=0,
-                        peak_clients=0,
-                        total_watch_seconds=0,
-                        connection_count=0,
-                    )
-                    session.add(record)
-
-                # Update record
-                record.bytes_transferred += bytes_delta
-                record.peak_clients = max(record.peak_clients, client_count)
-                record.total_watch_seconds += self.poll_interval * client_count  # Each client adds poll_interval seconds
-                record.channel_name = channel_name  # Update name in case it changed
-
-            session.commit()
-            logger.debug("[BANDWIDTH] Updated channel bandwidth for %s channels", len(updates))
+            await asyncio.to_thread(write_bandwidth_batch, batch, list(self._sessions.values()))
         except Exception as e:
-            logger.error("[BANDWIDTH] Failed to update channel bandwidth: %s", e)
-            session.rollback()
-        finally:
-            session.close()
-
-    def _update_watch_counts(self, channels: list[dict]):
-        """Update watch counts for channels that just became active and log journal events."""
-        from journal import log_entry
+            # Keep the totals and retry with the next flush
+            self._batch.merge(batch)
+            logger.error("[BANDWIDTH] Failed to write bandwidth stats: %s", e)
+            return
 
-        session = get_session()
-        today = get_current_date()
+        # One summary per flush for all live stats subscribers (rollup reads only)
         try:
-            now = datetime.now(get_user_timezone())
-            for ch in channels:
-                channel_id = ch["channel_id"]
-                channel_name = ch["channel_name"]
-                client_ips = ch.get("client_ips", [])
-                # Get or create watch stats record
-                record = session.query(ChannelWatchStats).filter(
-                    ChannelWatchStats.channel_id == channel_id
-                ).first()
-
-                if record is None:
-                    record = ChannelWatchStats(
-                        channel_id=channel_id,
-                        channel_name=channel_name,
-                        watch_count=0,
-                        total_watch_seconds=0,
-                    )
-                    session.add(record)
-
-                # Update record
-                record.watch_count += 1
-                record.last_watched = now
-                # Update channel name in case it changed
-                record.channel_name = channel_name
-
-                # Create UniqueClientConnection records for each client (v0.11.0)
-                for ip in client_ips:
-                    connection = UniqueClientConnection(
-                        ip_address=ip,
-                        channel_id=channel_id,
-                        channel_name=channel_name,
-                        date=today,
-                        connected_at=now,
-                        watch_seconds=0,
-                    )
-                    session.add(connection)
-                    session.flush()  # Get the ID
-                    # Track active connection
-                    self._active_connections[(channel_id, ip)] = connection.id
-
-                # Update ChannelBandwidth connection count
-                bw_record = session.query(ChannelBandwidth).filter(
-                    ChannelBandwidth.channel_id == channel_id,
-                    ChannelBandwidth.date == today
-                ).first()
-                if bw_record:
-                    bw_record.connection_count += len(client_ips)
-
-                # Build description with IP addresses
-                ip_str = ", ".join(client_ips) if client_ips else "unknown"
-                description = f"Started watching {channel_name} from {ip_str}"
-
-                # Log journal entry for watch start
-                log_entry(
-                    category="watch",
-                    action_type="start",
-                    entity_name=channel_name,
-                    description=description,
-                    user_initiated=False,
-                    after_value={
-                        "channel_id": channel_id,
-                        "watch_count": record.watch_count,
-                        "client_ips": client_ips,
-                    },
-                )
-
-            session.commit()
-            logger.debug("[BANDWIDTH] Updated watch counts for %s channels", len(channels))
+            get_live_stats().publish("bandwidth", await asyncio.to_thread(self.get_bandwidth_summary))
         except Exception as e:
-            logger.error("[BANDWIDTH] Failed to update watch counts: %s", e)
-            session.rollback()
-        finally:
-            session.close()
+            logger.error("[BANDWIDTH] Failed to publish bandwidth summary: %s", e)
 
-    def _update_watch_time(self, channels: list[dict]):
-        """Accumulate watch time for channels that are still active."""
-        session = get_session()
-        today = get_current_date()
-        try:
-            now = datetime.now(get_user_timezone())
-            for ch in channels:
-                channel_id = ch["channel_id"]
-                channel_name = ch["channel_name"]
-                new_clients = ch.get("new_clients", [])
-                continuing_clients = ch.get("continuing_clients", [])
-                record = session.query(ChannelWatchStats).filter(
-                    ChannelWatchStats.channel_id == channel_id
-                ).first()
-
-                if record:
-                    # Add poll interval seconds to watch time
-                    record.total_watch_seconds += self.poll_interval
-                    record.last_watched = now
-                    record.channel_name = channel_name
-
-                # Handle new clients that joined mid-stream (v0.11.0)
-                for ip in new_clients:
-                    connection = UniqueClientConnection(
-                        ip_address=ip,
-                        channel_id=channel_id,
-                        channel_name=channel_name,
-                        date=today,
-                        connected_at=now,
-                        watch_seconds=0,
-                    )
-                    session.add(connection)
-                    session.flush()
-                    self._active_connections[(channel_id, ip)] = connection.id
-
-                    # Update connection count in ChannelBandwidth
-                    bw_record = session.query(ChannelBandwidth).filter(
-                        ChannelBandwidth.channel_id == channel_id,
-                        ChannelBandwidth.date == today
-                    ).first()
-                    if bw_record:
-                        bw_record.connection_count += 1
-
-                # Update watch_seconds for continuing connections
-                for ip in continuing_clients:
-                    conn_key = (channel_id, ip)
-                    if conn_key in self._active_connections:
-                        conn_id = self._active_connections[conn_key]
-                        connection = session.query(UniqueClientConnection).filter(
-                            UniqueClientConnection.id == conn_id
-                        ).first()
-                        if connection:
-                            connection.watch_seconds += self.poll_interval
-
-                # Handle clients that disconnected from this still-active channel
-                last_clients = self._last_channel_clients.get(channel_id, set())
-                current_clients = set(ch.get("client_ips", []))
-                disconnected_clients = last_clients - current_clients
-                for ip in disconnected_clients:
-                    conn_key = (channel_id, ip)
-                    if conn_key in self._active_connections:
-                        conn_id = self._active_connections.pop(conn_key)
-                        connection = session.query(UniqueClientConnection).filter(
-                            UniqueClientConnection.id == conn_id
-                        ).first()
-                        if connection:
-                            connection.disconnected_at = now
+        if time.monotonic() - self._last_purge >= PURGE_INTERVAL:
+            self._last_purge = time.monotonic()
+            try:
+                await asyncio.to_thread(purge_samples)
+            except Exception as e:
+                logger.error("[BANDWIDTH] Failed to purge time series: %s", e)
+
+    def _open_sessions(self, channel_id: str, channel_name: str, ips: list[str], now: datetime, today: date):
+        """Start watch sessions for clients that just connected (v0.11.0)."""
+        for ip in ips:
+            self._sessions[(channel_id, ip)] = WatchSession(
+                channel_id=channel_id,
+                channel_name=channel_name,
+                ip_address=ip,
+                date=today,
+                connected_at=now,
+                last_seen=now,
+            )
 
-            session.commit()
-        except Exception as e:
-            logger.error("[BANDWIDTH] Failed to update watch time: %s", e)
-            session.rollback()
-        finally:
-            session.close()
+    def _close_sessions(self, keys: list[tuple[str, str]], now: datetime):
+        """End watch sessions; they are written with the next flush."""
+        for key in keys:
+            watch_session = self._sessions.pop(key, None)
+            if watch_session:
+                watch_session.disconnected_at = now
+                self._batch.closed_sessions.append(watch_session)
 
-    def _log_watch_stop_events(self, channel_ids: set[str]):
-        """Log journal entries when channels stop being watched."""
+    def _log_watch_events(self, newly_active: list[dict], stopped: set[str]):
+        """Log journal entries for channels that started or stopped being watched."""
         from journal import log_entry
 
+        # Watch totals for the journal: stored values plus the unflushed batch
         session = get_session()
         try:
-            for channel_id in channel_ids:
-                # Get channel name - prefer ECM map, then cache, then database
-                channel_name = (
-                    self._ecm_channel_map.get(channel_id)
-                    or self._channel_names.get(channel_id)
-                )
-                if not channel_name:
-                    record = session.query(ChannelWatchStats).filter(
-                        ChannelWatchStats.channel_id == channel_id
-                    ).first()
-                    channel_name = record.channel_name if record else f"Channel {channel_id[:8]}..."
-
-                # Get current stats for the log
-                record = session.query(ChannelWatchStats).filter(
-                    ChannelWatchStats.channel_id == channel_id
-                ).first()
-
-                watch_time = record.total_watch_seconds if record else 0
-
-                # Log journal entry for watch stop
-                log_entry(
-                    category="watch",
-                    action_type="stop",
-                    entity_name=channel_name,
-                    description=f"Stopped watching {channel_name}",
-                    user_initiated=False,
-                    after_value={
-                        "channel_id": channel_id,
-                        "total_watch_seconds": watch_time,
-                    },
-                )
-
-            logger.debug("[BANDWIDTH] Logged watch stop events for %s channels", len(channel_ids))
+            watch_ids = [ch["channel_id"] for ch in newly_active] + list(stopped)
+            stored = {
+                row.channel_id: row
+                for row in session.query(
+                    ChannelWatchStats.channel_id,
+                    ChannelWatchStats.channel_name,
+                    ChannelWatchStats.watch_count,
+                    ChannelWatchStats.total_watch_seconds,
+                ).filter(ChannelWatchStats.channel_id.in_(watch_ids))
+            }
         except Exception as e:
-            logger.error("[BANDWIDTH] Failed to log watch stop events: %s", e)
+            logger.error("[BANDWIDTH] Failed to log watch events: %s", e)
+            return
         finally:
             session.close()
 
-    def _close_client_connections(self, channel_ids: set[str]):
-        """Mark all client connections as disconnected when channels stop (v0.11.0)."""
-        session = get_session()
-        try:
-            now = datetime.now(get_user_timezone())
-            closed_count = 0
-
-            for channel_id in channel_ids:
-                # Find all active connections for this channel
-                keys_to_remove = [
-                    key for key in self._active_connections
-                    if key[0] == channel_id
-                ]
-
-                for key in keys_to_remove:
-                    conn_id = self._active_connections.pop(key)
-                    connection = session.query(UniqueClientConnection).filter(
-                        UniqueClientConnection.id == conn_id
-                    ).first()
-                    if connection and connection.disconnected_at is None:
-                        connection.disconnected_at = now
-                        closed_count += 1
+        for ch in newly_active:
+            channel_id = ch["channel_id"]
+            client_ips = ch["client_ips"]
+            record = stored.get(channel_id)
+            # Build description with IP addresses
+            ip_str = ", ".join(client_ips) if client_ips else "unknown"
+            log_entry(
+                category="watch",
+                action_type="start",
+                entity_name=ch["channel_name"],
+                description=f"Started watching {ch['channel_name']} from {ip_str}",
+                user_initiated=False,
+                after_value={
+                    "channel_id": channel_id,
+                    "watch_count": (record.watch_count if record else 0) + self._batch.pending_watch(channel_id)["watch_count"],
+                    "client_ips": client_ips,
+                },
+            )
 
-            session.commit()
-            if closed_count > 0:
-                logger.debug("[BANDWIDTH] Closed %s client connections for stopped channels", closed_count)
-        except Exception as e:
-            logger.error("[BANDWIDTH] Failed to close client connections: %s", e)
-            session.rollback()
-        finally:
-            session.close()
+        for channel_id in stopped:
+            record = stored.get(channel_id)
+            # Get channel name - prefer ECM map, then cache, then database
+            channel_name = (
+                self._ecm_channel_map.get(channel_id)
+                or self._channel_names.get(channel_id)
+                or (record.channel_name if record else f"Channel {channel_id[:8]}...")
+            )
+            watch_time = (record.total_watch_seconds if record else 0) + self._batch.pending_watch(channel_id)["total_watch_seconds"]
+            log_entry(
+                category="watch",
+                action_type="stop",
+                entity_name=channel_name,
+                description=f"Stopped watching {channel_name}",
+                user_initiated=False,
+                after_value={
+                    "channel_id": channel_id,
+                    "total_watch_seconds": watch_time,
+                },
+            )
 
     @staticmethod
     def get_bandwidth_summary() -> dict:
@@ -762,78 +608,40 @@ class BandwidthTracker:
             dict with today, this_week, this_month, this_year, all_time bytes,
             in/out breakdowns, peak bitrates, and daily_history for last 7 days
         """
-        from sqlalchemy import func
-
         today = get_current_date()
         week_ago = today - timedelta(days=7)
-        month_start = today.replace(day=1)
-        year_start = today.replace(month=1, day=1)
 
         session = get_session()
         try:
-            # Use SQL aggregation for efficient calculations
-            # Today's bytes (total, in, out)
-            today_result = session.query(
-                func.coalesce(func.sum(BandwidthDaily.bytes_transferred), 0),
-                func.coalesce(func.sum(BandwidthDaily.bytes_in), 0),
-                func.coalesce(func.sum(BandwidthDaily.bytes_out), 0),
-                func.coalesce(func.max(BandwidthDaily.peak_bitrate_in), 0),
-                func.coalesce(func.max(BandwidthDaily.peak_bitrate_out), 0),
-            ).filter(BandwidthDaily.date == today).first()
-            today_bytes = today_result[0] or 0
-            today_bytes_in = today_result[1] or 0
-            today_bytes_out = today_result[2] or 0
-            today_peak_bitrate_in = today_result[3] or 0
-            today_peak_bitrate_out = today_result[4] or 0
-
-            # This week's bytes
-            week_result = session.query(
-                func.coalesce(func.sum(BandwidthDaily.bytes_transferred), 0),
-                func.coalesce(func.sum(BandwidthDaily.bytes_in), 0),
-                func.coalesce(func.sum(BandwidthDaily.bytes_out), 0),
-                func.coalesce(func.max(BandwidthDaily.peak_bitrate_in), 0),
-                func.coalesce(func.max(BandwidthDaily.peak_bitrate_out), 0),
-            ).filter(BandwidthDaily.date >= week_ago).first()
-            week_bytes = week_result[0] or 0
-            week_bytes_in = week_result[1] or 0
-            week_bytes_out = week_result[2] or 0
-            week_peak_bitrate_in = week_result[3] or 0
-            week_peak_bitrate_out = week_result[4] or 0
-
-            # This month's bytes
-            month_result = session.query(
-                func.coalesce(func.sum(BandwidthDaily.bytes_transferred), 0),
-                func.coalesce(func.sum(BandwidthDaily.bytes_in), 0),
-                func.coalesce(func.sum(BandwidthDaily.bytes_out), 0),
-            ).filter(BandwidthDaily.date >= month_start).first()
-            month_bytes = month_result[0] or 0
-            month_bytes_in = month_result[1] or 0
-            month_bytes_out = month_result[2] or 0
-
-            # This year's bytes
-            year_result = session.query(
-                func.coalesce(func.sum(BandwidthDaily.bytes_transferred), 0),
-                func.coalesce(func.sum(BandwidthDaily.bytes_in), 0),
-                func.coalesce(func.sum(BandwidthDaily.bytes_out), 0),
-            ).filter(BandwidthDaily.date >= year_start).first()
-            year_bytes = year_result[0] or 0
-            year_bytes_in = year_result[1] or 0
-            year_bytes_out = year_result[2] or 0
-
-            # All time bytes
-            all_time_result = session.query(
-                func.coalesce(func.sum(BandwidthDaily.bytes_transferred), 0),
-                func.coalesce(func.sum(BandwidthDaily.bytes_in), 0),
-                func.coalesce(func.sum(BandwidthDaily.bytes_out), 0),
-            ).first()
-            all_time_bytes = all_time_result[0] or 0
-            all_time_bytes_in = all_time_result[1] or 0
-            all_time_bytes_out = all_time_result[2] or 0
-
-            # Get last 7 days for chart
+            # Today and the last 7 days come from at most 8 daily rows;
+            # month, year and all time are maintained rollups (stats_rollups)
             week_records = session.query(BandwidthDaily).filter(
                 BandwidthDaily.date >= week_ago
             ).order_by(BandwidthDaily.date.asc()).all()
+            today_record = next((r for r in week_records if r.date == today), None)
+
+            today_bytes = today_record.bytes_transferred if today_record else 0
+            today_bytes_in = today_record.bytes_in if today_record else 0
+            today_bytes_out = today_record.bytes_out if today_record else 0
+            today_peak_bitrate_in = today_record.peak_bitrate_in if today_record else 0
+            today_peak_bitrate_out = today_record.peak_bitrate_out if today_record else 0
+
+            week_bytes = sum(r.bytes_transferred for r in week_records)
+            week_bytes_in = sum(r.bytes_in for r in week_records)
+            week_bytes_out = sum(r.bytes_out for r in week_records)
+            week_peak_bitrate_in = max((r.peak_bitrate_in for r in week_records), default=0)
+            week_peak_bitrate_out = max((r.peak_bitrate_out for r in week_records), default=0)
+
+            totals = bandwidth_period_totals(session, today)
+            month_bytes = totals["month"]["bytes_transferred"]
+            month_bytes_in = totals["month"]["bytes_in"]
+            month_bytes_out = totals["month"]["bytes_out"]
+            year_bytes = totals["year"]["bytes_transferred"]
+            year_bytes_in = totals["year"]["bytes_in"]
+            year_bytes_out = totals["year"]["bytes_out"]
+            all_time_bytes = totals["all"]["bytes_transferred"]
+            all_time_bytes_in = totals["all"]["bytes_in"]
+            all_time_bytes_out = totals["all"]["bytes_out"]
 
             daily_history = [record.to_dict() for record in week_records]
 
@@ -928,37 +736,24 @@ class BandwidthTracker:
         Returns:
             dict with unique viewer counts and breakdown
         """
-        from sqlalchemy import func, distinct
+        from sqlalchemy import func
 
         cutoff = get_current_date() - timedelta(days=days)
         today = get_current_date()
 
         session = get_session()
         try:
-            # Total unique IPs in period
-            total_unique = session.query(
-                func.count(distinct(UniqueClientConnection.ip_address))
-            ).filter(UniqueClientConnection.date >= cutoff).scalar() or 0
-
-            # Unique IPs today
-            today_unique = session.query(
-                func.count(distinct(UniqueClientConnection.ip_address))
-            ).filter(UniqueClientConnection.date == today).scalar() or 0
-
-            # Total connections in period
-            total_connections = session.query(
-                func.count(UniqueClientConnection.id)
-            ).filter(UniqueClientConnection.date >= cutoff).scalar() or 0
-
-            # Average watch time per connection
-            avg_watch_time = session.query(
-                func.avg(UniqueClientConnection.watch_seconds)
-            ).filter(
-                UniqueClientConnection.date >= cutoff,
-                UniqueClientConnection.watch_seconds > 0
-            ).scalar() or 0
+            # Unique viewers, connections and watch time from the daily rollups
+            daily = viewer_rollups(session, cutoff)
+            total_unique = unique_count(daily)
+            today_unique = unique_count(row for row in daily if row.date == today)
+            total_connections = sum(row.connection_count for row in daily)
+
+            # Average watch time per connection that was watched at all
+            watched = sum(row.watched_connections for row in daily)
+            avg_watch_time = sum(row.watch_seconds for row in daily) / watched if watched else 0
 
-            # Top viewers by connection count
+            # Top viewers by connection count (per IP, read from the date-indexed connections)
             top_viewers = session.query(
                 UniqueClientConnection.ip_address,
                 func.count(UniqueClientConnection.id).label("connection_count"),
@@ -971,18 +766,6 @@ class BandwidthTracker:
                 func.count(UniqueClientConnection.id).desc()
             ).limit(10).all()
 
-            # Daily unique viewer counts for chart
-            daily_unique = session.query(
-                UniqueClientConnection.date,
-                func.count(distinct(UniqueClientConnection.ip_address)).label("unique_count")
-            ).filter(
-                UniqueClientConnection.date >= cutoff
-            ).group_by(
-                UniqueClientConnection.date
-            ).order_by(
-                UniqueClientConnection.date.asc()
-            ).all()
-
             return {
                 "period_days": days,
                 "total_unique_viewers": total_unique,
@@ -998,8 +781,8 @@ class BandwidthTracker:
                     for v in top_viewers
                 ],
                 "daily_unique": [
-                    {"date": d.date.isoformat(), "unique_count": d.unique_count}
-                    for d in daily_unique
+                    {"date": row.date.isoformat(), "unique_count": unique_count([row])}
+                    for row in daily
                 ],
             }
         finally:
@@ -1075,40 +858,29 @@ class BandwidthTracker:
         Returns:
             List of channels with their unique viewer counts
         """
-        from sqlalchemy import func, distinct
-
         cutoff = get_current_date() - timedelta(days=days)
 
         session = get_session()
         try:
-            results = session.query(
-                UniqueClientConnection.channel_id,
-                UniqueClientConnection.channel_name,
-                func.count(distinct(UniqueClientConnection.ip_address)).label("unique_viewers"),
-                func.count(UniqueClientConnection.id).label("total_connections"),
-                func.sum(UniqueClientConnection.watch_seconds).label("total_watch_seconds"),
-            ).filter(
-                UniqueClientConnection.date >= cutoff
-            ).group_by(
-                UniqueClientConnection.channel_id,
-                UniqueClientConnection.channel_name
-            ).order_by(
-                func.count(distinct(UniqueClientConnection.ip_address)).desc()
-            ).limit(limit).all()
-
-            return [
-                {
-                    "channel_id": r.channel_id,
-                    "channel_name": r.channel_name,
-                    "unique_viewers": r.unique_viewers,
-                    "total_connections": r.total_connections,
-                    "total_watch_seconds": r.total_watch_seconds or 0,
-                }
-                for r in results
-            ]
+            by_channel: dict[str, list] = {}
+            for row in viewer_rollups(session, cutoff, channel_id=None):
+                by_channel.setdefault(row.channel_id, []).append(row)
         finally:
             session.close()
 
+        results = [
+            {
+                "channel_id": channel_id,
+                "channel_name": rows[-1].channel_name,  # Most recent name
+                "unique_viewers": unique_count(rows),
+                "total_connections": sum(row.connection_count for row in rows),
+                "total_watch_seconds": sum(row.watch_seconds for row in rows),
+            }
+            for channel_id, rows in by_channel.items()
+        ]
+        results.sort(key=lambda r: r["unique_viewers"], reverse=True)
+        return results[:limit]
+
 
 # Global tracker instance
 _tracker: Optional[BandwidthTracker] = None
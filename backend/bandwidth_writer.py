@@ -0,0 +1,287 @@
+"""
+Write-behind persistence for bandwidth tracking.
+
+BandwidthTracker polls Dispatcharr every few seconds. Instead of writing
+each poll's deltas with per-channel SELECT-then-UPDATE queries, it adds
+them to a BandwidthBatch in memory: daily totals and peaks, per-channel
+bytes/peaks/watch seconds/connection counts, per-channel watch stats,
+time series buckets (bandwidth_timeseries) and finished watch sessions.
+write_bandwidth_batch() applies a batch as one multi-row UPSERT per table
+inside a single transaction, together with the stats rollups
+(stats_rollups) derived from it. Counters are added to the stored values and
+peaks keep the larger one, so batches can be written in any grouping
+without changing the result.
+
+Client connections are WatchSession intervals held by the tracker while
+active. A session's unique_client_connections row is inserted at the first
+write after it starts and afterwards only updated, with watch seconds
+derived from the interval. Writes happen at each flush (a checkpoint for
+open sessions) and for sessions that ended since the last flush.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.dialects.sqlite import insert
+
+from bandwidth_timeseries import RESOLUTIONS, Sample, bucket_start
+from database import get_session
+from models import BandwidthDaily, BandwidthSample, ChannelBandwidth, ChannelWatchStats, UniqueClientConnection
+from stats_rollups import ViewerDeltas, apply_viewer_deltas, upsert_bandwidth_rollups
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_POLLS = 6  # Polls between writes (one minute at the default 10s interval)
+
+_DAILY_SUMS = ("bytes_transferred", "bytes_in", "bytes_out")
+_DAILY_PEAKS = ("peak_channels", "peak_clients", "peak_bitrate_in", "peak_bitrate_out")
+_SERIES_SUMS = ("bytes_in", "bytes_out", "sample_count")
+_SERIES_PEAKS = ("peak_bitrate_in", "peak_bitrate_out", "peak_clients", "peak_channels")
+
+
+@dataclass
+class WatchSession:
+    """One client watching one channel, from connect until disconnect."""
+    channel_id: str
+    channel_name: str
+    ip_address: str
+    date: date
+    connected_at: datetime
+    last_seen: datetime
+    disconnected_at: Optional[datetime] = None
+    connection_id: Optional[int] = None  # unique_client_connections.id once written
+    written_seconds: int = 0  # watch_seconds as of the last write
+
+    @property
+    def watch_seconds(self) -> int:
+        return max(0, int((self.last_seen - self.connected_at).total_seconds()))
+
+
+class BandwidthBatch:
+    """Bandwidth stats accumulated since the last write."""
+
+    def __init__(self):
+        self.daily: dict[date, dict] = {}
+        self.channels: dict[tuple[str, date], dict] = {}  # (channel_id, date) -> channel_bandwidth deltas
+        self.watch: dict[str, dict] = {}  # channel_id -> channel_watch_stats deltas
+        self.closed_sessions: list[WatchSession] = []  # Ended since the last write
+        self.series: dict[tuple[int, str, datetime], dict] = {}  # (resolution, channel_id, bucket) -> bucket
+
+    def __bool__(self) -> bool:
+        return bool(self.daily or self.channels or self.watch or self.closed_sessions or self.series)
+
+    def add_daily(self, day: date, **values: int) -> None:
+        """Add byte counters and peak values for a day."""
+        row = self.daily.setdefault(day, {"date": day, **{c: 0 for c in _DAILY_SUMS + _DAILY_PEAKS}})
+        for column, value in values.items():
+            if column in _DAILY_SUMS:
+                row[column] += value
+            else:
+                row[column] = max(row[column], value)
+
+    def add_channel(
+        self,
+        channel_id: str,
+        channel_name: str,
+        day: date,
+        bytes_delta: int = 0,
+        clients: int = 0,
+        watch_seconds: int = 0,
+        connections: int = 0,
+    ) -> None:
+        """Add a channel's bytes, concurrent clients, watch seconds and new connections for a day."""
+        row = self.channels.setdefault((channel_id, day), {
+            "channel_id": channel_id, "date": day, "bytes_transferred": 0,
+            "peak_clients": 0, "total_watch_seconds": 0, "connection_count": 0,
+        })
+        row["channel_name"] = channel_name
+        row["bytes_transferred"] += bytes_delta
+        row["peak_clients"] = max(row["peak_clients"], clients)
+        row["total_watch_seconds"] += watch_seconds
+        row["connection_count"] += connections
+
+    def add_watch(
+        self,
+        channel_id: str,
+        channel_name: str,
+        watched_at: datetime,
+        watch_count: int = 0,
+        watch_seconds: int = 0,
+    ) -> None:
+        """Add watch starts and watch seconds for a channel."""
+        row = self.watch.setdefault(channel_id, {
+            "channel_id": channel_id, "watch_count": 0, "total_watch_seconds": 0,
+        })
+        row["channel_name"] = channel_name
+        row["last_watched"] = watched_at
+        row["watch_count"] += watch_count
+        row["total_watch_seconds"] += watch_seconds
+
+    def add_sample(self, sample: Sample) -> None:
+        """Add a poll sample to its bucket at every time series resolution."""
+        for resolution in RESOLUTIONS.values():
+            self._add_bucket({
+                "resolution": resolution,
+                "channel_id": sample.channel_id,
+                "bucket_start": bucket_start(sample.timestamp, resolution),
+                "bytes_in": sample.bytes_in,
+                "bytes_out": sample.bytes_out,
+                "sample_count": 1,
+                "peak_bitrate_in": sample.bitrate_in,
+                "peak_bitrate_out": sample.bitrate_out,
+                "peak_clients": sample.clients,
+                "peak_channels": sample.channels,
+            })
+
+    def _add_bucket(self, values: dict) -> None:
+        key = (values["resolution"], values["channel_id"], values["bucket_start"])
+        row = self.series.get(key)
+        if row is None:
+            self.series[key] = dict(values)
+            return
+        for column in _SERIES_SUMS:
+            row[column] += values[column]
+        for column in _SERIES_PEAKS:
+            row[column] = max(row[column], values[column])
+
+    def pending_watch(self, channel_id: str) -> dict:
+        """Unwritten watch stats of a channel (zeros if none)."""
+        return self.watch.get(channel_id, {"watch_count": 0, "total_watch_seconds": 0})
+
+    def merge(self, other: "BandwidthBatch") -> None:
+        """Fold an older batch back in (after a failed write)."""
+        for row in other.daily.values():
+            self.add_daily(row["date"], **{c: row[c] for c in _DAILY_SUMS + _DAILY_PEAKS})
+        for row in other.channels.values():
+            # Keep the newer name if this batch already has the channel
+            name = self.channels.get((row["channel_id"], row["date"]), row)["channel_name"]
+            self.add_channel(
+                row["channel_id"], name, row["date"], row["bytes_transferred"],
+                row["peak_clients"], row["total_watch_seconds"], row["connection_count"],
+            )
+        for row in other.watch.values():
+            newer = self.watch.get(row["channel_id"], row)
+            self.add_watch(
+                row["channel_id"], newer["channel_name"], newer["last_watched"],
+                row["watch_count"], row["total_watch_seconds"],
+            )
+        self.closed_sessions[:0] = other.closed_sessions
+        for row in other.series.values():
+            self._add_bucket(row)
+
+
+def _upsert(table, rows: list[dict], index_elements: list[str], sums: tuple, peaks: tuple = (), replace: tuple = ()):
+    stmt = insert(table).values(rows)
+    excluded = stmt.excluded
+    columns = table.__table__.c
+    update_set = {}
+    for column in sums:
+        update_set[column] = columns[column] + excluded[column]
+    for column in peaks:
+        update_set[column] = func.max(columns[column], excluded[column])
+    for column in replace:
+        update_set[column] = excluded[column]
+    return stmt.on_conflict_do_update(index_elements=index_elements, set_=update_set)
+
+
+def _viewer_deltas(sessions: list[WatchSession]) -> ViewerDeltas:
+    deltas = ViewerDeltas()
+    for ws in sessions:
+        deltas.add(
+            ws.date, ws.channel_id, ws.channel_name,
+            ip_address=ws.ip_address if ws.connection_id is None else None,
+            watch_seconds=ws.watch_seconds - ws.written_seconds,
+            became_watched=ws.written_seconds == 0 and ws.watch_seconds > 0,
+        )
+    return deltas
+
+
+def _write_sessions(session, sessions: list[WatchSession]) -> list[tuple[WatchSession, int]]:
+    """Insert new session rows and update written ones. Returns IDs to assign after commit."""
+    apply_viewer_deltas(session, _viewer_deltas(sessions))
+    written = [ws for ws in sessions if ws.connection_id is not None]
+    if written:
+        table = UniqueClientConnection.__table__
+        session.execute(
+            update(table).where(table.c.id == bindparam("connection_id")).values(
+                watch_seconds=bindparam("seconds"),
+                disconnected_at=bindparam("ended"),
+            ),
+            [
+                {"connection_id": ws.connection_id, "seconds": ws.watch_seconds, "ended": ws.disconnected_at}
+                for ws in written
+            ],
+        )
+
+    new = [
+        (ws, UniqueClientConnection(
+            ip_address=ws.ip_address,
+            channel_id=ws.channel_id,
+            channel_name=ws.channel_name,
+            date=ws.date,
+            connected_at=ws.connected_at,
+            disconnected_at=ws.disconnected_at,
+            watch_seconds=ws.watch_seconds,
+        ))
+        for ws in sessions if ws.connection_id is None
+    ]
+    if not new:
+        return []
+    session.add_all(row for _, row in new)
+    session.flush()  # One batched INSERT assigns all IDs
+    return [(ws, row.id) for ws, row in new]
+
+
+def write_bandwidth_batch(batch: BandwidthBatch, open_sessions: Iterable[WatchSession] = ()) -> None:
+    """
+    Apply a batch to the database in one transaction.
+
+    Args:
+        batch: Accumulated stats and finished watch sessions
+        open_sessions: Active watch sessions to checkpoint
+    """
+    sessions = batch.closed_sessions + list(open_sessions)
+    if not batch and not sessions:
+        return
+    session = get_session()
+    try:
+        if batch.daily:
+            session.execute(_upsert(
+                BandwidthDaily, list(batch.daily.values()), ["date"], _DAILY_SUMS, _DAILY_PEAKS,
+            ))
+            upsert_bandwidth_rollups(session, batch.daily.values())
+        if batch.channels:
+            now = datetime.utcnow()
+            session.execute(_upsert(
+                ChannelBandwidth,
+                [{**row, "updated_at": now} for row in batch.channels.values()],
+                ["channel_id", "date"],
+                sums=("bytes_transferred", "total_watch_seconds", "connection_count"),
+                peaks=("peak_clients",),
+                replace=("channel_name", "updated_at"),
+            ))
+        if batch.watch:
+            session.execute(_upsert(
+                ChannelWatchStats, list(batch.watch.values()), ["channel_id"],
+                sums=("watch_count", "total_watch_seconds"),
+                replace=("channel_name", "last_watched"),
+            ))
+        if batch.series:
+            session.execute(_upsert(
+                BandwidthSample, list(batch.series.values()), ["resolution", "channel_id", "bucket_start"],
+                _SERIES_SUMS, _SERIES_PEAKS,
+            ))
+        new_ids = _write_sessions(session, sessions) if sessions else []
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    for ws, connection_id in new_ids:
+        ws.connection_id = connection_id
+    for ws in sessions:
+        ws.written_seconds = ws.watch_seconds
@@ -1,44 +1,137 @@
-"""Simple in-memory cache for API responses."""
+"""Bounded in-memory cache for API responses.
+
+Entries are kept in LRU order and evicted once the cache exceeds either its
+entry count or its (estimated) byte budget. Expired entries are removed on
+read and by a periodic background sweep, so memory stays flat in
+long-running containers.
+
+Entries can carry tags (e.g. ``"m3u_account:5"``) so related keys are
+invalidated together without scanning every key.
+
+Entries stored with a ``soft_ttl`` support stale-while-revalidate: once
+older than the soft TTL (but younger than the hard ``ttl``), get() with a
+``revalidate`` loader returns the stale value immediately and refreshes it
+in the background, at most once per key at a time.
+"""
+import asyncio
+import sys
 import time
 import logging
-from typing import Any, TypeVar, Generic
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable, Optional, TypeVar, Generic
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Defaults for the global cache
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_SWEEP_INTERVAL = 60.0
+# Entries listed individually by stats() (most recently used first)
+STATS_MAX_ENTRIES = 100
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a JSON-like value in bytes."""
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
 
 @dataclass
 class CacheEntry(Generic[T]):
     """A cached value with timestamp."""
     data: T
     cached_at: float
+    size: int = 0
+    ttl: Optional[float] = None
+    soft_ttl: Optional[float] = None
+    tags: frozenset = field(default_factory=frozenset)
 
 
 class Cache:
-    """Simple in-memory cache with TTL support."""
-
-    def __init__(self, default_ttl: int = 300):
+    """In-memory LRU cache with TTL, size limits and tag invalidation."""
+
+    def __init__(
+        self,
+        default_ttl: int = 300,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        sweep_interval: float = DEFAULT_SWEEP_INTERVAL,
+    ):
         """
         Initialize cache.
 
         Args:
             default_ttl: Default time-to-live in seconds (default: 5 minutes)
+            max_entries: Maximum number of entries before LRU eviction
+            max_bytes: Approximate memory budget before LRU eviction
+            sweep_interval: Seconds between background expiry sweeps
         """
-        self._cache: dict[str, CacheEntry] = {}
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
         self._default_ttl = default_ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._sweep_interval = sweep_interval
+        self._bytes = 0
         self._hits = 0
         self._misses = 0
-        logger.debug("[CACHE] Cache initialized with TTL: %ss", default_ttl)
-
-    def get(self, key: str, ttl: int | None = None) -> Any | None:
+        self._evictions = 0
+        self._expirations = 0
+        self._stale_hits = 0
+        self._refreshes = 0
+        self._refresh_failures = 0
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._sweep_task: Optional[asyncio.Task] = None
+        logger.debug("[CACHE] Cache initialized with TTL: %ss, max entries: %s, max bytes: %s",
+                     default_ttl, max_entries, max_bytes)
+
+    def _entry_ttl(self, entry: CacheEntry, ttl: Optional[float] = None) -> float:
+        if ttl is not None:
+            return ttl
+        if entry.ttl is not None:
+            return entry.ttl
+        return self._default_ttl
+
+    def _remove(self, key: str) -> Optional[CacheEntry]:
+        entry = self._cache.pop(key, None)
+        if entry is None:
+            return None
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return entry
+
+    def get(
+        self,
+        key: str,
+        ttl: int | None = None,
+        revalidate: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any | None:
         """
         Get a value from cache if not expired.
 
         Args:
             key: Cache key
-            ttl: Time-to-live in seconds (uses default if not specified)
+            ttl: Time-to-live in seconds (uses the entry's or the default TTL if not specified)
+            revalidate: Loader for stale-while-revalidate. When the entry is past
+                        its soft TTL, the stale value is returned and this loader
+                        refreshes it in the background.
 
         Returns:
             Cached value or None if not found or expired
@@ -49,29 +142,100 @@ class Cache:
             logger.debug("[CACHE] Cache miss for key '%s'", key)
             return None
 
-        effective_ttl = ttl if ttl is not None else self._default_ttl
+        effective_ttl = self._entry_ttl(entry, ttl)
         age = time.time() - entry.cached_at
 
         if age > effective_ttl:
             self._misses += 1
+            self._expirations += 1
             logger.debug("[CACHE] Cache expired for key '%s' (age: %.1fs, ttl: %ss)", key, age, effective_ttl)
-            del self._cache[key]
+            self._remove(key)
             return None
 
-        self._hits += 1
-        logger.debug("[CACHE] Cache hit for key '%s' (age: %.1fs)", key, age)
+        if ttl is None and entry.soft_ttl is not None and age > entry.soft_ttl:
+            if revalidate is None:
+                self._misses += 1
+                logger.debug("[CACHE] Cache stale for key '%s' (age: %.1fs, soft ttl: %ss)", key, age, entry.soft_ttl)
+                return None
+            self._stale_hits += 1
+            self._start_refresh(key, entry, revalidate)
+            logger.debug("[CACHE] Serving stale value for key '%s' (age: %.1fs) while revalidating", key, age)
+        else:
+            self._hits += 1
+            logger.debug("[CACHE] Cache hit for key '%s' (age: %.1fs)", key, age)
+        self._cache.move_to_end(key)
         return entry.data
 
-    def set(self, key: str, value: Any) -> None:
+    def _start_refresh(self, key: str, entry: CacheEntry, loader: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._refresh(key, entry, loader))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, entry: CacheEntry, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            value = await loader()
+        except Exception as e:
+            self._refresh_failures += 1
+            logger.warning("[CACHE] Background refresh of '%s' failed, keeping stale value: %s", key, e)
+            return
+        # Don't resurrect an entry that was invalidated or replaced meanwhile
+        if self._cache.get(key) is not entry:
+            return
+        self._refreshes += 1
+        self.set(key, value, ttl=entry.ttl, soft_ttl=entry.soft_ttl, tags=entry.tags)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Optional[Iterable[str]] = None,
+        soft_ttl: Optional[float] = None,
+    ) -> None:
         """
         Store a value in cache.
 
         Args:
             key: Cache key
             value: Value to cache
+            ttl: Time-to-live for this entry (uses the default if not specified);
+                 the hard limit after which the value is never served
+            tags: Tags for group invalidation via invalidate_tag()
+            soft_ttl: Age after which the value is stale and is only served
+                      together with a background refresh (see get())
         """
-        self._cache[key] = CacheEntry(data=value, cached_at=time.time())
-        logger.debug("[CACHE] Cached value for key '%s'", key)
+        self._remove(key)
+        entry = CacheEntry(
+            data=value,
+            cached_at=time.time(),
+            size=estimate_size(value),
+            ttl=ttl,
+            soft_ttl=soft_ttl,
+            tags=frozenset(tags or ()),
+        )
+        self._cache[key] = entry
+        self._bytes += entry.size
+        for tag in entry.tags:
+            self._tags.setdefault(tag, set()).add(key)
+        logger.debug("[CACHE] Cached value for key '%s' (%s bytes)", key, entry.size)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within the limits."""
+        while self._cache and (len(self._cache) > self._max_entries or self._bytes > self._max_bytes):
+            # Never evict the entry just written, even if it alone exceeds the budget
+            if len(self._cache) == 1:
+                break
+            key = next(iter(self._cache))
+            self._remove(key)
+            self._evictions += 1
+            logger.debug("[CACHE] Evicted least recently used key '%s'", key)
 
     def invalidate(self, key: str) -> bool:
         """
@@ -83,16 +247,36 @@ class Cache:
         Returns:
             True if key was found and removed, False otherwise
         """
-        if key in self._cache:
-            del self._cache[key]
+        if self._remove(key) is not None:
             logger.debug("[CACHE] Invalidated cache for key '%s'", key)
             return True
         return False
 
+    def invalidate_tag(self, *tags: str) -> int:
+        """
+        Remove all entries carrying any of the given tags.
+
+        Args:
+            tags: Tags to invalidate
+
+        Returns:
+            Number of keys removed
+        """
+        keys = set()
+        for tag in tags:
+            keys.update(self._tags.get(tag, ()))
+        for key in keys:
+            self._remove(key)
+        if keys:
+            logger.debug("[CACHE] Invalidated %s cache entries tagged %s", len(keys), list(tags))
+        return len(keys)
+
     def invalidate_prefix(self, prefix: str) -> int:
         """
         Remove all keys matching a prefix.
 
+        Scans every key; prefer invalidate_tag() for known groups of entries.
+
         Args:
             prefix: Key prefix to match
 
@@ -101,7 +285,7 @@ class Cache:
         """
         keys_to_remove = [k for k in self._cache.keys() if k.startswith(prefix)]
         for key in keys_to_remove:
-            del self._cache[key]
+            self._remove(key)
         if keys_to_remove:
             logger.debug("[CACHE] Invalidated %s cache entries with prefix '%s'", len(keys_to_remove), prefix)
         return len(keys_to_remove)
@@ -115,9 +299,54 @@ class Cache:
         """
         count = len(self._cache)
         self._cache.clear()
+        self._tags.clear()
+        self._bytes = 0
         logger.info("[CACHE] Cleared entire cache (%s entries)", count)
         return count
 
+    def sweep(self) -> int:
+        """
+        Remove all expired entries.
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        expired = [
+            key for key, entry in self._cache.items()
+            if now - entry.cached_at > self._entry_ttl(entry)
+        ]
+        for key in expired:
+            self._remove(key)
+        self._expirations += len(expired)
+        if expired:
+            logger.debug("[CACHE] Swept %s expired entries", len(expired))
+        return len(expired)
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.warning("[CACHE] Expiry sweep failed: %s", e)
+
+    def start_sweeper(self) -> None:
+        """Start the background expiry sweep on the running event loop."""
+        if self._sweep_task is None or self._sweep_task.done():
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+            logger.debug("[CACHE] Expiry sweeper started (every %ss)", self._sweep_interval)
+
+    async def stop_sweeper(self) -> None:
+        """Stop the background expiry sweep."""
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+
     def stats(self) -> dict:
         """
         Get cache statistics.
@@ -127,10 +356,14 @@ class Cache:
         """
         now = time.time()
         entries = []
-        for key, entry in self._cache.items():
+        for key in reversed(self._cache):
+            if len(entries) >= STATS_MAX_ENTRIES:
+                break
+            entry = self._cache[key]
             entries.append({
                 "key": key,
                 "age_seconds": round(now - entry.cached_at, 1),
+                "size_bytes": entry.size,
             })
 
         total_requests = self._hits + self._misses
@@ -138,9 +371,19 @@ class Cache:
 
         stats = {
             "entry_count": len(self._cache),
+            "max_entries": self._max_entries,
+            "size_bytes": self._bytes,
+            "max_bytes": self._max_bytes,
             "hits": self._hits,
             "misses": self._misses,
             "hit_rate_percent": round(hit_rate, 1),
+            "stale_hits": self._stale_hits,
+            "refreshes": self._refreshes,
+            "refresh_failures": self._refresh_failures,
+            "refreshing": len(self._refreshing),
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "tag_count": len(self._tags),
             "entries": entries,
         }
 
@@ -86,9 +86,38 @@ class DispatcharrSettings(BaseModel):
     # Probe retry settings for transient ffprobe failures
     probe_retry_count: int = 1  # Number of retries when ffprobe fails but HTTP returns 200 (0 = no retry)
     probe_retry_delay: int = 2  # Seconds to wait between retries
+    # Reuse a probe result for streams with the same upstream URL (ignoring profile rewrites)
+    # for this many minutes (0 = always run ffprobe)
+    probe_cache_minutes: int = 60
+    # Check each stream URL with a ranged HTTP GET before running ffprobe, so dead
+    # streams (401/403/404/410, connection refused) fail without spawning ffprobe
+    probe_preflight_enabled: bool = False
+    # Read each stream once, feeding ffprobe and the bitrate sample from the same
+    # download (one provider connection per probe instead of two)
+    probe_single_connection: bool = False
+    # Max concurrent ffprobe/ffmpeg processes across probing, FFmpeg builder probes
+    # and previews (0 = auto: 2 per CPU core, and at least max_concurrent_probes
+    # plus the slot kept free for interactive work)
+    media_process_budget: int = 0
     # Maximum pages to fetch when retrieving streams from Dispatcharr (page_size=500)
     # 200 pages = 100,000 streams max. Increase if you have more than 100K streams.
     stream_fetch_page_limit: int = 200
+    # Number of Dispatcharr list pages fetched concurrently when reading a full
+    # paginated collection (channels, streams, logos, EPG data)
+    dispatcharr_page_concurrency: int = 4
+    # Dispatcharr HTTP connection pool
+    dispatcharr_max_connections: int = 50  # Max open connections to Dispatcharr
+    dispatcharr_max_keepalive_connections: int = 20  # Idle connections kept for reuse
+    dispatcharr_keepalive_expiry: float = 30.0  # Seconds an idle connection is kept
+    dispatcharr_http2: bool = False  # Multiplex requests over HTTP/2 (requires the h2 package)
+    dispatcharr_timeout: float = 30.0  # Default request timeout in seconds
+    # Per-endpoint timeout overrides in seconds, keyed by API path prefix (longest match wins)
+    dispatcharr_endpoint_timeouts: dict[str, float] = {"/api/epg/grid/": 120.0}
+    # Dispatcharr request traffic control
+    dispatcharr_max_concurrent_requests: int = 16  # Ceiling of the adaptive concurrency window
+    dispatcharr_retry_attempts: int = 2  # Retries for GET/HEAD/OPTIONS on transport errors and 429/502/503/504
+    dispatcharr_circuit_failure_threshold: int = 5  # Consecutive failures before failing fast (0 = disabled)
+    dispatcharr_circuit_reset_seconds: float = 30.0  # Seconds to fail fast before a trial request
     # Stream sort priority order for "Smart Sort" feature
     # Order determines priority: first element is primary sort key, subsequent elements are tie-breakers
     # Valid values: "resolution", "bitrate", "framerate", "m3u_priority", "audio_channels"
@@ -3,6 +3,7 @@ SQLite database setup for the Journal feature.
 Uses SQLAlchemy with async support via aiosqlite.
 """
 import logging
+import threading
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import StaticPool
@@ -21,6 +22,13 @@ Base = declarative_base()
 _engine = None
 _SessionLocal = None
 
+# Worker threads (asyncio.to_thread batch writers, rollup reads) get their own
+# connections: the StaticPool connection above is shared by every session, so a
+# commit or rollback on one thread would apply to another thread's statements.
+_worker_engine = None
+_WorkerSessionLocal = None
+WORKER_BUSY_TIMEOUT = 30  # Seconds a worker waits for SQLite's write lock
+
 
 def get_database_url() -> str:
     """Get the SQLite database URL."""
@@ -29,7 +37,7 @@ def get_database_url() -> str:
 
 def init_db() -> None:
     """Initialize the database, creating tables if they don't exist."""
-    global _engine, _SessionLocal
+    global _engine, _SessionLocal, _worker_engine, _WorkerSessionLocal
 
     try:
         # Ensure config directory exists
@@ -51,6 +59,16 @@ def init_db() -> None:
         # Create session factory
         _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
 
+        # WAL lets worker-thread connections write while the event loop reads
+        with _engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        _worker_engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False, "timeout": WORKER_BUSY_TIMEOUT},
+            echo=False,
+        )
+        _WorkerSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_worker_engine)
+
         # Import models to register them with Base
         from models import JournalEntry, BandwidthDaily, ChannelWatchStats, HiddenChannelGroup, StreamStats, ScheduledTask, TaskSchedule, TaskExecution, Notification, AlertMethod, TagGroup, Tag, NormalizationRuleGroup, NormalizationRule, User, UserSession, PasswordResetToken, UserIdentity, AutoCreationRule, AutoCreationExecution, AutoCreationConflict, FFmpegProfile  # noqa: F401
 
@@ -195,6 +213,15 @@ def _run_migrations(engine) -> None:
             # Add streams_excluded column to auto_creation_executions (v0.12.5 - Global exclusion filters)
             _add_auto_creation_executions_streams_excluded_column(conn)
 
+            # Add url_hash column to stream_stats (delta probes)
+            _add_stream_stats_url_hash_column(conn)
+
+            # Add materialized sort columns to stream_stats (smart sort)
+            _add_stream_stats_sort_columns(conn)
+
+            # Fill the stats rollup tables from existing bandwidth and connection rows
+            _backfill_stats_rollups(conn)
+
             logger.debug("[DATABASE] All migrations complete - schema is up to date")
     except Exception as e:
         logger.exception("[DATABASE] Migration failed: %s", e)
@@ -1415,6 +1442,96 @@ def _add_stream_stats_consecutive_failures_column(conn) -> None:
         logger.info("[DATABASE] Migration complete: added consecutive_failures column to stream_stats")
 
 
+def _add_stream_stats_url_hash_column(conn) -> None:
+    """Add url_hash column to stream_stats table (delta probes detect changed URLs)."""
+    from sqlalchemy import text
+
+    result = conn.execute(text("PRAGMA table_info(stream_stats)"))
+    columns = [row[1] for row in result.fetchall()]
+
+    if "url_hash" not in columns:
+        logger.info("[DATABASE] Adding url_hash column to stream_stats")
+        conn.execute(text(
+            "ALTER TABLE stream_stats ADD COLUMN url_hash VARCHAR(16)"
+        ))
+        conn.commit()
+        logger.info("[DATABASE] Migration complete: added url_hash column to stream_stats")
+
+
+def _add_stream_stats_sort_columns(conn) -> None:
+    """Add sort_height, sort_fps and sort_bitrate columns to stream_stats and backfill them."""
+    from sqlalchemy import text
+    from stream_sort import effective_bitrate, parse_fps, parse_height
+
+    result = conn.execute(text("PRAGMA table_info(stream_stats)"))
+    columns = [row[1] for row in result.fetchall()]
+
+    added = False
+    for column, column_type in (("sort_height", "INTEGER"), ("sort_fps", "FLOAT"), ("sort_bitrate", "BIGINT")):
+        if column not in columns:
+            logger.info("[DATABASE] Adding %s column to stream_stats", column)
+            conn.execute(text(f"ALTER TABLE stream_stats ADD COLUMN {column} {column_type}"))
+            added = True
+
+    if added:
+        # Existing rows get the values the next probe would compute
+        rows = conn.execute(text(
+            "SELECT id, resolution, fps, video_bitrate, bitrate FROM stream_stats"
+        )).fetchall()
+        updates = [
+            {
+                "id": row[0],
+                "sort_height": parse_height(row[1]),
+                "sort_fps": parse_fps(row[2]),
+                "sort_bitrate": effective_bitrate(row[3], row[4]),
+            }
+            for row in rows
+        ]
+        if updates:
+            conn.execute(text(
+                "UPDATE stream_stats SET sort_height = :sort_height, sort_fps = :sort_fps, "
+                "sort_bitrate = :sort_bitrate WHERE id = :id"
+            ), updates)
+        conn.commit()
+        logger.info("[DATABASE] Migration complete: added sort columns to stream_stats (%s rows backfilled)", len(updates))
+
+
+def _backfill_stats_rollups(conn) -> None:
+    """Build bandwidth_rollups and unique_viewer_rollups from existing data when they are empty."""
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+    from models import UniqueClientConnection
+    from stats_rollups import apply_viewer_deltas, build_viewer_deltas
+
+    if conn.execute(text("SELECT 1 FROM bandwidth_rollups LIMIT 1")).fetchone() is None:
+        for period, start in (
+            ("month", "date(date, 'start of month')"),
+            ("year", "date(date, 'start of year')"),
+            ("all", "'1970-01-01'"),
+        ):
+            conn.execute(text(
+                "INSERT INTO bandwidth_rollups (period, period_start, bytes_transferred, bytes_in, bytes_out) "
+                f"SELECT '{period}', {start}, SUM(bytes_transferred), SUM(bytes_in), SUM(bytes_out) "
+                f"FROM bandwidth_daily GROUP BY {start}"
+            ))
+        conn.commit()
+
+    if conn.execute(text("SELECT 1 FROM unique_viewer_rollups LIMIT 1")).fetchone() is None:
+        with Session(bind=conn) as session:
+            connections = session.query(
+                UniqueClientConnection.date,
+                UniqueClientConnection.channel_id,
+                UniqueClientConnection.channel_name,
+                UniqueClientConnection.ip_address,
+                UniqueClientConnection.watch_seconds,
+            ).order_by(UniqueClientConnection.id.asc()).all()
+            if connections:
+                apply_viewer_deltas(session, build_viewer_deltas(connections))
+                session.commit()
+                logger.info("[DATABASE] Migration complete: built viewer rollups from %s connections", len(connections))
+        conn.commit()
+
+
 def _add_m3u_digest_exclude_patterns_columns(conn) -> None:
     """Add exclude_group_patterns and exclude_stream_patterns columns to m3u_digest_settings."""
     from sqlalchemy import text
@@ -1505,10 +1622,17 @@ def _perform_maintenance(engine) -> None:
 
 
 def get_session():
-    """Get a database session. Use as context manager or close manually."""
+    """
+    Get a database session. Use as context manager or close manually.
+
+    Sessions created off the main (event loop) thread use the worker engine,
+    so their transactions are isolated from the shared connection.
+    """
     if _SessionLocal is None:
         logger.error("[DATABASE] Attempted to get database session before initialization")
         raise RuntimeError("Database not initialized. Call init_db() first.")
+    if _WorkerSessionLocal is not None and threading.current_thread() is not threading.main_thread():
+        return _WorkerSessionLocal()
     return _SessionLocal()
 
 
@@ -0,0 +1,452 @@
+"""
+Dispatcharr catalogue service.
+
+Keeps one indexed, in-process copy of Dispatcharr channels, channel groups,
+streams and M3U accounts so that heavy paths (stream probing, auto-creation,
+orphan detection, CSV export, bulk commits) stop re-paginating the full
+catalogue independently.
+
+Freshness is maintained incrementally:
+- Streams are partitioned per M3U account. A partition is only re-fetched
+  when the account's ``updated_at`` changes (i.e. after an M3U refresh) or
+  when ECM itself writes to that account.
+- Channels are re-fetched when the upstream count changes, when ECM issues a
+  bulk write, or once the copy is older than ``max_age``. Single-channel
+  writes made through DispatcharrClient are applied in place. Edits made
+  outside ECM that keep the count (membership, group, number) are only seen
+  at the next reload, so callers that delete or overwrite based on channels
+  pass ``fresh=True`` to reload first.
+- Groups and accounts are small and are simply re-read after ``sync_interval``.
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from config import get_settings
+from dispatcharr_client import DispatcharrClient, fetch_pages, get_client
+
+logger = logging.getLogger(__name__)
+
+# Seconds during which cached data is served without any upstream request
+CATALOG_SYNC_INTERVAL = 30
+# Seconds after which channels and the full stream list are reloaded regardless
+CATALOG_MAX_AGE = 900
+# Page size used when paginating Dispatcharr list endpoints
+CATALOG_PAGE_SIZE = 500
+
+
+def _account_version(account: dict):
+    """Value that changes whenever Dispatcharr finishes refreshing an account."""
+    return account.get("updated_at") or account.get("last_refresh")
+
+
+def _stream_account_id(stream: dict) -> Optional[int]:
+    """Extract the M3U account ID from a stream (direct ID or nested object)."""
+    m3u_account = stream.get("m3u_account")
+    if isinstance(m3u_account, dict):
+        return m3u_account.get("id")
+    return m3u_account
+
+
+class DispatcharrCatalog:
+    """Indexed, incrementally refreshed mirror of the Dispatcharr catalogue."""
+
+    def __init__(
+        self,
+        client,
+        sync_interval: float = CATALOG_SYNC_INTERVAL,
+        max_age: float = CATALOG_MAX_AGE,
+        page_size: int = CATALOG_PAGE_SIZE,
+    ):
+        """
+        Initialize the catalogue.
+
+        Args:
+            client: DispatcharrClient instance used for upstream reads
+            sync_interval: Seconds to serve cached data without checking upstream
+            max_age: Seconds after which channels/streams are fully reloaded
+            page_size: Page size for paginated list endpoints
+        """
+        self.client = client
+        self.sync_interval = sync_interval
+        self.max_age = max_age
+        self.page_size = page_size
+        self._lock = asyncio.Lock()
+
+        # Channels
+        self._channels: Optional[dict[int, dict]] = None
+        self._channels_loaded_at = 0.0
+        self._channels_checked_at = 0.0
+        self._channels_dirty = False
+
+        # Channel groups
+        self._groups: Optional[dict[int, dict]] = None
+        self._groups_loaded_at = 0.0
+        self._groups_dirty = False
+
+        # M3U accounts
+        self._accounts: Optional[dict[int, dict]] = None
+        self._accounts_loaded_at = 0.0
+        self._account_versions: dict[int, object] = {}
+
+        # Streams, partitioned by M3U account ID (None = custom streams)
+        self._streams_by_account: dict[Optional[int], dict[int, dict]] = {}
+        self._stream_index: dict[int, dict] = {}
+        self._account_streams_loaded_at: dict[Optional[int], float] = {}
+        self._all_streams_loaded_at = 0.0
+        self._dirty_accounts: set[int] = set()
+
+        # Counters for diagnostics
+        self._full_loads = 0
+        self._partial_loads = 0
+        self._writes_applied = 0
+
+    # -------------------------------------------------------------------------
+    # Pagination
+    # -------------------------------------------------------------------------
+
+    async def _fetch_all_pages(self, fetch, page_limit: Optional[int] = None, **params) -> list:
+        """Read a paginated Dispatcharr list endpoint with concurrent page prefetch."""
+        return await fetch_pages(fetch, page_size=self.page_size, page_limit=page_limit, **params)
+
+    def _stream_page_limit(self) -> Optional[int]:
+        """Configured stream pagination limit (pages of CATALOG_PAGE_SIZE)."""
+        try:
+            return get_settings().stream_fetch_page_limit
+        except Exception:
+            return None
+
+    # -------------------------------------------------------------------------
+    # Channels
+    # -------------------------------------------------------------------------
+
+    async def _ensure_channels(self) -> None:
+        now = time.time()
+        if (
+            self._channels is None
+            or self._channels_dirty
+            or now - self._channels_loaded_at > self.max_age
+        ):
+            await self._load_channels()
+            return
+
+        if now - self._channels_checked_at < self.sync_interval:
+            return
+
+        # Cheap change probe: a one-item page carries the total count
+        self._channels_checked_at = now
+        try:
+            probe = await self.client.get_channels(page=1, page_size=1)
+            if probe.get("count") != len(self._channels):
+                logger.debug(
+                    "[CATALOG] Channel count changed (%s -> %s), reloading",
+                    len(self._channels), probe.get("count")
+                )
+                await self._load_channels()
+        except Exception as e:
+            logger.warning("[CATALOG] Channel change probe failed, serving cached copy: %s", e)
+
+    async def _load_channels(self) -> None:
+        start = time.time()
+        channels = await self._fetch_all_pages(self.client.get_channels)
+        self._channels = {c["id"]: c for c in channels}
+        self._channels_loaded_at = self._channels_checked_at = time.time()
+        self._channels_dirty = False
+        self._full_loads += 1
+        logger.debug("[CATALOG] Loaded %s channels in %.1fms", len(channels), (time.time() - start) * 1000)
+
+    async def get_channels(self, fresh: bool = False) -> list[dict]:
+        """
+        Get all channels. Returned dicts are shared and must not be mutated.
+
+        Args:
+            fresh: Reload from Dispatcharr first (for destructive decisions)
+        """
+        async with self._lock:
+            if fresh:
+                await self._load_channels()
+            else:
+                await self._ensure_channels()
+            return list(self._channels.values())
+
+    async def get_channel_map(self, fresh: bool = False) -> dict[int, dict]:
+        """Get all channels keyed by channel ID (``fresh`` as for get_channels)."""
+        async with self._lock:
+            if fresh:
+                await self._load_channels()
+            else:
+                await self._ensure_channels()
+            return dict(self._channels)
+
+    # -------------------------------------------------------------------------
+    # Channel groups
+    # -------------------------------------------------------------------------
+
+    async def get_channel_groups(self) -> list[dict]:
+        """Get all channel groups."""
+        async with self._lock:
+            now = time.time()
+            if (
+                self._groups is None
+                or self._groups_dirty
+                or now - self._groups_loaded_at > self.sync_interval
+            ):
+                groups = await self.client.get_channel_groups() or []
+                self._groups = {g["id"]: g for g in groups}
+                self._groups_loaded_at = now
+                self._groups_dirty = False
+            return list(self._groups.values())
+
+    # -------------------------------------------------------------------------
+    # M3U accounts
+    # -------------------------------------------------------------------------
+
+    async def _sync_accounts(self) -> None:
+        """Re-read M3U accounts and mark partitions of refreshed accounts dirty."""
+        now = time.time()
+        if self._accounts is not None and now - self._accounts_loaded_at < self.sync_interval:
+            return
+
+        accounts = await self.client.get_m3u_accounts() or []
+        current = {a["id"]: a for a in accounts}
+        for account_id, account in current.items():
+            version = _account_version(account)
+            previous = self._account_versions.get(account_id)
+            if account_id in self._account_versions and version != previous:
+                logger.debug("[CATALOG] M3U account %s changed upstream, marking streams stale", account_id)
+                self._dirty_accounts.add(account_id)
+            self._account_versions[account_id] = version
+
+        # Accounts deleted upstream take their streams with them
+        if self._accounts is not None:
+            for account_id in set(self._accounts) - set(current):
+                self._drop_account_streams(account_id)
+                self._account_versions.pop(account_id, None)
+
+        self._accounts = current
+        self._accounts_loaded_at = now
+
+    async def get_m3u_accounts(self) -> list[dict]:
+        """Get all M3U accounts."""
+        async with self._lock:
+            await self._sync_accounts()
+            return list(self._accounts.values())
+
+    # -------------------------------------------------------------------------
+    # Streams
+    # -------------------------------------------------------------------------
+
+    def _drop_account_streams(self, account_id: Optional[int]) -> None:
+        partition = self._streams_by_account.pop(account_id, {})
+        for stream_id, stream in partition.items():
+            if self._stream_index.get(stream_id) is stream:
+                del self._stream_index[stream_id]
+        self._account_streams_loaded_at.pop(account_id, None)
+
+    def _store_account_streams(self, account_id: Optional[int], streams: list[dict], loaded_at: float) -> None:
+        self._drop_account_streams(account_id)
+        partition = {s["id"]: s for s in streams}
+        self._streams_by_account[account_id] = partition
+        self._stream_index.update(partition)
+        self._account_streams_loaded_at[account_id] = loaded_at
+        self._dirty_accounts.discard(account_id)
+
+    async def _load_all_streams(self) -> None:
+        start = time.time()
+        streams = await self._fetch_all_pages(
+            self.client.get_streams, page_limit=self._stream_page_limit()
+        )
+        partitions: dict[Optional[int], list[dict]] = {}
+        for stream in streams:
+            partitions.setdefault(_stream_account_id(stream), []).append(stream)
+
+        self._streams_by_account = {}
+        self._stream_index = {}
+        self._account_streams_loaded_at = {}
+        loaded_at = time.time()
+        for account_id, account_streams in partitions.items():
+            self._store_account_streams(account_id, account_streams, loaded_at)
+        self._dirty_accounts.clear()
+        self._all_streams_loaded_at = loaded_at
+        self._full_loads += 1
+        logger.info("[CATALOG] Loaded %s streams across %s accounts in %.1fms",
+                    len(streams), len(partitions), (loaded_at - start) * 1000)
+
+    async def _load_account_streams(self, account_id: int) -> None:
+        start = time.time()
+        streams = await self._fetch_all_pages(
+            self.client.get_streams, page_limit=self._stream_page_limit(), m3u_account=account_id
+        )
+        self._store_account_streams(account_id, streams, time.time())
+        self._partial_loads += 1
+        logger.debug("[CATALOG] Reloaded %s streams for M3U account %s in %.1fms",
+                     len(streams), account_id, (time.time() - start) * 1000)
+
+    async def _sync_accounts_safely(self) -> None:
+        try:
+            await self._sync_accounts()
+        except Exception as e:
+            logger.warning("[CATALOG] Failed to sync M3U accounts, using cached stream partitions: %s", e)
+
+    async def get_streams(self, m3u_account_id: Optional[int] = None) -> list[dict]:
+        """Get all streams, or the streams of a single M3U account.
+
+        Returned dicts are shared and must not be mutated; copy before
+        annotating them.
+        """
+        async with self._lock:
+            await self._sync_accounts_safely()
+            now = time.time()
+            full_fresh = self._all_streams_loaded_at and now - self._all_streams_loaded_at <= self.max_age
+
+            if m3u_account_id is None:
+                if not full_fresh:
+                    await self._load_all_streams()
+                else:
+                    for account_id in list(self._dirty_accounts):
+                        await self._load_account_streams(account_id)
+                return list(self._stream_index.values())
+
+            if not self._partition_fresh(m3u_account_id, now):
+                await self._load_account_streams(m3u_account_id)
+            return list(self._streams_by_account.get(m3u_account_id, {}).values())
+
+    def _partition_fresh(self, m3u_account_id: int, now: float) -> bool:
+        full_fresh = self._all_streams_loaded_at and now - self._all_streams_loaded_at <= self.max_age
+        loaded_at = self._account_streams_loaded_at.get(m3u_account_id)
+        return (
+            loaded_at is not None
+            and m3u_account_id not in self._dirty_accounts
+            and bool(full_fresh or now - loaded_at <= self.max_age)
+        )
+
+    def cached_streams(self, m3u_account_id: Optional[int] = None) -> Optional[list[dict]]:
+        """Streams already held in memory, without contacting Dispatcharr.
+
+        Returns None when the requested streams are not loaded or are stale,
+        so callers can fall back to reading Dispatcharr themselves.
+        """
+        now = time.time()
+        if m3u_account_id is None:
+            full_fresh = self._all_streams_loaded_at and now - self._all_streams_loaded_at <= self.max_age
+            if not full_fresh or self._dirty_accounts:
+                return None
+            return list(self._stream_index.values())
+        if not self._partition_fresh(m3u_account_id, now):
+            return None
+        return list(self._streams_by_account.get(m3u_account_id, {}).values())
+
+    async def get_stream_map(self) -> dict[int, dict]:
+        """Get all streams keyed by stream ID."""
+        await self.get_streams()
+        return dict(self._stream_index)
+
+    async def get_streams_by_ids(self, ids: list[int]) -> list[dict]:
+        """Get streams by ID, serving from the index and fetching only unknown IDs."""
+        found = [self._stream_index[i] for i in ids if i in self._stream_index]
+        missing = [i for i in ids if i not in self._stream_index]
+        if missing:
+            found.extend(await self.client.get_streams_by_ids(missing))
+        return found
+
+    # -------------------------------------------------------------------------
+    # Invalidation and write-through
+    # -------------------------------------------------------------------------
+
+    def invalidate(self) -> None:
+        """Mark everything stale so the next read reloads from Dispatcharr."""
+        self._channels_dirty = True
+        self._groups_dirty = True
+        self._accounts_loaded_at = 0.0
+        self._all_streams_loaded_at = 0.0
+        logger.debug("[CATALOG] Catalogue invalidated")
+
+    def invalidate_account(self, account_id: int) -> None:
+        """Mark one M3U account's streams stale (e.g. after a refresh)."""
+        self._dirty_accounts.add(account_id)
+        self._accounts_loaded_at = 0.0
+
+    def apply_write(self, resource: str, action: str, data) -> None:
+        """Apply a write made through DispatcharrClient to the local copy.
+
+        Args:
+            resource: "channels", "channel_groups" or "m3u_accounts"
+            action: "create", "update", "delete", "bulk" or "refresh"
+            data: The object returned by Dispatcharr, or the ID for deletes
+        """
+        self._writes_applied += 1
+        if resource == "channels":
+            if self._channels is None:
+                return
+            if action in ("create", "update") and isinstance(data, dict) and "id" in data:
+                self._channels[data["id"]] = data
+            elif action == "delete":
+                self._channels.pop(data, None)
+            else:
+                self._channels_dirty = True
+        elif resource == "channel_groups":
+            if self._groups is None:
+                return
+            if action in ("create", "update") and isinstance(data, dict) and "id" in data:
+                self._groups[data["id"]] = data
+            elif action == "delete":
+                self._groups.pop(data, None)
+            else:
+                self._groups_dirty = True
+        elif resource == "m3u_accounts":
+            # Account edits and refreshes change which streams exist
+            account_id = data.get("id") if isinstance(data, dict) else data
+            if action == "delete":
+                self._drop_account_streams(account_id)
+                self._account_versions.pop(account_id, None)
+            elif account_id is not None:
+                self._dirty_accounts.add(account_id)
+            else:
+                self._dirty_accounts.update(k for k in self._streams_by_account if k is not None)
+            self._accounts_loaded_at = 0.0
+
+    def stats(self) -> dict:
+        """Get catalogue statistics."""
+        now = time.time()
+        return {
+            "channels": len(self._channels) if self._channels is not None else None,
+            "channel_groups": len(self._groups) if self._groups is not None else None,
+            "m3u_accounts": len(self._accounts) if self._accounts is not None else None,
+            "streams": len(self._stream_index),
+            "stream_partitions": len(self._streams_by_account),
+            "dirty_accounts": sorted(self._dirty_accounts),
+            "channels_age_seconds": round(now - self._channels_loaded_at, 1) if self._channels is not None else None,
+            "streams_age_seconds": round(now - self._all_streams_loaded_at, 1) if self._all_streams_loaded_at else None,
+            "full_loads": self._full_loads,
+            "partial_loads": self._partial_loads,
+            "writes_applied": self._writes_applied,
+        }
+
+
+# Global catalogue instance, bound to the current Dispatcharr client
+_catalog: Optional[DispatcharrCatalog] = None
+
+
+def get_catalog(client=None) -> DispatcharrCatalog:
+    """Get the catalogue for a Dispatcharr client (defaults to the global client).
+
+    A new catalogue is created whenever the client changes (e.g. after the
+    Dispatcharr connection settings are edited).
+    """
+    global _catalog
+    if client is None:
+        client = get_client()
+
+    if _catalog is None or _catalog.client is not client:
+        _catalog = DispatcharrCatalog(client)
+        if isinstance(client, DispatcharrClient):
+            client.add_write_listener(_catalog.apply_write)
+        logger.debug("[CATALOG] Created catalogue for client %s", type(client).__name__)
+    return _catalog
+
+
+def invalidate_catalog() -> None:
+    """Invalidate the current catalogue, if one exists."""
+    if _catalog is not None:
+        _catalog.invalidate()
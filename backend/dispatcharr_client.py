@@ -1,11 +1,197 @@
 import asyncio
+import functools
+import hashlib
 import httpx
 import logging
-from typing import Optional
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+from cache import get_cache
 from config import get_settings, DispatcharrSettings
+from json_stream import JsonArrayDecoder
+from dispatcharr_limiter import AdaptiveLimiter, CircuitBreaker, Priority, current_priority
 
 logger = logging.getLogger(__name__)
 
+# Methods that are safe to retry automatically
+RETRYABLE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Responses that are retried for idempotent methods
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+# Responses that shrink the concurrency window
+OVERLOAD_STATUS_CODES = frozenset({429, 503})
+# Retry backoff (seconds): base * 2^(attempt-1), half of it jittered, capped
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 10.0
+# Longest Retry-After honoured (seconds)
+RETRY_AFTER_MAX = 30.0
+# Concurrent count queries in the per-group stream count fallback
+STREAM_GROUP_COUNT_CONCURRENCY = 8
+# Small, rarely-changing collections revalidated with conditional GETs
+CONDITIONAL_GET_PATHS = frozenset({
+    "/api/m3u/accounts/",
+    "/api/channels/groups/",
+    "/api/epg/sources/",
+    "/api/core/streamprofiles/",
+    "/api/channels/profiles/",
+})
+
+
+@dataclass
+class _ValidatedResponse:
+    """Parsed response body with the validators used to revalidate it."""
+    data: Any
+    digest: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Jittered exponential backoff for the given retry attempt (1-based)."""
+    delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given in seconds."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return min(RETRY_AFTER_MAX, max(0.0, float(value)))
+    except ValueError:
+        return None
+
+# Default number of list pages fetched concurrently by iter_pages()
+DEFAULT_PAGE_CONCURRENCY = 4
+
+
+def _params_key(params: Optional[dict]) -> tuple:
+    """Hashable, order-independent key for query parameters."""
+    if not params:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in params.items()))
+
+
+def _shallow_copy(data: Any) -> Any:
+    """New top-level container sharing its items, so callers can sort or append."""
+    if isinstance(data, list):
+        return list(data)
+    if isinstance(data, dict):
+        return dict(data)
+    return data
+
+
+def _page_items(data) -> list:
+    """Items of a list-endpoint response (paginated dict or flat list)."""
+    if isinstance(data, list):
+        return data
+    return data.get("results", []) or []
+
+
+async def iter_pages(
+    fetch: Callable[..., Awaitable],
+    page_size: int = 500,
+    max_in_flight: Optional[int] = None,
+    page_limit: Optional[int] = None,
+    **params,
+) -> AsyncIterator[dict]:
+    """Iterate every item of a paginated Dispatcharr list endpoint, in order.
+
+    The first page is fetched alone to learn ``count``; the remaining pages
+    are then fetched concurrently, at most ``max_in_flight`` at a time, and
+    yielded in page order. Responses without a usable ``count`` fall back to
+    following ``next`` sequentially, and flat-list responses (newer
+    Dispatcharr endpoints) are yielded as-is.
+
+    Args:
+        fetch: Paginated getter accepting ``page`` and ``page_size``, e.g.
+            ``client.get_streams``
+        page_size: Items per page
+        max_in_flight: Max concurrent page requests (default: settings)
+        page_limit: Stop after this many pages (None = no limit)
+        **params: Extra filters passed through to ``fetch``
+    """
+    if max_in_flight is None:
+        try:
+            max_in_flight = get_settings().dispatcharr_page_concurrency
+        except Exception:
+            max_in_flight = DEFAULT_PAGE_CONCURRENCY
+    max_in_flight = max(1, max_in_flight)
+
+    data = await fetch(page=1, page_size=page_size, **params)
+    items = _page_items(data)
+    for item in items:
+        yield item
+    if isinstance(data, list) or not items or not data.get("next"):
+        return
+
+    page = 1
+    count = data.get("count")
+    if isinstance(count, int) and count > 0:
+        last_page = -(-count // page_size)
+        if page_limit:
+            last_page = min(last_page, page_limit)
+        pending: deque = deque()
+        next_page = 2
+        try:
+            while next_page <= last_page or pending:
+                while next_page <= last_page and len(pending) < max_in_flight:
+                    pending.append(asyncio.ensure_future(
+                        fetch(page=next_page, page_size=page_size, **params)
+                    ))
+                    next_page += 1
+                page += 1
+                try:
+                    data = await pending.popleft()
+                except httpx.HTTPStatusError as e:
+                    # The collection shrank while paging: pages past the end 404
+                    if e.response.status_code == 404:
+                        return
+                    raise
+                items = _page_items(data)
+                for item in items:
+                    yield item
+                if isinstance(data, list) or not items:
+                    return
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    # Unknown count, or the collection grew while paging: follow "next"
+    while data.get("next"):
+        page += 1
+        if page_limit and page > page_limit:
+            logger.warning("[DISPATCHARR] Pagination limit reached (%s pages of %s)", page_limit, page_size)
+            return
+        data = await fetch(page=page, page_size=page_size, **params)
+        items = _page_items(data)
+        for item in items:
+            yield item
+        if isinstance(data, list) or not items:
+            return
+
+
+async def fetch_pages(
+    fetch: Callable[..., Awaitable],
+    page_size: int = 500,
+    max_in_flight: Optional[int] = None,
+    page_limit: Optional[int] = None,
+    **params,
+) -> list:
+    """Collect every item of a paginated Dispatcharr list endpoint.
+
+    See iter_pages() for the fetch strategy.
+    """
+    return [
+        item async for item in iter_pages(
+            fetch, page_size=page_size, max_in_flight=max_in_flight, page_limit=page_limit, **params
+        )
+    ]
+
 
 class DispatcharrClient:
     """API client for Dispatcharr with JWT authentication."""
@@ -15,10 +201,137 @@ class DispatcharrClient:
         self.base_url = self.settings.url.rstrip("/")
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
-        self._client = httpx.AsyncClient(timeout=30.0)
+        self._client = self._build_http_client(settings)
+        # Request/pool usage counters exposed on the health endpoint
+        self._requests_total = 0
+        self._requests_in_flight = 0
+        self._peak_in_flight = 0
+        self._timeouts = 0
+        self._pool_timeouts = 0
+        self._retries = 0
+        # Identical GETs currently in flight, keyed by (path, params)
+        self._in_flight_gets: dict[tuple, asyncio.Future] = {}
+        self._coalesced = 0
+        # Conditional GET state for CONDITIONAL_GET_PATHS
+        self._validated: dict[str, _ValidatedResponse] = {}
+        self._not_modified = 0
+        self._unchanged = 0
+        self._changed = 0
+        # Adaptive concurrency limit and circuit breaker for all API requests
+        self._limiter = AdaptiveLimiter(max_limit=settings.dispatcharr_max_concurrent_requests)
+        self._breaker = CircuitBreaker(
+            failure_threshold=settings.dispatcharr_circuit_failure_threshold,
+            reset_timeout=settings.dispatcharr_circuit_reset_seconds,
+        )
         # Lock to prevent multiple concurrent authentication attempts
         # This prevents race conditions when many requests arrive simultaneously
         self._auth_lock = asyncio.Lock()
+        # Callbacks notified of successful writes: fn(resource, action, data)
+        self._write_listeners: list[Callable] = []
+
+    def _build_http_client(self, settings: DispatcharrSettings) -> httpx.AsyncClient:
+        """Create the pooled HTTP client from the connection settings."""
+        limits = httpx.Limits(
+            max_connections=settings.dispatcharr_max_connections,
+            max_keepalive_connections=settings.dispatcharr_max_keepalive_connections,
+            keepalive_expiry=settings.dispatcharr_keepalive_expiry,
+        )
+        http2 = settings.dispatcharr_http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("[DISPATCHARR] HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+                http2 = False
+        self.http2_enabled = http2
+        self._limits = limits
+        return httpx.AsyncClient(timeout=settings.dispatcharr_timeout, limits=limits, http2=http2)
+
+    def _timeout_for(self, path: str):
+        """Timeout for a request path: longest matching endpoint override, else the client default."""
+        overrides = self.settings.dispatcharr_endpoint_timeouts or {}
+        matches = [prefix for prefix in overrides if path.startswith(prefix)]
+        if not matches:
+            return httpx.USE_CLIENT_DEFAULT
+        return overrides[max(matches, key=len)]
+
+    def pool_stats(self) -> dict:
+        """Connection pool and request counters."""
+        # httpx does not expose its pool; read the underlying httpcore pool when available
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", None) or [])
+        idle = 0
+        for connection in connections:
+            try:
+                idle += 1 if connection.is_idle() else 0
+            except Exception:
+                pass
+        return {
+            "http2": self.http2_enabled,
+            "max_connections": self._limits.max_connections,
+            "max_keepalive_connections": self._limits.max_keepalive_connections,
+            "keepalive_expiry": self._limits.keepalive_expiry,
+            "connections_open": len(connections),
+            "connections_idle": idle,
+            "requests_in_flight": self._requests_in_flight,
+            "peak_requests_in_flight": self._peak_in_flight,
+            "requests_total": self._requests_total,
+            "timeouts": self._timeouts,
+            "pool_timeouts": self._pool_timeouts,
+            "retries": self._retries,
+            "coalesced_requests": self._coalesced,
+            "coalescing_in_flight": len(self._in_flight_gets),
+            **self._limiter.stats(),
+            **self._breaker.stats(),
+        }
+
+    def add_write_listener(self, listener: Callable) -> None:
+        """Register a callback invoked after each successful write.
+
+        The callback receives (resource, action, data) where data is the
+        object returned by Dispatcharr, or the ID for deletes.
+        """
+        self._write_listeners.append(listener)
+
+    def iter_all(
+        self,
+        fetch: Callable[..., Awaitable],
+        page_size: int = 500,
+        max_in_flight: Optional[int] = None,
+        page_limit: Optional[int] = None,
+        **params,
+    ) -> AsyncIterator[dict]:
+        """Iterate all items of a paginated getter such as ``self.get_channels``.
+
+        Remaining pages are prefetched concurrently; see iter_pages().
+        """
+        if max_in_flight is None:
+            max_in_flight = self.settings.dispatcharr_page_concurrency
+        return iter_pages(fetch, page_size=page_size, max_in_flight=max_in_flight,
+                          page_limit=page_limit, **params)
+
+    async def fetch_all(
+        self,
+        fetch: Callable[..., Awaitable],
+        page_size: int = 500,
+        max_in_flight: Optional[int] = None,
+        page_limit: Optional[int] = None,
+        **params,
+    ) -> list:
+        """Collect all items of a paginated getter into a list."""
+        return [
+            item async for item in self.iter_all(
+                fetch, page_size=page_size, max_in_flight=max_in_flight, page_limit=page_limit, **params
+            )
+        ]
+
+    def _notify_write(self, resource: str, action: str, data) -> None:
+        """Notify write listeners. Listener errors never fail the write."""
+        for listener in self._write_listeners:
+            try:
+                listener(resource, action, data)
+            except Exception as e:
+                logger.warning("[DISPATCHARR] Write listener failed for %s %s: %s", action, resource, e)
 
     async def _ensure_authenticated(self) -> None:
         """Ensure we have a valid access token.
@@ -79,46 +392,56 @@ class DispatcharrClient:
             logger.warning("[DISPATCHARR] Refresh token expired (status: %s), performing full login", response.status_code)
             await self._login()
 
-    async def _request(
+    async def _send(
         self,
         method: str,
         path: str,
+        headers: dict,
+        request_timeout,
+        stream: bool = False,
         **kwargs,
     ) -> httpx.Response:
-        """Make an authenticated request with automatic token refresh."""
-        logger.debug("[DISPATCHARR] API request: %s %s", method, path)
-        await self._ensure_authenticated()
-
-        headers = kwargs.pop("headers", {})
-        headers["Authorization"] = f"Bearer {self.access_token}"
+        """Send one request attempt, refreshing the token once on 401.
 
-        # Use extended timeout for EPG grid endpoint (large channel counts)
-        request_timeout = kwargs.pop("timeout", None)
-        if request_timeout is None and path == "/api/epg/grid/":
-            request_timeout = 120.0  # 2 minutes for filtered EPG grid data
-            logger.debug("[DISPATCHARR] Using extended timeout (%ss) for EPG grid request", request_timeout)
+        With stream=True the response is returned once headers arrive and the
+        caller must read and close it (error responses are read in full).
+        """
+        self._requests_total += 1
+        self._requests_in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._requests_in_flight)
 
-        try:
-            response = await self._client.request(
+        async def send() -> httpx.Response:
+            if not stream:
+                return await self._client.request(
+                    method,
+                    f"{self.base_url}{path}",
+                    headers=headers,
+                    timeout=request_timeout,
+                    **kwargs,
+                )
+            request = self._client.build_request(
                 method,
                 f"{self.base_url}{path}",
                 headers=headers,
                 timeout=request_timeout,
                 **kwargs,
             )
+            return await self._client.send(request, stream=True)
+
+        try:
+            response = await send()
 
             # If unauthorized, try refreshing token and retry
             if response.status_code == 401:
                 logger.debug("[DISPATCHARR] Got 401, refreshing token and retrying: %s %s", method, path)
+                if stream:
+                    await response.aclose()
                 await self._refresh_access_token()
                 headers["Authorization"] = f"Bearer {self.access_token}"
-                response = await self._client.request(
-                    method,
-                    f"{self.base_url}{path}",
-                    headers=headers,
-                    timeout=request_timeout,
-                    **kwargs,
-                )
+                response = await send()
+
+            if stream and response.status_code >= 400:
+                await response.aread()
 
             if response.status_code >= 400:
                 logger.warning("[DISPATCHARR] API request failed: %s %s - status: %s", method, path, response.status_code)
@@ -126,9 +449,220 @@ class DispatcharrClient:
                 logger.debug("[DISPATCHARR] API request successful: %s %s - status: %s", method, path, response.status_code)
 
             return response
+        except httpx.PoolTimeout:
+            self._timeouts += 1
+            self._pool_timeouts += 1
+            logger.error("[DISPATCHARR] Timed out waiting for a pooled connection: %s %s (%s)",
+                         method, path, self.pool_stats())
+            raise
+        except httpx.TimeoutException as e:
+            self._timeouts += 1
+            logger.warning("[DISPATCHARR] API request timed out: %s %s - %s", method, path, e)
+            raise
+        except httpx.TransportError as e:
+            logger.warning("[DISPATCHARR] API request transport error: %s %s - %s", method, path, e)
+            raise
         except Exception as e:
             logger.exception("[DISPATCHARR] API request error: %s %s - %s", method, path, e)
             raise
+        finally:
+            self._requests_in_flight -= 1
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        priority: Optional[Priority] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """Make an authenticated request with automatic token refresh.
+
+        Requests pass through the circuit breaker and adaptive limiter;
+        idempotent requests are retried with jittered backoff on transport
+        errors and 429/502/503/504 responses.
+
+        Identical GETs (same path, query parameters and priority) that
+        overlap in time are coalesced: the first one goes upstream and later
+        callers await the same response. Each caller decodes its own JSON
+        from the shared body, so results can still be mutated freely. An
+        interactive GET never joins a background one, which would make it
+        wait in the limiter's background queue.
+
+        Args:
+            method: HTTP method
+            path: API path
+            priority: Queue priority (default: the context's request_priority())
+        """
+        if method.upper() != "GET" or set(kwargs) - {"params", "headers"}:
+            return await self._send_with_retries(method, path, priority, **kwargs)
+
+        if priority is None:
+            priority = current_priority()
+        key = (path, _params_key(kwargs.get("params")), _params_key(kwargs.get("headers")), priority)
+        task = self._in_flight_gets.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send_with_retries(method, path, priority, **kwargs))
+            self._in_flight_gets[key] = task
+            task.add_done_callback(functools.partial(self._get_finished, key))
+        else:
+            self._coalesced += 1
+            logger.debug("[DISPATCHARR] Coalesced GET %s with in-flight request", path)
+        # Shielded so a cancelled caller does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _get_finished(self, key: tuple, task: asyncio.Future) -> None:
+        if self._in_flight_gets.get(key) is task:
+            del self._in_flight_gets[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller was cancelled
+            task.exception()
+
+    async def _get_validated(self, path: str) -> Any:
+        """GET a rarely-changing collection, reusing the parsed body when unchanged.
+
+        Sends If-None-Match/If-Modified-Since when Dispatcharr provided
+        validators. On 304, or when the body hashes the same as last time,
+        the previously parsed data is returned without decoding JSON again.
+
+        The returned list is new, but its items are shared between callers
+        and must not be mutated; copy items before annotating them.
+        """
+        cached = self._validated.get(path)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        response = await self._request("GET", path, headers=headers)
+        if response.status_code == 304 and cached is not None:
+            self._not_modified += 1
+            return _shallow_copy(cached.data)
+        response.raise_for_status()
+
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if cached is not None and cached.digest == digest:
+            self._unchanged += 1
+            cached.etag, cached.last_modified = etag, last_modified
+            return _shallow_copy(cached.data)
+
+        self._changed += 1
+        data = response.json()
+        self._validated[path] = _ValidatedResponse(
+            data=data, digest=digest, etag=etag, last_modified=last_modified
+        )
+        return _shallow_copy(data)
+
+    async def _iter_json_items(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        decoder: Optional[JsonArrayDecoder] = None,
+    ) -> AsyncIterator[Any]:
+        """Stream a GET response, yielding the items of its array as they are decoded.
+
+        The array is the top-level list or the "results"/"data" field; the
+        remaining fields end up in ``decoder.metadata``.
+        """
+        response = await self._request("GET", path, params=params, stream=True)
+        try:
+            response.raise_for_status()
+            async for item in (decoder or JsonArrayDecoder()).iter_items(response.aiter_bytes()):
+                yield item
+        finally:
+            await response.aclose()
+
+    def response_cache_stats(self) -> dict:
+        """Conditional GET hit/miss counters."""
+        hits = self._not_modified + self._unchanged
+        total = hits + self._changed
+        return {
+            "entry_count": len(self._validated),
+            "not_modified": self._not_modified,
+            "unchanged": self._unchanged,
+            "changed": self._changed,
+            "hit_rate_percent": round(hits / total * 100, 1) if total else 0,
+        }
+
+    async def _send_with_retries(
+        self,
+        method: str,
+        path: str,
+        priority: Optional[Priority] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """Send a request through the breaker and limiter, retrying idempotent ones."""
+        logger.debug("[DISPATCHARR] API request: %s %s", method, path)
+        await self._ensure_authenticated()
+
+        headers = kwargs.pop("headers", {})
+        headers["Authorization"] = f"Bearer {self.access_token}"
+
+        # Per-endpoint timeout overrides (e.g. the EPG grid on large channel counts)
+        request_timeout = kwargs.pop("timeout", None)
+        if request_timeout is None:
+            request_timeout = self._timeout_for(path)
+
+        if priority is None:
+            priority = current_priority()
+        retries = self.settings.dispatcharr_retry_attempts if method.upper() in RETRYABLE_METHODS else 0
+
+        attempt = 0
+        while True:
+            is_trial = self._breaker.before_request()
+            response = None
+            error = None
+            try:
+                await self._limiter.acquire(priority)
+                started = time.monotonic()
+                try:
+                    response = await self._send(method, path, headers, request_timeout, **kwargs)
+                except httpx.TransportError as e:
+                    error = e
+                finally:
+                    self._limiter.release()
+            except BaseException:
+                # Cancelled or failed before a response: don't leave the breaker half-open forever
+                if is_trial:
+                    self._breaker.abandon_trial()
+                raise
+
+            if error is not None:
+                self._breaker.record_failure()
+                if isinstance(error, httpx.TimeoutException) and not isinstance(error, httpx.PoolTimeout):
+                    self._limiter.record_overload()
+                if attempt >= retries:
+                    logger.error("[DISPATCHARR] API request error: %s %s - %s", method, path, error)
+                    raise error
+                retry_after = None
+            else:
+                status = response.status_code
+                if status >= 500:
+                    self._breaker.record_failure()
+                else:
+                    self._breaker.record_success()
+                retry_after = _retry_after(response)
+                if status in OVERLOAD_STATUS_CODES:
+                    self._limiter.record_overload(retry_after)
+                elif status < 500:
+                    self._limiter.record_success(time.monotonic() - started)
+                if status not in RETRY_STATUS_CODES or attempt >= retries:
+                    return response
+                if kwargs.get("stream"):
+                    await response.aclose()
+
+            attempt += 1
+            self._retries += 1
+            delay = retry_after if retry_after is not None else _backoff_delay(attempt)
+            logger.warning(
+                "[DISPATCHARR] Retrying %s %s in %.1fs (attempt %s/%s, %s)",
+                method, path, delay, attempt, retries,
+                error or f"status {response.status_code}"
+            )
+            await asyncio.sleep(delay)
 
     # -------------------------------------------------------------------------
     # Channels
@@ -172,7 +706,9 @@ class DispatcharrClient:
             "PATCH", f"/api/channels/channels/{channel_id}/", json=data
         )
         response.raise_for_status()
-        return response.json()
+        result = response.json()
+        self._notify_write("channels", "update", result)
+        return result
 
     async def create_channel(self, data: dict) -> dict:
         """Create a new channel.
@@ -187,7 +723,9 @@ class DispatcharrClient:
             # Include response body in exception for better error handling
             error_body = response.text
             raise Exception(f"Channel creation failed: {response.status_code} - {error_body}")
-        return response.json()
+        result = response.json()
+        self._notify_write("channels", "create", result)
+        return result
 
     async def delete_channel(self, channel_id: int) -> None:
         """Delete a channel."""
@@ -195,6 +733,7 @@ class DispatcharrClient:
             "DELETE", f"/api/channels/channels/{channel_id}/"
         )
         response.raise_for_status()
+        self._notify_write("channels", "delete", channel_id)
 
     async def assign_channel_numbers(
         self, channel_ids: list[int], starting_number: Optional[float] = None
@@ -208,6 +747,7 @@ class DispatcharrClient:
             "POST", "/api/channels/channels/assign/", json=data
         )
         response.raise_for_status()
+        self._notify_write("channels", "bulk", channel_ids)
         return response.json()
 
     # -------------------------------------------------------------------------
@@ -216,9 +756,7 @@ class DispatcharrClient:
 
     async def get_channel_groups(self) -> list:
         """Get all channel groups."""
-        response = await self._request("GET", "/api/channels/groups/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_validated("/api/channels/groups/")
 
     async def create_channel_group(self, name: str) -> dict:
         """Create a new channel group.
@@ -233,7 +771,9 @@ class DispatcharrClient:
             # Include response body in exception for better error handling
             error_body = response.text
             raise Exception(f"Channel group creation failed: {response.status_code} - {error_body}")
-        return response.json()
+        result = response.json()
+        self._notify_write("channel_groups", "create", result)
+        return result
 
     async def update_channel_group(self, group_id: int, data: dict) -> dict:
         """Update a channel group."""
@@ -241,12 +781,15 @@ class DispatcharrClient:
             "PATCH", f"/api/channels/groups/{group_id}/", json=data
         )
         response.raise_for_status()
-        return response.json()
+        result = response.json()
+        self._notify_write("channel_groups", "update", result)
+        return result
 
     async def delete_channel_group(self, group_id: int) -> None:
         """Delete a channel group."""
         response = await self._request("DELETE", f"/api/channels/groups/{group_id}/")
         response.raise_for_status()
+        self._notify_write("channel_groups", "delete", group_id)
 
     # -------------------------------------------------------------------------
     # Streams
@@ -298,47 +841,37 @@ class DispatcharrClient:
         response.raise_for_status()
         return response.json()
 
-    async def get_stream_groups_with_counts(self, m3u_account_id: Optional[int] = None) -> list:
+    async def get_stream_groups_with_counts(
+        self,
+        m3u_account_id: Optional[int] = None,
+        streams: Optional[list[dict]] = None,
+    ) -> list:
         """Get all stream groups with their stream counts.
 
         Args:
             m3u_account_id: Optional M3U account ID to filter groups by provider.
                            When provided, only returns groups that have streams
                            from this provider, with counts reflecting only that provider's streams.
+            streams: Optional already-loaded stream list (e.g. from the catalogue)
+                     to count instead of reading streams from Dispatcharr.
 
         Returns list of dicts: [{"name": "Group Name", "count": 42}, ...]
 
-        Optimization: Instead of fetching all streams, we get group names first,
-        then query each group with page_size=1 to get just the count from the
-        paginated response. This is much faster than loading all stream data.
+        Counts are computed in a single pass over the stream list, read with
+        concurrent page prefetch. If that pass fails, falls back to one
+        page_size=1 count query per group with bounded concurrency.
         """
-        import asyncio
-
-        # First, get all group names (fast)
         group_names = await self.get_stream_groups()
 
-        # For each group, query with page_size=1 to get just the count
-        async def get_group_count(group_name: str) -> dict:
-            try:
-                params = {"channel_group_name": group_name, "page_size": 1}
-                if m3u_account_id is not None:
-                    params["m3u_account"] = m3u_account_id
-                response = await self._request(
-                    "GET",
-                    "/api/channels/streams/",
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
-                return {"name": group_name, "count": data.get("count", 0)}
-            except Exception:
-                return {"name": group_name, "count": 0}
+        try:
+            counts = await self._count_streams_by_group(m3u_account_id, streams)
+        except Exception as e:
+            logger.warning("[DISPATCHARR] Aggregated stream group count failed, counting per group: %s", e)
+            counts = await self._count_streams_per_group(group_names, m3u_account_id)
 
-        # Fetch counts concurrently for all groups
-        results = await asyncio.gather(*[get_group_count(name) for name in group_names])
+        results = [{"name": name, "count": counts.get(name, 0)} for name in group_names]
 
         # Filter out groups with 0 streams when filtering by provider
-        results = list(results)
         if m3u_account_id is not None:
             results = [r for r in results if r["count"] > 0]
 
@@ -347,15 +880,62 @@ class DispatcharrClient:
 
         return results
 
+    async def _count_streams_by_group(
+        self,
+        m3u_account_id: Optional[int],
+        streams: Optional[list[dict]] = None,
+    ) -> dict[str, int]:
+        """Count streams per group name in one pass over the stream list."""
+        # Streams carry the channel group ID; map it back to the group name
+        group_names_by_id = {g["id"]: g["name"] for g in await self.get_channel_groups() or []}
+        counts: dict[str, int] = {}
+
+        def add(stream: dict) -> None:
+            name = stream.get("channel_group_name") or group_names_by_id.get(stream.get("channel_group"))
+            if name:
+                counts[name] = counts.get(name, 0) + 1
+
+        if streams is not None:
+            for stream in streams:
+                add(stream)
+        else:
+            async for stream in self.iter_all(self.get_streams, page_size=500, m3u_account=m3u_account_id):
+                add(stream)
+        return counts
+
+    async def _count_streams_per_group(
+        self,
+        group_names: list[str],
+        m3u_account_id: Optional[int],
+    ) -> dict[str, int]:
+        """Count streams with one page_size=1 query per group, STREAM_GROUP_COUNT_CONCURRENCY at a time."""
+        semaphore = asyncio.Semaphore(STREAM_GROUP_COUNT_CONCURRENCY)
+
+        async def get_group_count(group_name: str) -> tuple[str, int]:
+            async with semaphore:
+                try:
+                    params = {"channel_group_name": group_name, "page_size": 1}
+                    if m3u_account_id is not None:
+                        params["m3u_account"] = m3u_account_id
+                    response = await self._request(
+                        "GET",
+                        "/api/channels/streams/",
+                        params=params
+                    )
+                    response.raise_for_status()
+                    return group_name, response.json().get("count", 0)
+                except Exception:
+                    return group_name, 0
+
+        return dict(await asyncio.gather(*[get_group_count(name) for name in group_names]))
+
     # -------------------------------------------------------------------------
     # M3U Accounts (Providers)
     # -------------------------------------------------------------------------
 
     async def get_m3u_accounts(self) -> list:
         """Get all M3U accounts/providers."""
-        response = await self._request("GET", "/api/m3u/accounts/")
-        response.raise_for_status()
-        accounts = response.json()
+        accounts = await self._get_validated("/api/m3u/accounts/")
         logger.debug("[DISPATCHARR] Dispatcharr returned %s M3U accounts", len(accounts))
         for account in accounts:
             logger.debug("[DISPATCHARR]   M3U Account: id=%s, name=%s, server_url=%s", account.get('id'), account.get('name'), account.get('server_url'))
@@ -405,7 +985,9 @@ class DispatcharrClient:
         """Create a new M3U account."""
         response = await self._request("POST", "/api/m3u/accounts/", json=data)
         response.raise_for_status()
-        return response.json()
+        result = response.json()
+        self._notify_write("m3u_accounts", "create", result)
+        return result
 
     async def update_m3u_account(self, account_id: int, data: dict) -> dict:
         """Update an M3U account (full update)."""
@@ -413,6 +995,7 @@ class DispatcharrClient:
             "PUT", f"/api/m3u/accounts/{account_id}/", json=data
         )
         response.raise_for_status()
+        self._notify_write("m3u_accounts", "update", account_id)
         return response.json()
 
     async def patch_m3u_account(self, account_id: int, data: dict) -> dict:
@@ -421,12 +1004,14 @@ class DispatcharrClient:
             "PATCH", f"/api/m3u/accounts/{account_id}/", json=data
         )
         response.raise_for_status()
+        self._notify_write("m3u_accounts", "update", account_id)
         return response.json()
 
     async def delete_m3u_account(self, account_id: int) -> None:
         """Delete an M3U account."""
         response = await self._request("DELETE", f"/api/m3u/accounts/{account_id}/")
         response.raise_for_status()
+        self._notify_write("m3u_accounts", "delete", account_id)
 
     async def refresh_m3u_account(self, account_id: int) -> dict:
         """Trigger refresh for a single M3U account."""
@@ -434,12 +1019,14 @@ class DispatcharrClient:
             "POST", f"/api/m3u/refresh/{account_id}/"
         )
         response.raise_for_status()
+        self._notify_write("m3u_accounts", "refresh", account_id)
         return response.json() if response.content else {"success": True, "message": "Refresh initiated"}
 
     async def refresh_all_m3u_accounts(self) -> dict:
         """Trigger refresh for all active M3U accounts."""
         response = await self._request("POST", "/api/m3u/refresh/")
         response.raise_for_status()
+        self._notify_write("m3u_accounts", "refresh", None)
         return response.json() if response.content else {"success": True, "message": "Refresh initiated"}
 
     async def refresh_m3u_vod(self, account_id: int) -> dict:
@@ -548,6 +1135,7 @@ class DispatcharrClient:
             "PATCH", f"/api/m3u/accounts/{account_id}/group-settings/", json=data
         )
         response.raise_for_status()
+        self._notify_write("m3u_accounts", "update", account_id)
         return response.json()
 
     # -------------------------------------------------------------------------
@@ -637,20 +1225,12 @@ class DispatcharrClient:
     async def find_logo_by_url(self, url: str) -> Optional[dict]:
         """Find an existing logo by its URL.
 
-        Paginates through logos to find exact URL match.
-        Uses larger page size to minimize API calls.
+        Paginates through logos to find exact URL match, prefetching
+        pages concurrently; outstanding requests are cancelled on a match.
         """
-        page = 1
-        page_size = 500  # Use larger page size for efficiency
-        while True:
-            result = await self.get_logos(page=page, page_size=page_size)
-            for logo in result.get("results", []):
-                if logo.get("url") == url:
-                    return logo
-            # Check if there are more pages
-            if not result.get("next"):
-                break
-            page += 1
+        async for logo in self.iter_all(self.get_logos, page_size=500):
+            if logo.get("url") == url:
+                return logo
         return None
 
     async def update_logo(self, logo_id: int, data: dict) -> dict:
@@ -672,9 +1252,7 @@ class DispatcharrClient:
 
     async def get_epg_sources(self) -> list:
         """Get all EPG sources."""
-        response = await self._request("GET", "/api/epg/sources/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_validated("/api/epg/sources/")
 
     async def get_epg_source(self, source_id: int) -> dict:
         """Get a single EPG source by ID."""
@@ -771,37 +1349,60 @@ class DispatcharrClient:
         """Get all EPG data entries.
 
         Handles both old (paginated dict) and new (flat list) Dispatcharr responses.
-        For paginated responses, fetches all pages automatically.
+        For paginated responses, fetches all pages automatically (concurrently
+        when starting from page 1).
         """
-        params = {"page": page, "page_size": page_size}
+        params = {}
         if search:
             params["search"] = search
         if epg_source:
             params["epg_source"] = epg_source
 
-        response = await self._request("GET", "/api/epg/epgdata/", params=params)
-        response.raise_for_status()
-        data = response.json()
+        async def fetch_page(page: int, page_size: int, **params):
+            response = await self._request(
+                "GET", "/api/epg/epgdata/", params={"page": page, "page_size": page_size, **params}
+            )
+            response.raise_for_status()
+            return response.json()
 
-        # New Dispatcharr: flat list response
-        if isinstance(data, list):
-            return data
+        if page == 1:
+            return await self.fetch_all(fetch_page, page_size=page_size, **params)
 
-        # Old Dispatcharr: paginated dict response - fetch all pages
-        all_results = data.get("results", [])
-        while data.get("next"):
+        # Explicit start page: follow "next" from there
+        all_results = []
+        while True:
+            data = await fetch_page(page, page_size, **params)
+            all_results.extend(_page_items(data))
+            if isinstance(data, list) or not data.get("next"):
+                return all_results
             page += 1
-            params["page"] = page
-            response = await self._request("GET", "/api/epg/epgdata/", params=params)
-            response.raise_for_status()
-            data = response.json()
-            if isinstance(data, list):
-                # Switched to new format mid-pagination (unlikely but safe)
-                all_results.extend(data)
-                break
-            all_results.extend(data.get("results", []))
 
-        return all_results
+    async def iter_epg_data(
+        self,
+        search: Optional[str] = None,
+        epg_source: Optional[int] = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[dict]:
+        """Iterate all EPG data entries as they are received.
+
+        Unlike get_epg_data(), responses are decoded incrementally and
+        entries are never collected into one list, so memory stays flat on
+        large EPGs. Handles both paginated and flat-list responses.
+        """
+        params = {"page_size": page_size}
+        if search:
+            params["search"] = search
+        if epg_source:
+            params["epg_source"] = epg_source
+
+        page = 1
+        while True:
+            decoder = JsonArrayDecoder()
+            async for entry in self._iter_json_items("/api/epg/epgdata/", {**params, "page": page}, decoder):
+                yield entry
+            if decoder.is_list or not decoder.metadata.get("next"):
+                return
+            page += 1
 
     async def get_epg_data_by_id(self, data_id: int) -> dict:
         """Get a single EPG data entry by ID."""
@@ -823,27 +1424,15 @@ class DispatcharrClient:
             start: Ignored - kept for API compatibility
             end: Ignored - kept for API compatibility
         """
-        response = await self._request("GET", "/api/epg/grid/")
-        response.raise_for_status()
-        data = response.json()
+        programs = [program async for program in self.iter_epg_grid()]
+        logger.debug("[DISPATCHARR] EPG grid returned %s programs", len(programs))
+        return programs
 
-        # DEBUG: Log the response structure to understand what we're getting
-        logger.debug("[DISPATCHARR] EPG grid response type: %s", type(data))
-        if isinstance(data, dict):
-            logger.debug("[DISPATCHARR] EPG grid response keys: %s", data.keys())
-            logger.debug("[DISPATCHARR] EPG grid data length: %s items", len(data.get('data', [])))
-            if data.get('data') and len(data.get('data', [])) > 0:
-                logger.debug("[DISPATCHARR] EPG grid first item sample: %s", data['data'][0])
-        elif isinstance(data, list):
-            logger.debug("[DISPATCHARR] EPG grid list length: %s items", len(data))
-            if data and len(data) > 0:
-                logger.debug("[DISPATCHARR] EPG grid first item sample: %s", data[0])
-
-        # Dispatcharr returns {"data": [...]}
-        if isinstance(data, dict):
-            return data.get("data", [])
-        # Fallback for list response
-        return data if isinstance(data, list) else []
+    async def iter_epg_grid(self) -> AsyncIterator[dict]:
+        """Iterate EPG grid programs as they are received (see get_epg_grid())."""
+        # Dispatcharr returns {"data": [...]}, older versions a plain list
+        async for program in self._iter_json_items("/api/epg/grid/"):
+            yield program
 
     # -------------------------------------------------------------------------
     # Stream Profiles
@@ -851,9 +1440,7 @@ class DispatcharrClient:
 
     async def get_stream_profiles(self) -> list:
         """Get all stream profiles."""
-        response = await self._request("GET", "/api/core/streamprofiles/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_validated("/api/core/streamprofiles/")
 
     async def create_stream_profile(self, data: dict) -> dict:
         """Create a new stream profile."""
@@ -867,9 +1454,7 @@ class DispatcharrClient:
 
     async def get_channel_profiles(self) -> list:
         """Get all channel profiles."""
-        response = await self._request("GET", "/api/channels/profiles/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_validated("/api/channels/profiles/")
 
     async def get_channel_profile(self, profile_id: int) -> dict:
         """Get a single channel profile by ID."""
@@ -1005,7 +1590,18 @@ _client_settings_hash: Optional[str] = None
 
 def _settings_hash(settings: DispatcharrSettings) -> str:
     """Get a hash of settings to detect changes."""
-    return f"{settings.url}:{settings.username}:{settings.password}"
+    return (
+        f"{settings.url}:{settings.username}:{settings.password}:"
+        f"{settings.dispatcharr_max_connections}:{settings.dispatcharr_max_keepalive_connections}:"
+        f"{settings.dispatcharr_keepalive_expiry}:{settings.dispatcharr_http2}:{settings.dispatcharr_timeout}:"
+        f"{settings.dispatcharr_max_concurrent_requests}:{settings.dispatcharr_retry_attempts}:"
+        f"{settings.dispatcharr_circuit_failure_threshold}:{settings.dispatcharr_circuit_reset_seconds}"
+    )
+
+
+def _invalidate_cached_responses(resource: str, action: str, data) -> None:
+    """Drop cached API responses tagged with a resource that was just written."""
+    get_cache().invalidate_tag(resource)
 
 
 def get_client() -> DispatcharrClient:
@@ -1017,6 +1613,7 @@ def get_client() -> DispatcharrClient:
 
     if _client is None or _client_settings_hash != current_hash:
         _client = DispatcharrClient(settings)
+        _client.add_write_listener(_invalidate_cached_responses)
         _client_settings_hash = current_hash
 
     return _client
@@ -1027,3 +1624,17 @@ def reset_client() -> None:
     global _client, _client_settings_hash
     _client = None
     _client_settings_hash = None
+
+
+def get_pool_stats() -> Optional[dict]:
+    """Connection pool stats of the current client, or None if no client exists yet."""
+    if _client is None:
+        return None
+    return _client.pool_stats()
+
+
+def get_response_cache_stats() -> Optional[dict]:
+    """Conditional GET stats of the current client, or None if no client exists yet."""
+    if _client is None:
+        return None
+    return _client.response_cache_stats()
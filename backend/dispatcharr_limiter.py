@@ -0,0 +1,293 @@
+"""
+Traffic control for Dispatcharr API requests.
+
+DispatcharrClient routes every request through:
+- AdaptiveLimiter: an AIMD concurrency window. It grows by roughly one
+  slot per window of successful requests and halves on overload signals
+  (429/503, timeouts, a sustained latency rise). Waiters are served by
+  priority, and background callers can never take the last
+  ``interactive_reserve`` slots, so UI requests always jump the queue.
+- CircuitBreaker: after ``failure_threshold`` consecutive failures
+  (connection errors, timeouts, 5xx) requests fail fast with
+  CircuitOpenError until ``reset_timeout`` has passed; then a single trial
+  request decides whether to close the circuit again.
+
+Callers declare their priority with the request_priority() context
+manager. Scheduled tasks, probes and pollers run as Priority.BACKGROUND;
+everything else defaults to Priority.INTERACTIVE.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request priority. Lower values are served first."""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_current_priority: ContextVar[Priority] = ContextVar("dispatcharr_request_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    """Priority of Dispatcharr requests made from the current context."""
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """Run the enclosed block (and tasks it creates) at the given priority."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while Dispatcharr is considered down."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"Dispatcharr is unavailable, retry in {retry_after:.0f}s")
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter with priority queueing."""
+
+    def __init__(
+        self,
+        max_limit: int = 16,
+        min_limit: int = 2,
+        initial_limit: Optional[int] = None,
+        interactive_reserve: int = 1,
+        latency_tolerance: float = 2.0,
+        decrease_cooldown: float = 1.0,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_limit: Upper bound of the concurrency window
+            min_limit: Lower bound of the concurrency window
+            initial_limit: Starting window (default: half of max_limit)
+            interactive_reserve: Slots background requests may never use
+            latency_tolerance: Short-term/long-term latency ratio treated as overload
+            decrease_cooldown: Minimum seconds between two window decreases
+        """
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = float(initial_limit or max(self.min_limit, self.max_limit // 2))
+        self.interactive_reserve = interactive_reserve
+        self.latency_tolerance = latency_tolerance
+        self.decrease_cooldown = decrease_cooldown
+
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+        self._last_decrease = 0.0
+
+        # Latency EWMAs: a fast one tracks the current level, a slow one the baseline
+        self._latency_fast: Optional[float] = None
+        self._latency_slow: Optional[float] = None
+        self._samples = 0
+
+        self._decreases = 0
+        self._max_queue = 0
+
+    def _capacity(self, priority: Priority) -> int:
+        limit = max(self.min_limit, int(self.limit))
+        if priority >= Priority.BACKGROUND:
+            return max(1, limit - self.interactive_reserve)
+        return limit
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """Wait for a request slot."""
+        if (
+            not self._waiters
+            and self._in_flight < self._capacity(priority)
+            and time.monotonic() >= self._paused_until
+        ):
+            self._in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        self._max_queue = max(self._max_queue, len(self._waiters))
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted just before cancellation: give it back
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a request slot."""
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        now = time.monotonic()
+        if now < self._paused_until:
+            if self._wake_handle is None and self._waiters:
+                loop = asyncio.get_running_loop()
+                self._wake_handle = loop.call_later(self._paused_until - now, self._resume)
+            return
+        while self._waiters:
+            priority, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._in_flight >= self._capacity(Priority(priority)):
+                break
+            heapq.heappop(self._waiters)
+            self._in_flight += 1
+            future.set_result(None)
+
+    def _resume(self) -> None:
+        self._wake_handle = None
+        self._wake()
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self.limit = max(float(self.min_limit), self.limit / 2)
+        self._decreases += 1
+        logger.info("[DISPATCHARR-LIMIT] %s: concurrency %d -> %d", reason, int(previous), int(self.limit))
+
+    def record_success(self, latency: float) -> None:
+        """Record a successful request and widen the window."""
+        self._samples += 1
+        if self._latency_fast is None:
+            self._latency_fast = self._latency_slow = latency
+        else:
+            self._latency_fast += 0.3 * (latency - self._latency_fast)
+            self._latency_slow += 0.02 * (latency - self._latency_slow)
+
+        if (
+            self._samples >= 20
+            and self._latency_fast > self._latency_slow * self.latency_tolerance
+        ):
+            self._decrease(
+                "Latency rising (%.0fms vs %.0fms baseline)" % (self._latency_fast * 1000, self._latency_slow * 1000)
+            )
+            return
+        self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        self._wake()
+
+    def record_overload(self, retry_after: Optional[float] = None) -> None:
+        """Record an overload signal (429/503/timeout) and halve the window."""
+        self._decrease("Dispatcharr overloaded")
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def stats(self) -> dict:
+        """Limiter statistics."""
+        return {
+            "concurrency_limit": int(self.limit),
+            "max_concurrency": self.max_limit,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "max_queued": self._max_queue,
+            "decreases": self._decreases,
+            "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 1),
+        }
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 = disabled)
+            reset_timeout: Seconds the circuit stays open before a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._rejected = 0
+
+    def before_request(self) -> bool:
+        """
+        Raise CircuitOpenError if the request must not be sent.
+
+        Returns:
+            True if the request is the half-open trial; it must end with
+            record_success, record_failure or abandon_trial
+        """
+        if self.state == self.CLOSED or not self.failure_threshold:
+            return False
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            remaining = self._opened_at + self.reset_timeout - now
+            if remaining > 0:
+                self._rejected += 1
+                raise CircuitOpenError(remaining)
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self._trial_in_flight:
+            self._rejected += 1
+            raise CircuitOpenError(self.reset_timeout)
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Record a healthy response."""
+        if self.state != self.CLOSED:
+            logger.info("[DISPATCHARR-LIMIT] Dispatcharr recovered, closing circuit")
+        self.state = self.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def abandon_trial(self) -> None:
+        """Let another request be the trial (this one was cancelled or failed locally)."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request (connection error, timeout or 5xx)."""
+        self._failures += 1
+        self._trial_in_flight = False
+        if not self.failure_threshold:
+            return
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(
+                    "[DISPATCHARR-LIMIT] Opening circuit after %s consecutive failures, failing fast for %ss",
+                    self._failures, self.reset_timeout
+                )
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        """Breaker statistics."""
+        return {
+            "circuit_state": self.state,
+            "consecutive_failures": self._failures,
+            "rejected": self._rejected,
+        }
@@ -1,5 +1,6 @@
 """FFprobe integration — probe sources and detect system capabilities."""
 
+import asyncio
 import json
 import logging
 import re
@@ -7,6 +8,8 @@ import subprocess
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
+from media_processes import Workload, get_media_processes
+
 logger = logging.getLogger(__name__)
 
 FFPROBE_BIN = "ffprobe"
@@ -77,14 +80,14 @@ def probe_source(path: str, timeout: int = DEFAULT_TIMEOUT) -> ProbeResult:
         return ProbeResult(success=False, error=error)
 
     safe_path = _rebuild_probe_path(path)
-    cmd = [
+    cmd = get_media_processes().command([
         FFPROBE_BIN,
         "-v", "quiet",
         "-print_format", "json",
         "-show_format",
         "-show_streams",
         safe_path,
-    ]
+    ], Workload.INTERACTIVE)
 
     try:
         proc = subprocess.run(
@@ -110,6 +113,20 @@ def probe_source(path: str, timeout: int = DEFAULT_TIMEOUT) -> ProbeResult:
     return parse_probe_output(proc.stdout)
 
 
+async def probe_source_async(path: str, timeout: int = DEFAULT_TIMEOUT) -> ProbeResult:
+    """Probe a media source off the event loop, within the shared media process budget.
+
+    Args:
+        path: File path, URL, or device to probe.
+        timeout: Subprocess timeout in seconds.
+
+    Returns:
+        ProbeResult with stream and format information.
+    """
+    async with get_media_processes().slot(Workload.INTERACTIVE):
+        return await asyncio.to_thread(probe_source, path, timeout)
+
+
 def parse_probe_output(raw_json: str) -> ProbeResult:
     """Parse ffprobe JSON output into a ProbeResult.
 
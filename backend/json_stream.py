@@ -0,0 +1,179 @@
+"""Incremental decoding of large JSON array responses.
+
+Dispatcharr returns big collections either as a top-level JSON array or
+wrapped in an object (``{"count": .., "next": .., "results": [...]}`` or
+``{"data": [...]}``). JsonArrayDecoder yields the array's items one by one
+while the body is still being received, so consumers never hold the raw
+body, its decoded text and the complete object graph at the same time.
+"""
+import codecs
+import json
+from typing import Any, AsyncIterator, Iterable
+
+# Keys whose array value is streamed when the document is an object
+ARRAY_KEYS = ("results", "data")
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+class JsonArrayDecoder:
+    """Decode the items of one JSON array as the document streams in.
+
+    The array is either the top-level value or the value of the first
+    top-level key in ``keys``. Other top-level fields (``count``, ``next``, ...)
+    are available in ``metadata`` once all items have been read.
+    """
+
+    def __init__(self, keys: Iterable[str] = ARRAY_KEYS):
+        self.keys = frozenset(keys)
+        self.metadata: dict = {}
+        self.is_list = False
+        self.found = False
+
+        self._buf = ""
+        self._pos = 0
+        self._state = "seek"
+        self._json = json.JSONDecoder()
+
+        # Scanner state while looking for the array
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._key_expected = False
+        self._last_key = None
+        self._target_pending = False
+        self._array_key = None
+        self._prefix = ""
+        self._tail = []
+
+    async def iter_items(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+        """Yield array items decoded from an async iterator of byte chunks."""
+        text = codecs.getincrementaldecoder("utf-8")()
+        async for chunk in chunks:
+            self._feed(text.decode(chunk))
+            for item in self._drain(eof=False):
+                yield item
+        self._feed(text.decode(b"", final=True))
+        for item in self._drain(eof=True):
+            yield item
+        self._finish()
+
+    def _feed(self, data: str) -> None:
+        if self._state == "tail":
+            self._tail.append(data)
+        else:
+            self._buf += data
+
+    def _drain(self, eof: bool) -> list:
+        items = []
+        if self._state == "seek":
+            self._seek()
+        if self._state == "items":
+            self._decode_items(items, eof)
+        return items
+
+    def _seek(self) -> None:
+        """Scan for the start of the array, tracking strings and nesting."""
+        buf = self._buf
+        i = self._pos
+        while i < len(buf):
+            c = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key_expected:
+                        self._last_key = json.loads(buf[self._string_start:i + 1])
+                i += 1
+                continue
+            if c in _WHITESPACE:
+                i += 1
+                continue
+            if self._target_pending:
+                self._target_pending = False
+                if c == "[":
+                    self._array_key = self._last_key
+                    self._start_items(i)
+                    return
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+            elif c == "[" and self._depth == 0:
+                self.is_list = True
+                self._start_items(i)
+                return
+            elif c in "{[":
+                self._depth += 1
+                self._key_expected = self._depth == 1 and c == "{"
+            elif c in "}]":
+                self._depth -= 1
+            elif c == "," and self._depth == 1:
+                self._key_expected = True
+            elif c == ":" and self._depth == 1:
+                self._key_expected = False
+                self._target_pending = self._last_key in self.keys
+            i += 1
+        self._pos = i
+
+    def _start_items(self, bracket: int) -> None:
+        self.found = True
+        self._prefix = self._buf[:bracket]
+        self._buf = self._buf[bracket + 1:]
+        self._pos = 0
+        self._state = "items"
+
+    def _decode_items(self, items: list, eof: bool) -> None:
+        buf = self._buf
+        pos = self._pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buf):
+                break
+            c = buf[pos]
+            if c == ",":
+                pos += 1
+                continue
+            if c == "]":
+                self._state = "tail"
+                self._tail.append(buf[pos + 1:])
+                buf, pos = "", 0
+                break
+            try:
+                item, end = self._json.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                break
+            # A number ending at the buffer end or before "." / "e" may be truncated
+            if not eof and isinstance(item, (int, float)) and (end == len(buf) or buf[end] not in _DELIMITERS):
+                break
+            items.append(item)
+            pos = end
+        # Drop consumed text so the buffer only holds the item being received
+        self._buf = buf[pos:]
+        self._pos = 0
+
+    def _finish(self) -> None:
+        if self.is_list:
+            return
+        if not self.found:
+            # No array to stream: the whole (small) document is metadata
+            try:
+                document = json.loads(self._buf) if self._buf.strip() else {}
+            except json.JSONDecodeError:
+                document = {}
+            self.metadata = document if isinstance(document, dict) else {}
+            return
+        try:
+            document = json.loads(self._prefix + "[]" + "".join(self._tail))
+        except json.JSONDecodeError:
+            document = {}
+        if isinstance(document, dict):
+            document.pop(self._array_key, None)
+            self.metadata = document
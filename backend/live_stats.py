@@ -0,0 +1,144 @@
+"""
+Server-push live stats for the web UI.
+
+The Stats tab and the probe/task progress views used to poll REST
+endpoints, so every open browser tab cost its own Dispatcharr call or DB
+aggregation. LiveStatsHub fans the data the backend already has out to
+every subscriber of GET /api/stats/live (Server-Sent Events):
+
+- "channels": the Dispatcharr channel stats BandwidthTracker fetches each poll
+- "bandwidth": the bandwidth summary, refreshed after each tracker flush
+- "probe": StreamProber.get_probe_progress(), when it changes
+- "tasks": status/progress of the scheduled tasks whose state changed
+
+Probe and task progress are read by a background loop that only runs
+while someone is subscribed. A new subscriber first receives the latest
+value of each topic ("tasks" as the full list), then deltas.
+"""
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 32  # Per subscriber; a full backlog is collapsed to the latest value per topic
+PROGRESS_INTERVAL = 1.0  # Seconds between probe/task progress checks
+KEEPALIVE_INTERVAL = 15.0  # Seconds of silence before an SSE comment is sent
+
+
+def format_event(topic: str, data) -> str:
+    """Encode one Server-Sent Event."""
+    return f"event: {topic}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class LiveStatsHub:
+    """Broadcasts live stats to SSE subscribers."""
+
+    def __init__(self, progress_interval: float = PROGRESS_INTERVAL):
+        self.progress_interval = progress_interval
+        self.latest: dict[str, object] = {}  # Topic -> value sent to new subscribers
+        self._subscribers: set[asyncio.Queue] = set()
+        self._task_progress: dict[str, dict] = {}
+        self._progress_task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, topic: str, data, snapshot=None) -> None:
+        """
+        Send an event to all subscribers.
+
+        Args:
+            snapshot: Value kept for new subscribers when ``data`` is a delta
+        """
+        self.latest[topic] = data if snapshot is None else snapshot
+        for queue in self._subscribers:
+            if queue.full():
+                self._collapse(queue, topic)
+            else:
+                queue.put_nowait((topic, data))
+
+    def _collapse(self, queue: asyncio.Queue, topic: str) -> None:
+        """
+        Replace a slow subscriber's backlog with the latest value of each topic in it.
+
+        Dropping single events could lose a "tasks" delta for good; the
+        snapshots supersede every queued event, so nothing is missed.
+        """
+        topics = {}
+        while not queue.empty():
+            topics[queue.get_nowait()[0]] = None
+        topics[topic] = None
+        for queued_topic in topics:
+            queue.put_nowait((queued_topic, self.latest[queued_topic]))
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a subscriber, primed with the latest value of each topic."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        for item in list(self.latest.items())[-QUEUE_SIZE:]:
+            queue.put_nowait(item)
+        self._subscribers.add(queue)
+        if self._progress_task is None or self._progress_task.done():
+            self._progress_task = asyncio.create_task(self._progress_loop())
+        logger.debug("[LIVE-STATS] Subscriber added (%s total)", len(self._subscribers))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        logger.debug("[LIVE-STATS] Subscriber removed (%s total)", len(self._subscribers))
+
+    async def stream(self) -> AsyncIterator[str]:
+        """Yield SSE text for one subscriber until the client disconnects."""
+        queue = self.subscribe()
+        try:
+            while True:
+                try:
+                    topic, data = await asyncio.wait_for(queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(topic, data)
+        finally:
+            self.unsubscribe(queue)
+
+    async def _progress_loop(self):
+        while self._subscribers:
+            try:
+                self.poll_progress()
+            except Exception as e:
+                logger.warning("[LIVE-STATS] Failed to read progress: %s", e)
+            await asyncio.sleep(self.progress_interval)
+
+    def poll_progress(self) -> None:
+        """Publish probe progress and task state that changed since the last check."""
+        from stream_prober import get_prober
+        from task_registry import get_registry
+
+        prober = get_prober()
+        if prober:
+            progress = prober.get_probe_progress()
+            if progress != self.latest.get("probe"):
+                self.publish("probe", progress)
+
+        changed = []
+        for status in get_registry().get_all_task_statuses():
+            state = {key: status[key] for key in ("task_id", "status", "progress", "last_run", "next_run")}
+            if self._task_progress.get(state["task_id"]) != state:
+                self._task_progress[state["task_id"]] = state
+                changed.append(state)
+        if changed:
+            self.publish("tasks", changed, snapshot=list(self._task_progress.values()))
+
+
+# Global hub instance
+_hub: Optional[LiveStatsHub] = None
+
+
+def get_live_stats() -> LiveStatsHub:
+    """Get the global live stats hub."""
+    global _hub
+    if _hub is None:
+        _hub = LiveStatsHub()
+    return _hub
@@ -10,6 +10,7 @@ import time
 from collections import defaultdict
 from datetime import datetime
 
+from cache import get_cache
 from dispatcharr_client import get_client
 from config import (
     get_settings,
@@ -316,6 +317,9 @@ async def startup_event():
         set_log_level(settings.backend_log_level)
         logger.info("[MAIN] Applied log level from settings: %s", settings.backend_log_level)
 
+    # Expire cached API responses in the background (both processes serve requests)
+    get_cache().start_sweeper()
+
     # Skip background services in HTTPS subprocess — only the main process
     # should run schedulers, probers, and trackers to avoid duplicate execution
     if _is_https_subprocess:
@@ -359,6 +363,9 @@ async def startup_event():
                 stream_sort_enabled=settings.stream_sort_enabled,
                 stream_fetch_page_limit=settings.stream_fetch_page_limit,
                 m3u_account_priorities=settings.m3u_account_priorities,
+                probe_cache_minutes=settings.probe_cache_minutes,
+                probe_preflight_enabled=settings.probe_preflight_enabled,
+                probe_single_connection=settings.probe_single_connection,
             )
             prober.set_notification_callbacks(
                 create_callback=create_notification_internal,
@@ -534,6 +541,8 @@ async def shutdown_event():
     except Exception as e:
         logger.error("[MAIN] Error stopping task engine: %s", e)
 
+    await get_cache().stop_sweeper()
+
     # Stop bandwidth tracker
     tracker = get_tracker()
     if tracker:
@@ -0,0 +1,264 @@
+"""
+Shared budget for ffprobe/ffmpeg subprocesses.
+
+Stream probing, FFmpeg builder probes and preview transcodes all start
+media subprocesses. MediaProcessManager caps how many run at once across
+all of them:
+
+- The budget is the media_process_budget setting, by default PROCESSES_PER_CORE
+  per usable core and never less than max_concurrent_probes plus the
+  interactive reserve, so the setting for parallel probes is not silently
+  capped on small machines.
+- Waiters are served by workload class. Background probes can never take
+  the last ``interactive_reserve`` slots, and their share shrinks while
+  the 1-minute load average is above the core count, so a preview starts
+  promptly even in the middle of a probe run. Probes waiting on the budget
+  (rather than on provider connection limits) are logged.
+- Commands are prefixed with nice (and ionice for background probes) so
+  the kernel favours interactive work among processes already running.
+
+Callers hold a slot for the lifetime of a process with
+``async with manager.slot(workload)`` or acquire()/release(), and start
+it with command() so the priority prefix is applied. popen() does both
+for subprocess.Popen users (preview transcodes).
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import shutil
+import subprocess
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PROCESSES_PER_CORE = 2
+MIN_BUDGET = 2
+INTERACTIVE_RESERVE = 1    # Slots background probes may never use
+LOAD_CHECK_INTERVAL = 5.0  # Seconds between load average reads
+BUDGET_LOG_INTERVAL = 60.0  # Seconds between "probes limited by the budget" log lines
+
+
+class Workload(IntEnum):
+    """Workload class of a media subprocess. Lower values are served first."""
+    PREVIEW = 0      # Stream/channel preview a user is watching
+    INTERACTIVE = 1  # FFmpeg builder probes
+    PROBE = 2        # Background stream probing
+
+
+NICE_LEVELS = {Workload.PREVIEW: 0, Workload.INTERACTIVE: 5, Workload.PROBE: 15}
+IONICE_ARGS = {Workload.PROBE: ["-c", "3"]}  # Idle I/O class
+
+
+def usable_cores() -> int:
+    """CPU cores this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def default_budget(max_concurrent_probes: int = 0, interactive_reserve: int = INTERACTIVE_RESERVE) -> int:
+    """PROCESSES_PER_CORE per core, with room for max_concurrent_probes background probes."""
+    return max(MIN_BUDGET, usable_cores() * PROCESSES_PER_CORE, max_concurrent_probes + interactive_reserve)
+
+
+def configured_budget(settings) -> int:
+    """Budget for the media_process_budget and max_concurrent_probes settings."""
+    return settings.media_process_budget or default_budget(settings.max_concurrent_probes)
+
+
+@lru_cache(maxsize=None)
+def _priority_tool(name: str) -> Optional[str]:
+    """Path of the nice/ionice binary, or None when it is not installed."""
+    return shutil.which(name)
+
+
+class MediaProcessManager:
+    """Global concurrency budget and scheduling for media subprocesses."""
+
+    def __init__(self, budget: Optional[int] = None, interactive_reserve: int = INTERACTIVE_RESERVE):
+        """
+        Initialize the manager.
+
+        Args:
+            budget: Maximum concurrent processes (default: default_budget())
+            interactive_reserve: Slots background probes may never use
+        """
+        self.cores = usable_cores()
+        self._requested_reserve = interactive_reserve
+
+        self._running: dict[Workload, int] = {workload: 0 for workload in Workload}
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._load: Optional[float] = None
+        self._load_checked = 0.0
+
+        self._started = 0
+        self._max_queue = 0
+        self._wait_total = 0.0
+        self._budget_waits = 0
+        self._budget_logged = float("-inf")
+        self.set_budget(budget)
+
+    def set_budget(self, budget: Optional[int]) -> None:
+        """Change the process budget; running processes keep their slots."""
+        self.budget = max(1, budget or default_budget(interactive_reserve=self._requested_reserve))
+        self.interactive_reserve = min(self._requested_reserve, self.budget - 1)
+        self._wake()
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    def _load_average(self) -> Optional[float]:
+        now = time.monotonic()
+        if now - self._load_checked >= LOAD_CHECK_INTERVAL:
+            self._load_checked = now
+            try:
+                self._load = os.getloadavg()[0]
+            except (AttributeError, OSError):
+                self._load = None
+        return self._load
+
+    def background_limit(self) -> int:
+        """Processes background probes may run right now."""
+        limit = max(1, self.budget - self.interactive_reserve)
+        load = self._load_average()
+        if load and load > self.cores:
+            limit = max(1, int(limit * self.cores / load))
+        return limit
+
+    def _capacity(self, workload: Workload) -> int:
+        if workload >= Workload.PROBE:
+            return self.background_limit()
+        return self.budget
+
+    async def acquire(self, workload: Workload) -> None:
+        """Wait for a process slot."""
+        started = time.monotonic()
+        if not self._waiters and self.running < self._capacity(workload):
+            self._grant(workload)
+            return
+
+        if workload >= Workload.PROBE and self.running >= self._capacity(workload):
+            self._note_budget_wait()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(workload), next(self._seq), future))
+        self._max_queue = max(self._max_queue, len(self._waiters))
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted just before cancellation: give it back
+                self.release(workload)
+            raise
+        self._wait_total += time.monotonic() - started
+
+    def _note_budget_wait(self) -> None:
+        """Log (at most every BUDGET_LOG_INTERVAL) that probes wait on the budget, not the provider."""
+        self._budget_waits += 1
+        now = time.monotonic()
+        if now - self._budget_logged < BUDGET_LOG_INTERVAL:
+            return
+        self._budget_logged = now
+        limit = self.background_limit()
+        reason = "budget %s minus %s interactive slots" % (self.budget, self.interactive_reserve)
+        if limit < max(1, self.budget - self.interactive_reserve):
+            reason += ", lowered for load average %.1f on %s cores" % (self._load, self.cores)
+        logger.info(
+            "[MEDIA] Background probes are waiting on the media process budget: %s running, limit %s (%s). "
+            "Raise media_process_budget to probe more streams at once.",
+            self._running[Workload.PROBE], limit, reason,
+        )
+
+    def release(self, workload: Workload) -> None:
+        """Return a process slot."""
+        self._running[workload] -= 1
+        self._wake()
+
+    def _grant(self, workload: Workload) -> None:
+        self._running[workload] += 1
+        self._started += 1
+
+    def _wake(self) -> None:
+        while self._waiters:
+            workload, _, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.running >= self._capacity(Workload(workload)):
+                break
+            heapq.heappop(self._waiters)
+            self._grant(Workload(workload))
+            future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, workload: Workload):
+        """Hold a process slot for the duration of the block."""
+        await self.acquire(workload)
+        try:
+            yield
+        finally:
+            self.release(workload)
+
+    def command(self, cmd: list[str], workload: Workload) -> list[str]:
+        """Prefix a command with the CPU/IO priority of its workload class."""
+        prefix = []
+        ionice_args = IONICE_ARGS.get(workload)
+        if ionice_args and _priority_tool("ionice"):
+            prefix += [_priority_tool("ionice"), *ionice_args]
+        if NICE_LEVELS[workload] and _priority_tool("nice"):
+            prefix += [_priority_tool("nice"), "-n", str(NICE_LEVELS[workload])]
+        return prefix + list(cmd)
+
+    async def popen(self, cmd: list[str], workload: Workload, timeout: Optional[float] = None, **kwargs) -> subprocess.Popen:
+        """
+        Start a subprocess.Popen in a slot.
+
+        The caller owns the slot and must release(workload) once the process
+        has exited. Raises asyncio.TimeoutError if no slot frees up in time.
+        """
+        await asyncio.wait_for(self.acquire(workload), timeout)
+        try:
+            return subprocess.Popen(self.command(cmd, workload), **kwargs)
+        except BaseException:
+            self.release(workload)
+            raise
+
+    def stats(self) -> dict:
+        """Budget and queue statistics."""
+        queued = {workload: 0 for workload in Workload}
+        for workload, _, future in self._waiters:
+            if not future.done():
+                queued[Workload(workload)] += 1
+        return {
+            "budget": self.budget,
+            "cores": self.cores,
+            "load_average": round(self._load, 2) if self._load is not None else None,
+            "background_limit": self.background_limit(),
+            "running": {workload.name.lower(): count for workload, count in self._running.items()},
+            "queued": {workload.name.lower(): count for workload, count in queued.items()},
+            "max_queued": self._max_queue,
+            "probe_budget_waits": self._budget_waits,
+            "started_total": self._started,
+            "wait_seconds_total": round(self._wait_total, 1),
+        }
+
+
+_manager: Optional[MediaProcessManager] = None
+
+
+def get_media_processes() -> MediaProcessManager:
+    """Process-wide media subprocess manager."""
+    global _manager
+    if _manager is None:
+        from config import get_settings
+        _manager = MediaProcessManager(budget=configured_budget(get_settings()))
+    return _manager
@@ -3,8 +3,8 @@ SQLAlchemy ORM models for the Journal and Bandwidth tracking features.
 """
 import json
 import logging
-from datetime import datetime, date
-from sqlalchemy import Column, Integer, BigInteger, String, Text, Boolean, DateTime, Date, Float, Index, ForeignKey, UniqueConstraint
+from datetime import datetime
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Boolean, DateTime, Date, Float, Index, ForeignKey, UniqueConstraint, LargeBinary
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -187,6 +187,11 @@ class StreamStats(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     dismissed_at = Column(DateTime, nullable=True)  # When failure was dismissed (acknowledged)
     consecutive_failures = Column(Integer, default=0, nullable=False)  # Strike rule: consecutive probe failures
+    url_hash = Column(String(16), nullable=True)  # Fingerprint of the upstream URL last probed (delta probes)
+    # Numeric sort inputs derived at probe time (see stream_sort.materialize_sort_columns)
+    sort_height = Column(Integer, nullable=True)  # e.g., 1080 (from resolution)
+    sort_fps = Column(Float, nullable=True)  # e.g., 29.97 (from fps)
+    sort_bitrate = Column(BigInteger, nullable=True)  # video_bitrate, else bitrate
 
     __table_args__ = (
         Index("idx_stream_stats_stream_id", stream_id),
@@ -207,6 +212,9 @@ class StreamStats(Base):
             "stream_type": self.stream_type,
             "bitrate": self.bitrate,
             "video_bitrate": self.video_bitrate,
+            "sort_height": self.sort_height,
+            "sort_fps": self.sort_fps,
+            "sort_bitrate": self.sort_bitrate,
             "probe_status": self.probe_status,
             "error_message": self.error_message,
             "last_probed": self.last_probed.isoformat() + "Z" if self.last_probed else None,
@@ -1152,6 +1160,97 @@ class ChannelBandwidth(Base):
         return f"<ChannelBandwidth(id={self.id}, channel={self.channel_name}, date={self.date}, bytes={self.bytes_transferred})>"
 
 
+class BandwidthSample(Base):
+    """
+    Bandwidth time series bucket (1-minute, 1-hour or 1-day resolution).
+    One row per resolution, series and bucket; the all-channels series has
+    an empty channel_id. Rows past their tier's retention are purged.
+    """
+    __tablename__ = "bandwidth_samples"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    resolution = Column(Integer, nullable=False)  # Bucket width in seconds
+    channel_id = Column(String(64), nullable=False, default="")  # "" = all channels
+    bucket_start = Column(DateTime, nullable=False)  # UTC
+    bytes_in = Column(BigInteger, default=0, nullable=False)  # Inbound from providers
+    bytes_out = Column(BigInteger, default=0, nullable=False)  # Outbound to clients
+    peak_bitrate_in = Column(BigInteger, default=0, nullable=False)  # bps
+    peak_bitrate_out = Column(BigInteger, default=0, nullable=False)  # bps
+    peak_clients = Column(Integer, default=0, nullable=False)
+    peak_channels = Column(Integer, default=0, nullable=False)
+    sample_count = Column(Integer, default=0, nullable=False)  # Polls in this bucket
+
+    __table_args__ = (
+        UniqueConstraint("resolution", "channel_id", "bucket_start", name="uq_bandwidth_samples_bucket"),
+        Index("idx_bandwidth_samples_resolution_start", resolution, bucket_start),
+    )
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for API responses."""
+        return {
+            "timestamp": self.bucket_start.isoformat() + "Z" if self.bucket_start else None,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "avg_bitrate_in": self.bytes_in * 8 // self.resolution if self.resolution else 0,
+            "avg_bitrate_out": self.bytes_out * 8 // self.resolution if self.resolution else 0,
+            "peak_bitrate_in": self.peak_bitrate_in,
+            "peak_bitrate_out": self.peak_bitrate_out,
+            "peak_clients": self.peak_clients,
+            "peak_channels": self.peak_channels,
+        }
+
+    def __repr__(self):
+        return f"<BandwidthSample(resolution={self.resolution}, channel={self.channel_id!r}, start={self.bucket_start})>"
+
+
+class BandwidthRollup(Base):
+    """
+    Bandwidth totals per calendar month, per year and for all time.
+    Maintained alongside bandwidth_daily so summaries read one row per period.
+    """
+    __tablename__ = "bandwidth_rollups"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    period = Column(String(8), nullable=False)  # "month", "year" or "all"
+    period_start = Column(Date, nullable=False)  # First day of the period (1970-01-01 for "all")
+    bytes_transferred = Column(BigInteger, default=0, nullable=False)
+    bytes_in = Column(BigInteger, default=0, nullable=False)
+    bytes_out = Column(BigInteger, default=0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("period", "period_start", name="uq_bandwidth_rollups_period"),
+    )
+
+    def __repr__(self):
+        return f"<BandwidthRollup(period={self.period}, start={self.period_start}, bytes={self.bytes_transferred})>"
+
+
+class UniqueViewerRollup(Base):
+    """
+    Daily viewer rollup per channel, plus an all-channels row (empty channel_id).
+    Holds a HyperLogLog sketch of client IPs so unique viewers over any range
+    of days is a merge of daily sketches, with connection and watch totals.
+    """
+    __tablename__ = "unique_viewer_rollups"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    date = Column(Date, nullable=False)
+    channel_id = Column(String(64), nullable=False, default="")  # "" = all channels
+    channel_name = Column(String(255), nullable=False, default="")  # Cached for display
+    ip_sketch = Column(LargeBinary, nullable=False)  # Serialized hyperloglog.HyperLogLog
+    connection_count = Column(Integer, default=0, nullable=False)
+    watched_connections = Column(Integer, default=0, nullable=False)  # Connections with watch_seconds > 0
+    watch_seconds = Column(BigInteger, default=0, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("date", "channel_id", name="uq_unique_viewer_rollups_date_channel"),
+        Index("idx_unique_viewer_rollups_channel_date", channel_id, date),
+    )
+
+    def __repr__(self):
+        return f"<UniqueViewerRollup(date={self.date}, channel={self.channel_id!r}, connections={self.connection_count})>"
+
+
 class ChannelPopularityScore(Base):
     """
     Calculated popularity scores for channels.
@@ -0,0 +1,148 @@
+"""
+Write-behind persistence for bulk probe results.
+
+probe_all_streams hands each result to a ProbeResultWriter instead of
+opening a session per stream. Results are collected in memory and written
+as one multi-row UPSERT on stream_stats when batch_size results are queued
+or flush_interval seconds have passed, whichever comes first. The write
+runs in a worker thread so the event loop keeps scheduling probes while
+SQLite commits. close() writes whatever is still queued.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.dialects.sqlite import insert
+
+from database import get_session
+from models import StreamStats
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+
+# Columns only overwritten when the new probe found a value
+_METADATA_COLUMNS = (
+    "resolution", "fps", "video_codec", "audio_codec", "audio_channels",
+    "stream_type", "bitrate", "video_bitrate", "url_hash",
+    "sort_height", "sort_fps",
+)
+_FAILED_STATUSES = ("failed", "timeout")
+
+
+def write_probe_rows(rows: list[dict]) -> None:
+    """UPSERT probe results into stream_stats in a single statement.
+
+    Mirrors the per-row update done by StreamProber._save_probe_result:
+    status, name, error and last_probed are replaced, the dismissal is
+    cleared, consecutive_failures counts failed/timeout probes and resets
+    on success, metadata columns keep their old value when the new
+    probe did not report one, and sort_bitrate follows the merged bitrates.
+    """
+    if not rows:
+        return
+    stmt = insert(StreamStats).values([
+        {**row, "consecutive_failures": 1 if row["probe_status"] in _FAILED_STATUSES else 0}
+        for row in rows
+    ])
+    excluded = stmt.excluded
+    table = StreamStats.__table__.c
+    update = {
+        "stream_name": excluded.stream_name,
+        "probe_status": excluded.probe_status,
+        "error_message": excluded.error_message,
+        "last_probed": excluded.last_probed,
+        "dismissed_at": None,
+        "consecutive_failures": case(
+            (excluded.probe_status.in_(_FAILED_STATUSES), table.consecutive_failures + 1),
+            (excluded.probe_status == "success", 0),
+            else_=table.consecutive_failures,
+        ),
+    }
+    for column in _METADATA_COLUMNS:
+        update[column] = case(
+            (getattr(excluded, column).is_not(None), getattr(excluded, column)),
+            else_=getattr(table, column),
+        )
+    # Derived from the merged columns: a probe may report bitrate but not video_bitrate
+    update["sort_bitrate"] = func.coalesce(func.nullif(update["video_bitrate"], 0), update["bitrate"])
+    stmt = stmt.on_conflict_do_update(index_elements=[StreamStats.stream_id], set_=update)
+
+    session = get_session()
+    try:
+        session.execute(stmt)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+class ProbeResultWriter:
+    """Queues probe results and flushes them in batches off the event loop."""
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """
+        Initialize the writer.
+
+        Args:
+            batch_size: Queued results that trigger an immediate flush
+            flush_interval: Maximum seconds a result waits before being written
+        """
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._pending: dict[int, dict] = {}  # stream_id -> row (latest result wins)
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.written = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def submit(self, row: dict) -> None:
+        """Queue a stream_stats row (must include stream_id and probe_status)."""
+        self._pending[row["stream_id"]] = row
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Write every queued result now."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            rows = list(self._pending.values())
+            self._pending = {}
+            try:
+                await asyncio.to_thread(write_probe_rows, rows)
+                self.written += len(rows)
+                logger.debug("[STREAM-PROBE] Wrote %s probe results", len(rows))
+            except Exception as e:
+                self.failed += len(rows)
+                logger.error("[STREAM-PROBE] Failed to write %s probe results: %s", len(rows), e)
+
+    async def close(self) -> None:
+        """Stop the flush loop and write the remaining results."""
+        # Let the loop finish its current write rather than cancelling it mid-commit
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
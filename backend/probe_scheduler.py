@@ -0,0 +1,221 @@
+"""
+Ready-queue scheduler for parallel probe runs.
+
+Streams are queued per M3U account in probe order. A dispatch pass looks at
+the head stream of each ready account (oldest head first) and asks an
+admission callback whether it can start now, must wait, or should be
+skipped. Accounts that must wait are parked until something can change
+their answer:
+
+- one of their own probes finishes (capacity token released),
+- a hold or cooldown timer expires,
+- or, when nothing of ours is running on the account, a recheck delay
+  passes (capacity is then held by Dispatcharr viewers we cannot observe).
+
+Every one of these wakes the probe loop through a single event, so the loop
+never sleeps on a fixed poll interval and never rescans waiting streams.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds before an account blocked only by Dispatcharr connections is rechecked
+DEFAULT_RECHECK_SECONDS = 5.0
+
+
+@dataclass
+class Admission:
+    """Admission decision for the head stream of an account queue."""
+    action: str
+    profile: Optional[dict] = None
+    retry_after: Optional[float] = None
+    reason: str = ""
+
+    START = "start"
+    WAIT = "wait"
+    SKIP = "skip"
+
+    @classmethod
+    def start(cls, profile: Optional[dict] = None) -> "Admission":
+        """Start the stream now, optionally through a specific M3U profile."""
+        return cls(cls.START, profile=profile)
+
+    @classmethod
+    def wait(cls, retry_after: Optional[float] = None) -> "Admission":
+        """Park the account until a probe finishes or retry_after seconds pass."""
+        return cls(cls.WAIT, retry_after=retry_after)
+
+    @classmethod
+    def skip(cls, reason: str) -> "Admission":
+        """Drop the stream without probing it."""
+        return cls(cls.SKIP, reason=reason)
+
+
+class ProbeScheduler:
+    """Per-account ready queues with capacity tokens and event wakeups."""
+
+    def __init__(self, max_concurrent: int, recheck_delay: float = DEFAULT_RECHECK_SECONDS):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrent: Global cap on probes running at once
+            recheck_delay: Seconds before re-admitting an account that waits
+                           while none of our probes run on it
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.recheck_delay = recheck_delay
+
+        self._queues: dict[Hashable, deque] = {}   # key -> deque of (seq, item)
+        self._ready: list[tuple[int, Hashable]] = []  # heap of (head seq, key)
+        self._in_ready: set = set()
+        self._blocked: dict[Hashable, Optional[asyncio.TimerHandle]] = {}
+        self._seq = itertools.count()
+        self._pending = 0
+
+        self._active = 0
+        self._active_by_key: dict[Hashable, int] = {}
+        self._active_by_profile: dict[int, int] = {}
+
+        self._wakeup = asyncio.Event()
+
+    @property
+    def pending(self) -> int:
+        """Streams queued and not yet dispatched."""
+        return self._pending
+
+    @property
+    def active(self) -> int:
+        """Probes currently holding a capacity token."""
+        return self._active
+
+    @property
+    def profile_counts(self) -> dict[int, int]:
+        """Running probes per M3U profile (read-only view)."""
+        return self._active_by_profile
+
+    def active_for(self, key: Hashable) -> int:
+        """Running probes for an account."""
+        return self._active_by_key.get(key, 0)
+
+    def add(self, key: Hashable, item) -> None:
+        """Queue an item behind the earlier items of its account."""
+        seq = next(self._seq)
+        queue = self._queues.setdefault(key, deque())
+        queue.append((seq, item))
+        self._pending += 1
+        if len(queue) == 1 and key not in self._blocked:
+            self._push_ready(key)
+
+    def dispatch(self, admit: Callable[[Hashable, object], Admission]) -> Iterator[tuple[Hashable, object, Admission]]:
+        """Yield (key, item, admission) for every head item started or skipped.
+
+        Started items hold a capacity token until release() is called.
+        Stops as soon as the global cap is reached or no account is ready.
+        """
+        while self._ready and self._active < self.max_concurrent:
+            _, key = self._ready[0]
+            if key in self._blocked:
+                heapq.heappop(self._ready)
+                self._in_ready.discard(key)
+                continue
+
+            queue = self._queues[key]
+            _, item = queue[0]
+            admission = admit(key, item)
+
+            heapq.heappop(self._ready)
+            self._in_ready.discard(key)
+            if admission.action == Admission.WAIT:
+                self._block(key, admission.retry_after)
+                continue
+
+            queue.popleft()
+            self._pending -= 1
+            if queue:
+                self._push_ready(key)
+            if admission.action == Admission.START:
+                self._acquire(key, admission.profile)
+            yield key, item, admission
+
+    def release(self, key: Hashable, profile: Optional[dict] = None, cooldown: float = 0.0) -> None:
+        """Return the capacity token of a finished probe.
+
+        Args:
+            key: Account the probe ran on
+            profile: Profile the probe was started with, if any
+            cooldown: Seconds to keep the account parked before its next probe
+        """
+        self._active -= 1
+        self._active_by_key[key] = max(0, self._active_by_key.get(key, 0) - 1)
+        if profile:
+            profile_id = profile["id"]
+            self._active_by_profile[profile_id] = max(0, self._active_by_profile.get(profile_id, 0) - 1)
+
+        if cooldown > 0:
+            self._block(key, cooldown)
+        elif key in self._blocked and self._blocked[key] is None:
+            # Parked until one of its probes finished: that just happened
+            self._unblock(key)
+        self.wake()
+
+    def wake(self) -> None:
+        """Wake the probe loop (pause, resume, cancel or a state change)."""
+        self._wakeup.set()
+
+    async def wait(self) -> None:
+        """Wait until something may allow progress."""
+        await self._wakeup.wait()
+        self._wakeup.clear()
+
+    def close(self) -> None:
+        """Cancel pending timers."""
+        for handle in self._blocked.values():
+            if handle is not None:
+                handle.cancel()
+        self._blocked.clear()
+
+    def _acquire(self, key: Hashable, profile: Optional[dict]) -> None:
+        self._active += 1
+        self._active_by_key[key] = self._active_by_key.get(key, 0) + 1
+        if profile:
+            profile_id = profile["id"]
+            self._active_by_profile[profile_id] = self._active_by_profile.get(profile_id, 0) + 1
+
+    def _push_ready(self, key: Hashable) -> None:
+        if key in self._in_ready or not self._queues.get(key):
+            return
+        heapq.heappush(self._ready, (self._queues[key][0][0], key))
+        self._in_ready.add(key)
+
+    def _block(self, key: Hashable, retry_after: Optional[float]) -> None:
+        if retry_after is None and not self._active_by_key.get(key):
+            # Nothing of ours will finish to wake this account: recheck later
+            retry_after = self.recheck_delay
+
+        previous = self._blocked.get(key)
+        if previous is not None:
+            if retry_after is not None and previous.when() >= asyncio.get_running_loop().time() + retry_after:
+                return
+            previous.cancel()
+
+        handle = None
+        if retry_after is not None:
+            handle = asyncio.get_running_loop().call_later(max(0.0, retry_after), self._on_timer, key)
+        self._blocked[key] = handle
+
+    def _on_timer(self, key: Hashable) -> None:
+        self._unblock(key)
+        self.wake()
+
+    def _unblock(self, key: Hashable) -> None:
+        handle = self._blocked.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+        self._push_ready(key)
@@ -0,0 +1,116 @@
+"""
+Stream selection for delta probes.
+
+A full probe run probes every stream in a channel. A delta run only probes
+streams whose stored result is likely out of date:
+
+- new: never probed
+- changed: the upstream URL differs from the one last probed
+- failing: the last probe failed or timed out
+- m3u_change: the M3U change log reports the stream (by account and
+  name) as added after its last probe, e.g. removed and re-added
+- due: the last probe is older than the stream's TTL
+
+The TTL shrinks with channel popularity (ChannelPopularityScore, 0-100),
+so streams behind popular channels are re-checked more often than streams
+nobody watches. Everything else keeps its stored result.
+"""
+import hashlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+DEFAULT_DELTA_TTL_HOURS = 72
+# A channel with the maximum score is re-probed this many times as often
+POPULARITY_TTL_SPEEDUP = 4
+
+
+class ProbeRecord(NamedTuple):
+    """The parts of a stream_stats row that decide whether to re-probe."""
+    probe_status: str
+    last_probed: Optional[datetime]
+    url_hash: Optional[str]
+
+
+def url_fingerprint(normalized_url: Optional[str]) -> Optional[str]:
+    """Short stable hash of a normalized stream URL, stored as stream_stats.url_hash."""
+    if not normalized_url:
+        return None
+    return hashlib.sha1(normalized_url.encode("utf-8")).hexdigest()[:16]
+
+
+def popularity_ttl(ttl_hours: float, score: Optional[float]) -> timedelta:
+    """TTL for a stream whose most popular channel has the given score."""
+    score = min(max(score or 0.0, 0.0), 100.0)
+    factor = 1 - (1 - 1 / POPULARITY_TTL_SPEEDUP) * score / 100
+    return timedelta(hours=ttl_hours * factor)
+
+
+def delta_probe_reason(
+    record: Optional[ProbeRecord],
+    url_hash: Optional[str],
+    added_at: Optional[datetime],
+    popularity: Optional[float],
+    ttl_hours: float,
+    now: datetime,
+) -> Optional[str]:
+    """Why a stream needs probing in a delta run, or None to keep its result."""
+    if record is None or record.last_probed is None:
+        return "new"
+    # Rows probed before URL tracking have no hash; they pick one up on their next probe
+    if record.url_hash and url_hash and record.url_hash != url_hash:
+        return "changed"
+    if record.probe_status != "success":
+        return "failing"
+    if added_at and added_at > record.last_probed:
+        return "m3u_change"
+    if now - record.last_probed >= popularity_ttl(ttl_hours, popularity):
+        return "due"
+    return None
+
+
+def select_delta_streams(
+    streams: list[dict],
+    records: dict[int, ProbeRecord],
+    url_hashes: dict[int, Optional[str]],
+    added_at: dict[tuple[int, str], datetime],
+    popularity: dict[int, float],
+    ttl_hours: float = DEFAULT_DELTA_TTL_HOURS,
+    now: Optional[datetime] = None,
+) -> tuple[list[dict], Counter]:
+    """
+    Filter streams down to those a delta run should probe.
+
+    Args:
+        streams: Candidate streams (Dispatcharr stream dicts)
+        records: stream_id -> stored probe record
+        url_hashes: stream_id -> url_fingerprint of the stream's current URL
+        added_at: (m3u_account_id, stream name) -> latest "streams_added" change time
+        popularity: stream_id -> highest popularity score of its channels
+        ttl_hours: Re-probe interval for streams of unwatched channels
+        now: Current UTC time (for tests)
+
+    Returns:
+        (selected streams, Counter of selection reasons)
+    """
+    from stream_prober import extract_m3u_account_id
+
+    now = now or datetime.utcnow()
+    selected = []
+    reasons = Counter()
+    for stream in streams:
+        stream_id = stream["id"]
+        # m3u_account may be an ID or a nested {"id": ..., "name": ...} object
+        account_id = extract_m3u_account_id(stream.get("m3u_account"))
+        reason = delta_probe_reason(
+            records.get(stream_id),
+            url_hashes.get(stream_id),
+            added_at.get((account_id, stream.get("name"))),
+            popularity.get(stream_id),
+            ttl_hours,
+            now,
+        )
+        if reason:
+            selected.append(stream)
+            reasons[reason] += 1
+    return selected, reasons
@@ -12,7 +12,8 @@ from fastapi import APIRouter, HTTPException, Body
 from pydantic import BaseModel
 
 from database import get_session
-from dispatcharr_client import get_client
+from dispatcharr_client import get_client, fetch_pages
+from dispatcharr_catalog import get_catalog
 import journal
 
 logger = logging.getLogger(__name__)
@@ -158,31 +159,10 @@ async def get_orphaned_channel_groups():
         # Get M3U group settings to see which M3U accounts groups were associated with
         m3u_group_settings = await client.get_all_m3u_group_settings()
 
-        # Get all streams (paginated) to check which groups have streams
-        streams = []
-        page = 1
-        while True:
-            result = await client.get_streams(page=page, page_size=500)
-            page_streams = result.get("results", [])
-            streams.extend(page_streams)
-
-            # Check if there are more pages
-            if len(page_streams) < 500:
-                break
-            page += 1
-
-        # Get all channels (paginated) to check which groups have channels
-        channels = []
-        page = 1
-        while True:
-            result = await client.get_channels(page=page, page_size=500)
-            page_channels = result.get("results", [])
-            channels.extend(page_channels)
-
-            # Check if there are more pages
-            if len(page_channels) < 500:
-                break
-            page += 1
+        # Get all streams and channels from the shared catalogue to check group usage
+        catalog = get_catalog(client)
+        streams = await catalog.get_streams()
+        channels = await catalog.get_channels()
 
         # Build map of group_id -> stream count (streams use group ID, not name)
         group_stream_count = {}
@@ -285,31 +265,11 @@ async def delete_orphaned_channel_groups(request: DeleteOrphanedGroupsRequest |
         # Get M3U group settings to see which groups are still in M3U accounts
         m3u_group_settings = await client.get_all_m3u_group_settings()
 
-        # Get all streams (paginated)
-        streams = []
-        page = 1
-        while True:
-            result = await client.get_streams(page=page, page_size=500)
-            page_streams = result.get("results", [])
-            streams.extend(page_streams)
-
-            # Check if there are more pages
-            if len(page_streams) < 500:
-                break
-            page += 1
-
-        # Get all channels (paginated)
-        channels = []
-        page = 1
-        while True:
-            result = await client.get_channels(page=page, page_size=500)
-            page_channels = result.get("results", [])
-            channels.extend(page_channels)
-
-            # Check if there are more pages
-            if len(page_channels) < 500:
-                break
-            page += 1
+        # Get all streams and channels from the shared catalogue; channels are
+        # reloaded so groups emptied or filled outside ECM are judged correctly
+        catalog = get_catalog(client)
+        streams = await catalog.get_streams()
+        channels = await catalog.get_channels(fresh=True)
 
         # Build map of group_id -> stream count (streams use group ID, not name)
         group_stream_count = {}
@@ -450,33 +410,24 @@ async def get_groups_with_auto_created_channels():
 
         # Fetch all channels (paginated) and find auto_created ones
         auto_created_by_group: dict[int, list[dict]] = {}
-        page = 1
         total_auto_created = 0
 
-        while True:
-            result = await client.get_channels(page=page, page_size=500)
-            page_channels = result.get("results", [])
-
-            for channel in page_channels:
-                if channel.get("auto_created"):
-                    total_auto_created += 1
-                    group_id = channel.get("channel_group_id")
-                    if group_id is not None:
-                        if group_id not in auto_created_by_group:
-                            auto_created_by_group[group_id] = []
-                        auto_created_by_group[group_id].append({
-                            "id": channel.get("id"),
-                            "name": channel.get("name"),
-                            "channel_number": channel.get("channel_number"),
-                            "auto_created_by": channel.get("auto_created_by"),
-                            "auto_created_by_name": channel.get("auto_created_by_name"),
-                        })
-
-            if not result.get("next"):
-                break
-            page += 1
-            if page > 50:  # Safety limit
-                break
+        all_channels = await fetch_pages(client.get_channels, page_size=500, page_limit=50)
+
+        for channel in all_channels:
+            if channel.get("auto_created"):
+                total_auto_created += 1
+                group_id = channel.get("channel_group_id")
+                if group_id is not None:
+                    if group_id not in auto_created_by_group:
+                        auto_created_by_group[group_id] = []
+                    auto_created_by_group[group_id].append({
+                        "id": channel.get("id"),
+                        "name": channel.get("name"),
+                        "channel_number": channel.get("channel_number"),
+                        "auto_created_by": channel.get("auto_created_by"),
+                        "auto_created_by_name": channel.get("auto_created_by_name"),
+                    })
 
         # Build result with group info
         groups_with_auto_created = []
@@ -525,8 +476,6 @@ async def get_channel_groups_with_streams():
         groups_with_streams_ids = set()
 
         # Fetch all channels and check which groups have channels with streams
-        page = 1
-        total_channels = 0
         channels_with_streams = 0
         channels_without_streams = 0
         auto_created_count = 0
@@ -535,82 +484,74 @@ async def get_channel_groups_with_streams():
         channels_by_group_id: dict = {}  # Track channel count per group for debugging
         sample_auto_created = []  # Track auto-created channels for debugging
 
-        while True:
-            result = await client.get_channels(page=page, page_size=500)
-            page_channels = result.get("results", [])
-            total_channels += len(page_channels)
-
-            for channel in page_channels:
-                channel_group_id = channel.get("channel_group_id")
-                channel_number = channel.get("channel_number")
-                channel_name = channel.get("name")
-                is_auto_created = channel.get("auto_created", False)
-
-                # Track auto-created channels
-                if is_auto_created:
-                    auto_created_count += 1
-                    if len(sample_auto_created) < 10:
-                        group_name = group_map.get(channel_group_id, {}).get("name", "Unknown")
-                        sample_auto_created.append({
-                            "channel_id": channel.get("id"),
-                            "channel_name": channel_name,
-                            "channel_number": channel_number,
-                            "channel_group_id": channel_group_id,
-                            "group_name": group_name,
-                            "auto_created_by": channel.get("auto_created_by"),
-                            "auto_created_by_name": channel.get("auto_created_by_name")
-                        })
-
-                # Track channels per group
+        all_channels = await fetch_pages(client.get_channels, page_size=500, page_limit=50)
+        total_channels = len(all_channels)
+
+        for channel in all_channels:
+            channel_group_id = channel.get("channel_group_id")
+            channel_number = channel.get("channel_number")
+            channel_name = channel.get("name")
+            is_auto_created = channel.get("auto_created", False)
+
+            # Track auto-created channels
+            if is_auto_created:
+                auto_created_count += 1
+                if len(sample_auto_created) < 10:
+                    group_name = group_map.get(channel_group_id, {}).get("name", "Unknown")
+                    sample_auto_created.append({
+                        "channel_id": channel.get("id"),
+                        "channel_name": channel_name,
+                        "channel_number": channel_number,
+                        "channel_group_id": channel_group_id,
+                        "group_name": group_name,
+                        "auto_created_by": channel.get("auto_created_by"),
+                        "auto_created_by_name": channel.get("auto_created_by_name")
+                    })
+
+            # Track channels per group
+            if channel_group_id is not None:
+                if channel_group_id not in channels_by_group_id:
+                    channels_by_group_id[channel_group_id] = {"count": 0, "with_streams": 0, "samples": []}
+                channels_by_group_id[channel_group_id]["count"] += 1
+                if len(channels_by_group_id[channel_group_id]["samples"]) < 3:
+                    channels_by_group_id[channel_group_id]["samples"].append(f"#{channel_number} {channel_name}")
+
+            # Check if channel has any streams
+            stream_ids = channel.get("streams", [])
+            if stream_ids:  # Has at least one stream
+                channels_with_streams += 1
                 if channel_group_id is not None:
-                    if channel_group_id not in channels_by_group_id:
-                        channels_by_group_id[channel_group_id] = {"count": 0, "with_streams": 0, "samples": []}
-                    channels_by_group_id[channel_group_id]["count"] += 1
-                    if len(channels_by_group_id[channel_group_id]["samples"]) < 3:
-                        channels_by_group_id[channel_group_id]["samples"].append(f"#{channel_number} {channel_name}")
-
-                # Check if channel has any streams
-                stream_ids = channel.get("streams", [])
-                if stream_ids:  # Has at least one stream
-                    channels_with_streams += 1
-                    if channel_group_id is not None:
-                        channels_by_group_id[channel_group_id]["with_streams"] += 1
-
-                    # Collect samples for debugging - dump first channel completely
-                    if len(sample_channel_groups) == 0:
-                        logger.debug("[GROUPS] First channel with streams (FULL DATA): %s", channel)
-
-                    if len(sample_channel_groups) < 5:
-                        sample_channel_groups.append({
-                            "channel_id": channel.get("id"),
-                            "channel_name": channel_name,
-                            "channel_number": channel_number,
-                            "channel_group_id": channel_group_id,
-                            "channel_group_type": type(channel_group_id).__name__,
-                            "stream_count": len(stream_ids)
-                        })
-
-                    # IMPORTANT: Check for not None instead of truthy to handle group ID 0
-                    if channel_group_id is not None:
-                        groups_with_streams_ids.add(channel_group_id)
-                else:
-                    # Track channels WITHOUT streams for debugging
-                    channels_without_streams += 1
-                    if len(sample_channels_no_streams) < 10:
-                        sample_channels_no_streams.append({
-                            "channel_id": channel.get("id"),
-                            "channel_name": channel_name,
-                            "channel_number": channel_number,
-                            "channel_group_id": channel_group_id,
-                            "streams_field": stream_ids,
-                            "streams_field_type": type(stream_ids).__name__
-                        })
-
-            if not result.get("next"):
-                break
-            page += 1
-            if page > 50:  # Safety limit
-                break
+                    channels_by_group_id[channel_group_id]["with_streams"] += 1
+
+                # Collect samples for debugging - dump first channel completely
+                if len(sample_channel_groups) == 0:
+                    logger.debug("[GROUPS] First channel with streams (FULL DATA): %s", channel)
+
+                if len(sample_channel_groups) < 5:
+                    sample_channel_groups.append({
+                        "channel_id": channel.get("id"),
+                        "channel_name": channel_name,
+                        "channel_number": channel_number,
+                        "channel_group_id": channel_group_id,
+                        "channel_group_type": type(channel_group_id).__name__,
+                        "stream_count": len(stream_ids)
+                    })
+
+                # IMPORTANT: Check for not None instead of truthy to handle group ID 0
+                if channel_group_id is not None:
+                    groups_with_streams_ids.add(channel_group_id)
+            else:
+                # Track channels WITHOUT streams for debugging
+                channels_without_streams += 1
+                if len(sample_channels_no_streams) < 10:
+                    sample_channels_no_streams.append({
+                        "channel_id": channel.get("id"),
+                        "channel_name": channel_name,
+                        "channel_number": channel_number,
+                        "channel_group_id": channel_group_id,
+                        "streams_field": stream_ids,
+                        "streams_field_type": type(stream_ids).__name__
+                    })
 
         # Log samples for debugging
         if sample_channel_groups:
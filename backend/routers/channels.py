@@ -18,7 +18,8 @@ from pydantic import BaseModel
 from config import get_settings
 from csv_handler import parse_csv, generate_csv, generate_template, CSVParseError
 from database import get_session
-from dispatcharr_client import get_client
+from dispatcharr_client import get_client, fetch_pages
+from dispatcharr_catalog import get_catalog
 import journal
 
 logger = logging.getLogger(__name__)
@@ -452,20 +453,12 @@ async def export_channels_csv():
     try:
         # Fetch channel groups to build ID -> name lookup
         start = time.time()
-        groups = await client.get_channel_groups()
+        catalog = get_catalog(client)
+        groups = await catalog.get_channel_groups()
         group_lookup = {g.get("id"): g.get("name", "") for g in groups}
 
-        # Fetch all channels (handle pagination)
-        all_channels = []
-        page = 1
-        page_size = 100
-        while True:
-            result = await client.get_channels(page=page, page_size=page_size)
-            channels = result.get("results", [])
-            all_channels.extend(channels)
-            if not result.get("next"):
-                break
-            page += 1
+        # Fetch all channels from the shared catalogue
+        all_channels = await catalog.get_channels()
 
         # Filter out auto-created channels and sort by channel number ascending
         manual_channels = [ch for ch in all_channels if not ch.get("auto_created", False)]
@@ -477,14 +470,14 @@ async def export_channels_csv():
             stream_ids = ch.get("streams", [])
             all_stream_ids.update(stream_ids)
 
-        # Fetch stream details to get URLs (batch by 100)
+        # Fetch stream details to get URLs (batch by 100; catalogued streams are served locally)
         stream_url_lookup = {}
         stream_ids_list = list(all_stream_ids)
         for i in range(0, len(stream_ids_list), 100):
             batch = stream_ids_list[i:i+100]
             if batch:
                 try:
-                    streams = await client.get_streams_by_ids(batch)
+                    streams = await catalog.get_streams_by_ids(batch)
                     for s in streams:
                         stream_url_lookup[s.get("id")] = s.get("url", "")
                 except Exception as e:
@@ -573,18 +566,11 @@ async def import_channels_csv(file: UploadFile = File(...)):
     stream_url_to_id = {}
     try:
         start = time.time()
-        page = 1
-        page_size = 500
-        while True:
-            result = await client.get_streams(page=page, page_size=page_size)
-            streams = result.get("results", [])
-            for s in streams:
-                url = s.get("url", "")
-                if url:
-                    stream_url_to_id[url] = s.get("id")
-            if not result.get("next"):
-                break
-            page += 1
+        streams = await fetch_pages(client.get_streams, page_size=500)
+        for s in streams:
+            url = s.get("url", "")
+            if url:
+                stream_url_to_id[url] = s.get("id")
         elapsed_ms = (time.time() - start) * 1000
         logger.info("[CHANNELS-CSV] Built stream URL lookup with %s streams in %.1fms", len(stream_url_to_id), elapsed_ms)
     except Exception as e:
@@ -595,8 +581,7 @@ async def import_channels_csv(file: UploadFile = File(...)):
     epg_name_to_icon = {}
     try:
         start = time.time()
-        epg_data = await client.get_epg_data()
-        for entry in epg_data:
+        async for entry in client.iter_epg_data():
             tvg_id = entry.get("tvg_id", "")
             icon_url = entry.get("icon_url", "")
             name = entry.get("name", "")
@@ -959,15 +944,7 @@ async def bulk_commit_operations(request: BulkCommitRequest):
         if referenced_channel_ids:
             try:
                 logger.debug("[CHANNELS-BULK] Fetching existing channels for validation...")
-                # Fetch all pages of channels to build lookup
-                page = 1
-                while True:
-                    response = await client.get_channels(page=page, page_size=500)
-                    for ch in response.get("results", []):
-                        existing_channels[ch["id"]] = ch
-                    if not response.get("next"):
-                        break
-                    page += 1
+                existing_channels = await get_catalog(client).get_channel_map(fresh=True)
                 logger.debug("[CHANNELS-BULK] Loaded %s existing channels", len(existing_channels))
                 # Check which referenced channels don't exist
                 missing_channels = referenced_channel_ids - set(existing_channels.keys())
@@ -1401,26 +1378,16 @@ async def clear_auto_created_flag(request: ClearAutoCreatedRequest):
         # Fetch all channels and find auto_created ones in the specified groups
         start = time.time()
         channels_to_update = []
-        page = 1
-
-        while True:
-            result = await client.get_channels(page=page, page_size=500)
-            page_channels = result.get("results", [])
-
-            for channel in page_channels:
-                if channel.get("auto_created") and channel.get("channel_group_id") in group_ids:
-                    channels_to_update.append({
-                        "id": channel.get("id"),
-                        "name": channel.get("name"),
-                        "channel_number": channel.get("channel_number"),
-                        "channel_group_id": channel.get("channel_group_id"),
-                    })
-
-            if not result.get("next"):
-                break
-            page += 1
-            if page > 50:  # Safety limit
-                break
+        all_channels = await fetch_pages(client.get_channels, page_size=500, page_limit=50)
+
+        for channel in all_channels:
+            if channel.get("auto_created") and channel.get("channel_group_id") in group_ids:
+                channels_to_update.append({
+                    "id": channel.get("id"),
+                    "name": channel.get("name"),
+                    "channel_number": channel.get("channel_number"),
+                    "channel_group_id": channel.get("channel_group_id"),
+                })
 
         if not channels_to_update:
             return {
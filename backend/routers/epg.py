@@ -18,6 +18,7 @@ from pydantic import BaseModel
 
 from alert_methods import send_alert
 from dispatcharr_client import get_client
+from dispatcharr_limiter import Priority, request_priority
 import journal
 
 logger = logging.getLogger(__name__)
@@ -281,9 +282,10 @@ async def refresh_epg_source(source_id: int):
         logger.debug("[EPG-REFRESH] Triggered refresh for source %s in %.1fms", source_id, elapsed_ms)
 
         # Spawn background task to poll for completion and send notification
-        asyncio.create_task(
-            _poll_epg_refresh_completion(source_id, source_name, initial_updated)
-        )
+        with request_priority(Priority.BACKGROUND):
+            asyncio.create_task(
+                _poll_epg_refresh_completion(source_id, source_name, initial_updated)
+            )
 
         logger.info("[EPG-REFRESH] Triggered refresh for '%s', polling for completion in background", source_name)
         return result
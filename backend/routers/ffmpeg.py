@@ -12,7 +12,7 @@ from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
 from database import get_session
-from ffmpeg_builder.probe import probe_source, detect_capabilities as ffmpeg_detect_capabilities
+from ffmpeg_builder.probe import probe_source_async, detect_capabilities as ffmpeg_detect_capabilities
 from ffmpeg_builder.validation import validate_config as ffmpeg_validate_config
 from ffmpeg_builder.command_generator import generate_command as ffmpeg_generate_command
 
@@ -46,7 +46,7 @@ async def get_ffmpeg_capabilities():
 async def probe_ffmpeg_source(request: FFMPEGProbeRequest):
     """Probe a media source using ffprobe."""
     logger.debug("[FFMPEG] POST /api/ffmpeg/probe - path=%s", request.path)
-    result = probe_source(request.path, timeout=request.timeout)
+    result = await probe_source_async(request.path, timeout=request.timeout)
     if not result.success:
         raise HTTPException(status_code=400, detail=result.error)
     return {
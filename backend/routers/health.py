@@ -9,13 +9,16 @@ from typing import Optional
 from fastapi import APIRouter
 
 from cache import get_cache
+from dispatcharr_catalog import invalidate_catalog
+from dispatcharr_client import get_pool_stats, get_response_cache_stats
+from media_processes import get_media_processes
 
 router = APIRouter(tags=["Health"])
 
 
 @router.get("/api/health")
 async def health_check():
-    """Health check endpoint returning version and connection status."""
+    """Health check endpoint returning version, connection status, Dispatcharr pool and media process usage."""
     version = os.environ.get("ECM_VERSION", "unknown")
     release_channel = os.environ.get("RELEASE_CHANNEL", "latest")
     git_commit = os.environ.get("GIT_COMMIT", "unknown")
@@ -26,6 +29,8 @@ async def health_check():
         "version": version,
         "release_channel": release_channel,
         "git_commit": git_commit,
+        "dispatcharr_pool": get_pool_stats(),
+        "media_processes": get_media_processes().stats(),
     }
 
 
@@ -38,6 +43,7 @@ async def invalidate_cache(prefix: Optional[str] = None):
         return {"message": f"Invalidated {count} cache entries with prefix '{prefix}'"}
     else:
         count = cache.clear()
+        invalidate_catalog()
         return {"message": f"Cleared entire cache ({count} entries)"}
 
 
@@ -45,4 +51,7 @@ async def invalidate_cache(prefix: Optional[str] = None):
 async def cache_stats():
     """Get cache statistics."""
     cache = get_cache()
-    return cache.stats()
+    return {
+        **cache.stats(),
+        "dispatcharr_conditional_gets": get_response_cache_stats(),
+    }
@@ -16,6 +16,7 @@ from cache import get_cache
 from config import CONFIG_DIR
 from database import get_session
 from dispatcharr_client import get_client
+from dispatcharr_limiter import Priority, request_priority
 from alert_methods import send_alert
 from tasks.m3u_digest import send_immediate_digest
 import journal
@@ -547,7 +548,7 @@ async def delete_m3u_account(account_id: int, delete_groups: bool = True):
 
         # Invalidate caches - streams from this M3U are now gone
         cache = get_cache()
-        streams_cleared = cache.invalidate_prefix("streams:")
+        streams_cleared = cache.invalidate_tag(f"m3u_account:{account_id}", "streams:all_accounts")
         groups_cleared = cache.invalidate("channel_groups")
         logger.info("[M3U] Invalidated cache after M3U deletion: %s stream entries, channel_groups=%s", streams_cleared, groups_cleared)
 
@@ -633,9 +634,10 @@ async def refresh_m3u_account(account_id: int):
         logger.debug("[M3U-REFRESH] Triggered refresh for account %s in %.1fms", account_id, elapsed_ms)
 
         # Spawn background task to poll for completion and send notification
-        asyncio.create_task(
-            _poll_m3u_refresh_completion(account_id, account_name, initial_updated)
-        )
+        with request_priority(Priority.BACKGROUND):
+            asyncio.create_task(
+                _poll_m3u_refresh_completion(account_id, account_name, initial_updated)
+            )
 
         logger.info("[M3U-REFRESH] Triggered refresh for '%s', polling for completion in background", account_name)
         return result
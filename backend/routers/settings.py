@@ -14,6 +14,7 @@ from config import get_settings, save_settings, clear_settings_cache, set_log_le
 from dispatcharr_client import get_client, reset_client
 from cache import get_cache
 from database import get_session
+from media_processes import configured_budget, get_media_processes
 from stream_prober import StreamProber, get_prober, set_prober
 from bandwidth_tracker import BandwidthTracker, get_tracker, set_tracker
 from services.notification_service import create_notification_internal, update_notification_internal, delete_notifications_by_source_internal
@@ -79,6 +80,21 @@ class SettingsRequest(BaseModel):
     probe_retry_count: int = 1  # Retries on transient ffprobe failure (0 = no retry, max 5)
     probe_retry_delay: int = 2  # Seconds between retries (1-30)
     stream_fetch_page_limit: int = 200  # Max pages when fetching streams (200 pages * 500 = 100K streams)
+    probe_cache_minutes: Optional[int] = None  # Reuse probe results of the same upstream URL for N minutes (None = keep current)
+    probe_preflight_enabled: Optional[bool] = None  # Ranged-GET liveness check before ffprobe (None = keep current)
+    probe_single_connection: Optional[bool] = None  # One download feeds ffprobe and the bitrate sample (None = keep current)
+    media_process_budget: Optional[int] = None  # Max concurrent ffprobe/ffmpeg processes (0 = auto) (None = keep current)
+    dispatcharr_page_concurrency: Optional[int] = None  # Concurrent page fetches for full list reads (None = keep current)
+    dispatcharr_max_connections: Optional[int] = None  # Max open connections to Dispatcharr (None = keep current)
+    dispatcharr_max_keepalive_connections: Optional[int] = None  # Idle connections kept for reuse (None = keep current)
+    dispatcharr_keepalive_expiry: Optional[float] = None  # Seconds an idle connection is kept (None = keep current)
+    dispatcharr_http2: Optional[bool] = None  # Multiplex requests over HTTP/2 (None = keep current)
+    dispatcharr_timeout: Optional[float] = None  # Default Dispatcharr request timeout in seconds (None = keep current)
+    dispatcharr_endpoint_timeouts: Optional[dict[str, float]] = None  # Timeout overrides keyed by API path prefix (None = keep current)
+    dispatcharr_max_concurrent_requests: Optional[int] = None  # Ceiling of the adaptive concurrency window (None = keep current)
+    dispatcharr_retry_attempts: Optional[int] = None  # Retries for idempotent Dispatcharr requests (None = keep current)
+    dispatcharr_circuit_failure_threshold: Optional[int] = None  # Consecutive failures before failing fast (0 = disabled) (None = keep current)
+    dispatcharr_circuit_reset_seconds: Optional[float] = None  # Seconds to fail fast before a trial request (None = keep current)
     stream_sort_priority: list[str] = ["resolution", "bitrate", "framerate", "m3u_priority", "audio_channels"]  # Priority order for Smart Sort
     stream_sort_enabled: dict[str, bool] = {"resolution": True, "bitrate": True, "framerate": True, "m3u_priority": False, "audio_channels": False}  # Which criteria are enabled
     m3u_account_priorities: dict[str, int] = {}  # M3U account priorities (account_id -> priority value)
@@ -150,6 +166,21 @@ class SettingsResponse(BaseModel):
     probe_retry_count: int  # Retries on transient ffprobe failure (0 = no retry, max 5)
     probe_retry_delay: int  # Seconds between retries (1-30)
     stream_fetch_page_limit: int  # Max pages when fetching streams (200 pages * 500 = 100K streams)
+    probe_cache_minutes: int  # Reuse probe results of the same upstream URL for N minutes (0 = off)
+    probe_preflight_enabled: bool  # Ranged-GET liveness check before ffprobe
+    probe_single_connection: bool  # One download feeds ffprobe and the bitrate sample
+    media_process_budget: int  # Max concurrent ffprobe/ffmpeg processes (0 = auto)
+    dispatcharr_page_concurrency: int  # Concurrent page fetches for full list reads
+    dispatcharr_max_connections: int  # Max open connections to Dispatcharr
+    dispatcharr_max_keepalive_connections: int  # Idle connections kept for reuse
+    dispatcharr_keepalive_expiry: float  # Seconds an idle connection is kept
+    dispatcharr_http2: bool  # Multiplex requests over HTTP/2
+    dispatcharr_timeout: float  # Default Dispatcharr request timeout in seconds
+    dispatcharr_endpoint_timeouts: dict[str, float]  # Timeout overrides keyed by API path prefix
+    dispatcharr_max_concurrent_requests: int  # Ceiling of the adaptive concurrency window
+    dispatcharr_retry_attempts: int  # Retries for idempotent Dispatcharr requests
+    dispatcharr_circuit_failure_threshold: int  # Consecutive failures before failing fast (0 = disabled)
+    dispatcharr_circuit_reset_seconds: float  # Seconds to fail fast before a trial request
     stream_sort_priority: list[str]  # Priority order for Smart Sort
     stream_sort_enabled: dict[str, bool]  # Which criteria are enabled
     m3u_account_priorities: dict[str, int]  # M3U account priorities (account_id -> priority value)
@@ -272,6 +303,21 @@ async def get_current_settings():
         probe_retry_count=settings.probe_retry_count,
         probe_retry_delay=settings.probe_retry_delay,
         stream_fetch_page_limit=settings.stream_fetch_page_limit,
+        probe_cache_minutes=settings.probe_cache_minutes,
+        probe_preflight_enabled=settings.probe_preflight_enabled,
+        probe_single_connection=settings.probe_single_connection,
+        media_process_budget=settings.media_process_budget,
+        dispatcharr_page_concurrency=settings.dispatcharr_page_concurrency,
+        dispatcharr_max_connections=settings.dispatcharr_max_connections,
+        dispatcharr_max_keepalive_connections=settings.dispatcharr_max_keepalive_connections,
+        dispatcharr_keepalive_expiry=settings.dispatcharr_keepalive_expiry,
+        dispatcharr_http2=settings.dispatcharr_http2,
+        dispatcharr_timeout=settings.dispatcharr_timeout,
+        dispatcharr_endpoint_timeouts=settings.dispatcharr_endpoint_timeouts,
+        dispatcharr_max_concurrent_requests=settings.dispatcharr_max_concurrent_requests,
+        dispatcharr_retry_attempts=settings.dispatcharr_retry_attempts,
+        dispatcharr_circuit_failure_threshold=settings.dispatcharr_circuit_failure_threshold,
+        dispatcharr_circuit_reset_seconds=settings.dispatcharr_circuit_reset_seconds,
         stream_sort_priority=settings.stream_sort_priority,
         stream_sort_enabled=settings.stream_sort_enabled,
         m3u_account_priorities=settings.m3u_account_priorities,
@@ -374,6 +420,66 @@ async def update_settings(request: SettingsRequest):
         probe_retry_count=request.probe_retry_count,
         probe_retry_delay=request.probe_retry_delay,
         stream_fetch_page_limit=request.stream_fetch_page_limit,
+        probe_cache_minutes=(
+            request.probe_cache_minutes
+            if request.probe_cache_minutes is not None else current_settings.probe_cache_minutes
+        ),
+        probe_preflight_enabled=(
+            request.probe_preflight_enabled
+            if request.probe_preflight_enabled is not None else current_settings.probe_preflight_enabled
+        ),
+        probe_single_connection=(
+            request.probe_single_connection
+            if request.probe_single_connection is not None else current_settings.probe_single_connection
+        ),
+        media_process_budget=(
+            request.media_process_budget
+            if request.media_process_budget is not None else current_settings.media_process_budget
+        ),
+        dispatcharr_page_concurrency=(
+            request.dispatcharr_page_concurrency
+            if request.dispatcharr_page_concurrency is not None else current_settings.dispatcharr_page_concurrency
+        ),
+        dispatcharr_max_connections=(
+            request.dispatcharr_max_connections
+            if request.dispatcharr_max_connections is not None else current_settings.dispatcharr_max_connections
+        ),
+        dispatcharr_max_keepalive_connections=(
+            request.dispatcharr_max_keepalive_connections
+            if request.dispatcharr_max_keepalive_connections is not None else current_settings.dispatcharr_max_keepalive_connections
+        ),
+        dispatcharr_keepalive_expiry=(
+            request.dispatcharr_keepalive_expiry
+            if request.dispatcharr_keepalive_expiry is not None else current_settings.dispatcharr_keepalive_expiry
+        ),
+        dispatcharr_http2=(
+            request.dispatcharr_http2
+            if request.dispatcharr_http2 is not None else current_settings.dispatcharr_http2
+        ),
+        dispatcharr_timeout=(
+            request.dispatcharr_timeout
+            if request.dispatcharr_timeout is not None else current_settings.dispatcharr_timeout
+        ),
+        dispatcharr_endpoint_timeouts=(
+            request.dispatcharr_endpoint_timeouts
+            if request.dispatcharr_endpoint_timeouts is not None else current_settings.dispatcharr_endpoint_timeouts
+        ),
+        dispatcharr_max_concurrent_requests=(
+            request.dispatcharr_max_concurrent_requests
+            if request.dispatcharr_max_concurrent_requests is not None else current_settings.dispatcharr_max_concurrent_requests
+        ),
+        dispatcharr_retry_attempts=(
+            request.dispatcharr_retry_attempts
+            if request.dispatcharr_retry_attempts is not None else current_settings.dispatcharr_retry_attempts
+        ),
+        dispatcharr_circuit_failure_threshold=(
+            request.dispatcharr_circuit_failure_threshold
+            if request.dispatcharr_circuit_failure_threshold is not None else current_settings.dispatcharr_circuit_failure_threshold
+        ),
+        dispatcharr_circuit_reset_seconds=(
+            request.dispatcharr_circuit_reset_seconds
+            if request.dispatcharr_circuit_reset_seconds is not None else current_settings.dispatcharr_circuit_reset_seconds
+        ),
         stream_sort_priority=request.stream_sort_priority,
         stream_sort_enabled=request.stream_sort_enabled,
         m3u_account_priorities=request.m3u_account_priorities,
@@ -422,7 +528,8 @@ async def update_settings(request: SettingsRequest):
         # Also clear all data tied to the old server
         from models import (
             M3UChangeLog, M3USnapshot, ChannelWatchStats, HiddenChannelGroup,
-            ChannelBandwidth, ChannelPopularityScore, UniqueClientConnection
+            ChannelBandwidth, ChannelPopularityScore, UniqueClientConnection, UniqueViewerRollup,
+            BandwidthSample
         )
         with get_session() as db:
             changes_deleted = db.query(M3UChangeLog).delete()
@@ -432,6 +539,10 @@ async def update_settings(request: SettingsRequest):
             bandwidth_deleted = db.query(ChannelBandwidth).delete()
             popularity_deleted = db.query(ChannelPopularityScore).delete()
             connections_deleted = db.query(UniqueClientConnection).delete()
+            # Viewer rollups come from the client connections, per-channel
+            # series from the same polls as the channel bandwidth rows
+            db.query(UniqueViewerRollup).delete()
+            db.query(BandwidthSample).filter(BandwidthSample.channel_id != "").delete()
             db.commit()
             logger.info(
                 "[SETTINGS] Dispatcharr URL changed - cleared all server-specific data: "
@@ -463,6 +574,11 @@ async def update_settings(request: SettingsRequest):
             )
             logger.info("[SETTINGS] Updated prober parallel probing settings from settings")
 
+    # Resize the media process budget without requiring restart
+    if (new_settings.media_process_budget != current_settings.media_process_budget or
+            new_settings.max_concurrent_probes != current_settings.max_concurrent_probes):
+        get_media_processes().set_budget(configured_budget(new_settings))
+
     # Update prober's sort settings without requiring restart
     if (new_settings.stream_sort_priority != current_settings.stream_sort_priority or
             new_settings.stream_sort_enabled != current_settings.stream_sort_enabled or
@@ -777,6 +893,9 @@ async def restart_services():
                 stream_sort_enabled=settings.stream_sort_enabled,
                 stream_fetch_page_limit=settings.stream_fetch_page_limit,
                 m3u_account_priorities=settings.m3u_account_priorities,
+                probe_cache_minutes=settings.probe_cache_minutes,
+                probe_preflight_enabled=settings.probe_preflight_enabled,
+                probe_single_connection=settings.probe_single_connection,
             )
             new_prober.set_notification_callbacks(
                 create_callback=create_notification_internal,
@@ -812,7 +931,9 @@ async def restart_services():
 async def reset_stats():
     """Reset all channel/stream statistics. Use when switching Dispatcharr servers."""
     logger.debug("[SETTINGS] POST /api/settings/reset-stats")
-    from models import HiddenChannelGroup, ChannelWatchStats, ChannelBandwidth, StreamStats, ChannelPopularityScore
+    from models import (
+        HiddenChannelGroup, ChannelWatchStats, ChannelBandwidth, StreamStats, ChannelPopularityScore, BandwidthSample
+    )
 
     try:
         with get_session() as db:
@@ -821,6 +942,8 @@ async def reset_stats():
             bandwidth = db.query(ChannelBandwidth).delete()
             streams = db.query(StreamStats).delete()
             popularity = db.query(ChannelPopularityScore).delete()
+            # Per-channel series come from the same polls as the channel bandwidth rows
+            db.query(BandwidthSample).filter(BandwidthSample.channel_id != "").delete()
             db.commit()
 
             total = hidden + watch + bandwidth + streams + popularity
@@ -3,15 +3,21 @@ Stats router — channel stats, enhanced stats, and popularity endpoints.
 
 Extracted from main.py (Phase 3 of v0.13.0 backend refactor).
 """
+import asyncio
 import logging
 import time
+from datetime import datetime, timedelta
 from typing import Optional
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
-from bandwidth_tracker import BandwidthTracker
+from bandwidth_timeseries import RAW_RESOLUTION, RESOLUTIONS, TOTAL_SERIES, query_series
+from bandwidth_tracker import BandwidthTracker, get_tracker
 from database import get_session
 from dispatcharr_client import get_client
+from live_stats import get_live_stats
+from stats_rollups import TOTAL_CHANNEL, unique_count, viewer_rollups
 
 logger = logging.getLogger(__name__)
 
@@ -136,6 +142,61 @@ async def get_bandwidth_stats():
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/bandwidth/series")
+async def get_bandwidth_series(hours: float = 24, resolution: Optional[str] = None, channel_id: Optional[str] = None):
+    """Get bandwidth over time for all channels or one channel.
+
+    Args:
+        hours: How far back to look from now
+        resolution: "raw" (per poll, last hour), "1m", "1h", "1d", or omitted to pick the finest that fits
+        channel_id: Channel UUID; omitted for the all-channels total
+    """
+    logger.debug("[STATS] GET /api/stats/bandwidth/series - hours=%s resolution=%s channel_id=%s", hours, resolution, channel_id)
+    if hours <= 0:
+        raise HTTPException(status_code=400, detail="hours must be positive")
+    if resolution is not None and resolution != RAW_RESOLUTION and resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown resolution: {resolution}")
+
+    end = datetime.utcnow()
+    start = end - timedelta(hours=hours)
+    series = channel_id or TOTAL_SERIES
+    try:
+        if resolution == RAW_RESOLUTION:
+            tracker = get_tracker()
+            samples = tracker.samples.query(start, end, series) if tracker else []
+            return {
+                "resolution": RAW_RESOLUTION,
+                "channel_id": channel_id,
+                "points": [sample.to_dict() for sample in samples],
+            }
+        result = await asyncio.to_thread(
+            query_series, start, end, RESOLUTIONS.get(resolution), series,
+        )
+        result["resolution"] = next(label for label, seconds in RESOLUTIONS.items() if seconds == result["resolution"])
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        logger.exception("[STATS] Failed to get bandwidth series")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/live")
+async def stream_live_stats():
+    """Stream live stats as Server-Sent Events.
+
+    Events: "channels" (each bandwidth poll), "bandwidth" (summary after each
+    flush), "probe" (probe progress) and "tasks" (changed task progress).
+    All subscribers share the tracker's Dispatcharr poll.
+    """
+    logger.debug("[STATS] GET /api/stats/live")
+    return StreamingResponse(
+        get_live_stats().stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/top-watched")
 async def get_top_watched_channels(limit: int = 10, sort_by: str = "views"):
     """Get the top watched channels by watch count or watch time."""
@@ -223,9 +284,6 @@ async def get_watch_history(
                 cutoff_date = date.today() - timedelta(days=days)
                 query = query.filter(UniqueClientConnection.date >= cutoff_date)
 
-            # Get total count
-            total = query.count()
-
             # Limit page_size
             page_size = min(page_size, 100)
 
@@ -235,20 +293,33 @@ async def get_watch_history(
                 desc(UniqueClientConnection.connected_at)
             ).offset(offset).limit(page_size).all()
 
-            # Get summary stats
-            summary_query = session.query(
-                func.count(func.distinct(UniqueClientConnection.channel_id)).label("unique_channels"),
-                func.count(func.distinct(UniqueClientConnection.ip_address)).label("unique_ips"),
-                func.sum(UniqueClientConnection.watch_seconds).label("total_watch_seconds"),
-            )
-            if channel_id:
-                summary_query = summary_query.filter(UniqueClientConnection.channel_id == channel_id)
             if ip_address:
-                summary_query = summary_query.filter(UniqueClientConnection.ip_address == ip_address)
-            if days:
-                summary_query = summary_query.filter(UniqueClientConnection.date >= cutoff_date)
-
-            summary = summary_query.first()
+                # Filtered by IP: the rollups are per channel, so count the (IP-indexed) rows
+                total = query.count()
+                summary_query = session.query(
+                    func.count(func.distinct(UniqueClientConnection.channel_id)).label("unique_channels"),
+                    func.count(func.distinct(UniqueClientConnection.ip_address)).label("unique_ips"),
+                    func.sum(UniqueClientConnection.watch_seconds).label("total_watch_seconds"),
+                ).filter(UniqueClientConnection.ip_address == ip_address)
+                if channel_id:
+                    summary_query = summary_query.filter(UniqueClientConnection.channel_id == channel_id)
+                if days:
+                    summary_query = summary_query.filter(UniqueClientConnection.date >= cutoff_date)
+                summary = summary_query.first()
+                unique_channels = summary.unique_channels or 0
+                unique_ips = summary.unique_ips or 0
+                total_watch_seconds = summary.total_watch_seconds or 0
+            else:
+                # Count and summary from the daily viewer rollups
+                cutoff = cutoff_date if days else None
+                totals = viewer_rollups(session, cutoff, channel_id or TOTAL_CHANNEL)
+                if channel_id:
+                    unique_channels = 1 if totals else 0
+                else:
+                    unique_channels = len({row.channel_id for row in viewer_rollups(session, cutoff, None)})
+                total = sum(row.connection_count for row in totals)
+                unique_ips = unique_count(totals)
+                total_watch_seconds = sum(row.watch_seconds for row in totals)
 
             return {
                 "total": total,
@@ -256,9 +327,9 @@ async def get_watch_history(
                 "page_size": page_size,
                 "total_pages": (total + page_size - 1) // page_size if total > 0 else 1,
                 "summary": {
-                    "unique_channels": summary.unique_channels or 0,
-                    "unique_ips": summary.unique_ips or 0,
-                    "total_watch_seconds": summary.total_watch_seconds or 0,
+                    "unique_channels": unique_channels,
+                    "unique_ips": unique_ips,
+                    "total_watch_seconds": total_watch_seconds,
                 },
                 "history": [
                     {
@@ -14,11 +14,18 @@ from fastapi.responses import StreamingResponse
 
 from config import get_settings
 from dispatcharr_client import get_client
+from media_processes import Workload, get_media_processes
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Stream Preview"])
 
+# Seconds a preview waits for a slot in the media process budget before giving up
+PREVIEW_SLOT_TIMEOUT = 10.0
+# Seconds a started preview waits for its client to read before FFmpeg is stopped
+PREVIEW_START_TIMEOUT = 30.0
+PREVIEW_EXIT_POLL_INTERVAL = 1.0  # Seconds between checks whether FFmpeg has exited
+
 
 async def stream_generator(process: subprocess.Popen, chunk_size: int = 65536):
     """Generator that yields chunks from FFmpeg process stdout."""
@@ -31,11 +38,75 @@ async def stream_generator(process: subprocess.Popen, chunk_size: int = 65536):
                 break
             yield chunk
     finally:
-        process.terminate()
+        stop_process(process)
+
+
+def stop_process(process: subprocess.Popen) -> None:
+    """Terminate FFmpeg, killing it if it does not exit within 5 seconds."""
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+class PreviewProcess:
+    """
+    Preview FFmpeg process holding a PREVIEW slot of the media process budget.
+
+    A watcher task returns the slot once the process has exited, however the
+    response ends. A client that disconnects before the first chunk never
+    runs stream_generator, so the watcher stops FFmpeg itself when nothing
+    has been read after PREVIEW_START_TIMEOUT.
+    """
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self._reading = asyncio.Event()
+        self._released = False
+        self._watcher = asyncio.create_task(self._watch())
+
+    async def chunks(self, chunk_size: int = 65536):
+        """Response body: FFmpeg stdout until it ends or the client disconnects."""
+        self._reading.set()
+        async for chunk in stream_generator(self.process, chunk_size):
+            yield chunk
+
+    def release(self) -> None:
+        """Return the slot (only the first call has an effect)."""
+        if not self._released:
+            self._released = True
+            get_media_processes().release(Workload.PREVIEW)
+
+    async def _watch(self):
         try:
-            process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            process.kill()
+            try:
+                await asyncio.wait_for(self._reading.wait(), PREVIEW_START_TIMEOUT)
+            except asyncio.TimeoutError:
+                if self.process.poll() is None:
+                    logger.warning("[PREVIEW] Preview (pid %s) was never read, stopping FFmpeg", self.process.pid)
+                    await asyncio.get_running_loop().run_in_executor(None, stop_process, self.process)
+            while self.process.poll() is None:
+                await asyncio.sleep(PREVIEW_EXIT_POLL_INTERVAL)
+        finally:
+            self.release()
+
+
+async def start_preview_process(ffmpeg_cmd: list[str]) -> PreviewProcess:
+    """Start a preview FFmpeg process in a PREVIEW slot of the media process budget."""
+    try:
+        process = await get_media_processes().popen(
+            ffmpeg_cmd,
+            Workload.PREVIEW,
+            timeout=PREVIEW_SLOT_TIMEOUT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=65536,
+        )
+    except asyncio.TimeoutError:
+        logger.warning("[PREVIEW] No media process slot free after %ss: %s", PREVIEW_SLOT_TIMEOUT, get_media_processes().stats())
+        raise HTTPException(status_code=503, detail="Too many media processes running, try again shortly")
+    return PreviewProcess(process)
 
 
 @router.get("/api/stream-preview/{stream_id}")
@@ -115,15 +186,10 @@ async def stream_preview(stream_id: int):
         ]
 
         try:
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                bufsize=65536
-            )
+            preview = await start_preview_process(ffmpeg_cmd)
 
             return StreamingResponse(
-                stream_generator(process),
+                preview.chunks(),
                 media_type="video/mp2t",
                 headers={
                     "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -131,6 +197,8 @@ async def stream_preview(stream_id: int):
                     "Expires": "0",
                 }
             )
+        except HTTPException:
+            raise
         except FileNotFoundError:
             raise HTTPException(
                 status_code=500,
@@ -158,15 +226,10 @@ async def stream_preview(stream_id: int):
         ]
 
         try:
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                bufsize=65536
-            )
+            preview = await start_preview_process(ffmpeg_cmd)
 
             return StreamingResponse(
-                stream_generator(process),
+                preview.chunks(),
                 media_type="video/mp2t",
                 headers={
                     "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -174,6 +237,8 @@ async def stream_preview(stream_id: int):
                     "Expires": "0",
                 }
             )
+        except HTTPException:
+            raise
         except FileNotFoundError:
             raise HTTPException(
                 status_code=500,
@@ -284,15 +349,10 @@ async def channel_preview(channel_id: int):
         ]
 
         try:
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                bufsize=65536
-            )
+            preview = await start_preview_process(ffmpeg_cmd)
 
             return StreamingResponse(
-                stream_generator(process),
+                preview.chunks(),
                 media_type="video/mp2t",
                 headers={
                     "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -300,6 +360,8 @@ async def channel_preview(channel_id: int):
                     "Expires": "0",
                 }
             )
+        except HTTPException:
+            raise
         except FileNotFoundError:
             raise HTTPException(
                 status_code=500,
@@ -329,15 +391,10 @@ async def channel_preview(channel_id: int):
         ]
 
         try:
-            process = subprocess.Popen(
-                ffmpeg_cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                bufsize=65536
-            )
+            preview = await start_preview_process(ffmpeg_cmd)
 
             return StreamingResponse(
-                stream_generator(process),
+                preview.chunks(),
                 media_type="video/mp2t",
                 headers={
                     "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -345,6 +402,8 @@ async def channel_preview(channel_id: int):
                     "Expires": "0",
                 }
             )
+        except HTTPException:
+            raise
         except FileNotFoundError:
             raise HTTPException(
                 status_code=500,
@@ -14,7 +14,8 @@ from pydantic import BaseModel
 
 from config import get_settings
 from database import get_session
-from dispatcharr_client import get_client
+from dispatcharr_client import get_client, fetch_pages
+from dispatcharr_limiter import Priority, request_priority
 from stream_prober import StreamProber, get_prober
 
 logger = logging.getLogger(__name__)
@@ -57,6 +58,7 @@ class ProbeAllRequest(BaseModel):
     channel_groups: list[str] = []  # Empty list means all groups
     skip_m3u_refresh: bool = False  # Skip M3U refresh for on-demand probes
     stream_ids: list[int] = []  # Optional list of specific stream IDs to probe (empty = all)
+    delta: bool = False  # Only probe new, changed, failing or stale streams
 
 
 class DismissStatsRequest(BaseModel):
@@ -125,15 +127,7 @@ async def get_struck_out_streams():
         # Find which channels contain these streams (paginated)
         client = get_client()
         start = time.time()
-        all_channels = []
-        page = 1
-        while True:
-            result = await client.get_channels(page=page, page_size=100)
-            page_channels = result.get("results", [])
-            all_channels.extend(page_channels)
-            if len(all_channels) >= result.get("count", 0) or not page_channels:
-                break
-            page += 1
+        all_channels = await fetch_pages(client.get_channels, page_size=500)
         elapsed_ms = (time.time() - start) * 1000
         logger.debug("[STREAM-STATS] Fetched %s channels for struck-out lookup in %.1fms", len(all_channels), elapsed_ms)
 
@@ -173,15 +167,7 @@ async def remove_struck_out_streams(request: RemoveStruckOutRequest):
 
     try:
         start = time.time()
-        all_channels = []
-        page = 1
-        while True:
-            result = await client.get_channels(page=page, page_size=100)
-            page_channels = result.get("results", [])
-            all_channels.extend(page_channels)
-            if len(all_channels) >= result.get("count", 0) or not page_channels:
-                break
-            page += 1
+        all_channels = await fetch_pages(client.get_channels, page_size=500)
 
         for ch in all_channels:
             ch_streams = ch.get("streams", [])
@@ -224,7 +210,7 @@ async def compute_sort(request: ComputeSortRequest):
     Stream IDs come from the frontend (may have staged edits).
     """
     logger.debug("[STREAM-STATS-SORT] POST /api/stream-stats/compute-sort - mode=%s, %d channels", request.mode, len(request.channels))
-    from stream_prober import smart_sort_streams, extract_m3u_account_id
+    from stream_prober import sort_channel_streams, extract_m3u_account_id
 
     settings = get_settings()
 
@@ -276,19 +262,18 @@ async def compute_sort(request: ComputeSortRequest):
         except Exception as e:
             logger.warning("[STREAM-STATS-SORT] Failed to fetch M3U data: %s", e)
 
-    # Sort each channel
+    # Sort every channel in one pass
+    sorted_orders = sort_channel_streams(
+        channels=[ch.stream_ids for ch in request.channels],
+        stats_map=stats_map,
+        stream_m3u_map=stream_m3u_map,
+        stream_sort_priority=sort_priority,
+        stream_sort_enabled=sort_enabled,
+        m3u_account_priorities=settings.m3u_account_priorities,
+        deprioritize_failed_streams=settings.deprioritize_failed_streams,
+    )
     results = []
-    for ch in request.channels:
-        sorted_ids = smart_sort_streams(
-            stream_ids=ch.stream_ids,
-            stats_map=stats_map,
-            stream_m3u_map=stream_m3u_map,
-            stream_sort_priority=sort_priority,
-            stream_sort_enabled=sort_enabled,
-            m3u_account_priorities=settings.m3u_account_priorities,
-            deprioritize_failed_streams=settings.deprioritize_failed_streams,
-            channel_name=f"channel-{ch.channel_id}",
-        )
+    for ch, sorted_ids in zip(request.channels, sorted_orders):
         changed = sorted_ids != ch.stream_ids
         results.append(ChannelSortResult(
             channel_id=ch.channel_id,
@@ -424,7 +409,8 @@ async def probe_all_streams_endpoint(request: ProbeAllRequest = ProbeAllRequest(
             await prober.probe_all_streams(
                 channel_groups_override=request.channel_groups or None,
                 skip_m3u_refresh=request.skip_m3u_refresh,
-                stream_ids_filter=request.stream_ids or None
+                stream_ids_filter=request.stream_ids or None,
+                delta=request.delta,
             )
             logger.info("[STREAM-STATS-PROBE] Background probe task completed successfully")
         except Exception as e:
@@ -433,7 +419,8 @@ async def probe_all_streams_endpoint(request: ProbeAllRequest = ProbeAllRequest(
     # Start background task with optional group filter
     stream_ids_msg = ", stream_ids: %s" % len(request.stream_ids) if request.stream_ids else ""
     logger.info("[STREAM-STATS-PROBE] Starting background probe task (groups: %s, skip_m3u_refresh: %s%s)", request.channel_groups or 'all', request.skip_m3u_refresh, stream_ids_msg)
-    asyncio.create_task(run_probe_with_logging())
+    with request_priority(Priority.BACKGROUND):
+        asyncio.create_task(run_probe_with_logging())
     logger.debug("[STREAM-STATS-PROBE] Background task created, returning response")
     return {"status": "started", "message": "Background probe started"}
 
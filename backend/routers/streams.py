@@ -3,21 +3,86 @@ Streams & providers router — stream listing and provider endpoints.
 
 Extracted from main.py (Phase 2 of v0.13.0 backend refactor).
 """
+import functools
 import logging
 import time
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from cache import get_cache
+from dispatcharr_catalog import get_catalog
 from dispatcharr_client import get_client
+from dispatcharr_limiter import Priority, request_priority
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Streams"])
 
 
+# Cached stream data is served fresh for the soft TTL, then stale (while a
+# background refresh runs) until the hard TTL
+STREAMS_CACHE_SOFT_TTL = 300
+STREAMS_CACHE_HARD_TTL = 3600
+PROVIDERS_CACHE_SOFT_TTL = 30
+PROVIDERS_CACHE_HARD_TTL = 600
+
+
+def _stream_cache_tags(m3u_account: Optional[int]) -> list[str]:
+    """Cache tags for stream data, scoped to one M3U account or to all of them."""
+    return ["streams", f"m3u_account:{m3u_account}" if m3u_account else "streams:all_accounts"]
+
+
+def _in_background(fetch: Callable[[], Awaitable]) -> Callable[[], Awaitable]:
+    """Wrap a loader so cache revalidation runs at background priority."""
+    async def refresh():
+        with request_priority(Priority.BACKGROUND):
+            return await fetch()
+    return refresh
+
+
+async def _fetch_streams(
+    page: int,
+    page_size: int,
+    search: Optional[str],
+    channel_group_name: Optional[str],
+    m3u_account: Optional[int],
+) -> dict:
+    """Fetch a page of streams and add channel_group_name to each stream."""
+    client = get_client()
+    cache = get_cache()
+    result = await client.get_streams(
+        page=page,
+        page_size=page_size,
+        search=search,
+        channel_group_name=channel_group_name,
+        m3u_account=m3u_account,
+    )
+
+    # Get channel groups for name lookup (also cached)
+    groups_cache_key = "channel_groups"
+    groups = cache.get(groups_cache_key)
+    if groups is None:
+        groups = await client.get_channel_groups()
+        cache.set(groups_cache_key, groups, tags=["channel_groups"])
+    group_map = {g["id"]: g["name"] for g in groups}
+
+    # Add channel_group_name to each stream
+    for stream in result.get("results", []):
+        group_id = stream.get("channel_group")
+        stream["channel_group_name"] = group_map.get(group_id) if group_id else None
+    return result
+
+
+async def _fetch_stream_groups(m3u_account_id: Optional[int]) -> list:
+    """Fetch stream groups with counts."""
+    client = get_client()
+    # Count from the catalogue's in-memory streams when it already holds fresh ones
+    streams = get_catalog(client).cached_streams(m3u_account_id)
+    return await client.get_stream_groups_with_counts(m3u_account_id=m3u_account_id, streams=streams)
+
+
 @router.get("/api/streams")
 async def get_streams(
     page: int = 1,
@@ -38,10 +103,18 @@ async def get_streams(
 
     cache = get_cache()
     cache_key = f"streams:p{page}:ps{page_size}:s{search or ''}:g{channel_group_name or ''}:m{m3u_account or ''}"
+    fetch = functools.partial(
+        _fetch_streams,
+        page=page,
+        page_size=page_size,
+        search=search,
+        channel_group_name=channel_group_name,
+        m3u_account=m3u_account,
+    )
 
-    # Try cache first (unless bypassed)
+    # Try cache first (unless bypassed); stale pages are served while they refresh
     if not bypass_cache:
-        cached = cache.get(cache_key)
+        cached = cache.get(cache_key, revalidate=_in_background(fetch))
         if cached is not None:
             cache_time = (time.time() - start_time) * 1000
             result_count = len(cached.get("results", []))
@@ -53,33 +126,18 @@ async def get_streams(
             )
             return cached
 
-    client = get_client()
     try:
         fetch_start = time.time()
-        result = await client.get_streams(
-            page=page,
-            page_size=page_size,
-            search=search,
-            channel_group_name=channel_group_name,
-            m3u_account=m3u_account,
-        )
+        result = await fetch()
         fetch_time = (time.time() - fetch_start) * 1000
 
-        # Get channel groups for name lookup (also cached)
-        groups_cache_key = "channel_groups"
-        groups = cache.get(groups_cache_key)
-        if groups is None:
-            groups = await client.get_channel_groups()
-            cache.set(groups_cache_key, groups)
-        group_map = {g["id"]: g["name"] for g in groups}
-
-        # Add channel_group_name to each stream
-        for stream in result.get("results", []):
-            group_id = stream.get("channel_group")
-            stream["channel_group_name"] = group_map.get(group_id) if group_id else None
-
-        # Cache the result
-        cache.set(cache_key, result)
+        # Cache the result, tagged so an M3U account's pages can be dropped together
+        cache.set(
+            cache_key, result,
+            ttl=STREAMS_CACHE_HARD_TTL,
+            soft_ttl=STREAMS_CACHE_SOFT_TTL,
+            tags=_stream_cache_tags(m3u_account),
+        )
 
         total_time = (time.time() - start_time) * 1000
         result_count = len(result.get("results", []))
@@ -111,19 +169,25 @@ async def get_stream_groups(bypass_cache: bool = False, m3u_account_id: Optional
     # Include provider filter in cache key for proper cache isolation
     cache_key = f"stream_groups_with_counts:{m3u_account_id}" if m3u_account_id else "stream_groups_with_counts"
 
-    # Try cache first (unless bypassed)
+    fetch = functools.partial(_fetch_stream_groups, m3u_account_id)
+
+    # Try cache first (unless bypassed); stale counts are served while they refresh
     if not bypass_cache:
-        cached = cache.get(cache_key)
+        cached = cache.get(cache_key, revalidate=_in_background(fetch))
         if cached is not None:
             return cached
 
-    client = get_client()
     try:
         start = time.time()
-        result = await client.get_stream_groups_with_counts(m3u_account_id=m3u_account_id)
+        result = await fetch()
         elapsed_ms = (time.time() - start) * 1000
         logger.debug("[STREAMS] Fetched stream groups in %.1fms", elapsed_ms)
-        cache.set(cache_key, result)
+        cache.set(
+            cache_key, result,
+            ttl=STREAMS_CACHE_HARD_TTL,
+            soft_ttl=STREAMS_CACHE_SOFT_TTL,
+            tags=[*_stream_cache_tags(m3u_account_id), "channel_groups"],
+        )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -153,12 +217,22 @@ async def get_streams_by_ids(request: BulkStreamIdsRequest):
 async def get_providers():
     """List M3U accounts (legacy endpoint)."""
     logger.debug("[STREAMS] GET /api/providers")
+    cache = get_cache()
     client = get_client()
+    cached = cache.get("providers", revalidate=_in_background(client.get_m3u_accounts))
+    if cached is not None:
+        return cached
     try:
         start = time.time()
         result = await client.get_m3u_accounts()
         elapsed_ms = (time.time() - start) * 1000
         logger.debug("[STREAMS] Fetched M3U accounts in %.1fms", elapsed_ms)
+        cache.set(
+            "providers", result,
+            ttl=PROVIDERS_CACHE_HARD_TTL,
+            soft_ttl=PROVIDERS_CACHE_SOFT_TTL,
+            tags=["m3u_accounts"],
+        )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -128,6 +128,22 @@ TASK_PARAMETER_SCHEMAS = {
                 "min": 1,
                 "max": 20,
             },
+            {
+                "name": "delta",
+                "type": "boolean",
+                "label": "Delta probe",
+                "description": "Only probe streams that are new, changed, failing, re-added in the M3U, or due for a re-check",
+                "default": False,
+            },
+            {
+                "name": "delta_ttl_hours",
+                "type": "number",
+                "label": "Re-check interval (hours)",
+                "description": "Delta probe: re-probe working streams after this long (popular channels up to 4x sooner)",
+                "default": 72,
+                "min": 1,
+                "max": 720,
+            },
         ],
     },
     "m3u_refresh": {
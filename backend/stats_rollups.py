@@ -0,0 +1,190 @@
+"""
+Incrementally maintained rollups behind the stats endpoints.
+
+The Stats tab polls summaries that used to be full SUM and
+COUNT(DISTINCT ip_address) scans over bandwidth_daily and
+unique_client_connections. Two tables are now kept up to date in the same
+transaction that writes the raw data (bandwidth_writer):
+
+- bandwidth_rollups: byte totals per calendar month, per year and for all
+  time, so month/year/all-time summaries read one row each.
+- unique_viewer_rollups: one row per day for each channel and for all
+  channels. Each row holds a HyperLogLog sketch of client IPs plus
+  connection and watch totals. Unique viewers over N days is a merge of
+  N sketches, so reads cost O(days) instead of a scan over every
+  connection.
+
+The read helpers below return plain dicts/lists so BandwidthTracker and
+the stats router can shape their responses without touching the raw
+tables.
+"""
+import logging
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy.dialects.sqlite import insert
+
+from hyperloglog import HyperLogLog
+from models import BandwidthRollup, UniqueViewerRollup
+
+logger = logging.getLogger(__name__)
+
+ALL_TIME_START = date(1970, 1, 1)
+TOTAL_CHANNEL = ""  # channel_id of the all-channels viewer rollup
+_BYTE_COLUMNS = ("bytes_transferred", "bytes_in", "bytes_out")
+
+
+def period_starts(day: date) -> dict[str, date]:
+    """Start of each rollup period containing ``day``."""
+    return {
+        "month": day.replace(day=1),
+        "year": day.replace(month=1, day=1),
+        "all": ALL_TIME_START,
+    }
+
+
+def upsert_bandwidth_rollups(session, daily_rows: Iterable[dict]) -> None:
+    """Add bandwidth_daily deltas (dicts with date and byte columns) to the period totals."""
+    totals: dict[tuple[str, date], dict] = {}
+    for row in daily_rows:
+        for period, start in period_starts(row["date"]).items():
+            total = totals.setdefault((period, start), {
+                "period": period, "period_start": start, **{c: 0 for c in _BYTE_COLUMNS},
+            })
+            for column in _BYTE_COLUMNS:
+                total[column] += row.get(column, 0)
+    if not totals:
+        return
+    table = BandwidthRollup.__table__
+    stmt = insert(table).values(list(totals.values()))
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=["period", "period_start"],
+        set_={column: table.c[column] + stmt.excluded[column] for column in _BYTE_COLUMNS},
+    ))
+
+
+class ViewerDeltas:
+    """Changes to unique_viewer_rollups from one write."""
+
+    def __init__(self):
+        self.rows: dict[tuple[date, str], dict] = {}
+        self.ips: dict[tuple[date, str], set[str]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.rows)
+
+    def add(
+        self,
+        day: date,
+        channel_id: str,
+        channel_name: str,
+        ip_address: Optional[str] = None,
+        watch_seconds: int = 0,
+        became_watched: bool = False,
+    ) -> None:
+        """
+        Record a connection change for a channel and the all-channels row.
+
+        Args:
+            ip_address: Set for a new connection (counted and added to the sketch)
+            watch_seconds: Watch seconds added since the last write
+            became_watched: The connection's watch time went from 0 to > 0
+        """
+        for key, name in (((day, channel_id), channel_name), ((day, TOTAL_CHANNEL), "")):
+            row = self.rows.setdefault(key, {
+                "date": day, "channel_id": key[1], "connection_count": 0,
+                "watched_connections": 0, "watch_seconds": 0,
+            })
+            row["channel_name"] = name
+            row["watch_seconds"] += watch_seconds
+            row["watched_connections"] += int(became_watched)
+            if ip_address is not None:
+                row["connection_count"] += 1
+                self.ips.setdefault(key, set()).add(ip_address)
+
+
+def apply_viewer_deltas(session, deltas: ViewerDeltas) -> None:
+    """Merge new IPs into the stored sketches and add the connection/watch totals."""
+    if not deltas:
+        return
+    days = {day for day, _ in deltas.rows}
+    channel_ids = {channel_id for _, channel_id in deltas.rows}
+    stored = {
+        (row.date, row.channel_id): row.ip_sketch
+        for row in session.query(
+            UniqueViewerRollup.date, UniqueViewerRollup.channel_id, UniqueViewerRollup.ip_sketch,
+        ).filter(UniqueViewerRollup.date.in_(days), UniqueViewerRollup.channel_id.in_(channel_ids))
+    }
+
+    values = []
+    for key, row in deltas.rows.items():
+        sketch = HyperLogLog.from_bytes(stored.get(key))
+        for ip in deltas.ips.get(key, ()):
+            sketch.add(ip)
+        values.append({**row, "ip_sketch": sketch.to_bytes()})
+
+    table = UniqueViewerRollup.__table__
+    stmt = insert(table).values(values)
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=["date", "channel_id"],
+        set_={
+            "ip_sketch": stmt.excluded.ip_sketch,
+            "channel_name": stmt.excluded.channel_name,
+            **{
+                column: table.c[column] + stmt.excluded[column]
+                for column in ("connection_count", "watched_connections", "watch_seconds")
+            },
+        },
+    ))
+
+
+def bandwidth_period_totals(session, today: date) -> dict[str, dict]:
+    """Byte totals of the month, year and all time containing ``today``."""
+    starts = period_starts(today)
+    rows = {
+        row.period: row
+        for row in session.query(BandwidthRollup).filter(
+            BandwidthRollup.period_start.in_(set(starts.values())),
+            BandwidthRollup.period.in_(starts.keys()),
+        )
+        if row.period_start == starts[row.period]
+    }
+    return {
+        period: {column: getattr(rows[period], column) if period in rows else 0 for column in _BYTE_COLUMNS}
+        for period in starts
+    }
+
+
+def viewer_rollups(session, cutoff: Optional[date], channel_id: Optional[str] = TOTAL_CHANNEL) -> list:
+    """
+    Viewer rollup rows since ``cutoff`` (all days if None), oldest first.
+
+    Args:
+        channel_id: A channel UUID, TOTAL_CHANNEL for the all-channels rows,
+            or None for every per-channel row
+    """
+    query = session.query(UniqueViewerRollup)
+    if channel_id is None:
+        query = query.filter(UniqueViewerRollup.channel_id != TOTAL_CHANNEL)
+    else:
+        query = query.filter(UniqueViewerRollup.channel_id == channel_id)
+    if cutoff is not None:
+        query = query.filter(UniqueViewerRollup.date >= cutoff)
+    return query.order_by(UniqueViewerRollup.date.asc()).all()
+
+
+def unique_count(rows: Iterable) -> int:
+    """Distinct IPs across viewer rollup rows."""
+    return HyperLogLog.union(HyperLogLog.from_bytes(row.ip_sketch) for row in rows).count()
+
+
+def build_viewer_deltas(connections: Iterable) -> ViewerDeltas:
+    """Viewer rollups for existing connection rows (date, channel_id, channel_name, ip_address, watch_seconds)."""
+    deltas = ViewerDeltas()
+    for conn in connections:
+        watch_seconds = conn.watch_seconds or 0
+        deltas.add(
+            conn.date, conn.channel_id, conn.channel_name, conn.ip_address,
+            watch_seconds=watch_seconds, became_watched=watch_seconds > 0,
+        )
+    return deltas
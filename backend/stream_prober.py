@@ -13,11 +13,19 @@ from typing import Optional
 from pathlib import Path
 import os
 import re
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import httpx
 
 from database import get_session
+from dispatcharr_catalog import get_catalog
+from media_processes import Workload, get_media_processes
 from models import StreamStats
+from probe_result_writer import ProbeResultWriter
+from probe_selection import DEFAULT_DELTA_TTL_HOURS, ProbeRecord, select_delta_streams, url_fingerprint
+from probe_scheduler import Admission, ProbeScheduler
+from stream_sort import DEFAULT_SORT_ENABLED, DEFAULT_SORT_PRIORITY, materialize_sort_columns, rank_channels
 
 logger = logging.getLogger(__name__)
 
@@ -26,17 +34,62 @@ DEFAULT_PROBE_TIMEOUT = 30  # seconds
 DEFAULT_PROBE_BATCH_SIZE = 10  # streams per cycle
 BITRATE_SAMPLE_DURATION = 8  # seconds to sample stream for bitrate measurement
 
-# Per-account ramp-up configuration
-RAMP_INITIAL_LIMIT = 1         # Start each account at 1 concurrent probe
+# Per-account ramp-up configuration (AIMD, learned across runs)
+RAMP_INITIAL_LIMIT = 1         # Start accounts with no history at 1 concurrent probe
 RAMP_INCREMENT = 1             # Increase allowed concurrency by 1 after each successful window
 RAMP_SUCCESS_WINDOW = 3        # Consecutive successes at current level before ramping up
-RAMP_FAILURE_HOLD_SECONDS = 10 # Seconds to hold an account after a probe failure
-RAMP_FAILURE_REDUCTION = 1     # Reduce current_limit by this on failure (min 1)
+RAMP_FAILURE_HOLD_SECONDS = 10 # Seconds to hold an account after an overload failure
+RAMP_DECREASE_FACTOR = 0.5     # Multiply current_limit by this on overload or rising latency (min 1)
+RAMP_DECREASE_COOLDOWN = 5.0   # Minimum seconds between two decreases of one account
+RAMP_LATENCY_TOLERANCE = 2.0   # Short-term/long-term ffprobe time ratio treated as overload
+RAMP_LATENCY_MIN_SAMPLES = 10  # Latency samples before latency can trigger a decrease
+RAMP_MAX_LIMIT = 16            # Upper bound of a learned limit
 RAMP_UNLIMITED_CAP = 4         # For accounts with max_streams=0 (unlimited), cap ramp here
 
+# Auto-reorder after probe
+REORDER_STATS_CHUNK = 500          # stream IDs per stats query (SQLite variable limit)
+REORDER_UPDATE_CONCURRENCY = 8     # channel updates in flight (Dispatcharr limiter still applies)
+
+# Seconds an HDHomeRun account waits after a probe so the tuner can release
+HDHOMERUN_RELEASE_DELAY = 0.5
+
+# Probe-result reuse across streams that point at the same upstream feed
+DEFAULT_PROBE_CACHE_MINUTES = 60
+PROBE_CACHE_MAX_ENTRIES = 20000
+
+# Pooled HTTP client shared by pre-flight checks, bitrate sampling and single-connection probes
+STREAM_CLIENT_MAX_CONNECTIONS = 32
+STREAM_USER_AGENT = "VLC/3.0.20 LibVLC/3.0.20"  # Mimic VLC to avoid server rejections
+
+# Optional HTTP pre-flight check run before ffprobe
+PREFLIGHT_TIMEOUT = 5.0            # Seconds to connect / receive response headers
+PREFLIGHT_DEAD_STATUSES = (401, 403, 404, 410)  # Responses that mean ffprobe cannot succeed either
+
+# ffprobe errors worth retrying (server errors, connection drops). 404s, connection
+# timeouts and invalid data won't succeed on retry.
+TRANSIENT_PROBE_ERRORS = (
+    "5XX", "500", "502", "503", "520", "Input/output error",
+    "Stream ends prematurely", "Connection reset", "Broken pipe",
+)
+
+# stream_stats columns written by bulk probes through ProbeResultWriter
+PROBE_RESULT_COLUMNS = (
+    "stream_id", "stream_name", "probe_status", "error_message", "last_probed",
+    "resolution", "fps", "video_codec", "audio_codec", "audio_channels",
+    "stream_type", "bitrate", "video_bitrate", "url_hash",
+    "sort_height", "sort_fps", "sort_bitrate",
+)
+
+# stream_stats columns a probe result shares with other streams of the same upstream feed
+PROBED_FIELDS = (
+    "resolution", "fps", "video_codec", "audio_codec", "audio_channels",
+    "stream_type", "bitrate", "video_bitrate",
+)
+
 # Probe history persistence
 CONFIG_DIR = Path(os.environ.get("CONFIG_DIR", "/config"))
 PROBE_HISTORY_FILE = CONFIG_DIR / "probe_history.json"
+PROBE_ACCOUNT_LIMITS_FILE = CONFIG_DIR / "probe_account_limits.json"
 
 
 def check_ffprobe_available() -> bool:
@@ -44,6 +97,47 @@ def check_ffprobe_available() -> bool:
     return shutil.which("ffprobe") is not None
 
 
+def _is_hdhomerun_url(url: str) -> bool:
+    """Detect HDHomeRun-style URLs (local tuner devices), e.g. http://IP:5004/auto/..."""
+    return bool(url) and (':5004/' in url or 'hdhomerun' in url.lower())
+
+
+def _is_transient_probe_error(error_text: str) -> bool:
+    """Whether a probe error is worth retrying (server error or dropped connection)."""
+    return any(p in error_text for p in TRANSIENT_PROBE_ERRORS) and "404" not in error_text
+
+
+def _is_playlist_url(url: str) -> bool:
+    """HLS/DASH manifests reference other URLs, so ffprobe must fetch them itself."""
+    path = urlsplit(url).path.lower()
+    return path.endswith((".m3u8", ".m3u", ".mpd"))
+
+
+def normalize_probe_url(url: str) -> str:
+    """Canonical form of an upstream stream URL, used as the probe-cache key.
+
+    Lowercases scheme and host, drops default ports and fragments, and sorts
+    query parameters so the same feed listed with cosmetic URL differences
+    shares one ffprobe result.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        netloc = (parts.hostname or "").lower()
+        if parts.username is not None:
+            userinfo = parts.username
+            if parts.password is not None:
+                userinfo += f":{parts.password}"
+            netloc = f"{userinfo}@{netloc}"
+        port = parts.port
+        if port and (scheme, port) not in (("http", 80), ("https", 443)):
+            netloc += f":{port}"
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+    except ValueError:
+        return url.strip()
+
+
 def extract_m3u_account_id(m3u_account):
     """Extract M3U account ID from stream data.
 
@@ -81,6 +175,8 @@ def smart_sort_streams(
     """
     Pure function — sort stream IDs by quality/priority criteria.
 
+    Single-channel form of sort_channel_streams (see stream_sort for the key).
+
     Args:
         stream_ids: List of stream IDs to sort
         stats_map: Map of stream_id -> StreamStats
@@ -91,134 +187,56 @@ def smart_sort_streams(
         deprioritize_failed_streams: Whether to push failed streams to bottom
         channel_name: Channel name for logging purposes
     """
-    if stream_m3u_map is None:
-        stream_m3u_map = {}
+    sorted_ids = sort_channel_streams(
+        [stream_ids], stats_map, stream_m3u_map, stream_sort_priority,
+        stream_sort_enabled, m3u_account_priorities, deprioritize_failed_streams,
+    )[0]
+    logger.debug("[STREAM-PROBE-SORT] Channel '%s': sorted %s streams -> %s",
+                 str(channel_name).replace('\n', '').replace('\r', ''), len(stream_ids), sorted_ids)
+    return sorted_ids
+
+
+def sort_channel_streams(
+    channels: list[list[int]],
+    stats_map: dict,
+    stream_m3u_map: dict[int, int] = None,
+    stream_sort_priority: list[str] = None,
+    stream_sort_enabled: dict[str, bool] = None,
+    m3u_account_priorities: dict[str, int] = None,
+    deprioritize_failed_streams: bool = True,
+) -> list[list[int]]:
+    """
+    Sort the streams of many channels in one pass.
+
+    Each stream's sort key is built once, from the sort columns materialized
+    at probe time, and reused for every channel that contains it.
+
+    Args:
+        channels: Stream ID lists, one per channel
+        stats_map: Map of stream_id -> StreamStats
+        stream_m3u_map: Map of stream_id -> m3u_account_id (for M3U priority sorting)
+        stream_sort_priority: Priority order for sort criteria
+        stream_sort_enabled: Which criteria are enabled
+        m3u_account_priorities: M3U account priorities (account_id_str -> priority)
+        deprioritize_failed_streams: Whether to push failed streams to bottom
+
+    Returns:
+        Sorted stream ID lists, in the order of channels
+    """
     if stream_sort_priority is None:
-        stream_sort_priority = ["resolution", "bitrate", "framerate", "m3u_priority", "audio_channels"]
+        stream_sort_priority = DEFAULT_SORT_PRIORITY
     if stream_sort_enabled is None:
-        stream_sort_enabled = {"resolution": True, "bitrate": True, "framerate": True, "m3u_priority": False, "audio_channels": False}
-    if m3u_account_priorities is None:
-        m3u_account_priorities = {}
+        stream_sort_enabled = DEFAULT_SORT_ENABLED
 
     # Get active sort criteria (enabled and in priority order)
     active_criteria = [
         criterion for criterion in stream_sort_priority
         if stream_sort_enabled.get(criterion, False)
     ]
-
-    safe_name = str(channel_name).replace('\n', '').replace('\r', '')
-    logger.info("[STREAM-PROBE-SORT] Channel '%s': Sorting %s streams", safe_name, len(stream_ids))
-    logger.info("[STREAM-PROBE-SORT] Sort config: priority=%s, enabled=%s", stream_sort_priority, stream_sort_enabled)
-    logger.info("[STREAM-PROBE-SORT] Active criteria (in order): %s", active_criteria)
-    logger.info("[STREAM-PROBE-SORT] Deprioritize failed streams: %s", deprioritize_failed_streams)
-
-    # Log each stream's stats before sorting
-    for stream_id in stream_ids:
-        stat = stats_map.get(stream_id)
-        if stat:
-            logger.debug("[STREAM-PROBE-SORT]   Stream %s (%s): "
-                        "status=%s, res=%s, "
-                        "bitrate=%s, fps=%s",
-                        stream_id, stat.stream_name,
-                        stat.probe_status, stat.resolution,
-                        stat.bitrate, stat.fps)
-        else:
-            logger.debug("[STREAM-PROBE-SORT]   Stream %s: NO STATS AVAILABLE", stream_id)
-
-    def get_sort_value(stream_id: int) -> tuple:
-        stat = stats_map.get(stream_id)
-        stream_name = stat.stream_name if stat else f"Stream {stream_id}"
-
-        # Deprioritize failed streams if enabled
-        if deprioritize_failed_streams:
-            if not stat or stat.probe_status in ('failed', 'timeout', 'pending'):
-                logger.debug("[STREAM-PROBE-SORT]   %s: DEPRIORITIZED (status=%s)", stream_name, stat.probe_status if stat else 'no_stats')
-                # Return tuple with 1 as first element to sort to bottom
-                return (1,) + tuple(0 for _ in active_criteria)
-
-        if not stat or stat.probe_status != 'success':
-            logger.debug("[STREAM-PROBE-SORT]   %s: No successful probe data", stream_name)
-            # Still compute M3U priority for unprobed streams (M3U priority doesn't require probing)
-            sort_values = [0]
-            for criterion in active_criteria:
-                if criterion == "m3u_priority":
-                    m3u_priority_value = 0
-                    m3u_account_id = stream_m3u_map.get(stream_id)
-                    if m3u_account_id is not None:
-                        m3u_priority_value = m3u_account_priorities.get(str(m3u_account_id), 0)
-                    sort_values.append(-m3u_priority_value)
-                else:
-                    sort_values.append(0)
-            return tuple(sort_values)
-
-        # Build sort values based on active criteria in priority order
-        sort_values = [0]  # First element: 0 = successful stream
-
-        for criterion in active_criteria:
-            if criterion == "resolution":
-                # Parse resolution (e.g., "1920x1080" -> height only, matching frontend)
-                resolution_value = 0
-                if stat.resolution:
-                    try:
-                        parts = stat.resolution.split('x')
-                        if len(parts) == 2:
-                            resolution_value = int(parts[1])  # Use height only
-                    except (ValueError, IndexError) as e:
-                        logger.debug("[STREAM-PROBE] Suppressed resolution parse error: %s", e)
-                # Negate for descending sort (higher values first)
-                sort_values.append(-resolution_value)
-
-            elif criterion == "bitrate":
-                # Use video_bitrate first (from probe), fallback to overall bitrate
-                bitrate_value = stat.video_bitrate or stat.bitrate or 0
-                sort_values.append(-bitrate_value)
-
-            elif criterion == "framerate":
-                # Parse fps - could be string like "29.97" or "30"
-                framerate_value = 0
-                if stat.fps:
-                    try:
-                        framerate_value = float(stat.fps)
-                    except (ValueError, TypeError) as e:
-                        logger.debug("[STREAM-PROBE] Suppressed fps parse error: %s", e)
-                sort_values.append(-framerate_value)
-
-            elif criterion == "m3u_priority":
-                # Get M3U account priority from settings (higher priority = sorted first)
-                m3u_priority_value = 0
-                m3u_account_id = stream_m3u_map.get(stream_id)
-                if m3u_account_id is not None:
-                    # Convert to string since JSON keys are strings
-                    m3u_priority_value = m3u_account_priorities.get(str(m3u_account_id), 0)
-                # Negate for descending sort (higher priority first)
-                sort_values.append(-m3u_priority_value)
-
-            elif criterion == "audio_channels":
-                # Sort by audio channels: 5.1/6ch > stereo/2ch > mono/1ch
-                audio_channels_value = stat.audio_channels or 0
-                # Negate for descending sort (more channels first)
-                sort_values.append(-audio_channels_value)
-
-        m3u_account_id = stream_m3u_map.get(stream_id)
-        logger.debug("[STREAM-PROBE-SORT]   %s: sort_tuple=%s "
-                    "(res=%s, br=%s, fps=%s, m3u=%s, audio_ch=%s)",
-                    stream_name, tuple(sort_values),
-                    stat.resolution, stat.bitrate, stat.fps, m3u_account_id, stat.audio_channels)
-        return tuple(sort_values)
-
-    # Sort stream IDs by their stats
-    sorted_ids = sorted(stream_ids, key=get_sort_value)
-
-    # Log the final sorted order
-    logger.info("[STREAM-PROBE-SORT] Channel '%s' sorted order:", channel_name)
-    for idx, stream_id in enumerate(sorted_ids):
-        stat = stats_map.get(stream_id)
-        stream_name = stat.stream_name if stat else f"Stream {stream_id}"
-        status = stat.probe_status if stat else "no_stats"
-        res = stat.resolution if stat else "?"
-        logger.info("[STREAM-PROBE-SORT]   #%s: %s (id=%s, status=%s, res=%s)", idx+1, stream_name, stream_id, status, res)
-
-    return sorted_ids
+    return rank_channels(
+        channels, stats_map, stream_m3u_map, active_criteria,
+        m3u_account_priorities, deprioritize_failed_streams,
+    )
 
 
 class StreamProber:
@@ -247,6 +265,9 @@ class StreamProber:
         stream_sort_enabled: dict[str, bool] = None,  # Which criteria are enabled for Smart Sort
         stream_fetch_page_limit: int = 200,  # Max pages when fetching streams (200 * 500 = 100K streams)
         m3u_account_priorities: dict[str, int] = None,  # M3U account priorities (account_id -> priority)
+        probe_cache_minutes: int = DEFAULT_PROBE_CACHE_MINUTES,  # Reuse probe results of the same upstream URL for N minutes (0 = off)
+        probe_preflight_enabled: bool = False,  # Check URLs with a ranged GET before running ffprobe
+        probe_single_connection: bool = False,  # Feed ffprobe and the bitrate sample from one HTTP download
     ):
         self.client = client
         self.probe_timeout = probe_timeout
@@ -263,6 +284,9 @@ class StreamProber:
         self.probe_retry_delay = max(1, min(30, probe_retry_delay))  # Clamp 1-30
         self.deprioritize_failed_streams = deprioritize_failed_streams
         self.stream_fetch_page_limit = stream_fetch_page_limit
+        self.probe_cache_minutes = max(0, probe_cache_minutes)
+        self.probe_preflight_enabled = probe_preflight_enabled
+        self.probe_single_connection = probe_single_connection
         logger.info("[STREAM-PROBE] auto_reorder_after_probe=%s", auto_reorder_after_probe)
         # Smart Sort configuration
         self.stream_sort_priority = stream_sort_priority or ["resolution", "bitrate", "framerate", "m3u_priority", "audio_channels"]
@@ -271,6 +295,14 @@ class StreamProber:
         self._probe_cancelled = False  # Controls cancellation of in-progress probe
         self._probe_paused = False  # Controls pausing of in-progress probe
         self._probing_in_progress = False
+        self._probe_scheduler = None  # ProbeScheduler of the running parallel probe
+        # Probe results by upstream URL hash: url_hash -> (expires_at, PROBED_FIELDS values).
+        # Loaded from stream_stats at the start of each bulk probe, so reuse survives restarts.
+        self._probe_result_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._probe_in_flight: dict[str, asyncio.Future] = {}  # url_hash -> future of PROBED_FIELDS values
+        self._probe_cache_hits = 0
+        # Pooled client for direct stream requests (created on first use)
+        self._stream_client: Optional[httpx.AsyncClient] = None
         # Progress tracking for probe all streams
         self._probe_progress_total = 0
         self._probe_progress_current = 0
@@ -293,6 +325,8 @@ class StreamProber:
 
         # Per-account ramp-up state (reset each probe run)
         self._account_ramp_state = {}  # account_id -> ramp state dict
+        # Learned per-account limits and ffprobe latency (persisted across runs)
+        self._account_learned = {}  # account_id -> {limit, latency_fast, latency_slow, samples, updated}
 
         # Notification callbacks for progress updates
         self._notification_create_callback = None  # async fn(type, title, message, source, source_id, metadata) -> dict with id
@@ -301,13 +335,36 @@ class StreamProber:
         self._probe_notification_id = None  # Current probe notification ID
         self._last_notification_update = 0  # Timestamp of last notification update
 
-        # Load probe history from disk on initialization
+        # Load probe history and learned account limits from disk on initialization
         self._load_probe_history()
+        self._load_account_limits()
 
     def _extract_m3u_account_id(self, m3u_account):
         """Extract M3U account ID from stream data. Delegates to module-level function."""
         return extract_m3u_account_id(m3u_account)
 
+    def _probe_display_string(self, stream: dict, stream_to_channels: dict, m3u_accounts_map: dict) -> str:
+        """Build the progress label for a stream: "channel(s): stream | M3U"."""
+        stream_id = stream["id"]
+        stream_name = stream.get("name", f"Stream {stream_id}")
+        channel_names = stream_to_channels.get(stream_id)
+        if not channel_names:
+            channel_label = "Unknown Channel"
+        elif len(channel_names) == 1:
+            channel_label = channel_names[0]
+        else:
+            channel_label = f"{channel_names[0]} (+{len(channel_names)-1})"
+
+        m3u_account_id = self._extract_m3u_account_id(stream.get("m3u_account"))
+        if m3u_account_id and m3u_account_id in m3u_accounts_map:
+            return f"{channel_label}: {stream_name} | {m3u_accounts_map[m3u_account_id]}"
+        return f"{channel_label}: {stream_name}"
+
+    def _wake_probe_scheduler(self):
+        """Let a running parallel probe react to cancel/pause/resume immediately."""
+        if self._probe_scheduler is not None:
+            self._probe_scheduler.wake()
+
     def _load_probe_history(self):
         """Load probe history from persistent storage."""
         try:
@@ -565,16 +622,61 @@ class StreamProber:
         except Exception as e:
             logger.error("[STREAM-PROBE] Failed to persist probe history to %s: %s", PROBE_HISTORY_FILE, e)
 
+    def _load_account_limits(self):
+        """Load learned per-account probe limits from persistent storage."""
+        try:
+            if PROBE_ACCOUNT_LIMITS_FILE.exists():
+                with open(PROBE_ACCOUNT_LIMITS_FILE, 'r') as f:
+                    # JSON keys are strings; account IDs are ints everywhere else
+                    self._account_learned = {int(k): v for k, v in json.load(f).items()}
+                logger.info("[STREAM-PROBE] Loaded learned probe limits for %s accounts", len(self._account_learned))
+        except Exception as e:
+            logger.error("[STREAM-PROBE] Failed to load learned probe limits from %s: %s", PROBE_ACCOUNT_LIMITS_FILE, e)
+            self._account_learned = {}
+
+    def _persist_account_limits(self):
+        """Fold this run's ramp state into the learned limits and persist them."""
+        for account_id, state in self._account_ramp_state.items():
+            if not state["total_successes"] and not state["total_failures"]:
+                continue
+            self._account_learned[account_id] = {
+                "limit": max(1, min(RAMP_MAX_LIMIT, int(state["current_limit"]))),
+                "latency_fast": state["latency_fast"],
+                "latency_slow": state["latency_slow"],
+                "samples": state["samples"],
+                "updated": datetime.utcnow().isoformat() + "Z",
+            }
+        try:
+            CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+            with open(PROBE_ACCOUNT_LIMITS_FILE, 'w') as f:
+                json.dump({str(k): v for k, v in self._account_learned.items()}, f, indent=2)
+            logger.debug("[STREAM-PROBE] Persisted learned probe limits for %s accounts", len(self._account_learned))
+        except Exception as e:
+            logger.error("[STREAM-PROBE] Failed to persist learned probe limits to %s: %s", PROBE_ACCOUNT_LIMITS_FILE, e)
+
     def _init_account_ramp(self, account_id: int):
-        """Initialize ramp-up state for an account if not already present."""
+        """Initialize ramp-up state for an account if not already present.
+
+        Accounts probed before start at the limit they had reached at the end
+        of the last run, with their latency baseline; others start at
+        RAMP_INITIAL_LIMIT.
+        """
         if account_id not in self._account_ramp_state:
+            learned = self._account_learned.get(account_id, {})
             self._account_ramp_state[account_id] = {
-                "current_limit": RAMP_INITIAL_LIMIT,
+                "current_limit": float(learned.get("limit", RAMP_INITIAL_LIMIT)),
                 "consecutive_successes": 0,
                 "hold_until": 0.0,
                 "total_successes": 0,
                 "total_failures": 0,
+                "latency_fast": learned.get("latency_fast"),
+                "latency_slow": learned.get("latency_slow"),
+                "samples": learned.get("samples", 0),
+                "last_decrease": 0.0,
+                "ceiling": RAMP_MAX_LIMIT,  # Account capacity, set once the limit is first checked
             }
+            if learned:
+                logger.debug("[STREAM-PROBE] Account %s: starting at learned limit %s", account_id, learned.get("limit"))
 
     def _get_account_ramp_limit(self, account_id: int, account_max: int, dispatcharr_active: int) -> int:
         """Get current ramp-limited concurrent probe cap for an account.
@@ -583,11 +685,13 @@ class StreamProber:
         state = self._account_ramp_state.get(account_id)
         if not state:
             return RAMP_INITIAL_LIMIT
-        ramp_limit = state["current_limit"]
+        ramp_limit = int(state["current_limit"])
         if account_max > 0:
             dynamic_cap = max(0, account_max - dispatcharr_active)
+            state["ceiling"] = min(RAMP_MAX_LIMIT, account_max)
         else:
             dynamic_cap = RAMP_UNLIMITED_CAP
+            state["ceiling"] = RAMP_UNLIMITED_CAP
         return min(ramp_limit, dynamic_cap)
 
     def _is_account_held(self, account_id: int) -> bool:
@@ -604,17 +708,61 @@ class StreamProber:
             return 0.0
         return max(0.0, state["hold_until"] - time.time())
 
-    def _record_probe_success(self, account_id: int):
-        """Record success. After RAMP_SUCCESS_WINDOW consecutive successes, ramp up by 1."""
+    def _record_probe_latency(self, state: dict, seconds: Optional[float]) -> bool:
+        """Feed an ffprobe wall time into the account's latency EWMAs.
+
+        Returns True when the short-term average has risen past
+        RAMP_LATENCY_TOLERANCE times the long-term baseline.
+        """
+        if seconds is None:
+            return False
+        state["samples"] += 1
+        if state["latency_fast"] is None:
+            state["latency_fast"] = state["latency_slow"] = seconds
+            return False
+        state["latency_fast"] += 0.3 * (seconds - state["latency_fast"])
+        state["latency_slow"] += 0.05 * (seconds - state["latency_slow"])
+        return (
+            state["samples"] >= RAMP_LATENCY_MIN_SAMPLES
+            and state["latency_fast"] > state["latency_slow"] * RAMP_LATENCY_TOLERANCE
+        )
+
+    def _decrease_account_limit(self, account_id: int, state: dict, reason: str) -> bool:
+        """Multiplicative decrease, at most once per RAMP_DECREASE_COOLDOWN."""
+        now = time.time()
+        if now - state["last_decrease"] < RAMP_DECREASE_COOLDOWN:
+            return False
+        state["last_decrease"] = now
+        old_limit = state["current_limit"]
+        state["current_limit"] = max(1.0, old_limit * RAMP_DECREASE_FACTOR)
+        logger.warning("[STREAM-PROBE] Account %s: %s, limit %s->%s",
+                       account_id, reason, int(old_limit), int(state['current_limit']))
+        return True
+
+    def _record_probe_success(self, account_id: int, probe_seconds: Optional[float] = None):
+        """Record success. After RAMP_SUCCESS_WINDOW consecutive successes, ramp up by 1.
+
+        If ffprobe has become much slower than this account's baseline, the
+        limit is decreased instead: the provider is struggling before it
+        starts returning errors.
+        """
         state = self._account_ramp_state.get(account_id)
         if not state:
             return
         state["total_successes"] += 1
+        if self._record_probe_latency(state, probe_seconds):
+            state["consecutive_successes"] = 0
+            self._decrease_account_limit(
+                account_id, state,
+                "ffprobe latency rising (%.1fs vs %.1fs baseline)" % (state["latency_fast"], state["latency_slow"]),
+            )
+            return
         state["consecutive_successes"] += 1
         if state["consecutive_successes"] >= RAMP_SUCCESS_WINDOW:
-            state["current_limit"] += RAMP_INCREMENT
+            # Growing past the account's capacity would only blunt the next decrease
+            state["current_limit"] = min(float(state["ceiling"]), state["current_limit"] + RAMP_INCREMENT)
             state["consecutive_successes"] = 0
-            logger.info("[STREAM-PROBE] Account %s: ramped to %s concurrent probes", account_id, state['current_limit'])
+            logger.info("[STREAM-PROBE] Account %s: ramped to %s concurrent probes", account_id, int(state['current_limit']))
 
     def _is_overload_error(self, error_message: str) -> bool:
         """Check if an error indicates server overload (should trigger ramp-down).
@@ -627,11 +775,14 @@ class StreamProber:
         overload_patterns = ("429", "Too Many Requests", "5XX", "500", "502", "503", "520")
         return any(p in error_message for p in overload_patterns)
 
-    def _record_probe_failure(self, account_id: int, error_message: str):
-        """Record failure. Only ramp-down/hold for overload errors (429/5XX).
+    def _record_probe_failure(self, account_id: int, error_message: str, probe_seconds: Optional[float] = None,
+                              timed_out: bool = False):
+        """Record failure. Overload errors (429/5XX) halve the limit and hold the account.
 
-        Dead streams (404, connection timeout, invalid data) reset the
-        consecutive success counter but do NOT reduce concurrency or hold
+        Probe timeouts count as a latency sample, so a provider that starts
+        timing out across the board is ramped down through the latency
+        signal. Dead streams (404, connection refused, invalid data) reset
+        the consecutive success counter but do NOT reduce concurrency or hold
         the account, since the server isn't overloaded.
         """
         state = self._account_ramp_state.get(account_id)
@@ -641,14 +792,10 @@ class StreamProber:
         state["consecutive_successes"] = 0
 
         if self._is_overload_error(error_message):
-            old_limit = state["current_limit"]
-            state["current_limit"] = max(1, old_limit - RAMP_FAILURE_REDUCTION)
+            self._decrease_account_limit(account_id, state, "overload detected — %s" % error_message[:100])
             state["hold_until"] = time.time() + RAMP_FAILURE_HOLD_SECONDS
-            logger.warning("[STREAM-PROBE] Account %s: overload detected, "
-                           "limit %s->%s, "
-                           "hold %ss — %s",
-                           account_id, old_limit, state['current_limit'],
-                           RAMP_FAILURE_HOLD_SECONDS, error_message[:100])
+        elif timed_out and self._record_probe_latency(state, probe_seconds):
+            self._decrease_account_limit(account_id, state, "probes timing out")
         else:
             logger.debug("[STREAM-PROBE] Account %s: non-overload failure, "
                          "no ramp-down — %s",
@@ -680,6 +827,10 @@ class StreamProber:
         """Stop the stream prober and cancel any in-progress probes."""
         logger.info("[STREAM-PROBE] StreamProber stopping...")
         self._probe_cancelled = True
+        self._wake_probe_scheduler()
+        if self._stream_client is not None:
+            await self._stream_client.aclose()
+            self._stream_client = None
         logger.info("[STREAM-PROBE] StreamProber stopped")
 
     def cancel_probe(self) -> dict:
@@ -693,6 +844,7 @@ class StreamProber:
 
         logger.info("[STREAM-PROBE] Cancelling in-progress probe...")
         self._probe_cancelled = True
+        self._wake_probe_scheduler()
         # The probe loop will detect _probe_cancelled=True and set status to "cancelled"
         return {"status": "cancelling", "message": "Probe cancellation requested"}
 
@@ -710,6 +862,7 @@ class StreamProber:
 
         logger.info("[STREAM-PROBE] Pausing in-progress probe...")
         self._probe_paused = True
+        self._wake_probe_scheduler()
         return {"status": "paused", "message": "Probe paused"}
 
     def resume_probe(self) -> dict:
@@ -726,6 +879,7 @@ class StreamProber:
 
         logger.info("[STREAM-PROBE] Resuming paused probe...")
         self._probe_paused = False
+        self._wake_probe_scheduler()
         return {"status": "resumed", "message": "Probe resumed"}
 
     def force_reset_probe_state(self) -> dict:
@@ -740,6 +894,7 @@ class StreamProber:
         self._probing_in_progress = False
         self._probe_cancelled = True  # Signal any running probe to stop
         self._probe_paused = False  # Reset paused state
+        self._wake_probe_scheduler()
         self._probe_progress_status = "idle"
         self._probe_progress_current_stream = ""
 
@@ -749,49 +904,225 @@ class StreamProber:
         }
 
     async def probe_stream(
-        self, stream_id: int, url: Optional[str], name: Optional[str] = None
+        self, stream_id: int, url: Optional[str], name: Optional[str] = None,
+        cache_url: Optional[str] = None, writer: Optional[ProbeResultWriter] = None,
     ) -> dict:
         """
         Probe a single stream using ffprobe.
         Returns the probe result dict.
+
+        Args:
+            stream_id: Stream to record the result for
+            url: URL to probe (after any profile rewrite)
+            name: Stream name
+            cache_url: Upstream URL before profile rewriting. When given, the
+                       result is shared with other streams of the same feed:
+                       a fresh cached result or an identical probe already in
+                       flight is reused instead of running ffprobe again.
+            writer: Write-behind queue for bulk runs. When given, the result is
+                    queued instead of written immediately, and the returned
+                    dict does not include database-only fields.
+
+        When ffprobe ran, the returned dict carries its wall time in
+        probe_seconds for the per-account concurrency controller.
         """
         logger.debug("[STREAM-PROBE] probe_stream() called for stream_id=%s, name=%s, url=%s", stream_id, name, 'present' if url else 'missing')
 
         if not url:
             logger.warning("[STREAM-PROBE] Stream %s has no URL, marking as failed", stream_id)
             return self._save_probe_result(
-                stream_id, name, None, "failed", "No URL available"
+                stream_id, name, None, "failed", "No URL available", writer=writer
             )
 
-        try:
-            logger.debug("[STREAM-PROBE] Running ffprobe for stream %s", stream_id)
-            result = await self._run_ffprobe(url)
-            logger.info("[STREAM-PROBE] Stream %s ffprobe succeeded", stream_id)
+        normalized_url = normalize_probe_url(cache_url or url)
+        url_hash = url_fingerprint(normalized_url)
+        cache_key = url_hash if cache_url and self.probe_cache_minutes else None
+        if cache_key:
+            shared = await self._get_shared_probe(cache_key)
+            if shared:
+                self._probe_cache_hits += 1
+                logger.info("[STREAM-PROBE] Stream %s reused probe result of the same upstream feed", stream_id)
+                saved = self._save_probe_result(
+                    stream_id, name, None, "success", None, writer=writer, url_hash=url_hash, probed_fields=shared,
+                )
+                saved["from_cache"] = True
+                return saved
+            in_flight = asyncio.get_running_loop().create_future()
+            self._probe_in_flight[cache_key] = in_flight
 
-            # Measure actual bitrate by downloading stream data
-            logger.debug("[STREAM-PROBE] Measuring bitrate for stream %s", stream_id)
-            measured_bitrate = await self._measure_stream_bitrate(url)
+        shared_result = None
+        probe_started = time.monotonic()
+        try:
+            if self.probe_preflight_enabled:
+                preflight_error = await self._preflight_check(url)
+                if preflight_error:
+                    raise RuntimeError(f"Pre-flight check failed: {preflight_error}")
+
+            combined = None
+            if self.probe_single_connection:
+                logger.debug("[STREAM-PROBE] Running single-connection probe for stream %s", stream_id)
+                combined = await self._run_ffprobe_with_bitrate(url)
+            if combined:
+                result, measured_bitrate, ffprobe_seconds = combined
+                probe_seconds = ffprobe_seconds
+                logger.info("[STREAM-PROBE] Stream %s ffprobe succeeded", stream_id)
+            else:
+                logger.debug("[STREAM-PROBE] Running ffprobe for stream %s", stream_id)
+                async with get_media_processes().slot(Workload.PROBE):
+                    # Time spent waiting for a process slot is not provider latency
+                    probe_started = time.monotonic()
+                    result = await self._run_ffprobe(url)
+                probe_seconds = time.monotonic() - probe_started
+                logger.info("[STREAM-PROBE] Stream %s ffprobe succeeded", stream_id)
+
+                # Measure actual bitrate by downloading stream data
+                logger.debug("[STREAM-PROBE] Measuring bitrate for stream %s", stream_id)
+                measured_bitrate = await self._measure_stream_bitrate(url)
+
+            if cache_key:
+                shared_result = self._probed_fields(result, measured_bitrate)
+                self._store_probe_cache(cache_key, shared_result)
 
             # Save probe result with both ffprobe metadata and measured bitrate
-            return self._save_probe_result(
-                stream_id, name, result, "success", None, measured_bitrate
+            saved = self._save_probe_result(
+                stream_id, name, result, "success", None, measured_bitrate, writer=writer, url_hash=url_hash,
             )
         except asyncio.TimeoutError:
             logger.warning("[STREAM-PROBE] Stream %s probe timed out after %ss", stream_id, self.probe_timeout)
-            return self._save_probe_result(
+            saved = self._save_probe_result(
                 stream_id,
                 name,
                 None,
                 "timeout",
-                f"Probe timed out after {self.probe_timeout}s"
+                f"Probe timed out after {self.probe_timeout}s",
+                writer=writer,
+                url_hash=url_hash,
             )
+            probe_seconds = time.monotonic() - probe_started
         except Exception as e:
             error_msg = str(e)
             # Truncate very long error messages
             if len(error_msg) > 500:
                 error_msg = error_msg[:500] + "..."
             logger.error("[STREAM-PROBE] Stream %s probe failed: %s", stream_id, error_msg)
-            return self._save_probe_result(stream_id, name, None, "failed", error_msg)
+            saved = self._save_probe_result(stream_id, name, None, "failed", error_msg, writer=writer, url_hash=url_hash)
+            probe_seconds = time.monotonic() - probe_started
+        finally:
+            if cache_key:
+                # Waiters get the result, or None to probe for themselves
+                # (a failure may be specific to this stream's profile)
+                if self._probe_in_flight.get(cache_key) is in_flight:
+                    del self._probe_in_flight[cache_key]
+                in_flight.set_result(shared_result)
+        saved["probe_seconds"] = round(probe_seconds, 3)
+        return saved
+
+    async def _get_shared_probe(self, cache_key: str) -> Optional[dict]:
+        """Cached or in-flight probe result for an upstream URL hash, if any."""
+        cached = self._probe_result_cache.get(cache_key)
+        if cached:
+            expires_at, fields = cached
+            if time.time() < expires_at:
+                return fields
+            del self._probe_result_cache[cache_key]
+        in_flight = self._probe_in_flight.get(cache_key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+        return None
+
+    def _has_cached_probe(self, url: Optional[str]) -> bool:
+        """Whether a fresh cached probe result exists for this upstream URL."""
+        if not url or not self.probe_cache_minutes:
+            return False
+        cached = self._probe_result_cache.get(url_fingerprint(normalize_probe_url(url)))
+        return bool(cached) and time.time() < cached[0]
+
+    def _store_probe_cache(self, cache_key: str, fields: dict, expires_at: Optional[float] = None) -> None:
+        if expires_at is None:
+            expires_at = time.time() + self.probe_cache_minutes * 60
+        self._probe_result_cache[cache_key] = (expires_at, fields)
+        self._probe_result_cache.move_to_end(cache_key)
+        while len(self._probe_result_cache) > PROBE_CACHE_MAX_ENTRIES:
+            self._probe_result_cache.popitem(last=False)
+
+    def _load_stored_probes(self) -> int:
+        """Seed the probe cache with successful results stored within the cache TTL.
+
+        Rows are keyed by stream_stats.url_hash, so feeds probed before a
+        restart are reused like ones probed earlier in this process.
+        Returns the number of URL hashes loaded.
+        """
+        ttl = timedelta(minutes=self.probe_cache_minutes)
+        now = datetime.utcnow()
+        session = get_session()
+        try:
+            rows = session.query(
+                StreamStats.url_hash, StreamStats.last_probed, *(getattr(StreamStats, f) for f in PROBED_FIELDS),
+            ).filter(
+                StreamStats.probe_status == "success",
+                StreamStats.url_hash.isnot(None),
+                StreamStats.last_probed >= now - ttl,
+            ).order_by(StreamStats.last_probed).all()
+        finally:
+            session.close()
+
+        loaded = set()
+        for row in rows:  # Oldest first, so the newest result per hash wins
+            cached = self._probe_result_cache.get(row.url_hash)
+            expires_at = time.time() + (row.last_probed + ttl - now).total_seconds()
+            if cached and cached[0] >= expires_at:
+                continue
+            self._store_probe_cache(row.url_hash, {f: getattr(row, f) for f in PROBED_FIELDS}, expires_at)
+            loaded.add(row.url_hash)
+        return len(loaded)
+
+    def _get_stream_client(self) -> httpx.AsyncClient:
+        """Shared pooled client for direct stream requests, created on first use.
+
+        Callers pass their own timeout per request.
+        """
+        if self._stream_client is None:
+            self._stream_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=STREAM_CLIENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=STREAM_CLIENT_MAX_CONNECTIONS // 2,
+                ),
+                follow_redirects=True,
+                headers={"User-Agent": STREAM_USER_AGENT},
+            )
+        return self._stream_client
+
+    async def _preflight_check(self, url: str) -> Optional[str]:
+        """
+        Cheap liveness check before spawning ffprobe.
+
+        Requests the first byte of the stream and only reads the response
+        headers. Returns an error message when the stream is certainly dead
+        (401/403/404/410 or connection refused), otherwise None so that
+        ffprobe makes the decision. Timeouts and server errors are left to
+        ffprobe: they may be transient and go through its retry and
+        overload handling.
+
+        A ranged GET is used rather than HEAD because many IPTV servers
+        answer HEAD with 404/405 for streams that play fine.
+        """
+        if urlsplit(url).scheme not in ("http", "https") or _is_hdhomerun_url(url):
+            # Non-HTTP inputs can't be checked; HDHomeRun would tie up a tuner
+            return None
+        try:
+            async with self._get_stream_client().stream(
+                "GET", url, headers={"Range": "bytes=0-0"}, timeout=PREFLIGHT_TIMEOUT,
+            ) as response:
+                if response.status_code in PREFLIGHT_DEAD_STATUSES:
+                    return f"HTTP {response.status_code} {response.reason_phrase}".strip()
+                return None
+        except httpx.ConnectError as e:
+            if isinstance(e.__cause__, ConnectionRefusedError) or "refused" in str(e).lower():
+                return "Connection refused"
+            return None
+        except httpx.HTTPError as e:
+            logger.debug("[STREAM-PROBE] Pre-flight inconclusive for %s...: %s", url[:80], e)
+            return None
 
     async def _run_ffprobe(self, url: str, _retry_attempt: int = 0) -> dict:
         """Run ffprobe and parse JSON output."""
@@ -803,14 +1134,15 @@ class StreamProber:
             "json",
             "-show_format",
             "-show_streams",
-            "-user_agent", "VLC/3.0.20 LibVLC/3.0.20",  # Mimic VLC to avoid server rejections
+            "-user_agent", STREAM_USER_AGENT,
             "-timeout",
             str(self.probe_timeout * 1000000),  # microseconds
             url,
         ]
 
+        # The caller holds a Workload.PROBE slot of the media process budget
         process = await asyncio.create_subprocess_exec(
-            *cmd,
+            *get_media_processes().command(cmd, Workload.PROBE),
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
@@ -832,8 +1164,7 @@ class StreamProber:
             # Do NOT retry 404 (dead stream), connection timeouts (server down), or
             # invalid data (corrupt stream) — these won't succeed on retry and just
             # waste semaphore time.
-            transient_patterns = ("5XX", "500", "502", "503", "520", "Input/output error", "Stream ends prematurely", "Connection reset", "Broken pipe")
-            if any(p in error_text for p in transient_patterns) and "404" not in error_text and _retry_attempt < self.probe_retry_count:
+            if _is_transient_probe_error(error_text) and _retry_attempt < self.probe_retry_count:
                 logger.info("[STREAM-PROBE] Transient error — retry %s/%s in %ss: %s...", _retry_attempt + 1, self.probe_retry_count, self.probe_retry_delay, url[:80])
                 await asyncio.sleep(self.probe_retry_delay)
                 return await self._run_ffprobe(url, _retry_attempt=_retry_attempt + 1)
@@ -846,6 +1177,119 @@ class StreamProber:
 
         return json.loads(output)
 
+    async def _run_ffprobe_with_bitrate(
+        self, url: str, _retry_attempt: int = 0,
+    ) -> Optional[tuple[dict, Optional[int], float]]:
+        """
+        Probe a stream over a single HTTP connection.
+
+        The stream is downloaded once: every chunk is counted for the bitrate
+        sample and written to ffprobe's stdin until ffprobe has what it needs.
+        Reading continues until bitrate_sample_duration has passed, so the
+        provider sees one connection per probe instead of two. A
+        Workload.PROBE slot of the media process budget is held from
+        connecting until ffprobe exits.
+
+        Returns (ffprobe_data, measured_bitrate, ffprobe_seconds), or None
+        when the URL can't be probed this way (non-HTTP, HLS/DASH playlist)
+        and the caller should fall back to _run_ffprobe and
+        _measure_stream_bitrate. Errors are raised like _run_ffprobe's.
+        """
+        if urlsplit(url).scheme not in ("http", "https") or _is_playlist_url(url):
+            return None
+
+        cmd = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            "-i",
+            "pipe:0",
+        ]
+        timeout = httpx.Timeout(connect=10.0, read=float(self.probe_timeout), write=10.0, pool=10.0)
+        media_processes = get_media_processes()
+        await media_processes.acquire(Workload.PROBE)
+        holding_slot = True
+        start_time = time.time()
+        process = None
+        try:
+            async with asyncio.timeout(self.probe_timeout + self.bitrate_sample_duration + 5):
+                async with self._get_stream_client().stream("GET", url, timeout=timeout) as response:
+                    if response.status_code >= 400:
+                        error_text = f"Server returned {response.status_code} {response.reason_phrase}".strip()
+                        if _is_transient_probe_error(error_text) and _retry_attempt < self.probe_retry_count:
+                            logger.info("[STREAM-PROBE] Transient error — retry %s/%s in %ss: %s...", _retry_attempt + 1, self.probe_retry_count, self.probe_retry_delay, url[:80])
+                            await response.aclose()
+                            media_processes.release(Workload.PROBE)
+                            holding_slot = False
+                            await asyncio.sleep(self.probe_retry_delay)
+                            return await self._run_ffprobe_with_bitrate(url, _retry_attempt=_retry_attempt + 1)
+                        raise RuntimeError(f"ffprobe failed: {error_text}")
+                    if "mpegurl" in response.headers.get("content-type", "").lower():
+                        return None
+
+                    process = await asyncio.create_subprocess_exec(
+                        *media_processes.command(cmd, Workload.PROBE),
+                        stdin=asyncio.subprocess.PIPE,
+                        stdout=asyncio.subprocess.PIPE,
+                        stderr=asyncio.subprocess.PIPE,
+                    )
+                    # Drain the output pipes while feeding stdin so neither side blocks
+                    stdout_task = asyncio.create_task(process.stdout.read())
+                    stderr_task = asyncio.create_task(process.stderr.read())
+                    ffprobe_seconds = None
+                    bytes_downloaded = 0
+
+                    async for chunk in response.aiter_bytes(chunk_size=65536):
+                        bytes_downloaded += len(chunk)
+                        if ffprobe_seconds is None:
+                            if process.returncode is None:
+                                try:
+                                    process.stdin.write(chunk)
+                                    await process.stdin.drain()
+                                except (BrokenPipeError, ConnectionResetError):
+                                    pass  # ffprobe stopped reading once it had enough
+                            if process.returncode is not None or process.stdin.is_closing():
+                                ffprobe_seconds = time.time() - start_time
+                                # The rest is only the bitrate sample; free the slot
+                                media_processes.release(Workload.PROBE)
+                                holding_slot = False
+                        if ffprobe_seconds is not None and time.time() - start_time >= self.bitrate_sample_duration:
+                            break
+                    elapsed = time.time() - start_time
+
+                    if process.stdin and not process.stdin.is_closing():
+                        process.stdin.close()
+                    await process.wait()
+                    if ffprobe_seconds is None:
+                        ffprobe_seconds = time.time() - start_time
+                    stdout, stderr = await stdout_task, await stderr_task
+        except BaseException:
+            # Includes the overall timeout (asyncio.TimeoutError), reported like _run_ffprobe's
+            if process is not None and process.returncode is None:
+                process.kill()
+            raise
+        finally:
+            if holding_slot:
+                media_processes.release(Workload.PROBE)
+
+        if process.returncode != 0:
+            error_text = stderr.decode().strip()[:500] if stderr else ""
+            if not error_text:
+                error_text = f"Exit code {process.returncode} (no stderr output)"
+            raise RuntimeError(f"ffprobe failed: {error_text}")
+
+        output = stdout.decode()
+        if not output.strip():
+            raise RuntimeError("ffprobe returned empty output")
+
+        measured_bitrate = int((bytes_downloaded * 8) / elapsed) if elapsed > 0 else None
+        logger.debug("[STREAM-PROBE] Single-connection probe read %s bytes in %.2fs", bytes_downloaded, elapsed)
+        return json.loads(output), measured_bitrate, ffprobe_seconds
+
     async def _measure_stream_bitrate(self, url: str) -> Optional[int]:
         """
         Measure actual stream bitrate by downloading data for a few seconds.
@@ -867,19 +1311,17 @@ class StreamProber:
                 pool=10.0
             )
 
-            headers = {"User-Agent": "VLC/3.0.20 LibVLC/3.0.20"}
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True, headers=headers) as client:
-                async with client.stream("GET", url) as response:
-                    response.raise_for_status()
+            async with self._get_stream_client().stream("GET", url, timeout=timeout) as response:
+                response.raise_for_status()
 
-                    # Download stream data for the sample duration
-                    async for chunk in response.aiter_bytes(chunk_size=65536):  # 64KB chunks
-                        bytes_downloaded += len(chunk)
-                        elapsed = time.time() - start_time
+                # Download stream data for the sample duration
+                async for chunk in response.aiter_bytes(chunk_size=65536):  # 64KB chunks
+                    bytes_downloaded += len(chunk)
+                    elapsed = time.time() - start_time
 
-                        # Stop after sample duration
-                        if elapsed >= self.bitrate_sample_duration:
-                            break
+                    # Stop after sample duration
+                    if elapsed >= self.bitrate_sample_duration:
+                        break
 
             elapsed = time.time() - start_time
 
@@ -910,8 +1352,36 @@ class StreamProber:
         status: str,
         error_message: Optional[str],
         measured_bitrate: Optional[int] = None,
+        writer: Optional[ProbeResultWriter] = None,
+        url_hash: Optional[str] = None,
+        probed_fields: Optional[dict] = None,
     ) -> dict:
-        """Parse ffprobe output and save to database."""
+        """Parse ffprobe output and save to database (or queue it on writer).
+
+        probed_fields (PROBED_FIELDS values reused from another stream of the
+        same feed) are stored as-is instead of parsing ffprobe_data.
+        """
+        if writer is not None:
+            stats = StreamStats(
+                stream_id=stream_id,
+                stream_name=stream_name,
+                probe_status=status,
+                error_message=error_message,
+                last_probed=datetime.utcnow(),
+                url_hash=url_hash,
+            )
+            if probed_fields:
+                self._apply_probed_fields(stats, probed_fields)
+            elif ffprobe_data and status == "success":
+                self._parse_ffprobe_data(stats, ffprobe_data)
+            if measured_bitrate is not None:
+                stats.video_bitrate = measured_bitrate
+            materialize_sort_columns(stats)
+            writer.submit({column: getattr(stats, column) for column in PROBE_RESULT_COLUMNS})
+            result = stats.to_dict()
+            result["consecutive_failures"] = None  # Known once written
+            return result
+
         session = get_session()
         try:
             # Get or create stats record
@@ -927,6 +1397,8 @@ class StreamProber:
             stats.error_message = error_message
             stats.last_probed = datetime.utcnow()
             stats.dismissed_at = None  # Clear dismissal when re-probed
+            if url_hash:
+                stats.url_hash = url_hash
 
             # Track consecutive failures for strike rule
             if status in ("failed", "timeout"):
@@ -934,13 +1406,16 @@ class StreamProber:
             elif status == "success":
                 stats.consecutive_failures = 0
 
-            if ffprobe_data and status == "success":
+            if probed_fields:
+                self._apply_probed_fields(stats, probed_fields)
+            elif ffprobe_data and status == "success":
                 self._parse_ffprobe_data(stats, ffprobe_data)
 
             # Apply measured bitrate if available (overrides ffprobe metadata)
             if measured_bitrate is not None:
                 stats.video_bitrate = measured_bitrate
                 logger.debug("[STREAM-PROBE] Applied measured bitrate: %s bps", measured_bitrate)
+            materialize_sort_columns(stats)
 
             session.commit()
             result = stats.to_dict()
@@ -953,6 +1428,19 @@ class StreamProber:
         finally:
             session.close()
 
+    def _probed_fields(self, ffprobe_data: dict, measured_bitrate: Optional[int]) -> dict:
+        """PROBED_FIELDS values of a successful probe, for sharing with other streams."""
+        stats = StreamStats()
+        self._parse_ffprobe_data(stats, ffprobe_data)
+        if measured_bitrate is not None:
+            stats.video_bitrate = measured_bitrate
+        return {field: getattr(stats, field) for field in PROBED_FIELDS}
+
+    @staticmethod
+    def _apply_probed_fields(stats: StreamStats, fields: dict):
+        for field in PROBED_FIELDS:
+            setattr(stats, field, fields.get(field))
+
     def _parse_ffprobe_data(self, stats: StreamStats, data: dict):
         """Extract relevant fields from ffprobe JSON output."""
         streams = data.get("streams", [])
@@ -1065,29 +1553,67 @@ class StreamProber:
         return None
 
     async def _fetch_all_streams(self) -> list:
-        """Fetch all streams from Dispatcharr (paginated)."""
-        all_streams = []
-        page = 1
-        page_limit = self.stream_fetch_page_limit  # Configurable: pages * 500 = max streams
-        while True:
+        """Fetch all streams from the shared Dispatcharr catalogue.
+
+        The catalogue only re-fetches M3U accounts that changed since the
+        last read, so back-to-back probe runs do not re-paginate everything.
+        """
+        try:
+            return await get_catalog(self.client).get_streams()
+        except Exception as e:
+            logger.error("[STREAM-PROBE] Failed to fetch streams: %s", e)
+            return []
+
+    async def _select_delta_streams(self, streams: list[dict], ttl_hours: float):
+        """Load stored probe state, M3U changes and popularity, then pick streams for a delta run."""
+        from models import ChannelPopularityScore, M3UChangeLog
+
+        now = datetime.utcnow()
+        stream_ids = {s["id"] for s in streams}
+        records = {}
+        added_at = {}
+        channel_scores = {}
+        session = get_session()
+        try:
+            # Whole table rather than IN (...): delta runs target large stream sets
+            for row in session.query(
+                StreamStats.stream_id, StreamStats.probe_status, StreamStats.last_probed, StreamStats.url_hash,
+            ):
+                if row.stream_id in stream_ids:
+                    records[row.stream_id] = ProbeRecord(row.probe_status, row.last_probed, row.url_hash)
+
+            # Names re-added to an M3U since the oldest result we could still keep
+            since = now - timedelta(hours=ttl_hours)
+            for log in session.query(M3UChangeLog).filter(
+                M3UChangeLog.change_type == "streams_added",
+                M3UChangeLog.change_time >= since,
+            ):
+                for stream_name in log.get_stream_names():
+                    key = (log.m3u_account_id, stream_name)
+                    if key not in added_at or log.change_time > added_at[key]:
+                        added_at[key] = log.change_time
+
+            for channel_id, score in session.query(ChannelPopularityScore.channel_id, ChannelPopularityScore.score):
+                channel_scores[channel_id] = score
+        finally:
+            session.close()
+
+        popularity = {}
+        if channel_scores:
             try:
-                result = await self.client.get_streams(page=page, page_size=500)
-                streams = result.get("results", [])
-                all_streams.extend(streams)
-                if not result.get("next"):
-                    break
-                page += 1
-                if page > page_limit:
-                    logger.warning(
-                        "[STREAM-PROBE] Pagination limit reached (%s pages, %s streams). "
-                        "Some streams may be missing. Increase 'Stream Fetch Page Limit' in settings if needed.",
-                        page_limit, len(all_streams)
-                    )
-                    break
+                channels = await get_catalog(self.client).get_channels()
             except Exception as e:
-                logger.error("[STREAM-PROBE] Failed to fetch streams page %s: %s", page, e)
-                break
-        return all_streams
+                logger.warning("[STREAM-PROBE] Delta probe: could not load channels for popularity: %s", e)
+                channels = []
+            for channel in channels:
+                score = channel_scores.get(channel.get("uuid"))
+                if score is None:
+                    continue
+                for stream_id in channel.get("streams", []):
+                    popularity[stream_id] = max(score, popularity.get(stream_id, 0.0))
+
+        url_hashes = {s["id"]: url_fingerprint(normalize_probe_url(s["url"])) if s.get("url") else None for s in streams}
+        return select_delta_streams(streams, records, url_hashes, added_at, popularity, ttl_hours, now=now)
 
     async def _fetch_channel_stream_ids(self, channel_groups_override: list[str] = None) -> tuple[set, dict, dict]:
         """
@@ -1113,7 +1639,7 @@ class StreamProber:
         selected_group_ids = set()
         if groups_to_filter:
             try:
-                all_groups = await self.client.get_channel_groups()
+                all_groups = await get_catalog(self.client).get_channel_groups()
                 available_group_names = [g.get("name") for g in all_groups]
                 logger.debug("[STREAM-PROBE] Requested groups: %s", groups_to_filter)
                 logger.debug("[STREAM-PROBE] Available groups: %s", available_group_names)
@@ -1138,58 +1664,51 @@ class StreamProber:
                 logger.error("[STREAM-PROBE] Failed to fetch channel groups for filtering: %s", e)
                 # Continue without filtering if we can't fetch groups
 
-        page = 1
         total_channels_seen = 0
         channels_included = 0
         channels_excluded_wrong_group = 0
         channels_with_no_streams = 0
         excluded_channel_names = []  # Track names for debug logging
 
-        while True:
-            try:
-                result = await self.client.get_channels(page=page, page_size=500)
-                channels = result.get("results", [])
-                for channel in channels:
-                    total_channels_seen += 1
-                    channel_name = channel.get("name", f"Channel {channel.get('id', 'Unknown')}")
-                    channel_group_id = channel.get("channel_group_id")
-
-                    # If groups are selected, filter by channel_group_id
-                    if selected_group_ids:
-                        if channel_group_id not in selected_group_ids:
-                            channels_excluded_wrong_group += 1
-                            excluded_channel_names.append(channel_name)
-                            continue  # Skip channels not in selected groups
-
-                    channel_number = channel.get("channel_number", 999999)  # Default high number for sorting
-                    # Each channel has a "streams" field which is a list of stream IDs
-                    stream_ids = channel.get("streams", [])
-
-                    if not stream_ids:
-                        channels_with_no_streams += 1
-                        logger.debug("[STREAM-PROBE] Channel '%s' has no streams, skipping", channel_name)
-                        continue
-
-                    channels_included += 1
-                    channel_stream_ids.update(stream_ids)
-                    logger.debug("[STREAM-PROBE] Including channel '%s' with %s stream(s)", channel_name, len(stream_ids))
-
-                    # Map each stream to its channel names and track lowest channel number
-                    for stream_id in stream_ids:
-                        if stream_id not in stream_to_channels:
-                            stream_to_channels[stream_id] = []
-                        stream_to_channels[stream_id].append(channel_name)
-                        # Track the lowest channel number for this stream (for sorting)
-                        if stream_id not in stream_to_channel_number or channel_number < stream_to_channel_number[stream_id]:
-                            stream_to_channel_number[stream_id] = channel_number
-                if not result.get("next"):
-                    break
-                page += 1
-                if page > 50:  # Safety limit
-                    break
-            except Exception as e:
-                logger.error("[STREAM-PROBE] Failed to fetch channels page %s: %s", page, e)
-                break
+        try:
+            channels = await get_catalog(self.client).get_channels()
+        except Exception as e:
+            logger.error("[STREAM-PROBE] Failed to fetch channels: %s", e)
+            channels = []
+
+        for channel in channels:
+            total_channels_seen += 1
+            channel_name = channel.get("name", f"Channel {channel.get('id', 'Unknown')}")
+            channel_group_id = channel.get("channel_group_id")
+
+            # If groups are selected, filter by channel_group_id
+            if selected_group_ids:
+                if channel_group_id not in selected_group_ids:
+                    channels_excluded_wrong_group += 1
+                    excluded_channel_names.append(channel_name)
+                    continue  # Skip channels not in selected groups
+
+            channel_number = channel.get("channel_number", 999999)  # Default high number for sorting
+            # Each channel has a "streams" field which is a list of stream IDs
+            stream_ids = channel.get("streams", [])
+
+            if not stream_ids:
+                channels_with_no_streams += 1
+                logger.debug("[STREAM-PROBE] Channel '%s' has no streams, skipping", channel_name)
+                continue
+
+            channels_included += 1
+            channel_stream_ids.update(stream_ids)
+            logger.debug("[STREAM-PROBE] Including channel '%s' with %s stream(s)", channel_name, len(stream_ids))
+
+            # Map each stream to its channel names and track lowest channel number
+            for stream_id in stream_ids:
+                if stream_id not in stream_to_channels:
+                    stream_to_channels[stream_id] = []
+                stream_to_channels[stream_id].append(channel_name)
+                # Track the lowest channel number for this stream (for sorting)
+                if stream_id not in stream_to_channel_number or channel_number < stream_to_channel_number[stream_id]:
+                    stream_to_channel_number[stream_id] = channel_number
 
         # Log summary of channel filtering
         logger.debug("[STREAM-PROBE] Channel filtering summary:")
@@ -1411,14 +1930,23 @@ class StreamProber:
             logger.warning("[STREAM-PROBE] Invalid regex in profile %s: %s", profile['id'], e)
             return original_url
 
-    async def _auto_reorder_channels(self, channel_groups_override: list[str] = None, stream_to_channels: dict = None) -> list[dict]:
+    async def _auto_reorder_channels(self, channel_groups_override: list[str] = None) -> list[dict]:
         """
         Auto-reorder streams in all channels from the selected groups using smart sort.
         Returns a list of dicts with {channel_id, channel_name, stream_count} for channels that were reordered.
+
+        Runs as one batch: channel stream lists come from the catalogue the
+        probe run just loaded, stream details from one bulk lookup and probe
+        stats from one query. Every new order is computed in memory. Each
+        channel whose order changed is re-read from Dispatcharr before it is
+        written, and skipped if its streams were added or removed meanwhile,
+        so edits made during the run are never undone.
         """
         reordered = []
 
         try:
+            catalog = get_catalog(self.client)
+
             # Determine which groups to filter by
             groups_to_filter = channel_groups_override or []
             logger.info("[STREAM-PROBE-SORT] groups_to_filter=%s", groups_to_filter)
@@ -1427,7 +1955,7 @@ class StreamProber:
             selected_group_ids = set()
             if groups_to_filter:
                 try:
-                    all_groups = await self.client.get_channel_groups()
+                    all_groups = await catalog.get_channel_groups()
                     available_group_names = [g.get("name") for g in all_groups]
                     logger.info("[STREAM-PROBE-SORT] Available groups: %s... (total: %s)", available_group_names[:10], len(all_groups))
                     for group in all_groups:
@@ -1438,134 +1966,107 @@ class StreamProber:
                     logger.error("[STREAM-PROBE] Failed to fetch channel groups for auto-reorder: %s", e)
                     return []
 
-            # Fetch all channels and filter by selected groups
-            page = 1
-            channels_to_reorder = []
-            while True:
-                try:
-                    result = await self.client.get_channels(page=page, page_size=500)
-                    channels = result.get("results", [])
-                    for channel in channels:
-                        # Filter by channel_group_id if groups selected
-                        if selected_group_ids:
-                            channel_group_id = channel.get("channel_group_id")
-                            if channel_group_id not in selected_group_ids:
-                                continue
-
-                        # Add all channels - we'll check stream count later when we fetch full details
-                        # The paginated list might not include full stream data
-                        channels_to_reorder.append(channel)
-
-                    if not result.get("next"):
-                        break
-                    page += 1
-                    if page > 50:  # Safety limit
-                        break
-                except Exception as e:
-                    logger.error("[STREAM-PROBE] Failed to fetch channels page %s for auto-reorder: %s", page, e)
-                    break
-
-            logger.info("[STREAM-PROBE-SORT] Found %s channels to potentially reorder", len(channels_to_reorder))
+            # Channels from the selected groups with more than one stream
+            try:
+                channels = await catalog.get_channels()
+            except Exception as e:
+                logger.error("[STREAM-PROBE] Failed to fetch channels for auto-reorder: %s", e)
+                return []
+            channels_to_reorder = [
+                channel for channel in channels
+                if (not selected_group_ids or channel.get("channel_group_id") in selected_group_ids)
+                and len(channel.get("streams") or []) > 1
+            ]
+            all_stream_ids = sorted({stream_id for channel in channels_to_reorder for stream_id in channel["streams"]})
+            logger.info("[STREAM-PROBE-SORT] Found %s channels to potentially reorder (%s streams)",
+                        len(channels_to_reorder), len(all_stream_ids))
+            if not channels_to_reorder:
+                return []
+
+            # One bulk lookup for the M3U account of every involved stream
+            streams_data = await catalog.get_streams_by_ids(all_stream_ids)
+            # Extract M3U account IDs (handles both direct ID and nested object formats)
+            stream_m3u_map = {s["id"]: self._extract_m3u_account_id(s.get("m3u_account")) for s in streams_data}
+
+            # One query for the stats of every involved stream (chunked below SQLite's variable limit)
+            stats_map = {}
+            session = get_session()
+            try:
+                for i in range(0, len(all_stream_ids), REORDER_STATS_CHUNK):
+                    chunk = all_stream_ids[i:i + REORDER_STATS_CHUNK]
+                    for stat in session.query(StreamStats).filter(StreamStats.stream_id.in_(chunk)):
+                        stats_map[stat.stream_id] = stat
+                session.expunge_all()
+            finally:
+                session.close()
+            logger.info("[STREAM-PROBE-SORT] Loaded stats for %s/%s streams", len(stats_map), len(all_stream_ids))
+
+            def describe(stream_ids: list[int]) -> list[dict]:
+                described = []
+                for idx, stream_id in enumerate(stream_ids):
+                    stat = stats_map.get(stream_id)
+                    described.append({
+                        "id": stream_id,
+                        "name": stat.stream_name if stat else f"Stream {stream_id}",
+                        "position": idx + 1,
+                        "status": stat.probe_status if stat else "unknown",
+                        "resolution": stat.resolution if stat else None,
+                        "bitrate": stat.bitrate if stat else None,
+                    })
+                return described
+
+            # Compute every new order in memory, one sort key per stream
+            sorted_orders = sort_channel_streams(
+                [channel["streams"] for channel in channels_to_reorder], stats_map, stream_m3u_map,
+                self.stream_sort_priority, self.stream_sort_enabled,
+                self.m3u_account_priorities, self.deprioritize_failed_streams,
+            )
+            changes = []
+            for channel, sorted_stream_ids in zip(channels_to_reorder, sorted_orders):
+                channel_id = channel["id"]
+                channel_name = channel.get("name", f"Channel {channel_id}")
+                stream_ids = list(channel["streams"])
+                if sorted_stream_ids == stream_ids:
+                    logger.debug("[STREAM-PROBE-SORT] Channel %s (%s) - No reorder needed (already in correct order)", channel_id, channel_name)
+                    continue
+                streams_before = describe(stream_ids)
+                streams_after = describe(sorted_stream_ids)
+                logger.debug("[STREAM-PROBE-SORT] Channel %s (%s) - Proposing reorder:", channel_id, channel_name)
+                logger.debug("[STREAM-PROBE-SORT]   Before: %s", [f"{s['name']} (pos={s['position']}, status={s['status']}, res={s['resolution']}, br={s['bitrate']})" for s in streams_before])
+                logger.debug("[STREAM-PROBE-SORT]   After:  %s", [f"{s['name']} (pos={s['position']}, status={s['status']}, res={s['resolution']}, br={s['bitrate']})" for s in streams_after])
+                changes.append({
+                    "channel_id": channel_id,
+                    "channel_name": channel_name,
+                    "stream_count": len(stream_ids),
+                    "streams_before": streams_before,
+                    "streams_after": streams_after,
+                })
+            logger.info("[STREAM-PROBE-SORT] %s of %s channels need a new order", len(changes), len(channels_to_reorder))
 
-            # For each channel, fetch full details, get stream stats, and reorder
-            for channel in channels_to_reorder:
-                try:
-                    channel_id = channel["id"]
-                    channel_name = channel.get("name", f"Channel {channel_id}")
-
-                    # Fetch full channel details to get streams list
-                    full_channel = await self.client.get_channel(channel_id)
-                    stream_ids = full_channel.get("streams", [])
-
-                    if len(stream_ids) <= 1:
-                        logger.debug("[STREAM-PROBE-SORT] Channel %s (%s) - Skipping, only %s streams", channel_id, channel_name, len(stream_ids))
-                        continue  # Skip if 0 or 1 streams
-
-                    logger.info("[STREAM-PROBE-SORT] Processing channel %s (%s) with %s streams: %s", channel_id, channel_name, len(stream_ids), stream_ids)
-
-                    # Fetch full stream data to get M3U account mapping
-                    streams_data = await self.client.get_streams_by_ids(stream_ids)
-                    # Log raw stream data for debugging
-                    for s in streams_data:
-                        logger.debug("[STREAM-PROBE-SORT] Channel %s: Stream %s ('%s') has raw m3u_account=%r", channel_id, s['id'], s.get('name', 'Unknown'), s.get('m3u_account'))
-                    # Extract M3U account IDs (handles both direct ID and nested object formats)
-                    stream_m3u_map = {s["id"]: self._extract_m3u_account_id(s.get("m3u_account")) for s in streams_data}
-                    logger.debug("[STREAM-PROBE-SORT] Channel %s: Built M3U map for %s streams: %s", channel_id, len(stream_m3u_map), stream_m3u_map)
-
-                    # Fetch stream stats for this channel's streams (uses get_session and StreamStats imported at top of file)
-                    logger.info("[STREAM-PROBE-SORT] Channel %s: Opening database session...", channel_id)
-                    with get_session() as session:
-                        logger.info("[STREAM-PROBE-SORT] Channel %s: Querying stats for stream_ids: %s", channel_id, stream_ids)
-                        stats_records = session.query(StreamStats).filter(
-                            StreamStats.stream_id.in_(stream_ids)
-                        ).all()
-                        logger.info("[STREAM-PROBE-SORT] Channel %s: Query returned %s records", channel_id, len(stats_records))
-
-                        # Build stats map
-                        stats_map = {stat.stream_id: stat for stat in stats_records}
-                        logger.info("[STREAM-PROBE-SORT] Channel %s: Found stats for %s/%s streams", channel_id, len(stats_map), len(stream_ids))
-
-                        # Sort streams using smart sort logic (similar to frontend)
-                        sorted_stream_ids = self._smart_sort_streams(stream_ids, stats_map, stream_m3u_map, channel_name)
-                        logger.info("[STREAM-PROBE-SORT] Channel %s: Original order: %s", channel_id, stream_ids)
-                        logger.info("[STREAM-PROBE-SORT] Channel %s: Sorted order:   %s", channel_id, sorted_stream_ids)
-                        logger.info("[STREAM-PROBE-SORT] Channel %s: Order changed: %s", channel_id, sorted_stream_ids != stream_ids)
-
-                        # Only update if order changed
-                        if sorted_stream_ids != stream_ids:
-                            # Build detailed stream info for before/after
-                            streams_before = []
-                            streams_after = []
-                            for idx, stream_id in enumerate(stream_ids):
-                                stat = stats_map.get(stream_id)
-                                streams_before.append({
-                                    "id": stream_id,
-                                    "name": stat.stream_name if stat else f"Stream {stream_id}",
-                                    "position": idx + 1,
-                                    "status": stat.probe_status if stat else "unknown",
-                                    "resolution": stat.resolution if stat else None,
-                                    "bitrate": stat.bitrate if stat else None,
-                                })
-
-                            for idx, stream_id in enumerate(sorted_stream_ids):
-                                stat = stats_map.get(stream_id)
-                                streams_after.append({
-                                    "id": stream_id,
-                                    "name": stat.stream_name if stat else f"Stream {stream_id}",
-                                    "position": idx + 1,
-                                    "status": stat.probe_status if stat else "unknown",
-                                    "resolution": stat.resolution if stat else None,
-                                    "bitrate": stat.bitrate if stat else None,
-                                })
-
-                            # Debug logging: log the proposed changes
-                            logger.debug("[STREAM-PROBE-SORT] Channel %s (%s) - Proposing reorder:", channel_id, channel_name)
-                            before_str = [f"{s['name']} (pos={s['position']}, status={s['status']}, res={s['resolution']}, br={s['bitrate']})" for s in streams_before]
-                            after_str = [f"{s['name']} (pos={s['position']}, status={s['status']}, res={s['resolution']}, br={s['bitrate']})" for s in streams_after]
-                            logger.debug("[STREAM-PROBE-SORT]   Before: %s", before_str)
-                            logger.debug("[STREAM-PROBE-SORT]   After:  %s", after_str)
-
-                            # Execute the reorder
-                            try:
-                                await self.client.update_channel(channel_id, {"streams": sorted_stream_ids})
-                                logger.debug("[STREAM-PROBE-SORT] Successfully reordered channel %s (%s)", channel_id, channel_name)
-                            except Exception as update_err:
-                                logger.error("[STREAM-PROBE-SORT] Failed to update channel %s (%s): %s", channel_id, channel_name, update_err)
-                                raise  # Re-raise to be caught by outer exception handler
-
-                            reordered.append({
-                                "channel_id": channel_id,
-                                "channel_name": channel_name,
-                                "stream_count": len(stream_ids),
-                                "streams_before": streams_before,
-                                "streams_after": streams_after,
-                            })
-                        else:
-                            logger.debug("[STREAM-PROBE-SORT] Channel %s (%s) - No reorder needed (already in correct order)", channel_id, channel_name)
+            # Write back only the changed channels
+            semaphore = asyncio.Semaphore(REORDER_UPDATE_CONCURRENCY)
 
-                except Exception as e:
-                    logger.error("[STREAM-PROBE] Failed to reorder channel %s: %s", channel.get('id', 'unknown'), e)
-                    continue
+            async def apply(change: dict) -> bool:
+                async with semaphore:
+                    sorted_stream_ids = [s["id"] for s in change["streams_after"]]
+                    try:
+                        # The catalogue copy may predate edits made while probing
+                        current = await self.client.get_channel(change["channel_id"])
+                        current_stream_ids = list(current.get("streams") or [])
+                        if set(current_stream_ids) != set(sorted_stream_ids):
+                            logger.info("[STREAM-PROBE-SORT] Channel %s (%s) streams changed during the run, skipping reorder", change["channel_id"], change["channel_name"])
+                            return False
+                        if current_stream_ids == sorted_stream_ids:
+                            return False
+                        await self.client.update_channel(change["channel_id"], {"streams": sorted_stream_ids})
+                        logger.debug("[STREAM-PROBE-SORT] Successfully reordered channel %s (%s)", change["channel_id"], change["channel_name"])
+                        return True
+                    except Exception as update_err:
+                        logger.error("[STREAM-PROBE-SORT] Failed to update channel %s (%s): %s", change["channel_id"], change["channel_name"], update_err)
+                        return False
+
+            applied = await asyncio.gather(*[apply(change) for change in changes])
+            reordered = [change for change, ok in zip(changes, applied) if ok]
 
         except Exception as e:
             logger.error("[STREAM-PROBE] Auto-reorder channels failed: %s", e)
@@ -1587,7 +2088,14 @@ class StreamProber:
             channel_name
         )
 
-    async def probe_all_streams(self, channel_groups_override: list[str] = None, skip_m3u_refresh: bool = False, stream_ids_filter: list[int] = None):
+    async def probe_all_streams(
+        self,
+        channel_groups_override: list[str] = None,
+        skip_m3u_refresh: bool = False,
+        stream_ids_filter: list[int] = None,
+        delta: bool = False,
+        delta_ttl_hours: float = DEFAULT_DELTA_TTL_HOURS,
+    ):
         """Probe all streams that are in channels (runs in background).
 
         Uses parallel probing - streams from different M3U accounts (or same M3U with
@@ -1600,8 +2108,12 @@ class StreamProber:
                              Use this for on-demand probes from the UI.
             stream_ids_filter: Optional list of specific stream IDs to probe.
                               If provided, only these streams will be probed (useful for re-probing failed streams).
+            delta: If True, only probe streams that are new, changed, failing, re-added
+                   in the M3U, or older than their popularity-weighted TTL
+                   (see probe_selection). Ignored when stream_ids_filter is given.
+            delta_ttl_hours: Re-probe interval in delta mode for streams of unwatched channels.
         """
-        logger.info("[STREAM-PROBE] probe_all_streams called with channel_groups_override=%s, skip_m3u_refresh=%s, stream_ids_filter=%s", channel_groups_override, skip_m3u_refresh, len(stream_ids_filter) if stream_ids_filter else 0)
+        logger.info("[STREAM-PROBE] probe_all_streams called with channel_groups_override=%s, skip_m3u_refresh=%s, stream_ids_filter=%s, delta=%s", channel_groups_override, skip_m3u_refresh, len(stream_ids_filter) if stream_ids_filter else 0, delta)
         logger.info("[STREAM-PROBE] Settings: parallel_probing_enabled=%s, max_concurrent_probes=%s, "
                      "profile_distribution_strategy=%s",
                      self.parallel_probing_enabled, self.max_concurrent_probes,
@@ -1628,7 +2140,13 @@ class StreamProber:
 
         probed_count = 0
         start_time = datetime.utcnow()
+        cache_hits_before = self._probe_cache_hits
+        result_writer = None
         try:
+            if self.probe_cache_minutes:
+                loaded = self._load_stored_probes()
+                logger.debug("[STREAM-PROBE] Loaded %s stored probe results into the probe cache", loaded)
+
             # Refresh M3U accounts if configured AND not explicitly skipped
             # On-demand probes from UI should skip refresh; only scheduled probes refresh
             if self.refresh_m3us_before_probe and not skip_m3u_refresh:
@@ -1662,7 +2180,7 @@ class StreamProber:
             self._account_profiles = {}  # account_id -> [sorted list of active profile dicts]
             self._profile_max_streams = {}  # profile_id -> max_streams
             try:
-                m3u_accounts = await self.client.get_m3u_accounts()
+                m3u_accounts = await get_catalog(self.client).get_m3u_accounts()
                 for account in m3u_accounts:
                     account_id = account["id"]
                     m3u_accounts_map[account_id] = account.get("name", f"M3U {account_id}")
@@ -1706,8 +2224,8 @@ class StreamProber:
                     channel_names = stream_to_channels.get(missing_id, ["Unknown"])
                     logger.warning("[STREAM-PROBE]   Missing stream %s is referenced by channels: %s", missing_id, channel_names)
 
-            # Filter to only streams that are in channels
-            streams_to_probe = [s for s in all_streams if s["id"] in channel_stream_ids]
+            # Filter to only streams that are in channels (copied: catalogue dicts are shared)
+            streams_to_probe = [dict(s) for s in all_streams if s["id"] in channel_stream_ids]
             logger.debug("[STREAM-PROBE] Matched %s streams to probe", len(streams_to_probe))
 
             # If stream_ids_filter is provided, further filter to only those specific streams
@@ -1718,6 +2236,13 @@ class StreamProber:
                 streams_to_probe = [s for s in streams_to_probe if s["id"] in stream_ids_filter_set]
                 logger.info("[STREAM-PROBE] Filtered to %s specific streams (from %s channel streams, requested %s)", len(streams_to_probe), original_count, len(stream_ids_filter))
 
+            # Delta mode: keep only streams whose stored result is out of date
+            if delta and not stream_ids_filter:
+                original_count = len(streams_to_probe)
+                streams_to_probe, reasons = await self._select_delta_streams(streams_to_probe, delta_ttl_hours)
+                logger.info("[STREAM-PROBE] Delta probe: %s of %s streams need probing (%s)", len(streams_to_probe), original_count,
+                            ", ".join(f"{reason}={count}" for reason, count in reasons.most_common()) or "none")
+
             # Skip recently probed streams if configured
             if self.skip_recently_probed_hours > 0:
                 from datetime import timedelta
@@ -1761,42 +2286,84 @@ class StreamProber:
             else:
                 logger.info("[STREAM-PROBE] Starting probe of %s streams", len(streams_to_probe))
 
+            # Results are queued and written in batches off the event loop
+            result_writer = ProbeResultWriter()
+            result_writer.start()
+
             if self.parallel_probing_enabled:
                 # ========== PARALLEL PROBING MODE ==========
                 logger.info("[STREAM-PROBE] Starting parallel probe of %s streams (filtered from %s total)", len(streams_to_probe), len(all_streams))
                 logger.info("[STREAM-PROBE] Rate limit settings: max_concurrent_probes=%s", self.max_concurrent_probes)
 
-                # Global concurrency limit - max simultaneous probes regardless of M3U account
-                # This prevents system resource exhaustion when probing many streams
-                global_probe_semaphore = asyncio.Semaphore(self.max_concurrent_probes)
-                logger.info("[STREAM-PROBE] Semaphore created with limit=%s", self.max_concurrent_probes)
-
-                # Track our own probe connections per M3U (separate from Dispatcharr's active connections)
-                # This lets us know how many streams WE are currently probing per M3U
-                probe_connections_lock = asyncio.Lock()
-                probe_connections = {}  # profile_id (or m3u_id fallback) -> count of our active probes
-
-                # Results lock for thread-safe updates
-                results_lock = asyncio.Lock()
-
-                # Track active concurrent probes for debugging
-                active_probe_count = [0]  # Use list to allow modification in nested function
-                active_probe_count_lock = asyncio.Lock()
+                # Streams wait in per-account ready queues; the global cap and
+                # per-account/per-profile capacity are tracked as tokens that
+                # finished probes hand back, waking the loop below.
+                scheduler = ProbeScheduler(self.max_concurrent_probes)
+                for stream in streams_to_probe:
+                    scheduler.add(self._extract_m3u_account_id(stream.get("m3u_account")), stream)
+                self._probe_scheduler = scheduler
 
-                async def probe_single_stream(stream: dict, display_string: str) -> tuple[str, dict]:
+                # Dispatcharr's own connection counts only matter for capped accounts
+                # (HDHomeRun tuners are always capped)
+                needs_connection_counts = any(m3u_max_streams.values()) or any(
+                    _is_hdhomerun_url(s.get("url", "")) for s in streams_to_probe
+                )
+                dispatcharr_profile_conns = {}
+                dispatcharr_connections = {}
+
+                def admit(m3u_account_id, stream: dict) -> Admission:
+                    """Decide whether the next stream of an account can start now."""
+                    if not m3u_account_id or self._has_cached_probe(stream.get("url")):
+                        # Cached feeds need no provider connection
+                        return Admission.start()
+
+                    # HDHomeRun-style URLs (local tuner devices) lock a tuner per probe:
+                    # limit to 2 concurrent probes regardless of max_streams
+                    is_hdhomerun = _is_hdhomerun_url(stream.get("url", ""))
+                    effective_max = 2 if is_hdhomerun else m3u_max_streams.get(m3u_account_id, 0)
+
+                    # Ramp-up gate: limit concurrent probes per account
+                    self._init_account_ramp(m3u_account_id)
+                    if self._is_account_held(m3u_account_id):
+                        return Admission.wait(self._get_account_hold_remaining(m3u_account_id))
+                    dispatcharr_active = dispatcharr_connections.get(m3u_account_id, 0)
+                    our_account_total = scheduler.active_for(m3u_account_id)
+                    ramp_limit = self._get_account_ramp_limit(m3u_account_id, effective_max, dispatcharr_active)
+                    if our_account_total >= ramp_limit:
+                        return Admission.wait()
+                    if effective_max <= 0:
+                        return Admission.start()
+
+                    total_account_conns = dispatcharr_active + our_account_total
+                    profiles = self._account_profiles.get(m3u_account_id, [])
+                    if not is_hdhomerun and profiles:
+                        # Profile-aware selection
+                        selected_profile = self._select_probe_profile(
+                            m3u_account_id, dispatcharr_profile_conns,
+                            scheduler.profile_counts, effective_max, total_account_conns
+                        )
+                        if selected_profile:
+                            return Admission.start(selected_profile)
+                    elif total_account_conns < effective_max:
+                        # HDHomeRun or no profiles - use account-level logic
+                        return Admission.start()
+
+                    if our_account_total > 0:
+                        return Admission.wait()  # Wait for our active probes to finish
+                    m3u_name = m3u_accounts_map.get(m3u_account_id, f"M3U {m3u_account_id}")
+                    return Admission.skip(f"M3U '{m3u_name}' at max connections ({dispatcharr_active}/{effective_max})")
+
+                async def probe_single_stream(stream: dict, m3u_account_id, selected_profile: Optional[dict]) -> tuple[str, dict]:
                     """Probe a single stream and return (status, stream_info)."""
                     stream_id = stream["id"]
                     stream_name = stream.get("name", f"Stream {stream_id}")
-                    stream_url = stream.get("url", "")
-                    m3u_account_id = self._extract_m3u_account_id(stream.get("m3u_account"))
+                    original_url = stream.get("url", "")
+                    stream_url = original_url
+                    is_hdhomerun = _is_hdhomerun_url(stream_url)
 
                     # Apply profile URL rewriting if a profile was selected
-                    selected_profile = stream.get("_selected_profile")
                     if selected_profile:
                         stream_url = self._rewrite_url_for_profile(stream_url, selected_profile)
-
-                    # Log probe details for traceability
-                    if selected_profile:
                         logger.debug("[STREAM-PROBE] Stream %s (%s): "
                                      "strategy=%s, "
                                      "profile=%s ('%s'), "
@@ -1810,277 +2377,115 @@ class StreamProber:
                                      "no profile (direct URL), url=%s",
                                      stream_id, stream_name, stream_url)
 
-                    # Acquire global semaphore to limit total concurrent probes
-                    async with global_probe_semaphore:
-                        # Track concurrent probe count
-                        async with active_probe_count_lock:
-                            active_probe_count[0] += 1
-                            current_count = active_probe_count[0]
-                            if current_count > self.max_concurrent_probes:
-                                logger.error("[STREAM-PROBE] RATE LIMIT EXCEEDED! active=%s, limit=%s", current_count, self.max_concurrent_probes)
-                            else:
-                                logger.debug("[STREAM-PROBE] Acquired semaphore: active=%s/%s, stream=%s", current_count, self.max_concurrent_probes, stream_id)
-                        try:
-                            result = await self.probe_stream(stream_id, stream_url, stream_name)
-                            probe_status = result.get("probe_status", "failed")
-                            error_message = result.get("error_message", "")
-                            stream_info = {"id": stream_id, "name": stream_name, "url": stream_url}
-
-                            if probe_status != "success":
-                                stream_info["error"] = error_message or "Unknown error"
-                                if m3u_account_id:
-                                    self._record_probe_failure(m3u_account_id, error_message)
-                            else:
-                                if m3u_account_id:
-                                    self._record_probe_success(m3u_account_id)
-
-                            return (probe_status, stream_info)
-                        finally:
-                            # Track concurrent probe count decrement
-                            async with active_probe_count_lock:
-                                active_probe_count[0] -= 1
-                                logger.debug("[STREAM-PROBE] Released semaphore: active=%s/%s, stream=%s", active_probe_count[0], self.max_concurrent_probes, stream_id)
-                            # Release our probe connection (by profile_id or m3u_account_id)
-                            release_key = selected_profile["id"] if selected_profile else m3u_account_id
-                            if release_key:
-                                async with probe_connections_lock:
-                                    if release_key in probe_connections:
-                                        probe_connections[release_key] = max(0, probe_connections[release_key] - 1)
-
-                # Process streams with parallel probing
-                pending_streams = list(streams_to_probe)  # Streams waiting to be probed
-                active_tasks = {}  # task -> (stream, display_string)
-
-                while pending_streams or active_tasks:
-                    if self._probe_cancelled:
-                        self._probe_progress_status = "cancelled"
-                        # Cancel active tasks
-                        for task in active_tasks:
-                            task.cancel()
-                        break
-
-                    # Check for pause - wait while paused
-                    while self._probe_paused and not self._probe_cancelled:
-                        if self._probe_progress_status != "paused":
-                            self._probe_progress_status = "paused"
-                            self._probe_progress_current_stream = "Probe paused"
-                            await self._update_probe_notification()
-                        await asyncio.sleep(1)
-
-                    # If cancelled while paused, break
-                    if self._probe_cancelled:
-                        self._probe_progress_status = "cancelled"
-                        for task in active_tasks:
-                            task.cancel()
-                        break
-
-                    # Restore status after unpause
-                    if self._probe_progress_status == "paused":
-                        self._probe_progress_status = "probing"
+                    try:
+                        result = await self.probe_stream(stream_id, stream_url, stream_name, cache_url=original_url, writer=result_writer)
+                        probe_status = result.get("probe_status", "failed")
+                        error_message = result.get("error_message", "")
+                        stream_info = {"id": stream_id, "name": stream_name, "url": stream_url}
+
+                        if probe_status != "success":
+                            stream_info["error"] = error_message or "Unknown error"
+                            if m3u_account_id:
+                                self._record_probe_failure(
+                                    m3u_account_id, error_message, result.get("probe_seconds"),
+                                    timed_out=probe_status == "timeout",
+                                )
+                        elif m3u_account_id and not result.get("from_cache"):
+                            self._record_probe_success(m3u_account_id, result.get("probe_seconds"))
 
-                    # Get fresh connection counts from Dispatcharr (profile and account level)
-                    dispatcharr_profile_conns = await self._get_profile_active_connections()
-                    # Derive account-level from profile-level
-                    dispatcharr_connections = {}
-                    for pid, cnt in dispatcharr_profile_conns.items():
-                        aid = self._profile_to_account_map.get(pid, pid)
-                        dispatcharr_connections[aid] = dispatcharr_connections.get(aid, 0) + cnt
-                    if dispatcharr_connections:
-                        logger.info("[STREAM-PROBE] Account-level active connections: %s", dispatcharr_connections)
-
-                    # Try to start new probes for streams that have available M3U capacity
-                    streams_started_this_round = []
-                    for stream in pending_streams:
-                        m3u_account_id = self._extract_m3u_account_id(stream.get("m3u_account"))
-                        stream_id = stream["id"]
-                        stream_name = stream.get("name", f"Stream {stream_id}")
-                        stream_url = stream.get("url", "")
-
-                        # Build display string
-                        display_parts = []
-                        if stream_id in stream_to_channels and stream_to_channels[stream_id]:
-                            channel_names = stream_to_channels[stream_id]
-                            if len(channel_names) == 1:
-                                display_parts.append(channel_names[0])
-                            else:
-                                display_parts.append(f"{channel_names[0]} (+{len(channel_names)-1})")
-                        else:
-                            display_parts.append("Unknown Channel")
-                        display_parts.append(stream_name)
-
-                        if m3u_account_id and m3u_account_id in m3u_accounts_map:
-                            m3u_name = m3u_accounts_map[m3u_account_id]
-                            display_string = f"{display_parts[0]}: {display_parts[1]} | {m3u_name}"
-                        else:
-                            display_string = f"{display_parts[0]}: {display_parts[1]}"
-
-                        # Check M3U capacity
-                        can_probe = True
-                        skip_reason = None
-
-                        # Detect HDHomeRun-style URLs (local tuner devices)
-                        # These need limited parallelism because each probe locks a tuner
-                        is_hdhomerun = False
-                        if stream_url:
-                            # HDHomeRun URLs: http://192.168.x.x:5004/auto/... or http://IP:5004/...
-                            if ':5004/' in stream_url or 'hdhomerun' in stream_url.lower():
-                                is_hdhomerun = True
+                        return (probe_status, stream_info)
+                    finally:
+                        # Hand the capacity token back; HDHomeRun tuners get a
+                        # short cooldown to release before the next probe
+                        scheduler.release(
+                            m3u_account_id, selected_profile,
+                            cooldown=HDHOMERUN_RELEASE_DELAY if is_hdhomerun else 0.0,
+                        )
 
-                        if m3u_account_id:
-                            max_streams = m3u_max_streams.get(m3u_account_id, 0)
-
-                            # For HDHomeRun devices, limit to 2 concurrent probes regardless of max_streams
-                            # This prevents 5XX errors from overwhelming the tuner while still allowing some parallelism
-                            effective_max = 2 if is_hdhomerun else max_streams
-
-                            if effective_max > 0:
-                                # Calculate total account connections (dispatcharr + our probes)
-                                dispatcharr_active = dispatcharr_connections.get(m3u_account_id, 0)
-                                async with probe_connections_lock:
-                                    our_profile_conns_snapshot = dict(probe_connections)
-                                # Sum our probes for this account across all profiles
-                                profiles = self._account_profiles.get(m3u_account_id, [])
-                                if profiles:
-                                    our_account_total = sum(
-                                        our_profile_conns_snapshot.get(p["id"], 0) for p in profiles
-                                    )
-                                else:
-                                    our_account_total = our_profile_conns_snapshot.get(m3u_account_id, 0)
-                                total_account_conns = dispatcharr_active + our_account_total
+                active_tasks = {}  # task -> display_string
 
-                                # Ramp-up gate: limit concurrent probes per account
-                                self._init_account_ramp(m3u_account_id)
-                                if self._is_account_held(m3u_account_id):
-                                    can_probe = False
-                                else:
-                                    ramp_limit = self._get_account_ramp_limit(m3u_account_id, effective_max, dispatcharr_active)
-                                    if our_account_total >= ramp_limit:
-                                        can_probe = False
-
-                                if can_probe:
-                                    if not is_hdhomerun and profiles:
-                                        # Profile-aware selection
-                                        selected_profile = self._select_probe_profile(
-                                            m3u_account_id, dispatcharr_profile_conns,
-                                            our_profile_conns_snapshot, effective_max, total_account_conns
-                                        )
-                                        if selected_profile:
-                                            stream["_selected_profile"] = selected_profile
-                                        else:
-                                            if our_account_total > 0:
-                                                can_probe = False  # Wait for active probes to finish
-                                            else:
-                                                m3u_name = m3u_accounts_map.get(m3u_account_id, f"M3U {m3u_account_id}")
-                                                skip_reason = f"M3U '{m3u_name}' at max connections ({dispatcharr_active}/{effective_max})"
-                                                logger.info("[STREAM-PROBE] Skipping stream %s (%s): %s", stream_id, stream_name, skip_reason)
-                                    else:
-                                        # HDHomeRun or no profiles - use account-level logic
-                                        if total_account_conns >= effective_max:
-                                            if our_account_total > 0:
-                                                can_probe = False  # Wait, don't skip
-                                            else:
-                                                m3u_name = m3u_accounts_map.get(m3u_account_id, f"M3U {m3u_account_id}")
-                                                skip_reason = f"M3U '{m3u_name}' at max connections ({dispatcharr_active}/{effective_max})"
-                                                logger.info("[STREAM-PROBE] Skipping stream %s (%s): %s", stream_id, stream_name, skip_reason)
-                            else:
-                                # Unlimited account — still apply ramp-up
-                                self._init_account_ramp(m3u_account_id)
-                                dispatcharr_active = dispatcharr_connections.get(m3u_account_id, 0)
-                                if self._is_account_held(m3u_account_id):
-                                    can_probe = False
-                                else:
-                                    async with probe_connections_lock:
-                                        our_profile_conns_snapshot = dict(probe_connections)
-                                    profiles = self._account_profiles.get(m3u_account_id, [])
-                                    if profiles:
-                                        our_account_total = sum(our_profile_conns_snapshot.get(p["id"], 0) for p in profiles)
-                                    else:
-                                        our_account_total = our_profile_conns_snapshot.get(m3u_account_id, 0)
-                                    ramp_limit = self._get_account_ramp_limit(m3u_account_id, 0, dispatcharr_active)
-                                    if our_account_total >= ramp_limit:
-                                        can_probe = False
-
-                        if skip_reason:
-                            # Skip this stream - M3U is at capacity with Dispatcharr connections
-                            stream_info = {"id": stream_id, "name": stream_name, "url": stream_url, "reason": skip_reason}
-                            async with results_lock:
-                                self._probe_progress_skipped_count += 1
-                                self._probe_skipped_streams.append(stream_info)
-                            probed_count += 1
-                            streams_started_this_round.append(stream)
-                            self._probe_progress_current = probed_count
-                            await self._update_probe_notification()
-                            continue
-
-                        if can_probe:
-                            # Reserve a probe connection (by profile_id or m3u_account_id)
-                            selected_profile = stream.get("_selected_profile")
-                            reserve_key = selected_profile["id"] if selected_profile else m3u_account_id
-                            if reserve_key:
-                                async with probe_connections_lock:
-                                    probe_connections[reserve_key] = probe_connections.get(reserve_key, 0) + 1
-
-                            # Start the probe task
-                            task = asyncio.create_task(probe_single_stream(stream, display_string))
-                            active_tasks[task] = (stream, display_string)
-                            streams_started_this_round.append(stream)
-
-                            # Update progress display with active streams
-                            # Show actual concurrent probe count (inside semaphore), not queued tasks
-                            active_displays = [info[1] for info in active_tasks.values()]
-                            async with active_probe_count_lock:
-                                actual_concurrent = active_probe_count[0]
-                            if len(active_displays) == 1:
-                                self._probe_progress_current_stream = active_displays[0]
-                            elif actual_concurrent <= 1:
-                                # Tasks queued but only 0-1 actually running
-                                self._probe_progress_current_stream = f"[{len(active_displays)} queued] {active_displays[0]}"
-                            else:
-                                self._probe_progress_current_stream = f"[{actual_concurrent} parallel] {active_displays[0]}"
-
-                    # Remove started streams from pending
-                    for stream in streams_started_this_round:
-                        pending_streams.remove(stream)
-
-                    # If we have active tasks, wait for at least one to complete
-                    if active_tasks:
-                        done, _ = await asyncio.wait(active_tasks.keys(), return_when=asyncio.FIRST_COMPLETED)
-
-                        completed_had_hdhomerun = False
-                        for task in done:
-                            stream, display_string = active_tasks.pop(task)
-                            stream_url = stream.get("url", "")
-                            if ':5004/' in stream_url or 'hdhomerun' in stream_url.lower():
-                                completed_had_hdhomerun = True
+                try:
+                    while True:
+                        # Collect finished probes
+                        for task in [t for t in active_tasks if t.done()]:
+                            active_tasks.pop(task)
                             try:
                                 probe_status, stream_info = task.result()
-                                async with results_lock:
-                                    if probe_status == "success":
-                                        self._probe_progress_success_count += 1
-                                        self._probe_success_streams.append(stream_info)
-                                    else:
-                                        self._probe_progress_failed_count += 1
-                                        self._probe_failed_streams.append(stream_info)
-                                probed_count += 1
-                                self._probe_progress_current = probed_count
-                                await self._update_probe_notification()
+                                if probe_status == "success":
+                                    self._probe_progress_success_count += 1
+                                    self._probe_success_streams.append(stream_info)
+                                else:
+                                    self._probe_progress_failed_count += 1
+                                    self._probe_failed_streams.append(stream_info)
                             except asyncio.CancelledError:
                                 logger.debug("[STREAM-PROBE] Probe task cancelled")
                             except Exception as e:
                                 logger.error("[STREAM-PROBE] Probe task failed: %s", e)
-                                probed_count += 1
-                                self._probe_progress_current = probed_count
+                            probed_count += 1
+                            self._probe_progress_current = probed_count
+                            await self._update_probe_notification()
+
+                        if self._probe_cancelled:
+                            self._probe_progress_status = "cancelled"
+                            for task in active_tasks:
+                                task.cancel()
+                            break
+
+                        if self._probe_paused:
+                            # Running probes finish; nothing new starts until resumed
+                            if self._probe_progress_status != "paused":
+                                self._probe_progress_status = "paused"
+                                self._probe_progress_current_stream = "Probe paused"
                                 await self._update_probe_notification()
+                        elif scheduler.pending:
+                            # Restore status after unpause
+                            if self._probe_progress_status == "paused":
+                                self._probe_progress_status = "probing"
+
+                            if needs_connection_counts:
+                                # Cached for a few seconds; only re-derived when refreshed
+                                profile_conns = await self._get_profile_active_connections()
+                                if profile_conns is not dispatcharr_profile_conns:
+                                    dispatcharr_profile_conns = profile_conns
+                                    dispatcharr_connections = {}
+                                    for pid, cnt in dispatcharr_profile_conns.items():
+                                        aid = self._profile_to_account_map.get(pid, pid)
+                                        dispatcharr_connections[aid] = dispatcharr_connections.get(aid, 0) + cnt
+                                    if dispatcharr_connections:
+                                        logger.info("[STREAM-PROBE] Account-level active connections: %s", dispatcharr_connections)
+
+                            for m3u_account_id, stream, admission in scheduler.dispatch(admit):
+                                stream_id = stream["id"]
+                                stream_name = stream.get("name", f"Stream {stream_id}")
+
+                                if admission.action == Admission.SKIP:
+                                    # M3U is at capacity with Dispatcharr connections
+                                    logger.info("[STREAM-PROBE] Skipping stream %s (%s): %s", stream_id, stream_name, admission.reason)
+                                    stream_info = {"id": stream_id, "name": stream_name, "url": stream.get("url", ""), "reason": admission.reason}
+                                    self._probe_progress_skipped_count += 1
+                                    self._probe_skipped_streams.append(stream_info)
+                                    probed_count += 1
+                                    self._probe_progress_current = probed_count
+                                    await self._update_probe_notification()
+                                    continue
+
+                                task = asyncio.create_task(probe_single_stream(stream, m3u_account_id, admission.profile))
+                                task.add_done_callback(lambda _: scheduler.wake())
+                                active_tasks[task] = self._probe_display_string(stream, stream_to_channels, m3u_accounts_map)
+
+                                # Update progress display with active streams
+                                active_displays = list(active_tasks.values())
+                                if len(active_displays) == 1:
+                                    self._probe_progress_current_stream = active_displays[0]
+                                else:
+                                    self._probe_progress_current_stream = f"[{len(active_displays)} parallel] {active_displays[0]}"
 
-                        # Small delay only for HDHomeRun devices to let tuners release
-                        if completed_had_hdhomerun:
-                            await asyncio.sleep(0.5)
-                    elif not pending_streams:
-                        # No active tasks and no pending streams - we're done
-                        break
-                    else:
-                        # All pending streams are waiting for M3U capacity - wait a bit and retry
-                        await asyncio.sleep(0.5)
+                        if not scheduler.pending and not active_tasks:
+                            break
+                        await scheduler.wait()
+                finally:
+                    scheduler.close()
+                    self._probe_scheduler = None
             else:
                 # ========== SEQUENTIAL PROBING MODE ==========
                 logger.info("[STREAM-PROBE] Starting sequential probe of %s streams (filtered from %s total)", len(streams_to_probe), len(all_streams))
@@ -2111,27 +2516,8 @@ class StreamProber:
                     stream_name = stream.get("name", f"Stream {stream_id}")
                     stream_url = stream.get("url", "")
 
-                    # Build display string: "channel(s): stream | M3U"
-                    display_parts = []
-
-                    # Add channel name(s)
-                    if stream_id in stream_to_channels and stream_to_channels[stream_id]:
-                        channel_names = stream_to_channels[stream_id]
-                        if len(channel_names) == 1:
-                            display_parts.append(channel_names[0])
-                        else:
-                            display_parts.append(f"{channel_names[0]} (+{len(channel_names)-1})")
-                    else:
-                        display_parts.append("Unknown Channel")
-
-                    display_parts.append(stream_name)
-
                     m3u_account_id = self._extract_m3u_account_id(stream.get("m3u_account"))
-                    if m3u_account_id and m3u_account_id in m3u_accounts_map:
-                        m3u_name = m3u_accounts_map[m3u_account_id]
-                        display_string = f"{display_parts[0]}: {display_parts[1]} | {m3u_name}"
-                    else:
-                        display_string = f"{display_parts[0]}: {display_parts[1]}"
+                    display_string = self._probe_display_string(stream, stream_to_channels, m3u_accounts_map)
 
                     self._probe_progress_current = probed_count + 1
                     self._probe_progress_current_stream = display_string
@@ -2188,7 +2574,7 @@ class StreamProber:
                             logger.debug("[STREAM-PROBE] Account %s: waiting %.1fs", m3u_account_id, hold_remaining)
                             await asyncio.sleep(hold_remaining)
 
-                    result = await self.probe_stream(stream_id, stream_url, stream_name)
+                    result = await self.probe_stream(stream_id, stream_url, stream_name, cache_url=stream.get("url"), writer=result_writer)
 
                     # Track success/failure
                     probe_status = result.get("probe_status", "failed")
@@ -2197,25 +2583,31 @@ class StreamProber:
                     if probe_status == "success":
                         self._probe_progress_success_count += 1
                         self._probe_success_streams.append(stream_info)
-                        if m3u_account_id:
-                            self._record_probe_success(m3u_account_id)
+                        if m3u_account_id and not result.get("from_cache"):
+                            self._record_probe_success(m3u_account_id, result.get("probe_seconds"))
                     else:
                         self._probe_progress_failed_count += 1
                         stream_info["error"] = error_message or "Unknown error"
                         self._probe_failed_streams.append(stream_info)
                         if m3u_account_id:
-                            self._record_probe_failure(m3u_account_id, error_message)
+                            self._record_probe_failure(
+                                m3u_account_id, error_message, result.get("probe_seconds"),
+                                timed_out=probe_status == "timeout",
+                            )
 
                     probed_count += 1
                     await self._update_probe_notification()
                     await asyncio.sleep(0.5)  # Base rate limiting delay
 
+            # Everything must be on disk before auto-reorder reads the stats back
+            await result_writer.close()
             logger.info("[STREAM-PROBE] Completed probing %s streams", probed_count)
             logger.info("[STREAM-PROBE] Final counts: success=%s, "
-                       "failed=%s, skipped=%s",
+                       "failed=%s, skipped=%s, reused=%s",
                        self._probe_progress_success_count,
                        self._probe_progress_failed_count,
-                       self._probe_progress_skipped_count)
+                       self._probe_progress_skipped_count,
+                       self._probe_cache_hits - cache_hits_before)
             self._probe_progress_status = "completed"
             self._probe_progress_current_stream = ""
 
@@ -2227,7 +2619,7 @@ class StreamProber:
                 self._probe_progress_status = "reordering"
                 self._probe_progress_current_stream = "Reordering streams..."
                 try:
-                    reordered_channels = await self._auto_reorder_channels(channel_groups_override, stream_to_channels)
+                    reordered_channels = await self._auto_reorder_channels(channel_groups_override)
                     logger.info("[STREAM-PROBE-SORT] Auto-reordered %s channels", len(reordered_channels))
                 except Exception as e:
                     logger.error("[STREAM-PROBE] Auto-reorder failed: %s", e)
@@ -2252,6 +2644,11 @@ class StreamProber:
 
             return {"status": "failed", "error": str(e), "probed": probed_count}
         finally:
+            if result_writer is not None:
+                # Keep results probed before a failure; no-op after a normal close
+                await result_writer.close()
+            # Carry each account's learned concurrency over to the next run
+            self._persist_account_limits()
             self._probing_in_progress = False
 
     def get_probe_progress(self) -> dict:
@@ -0,0 +1,152 @@
+"""
+Stream ranking for smart sort.
+
+A channel's streams are ordered by a tuple key built from the enabled sort
+criteria in priority order (resolution, bitrate, framerate, m3u_priority,
+audio_channels), highest first. Failed, timed-out, pending and unprobed
+streams can be pushed below every working stream.
+
+The numeric inputs are materialized on stream_stats at probe time
+(sort_height, sort_fps, sort_bitrate) so ranking does not re-parse the
+"1920x1080" / "29.97" text columns for every stream of every channel.
+Rows probed before those columns existed fall back to parsing.
+
+rank_channels() builds each stream's key once and sorts every channel from
+those keys, so a stream shared by several channels is only looked at once.
+"""
+from typing import Iterable, Optional
+
+SORT_CRITERIA = ("resolution", "bitrate", "framerate", "m3u_priority", "audio_channels")
+DEFAULT_SORT_PRIORITY = ["resolution", "bitrate", "framerate", "m3u_priority", "audio_channels"]
+DEFAULT_SORT_ENABLED = {"resolution": True, "bitrate": True, "framerate": True, "m3u_priority": False, "audio_channels": False}
+DEPRIORITIZED_STATUSES = ("failed", "timeout", "pending")
+
+
+def parse_height(resolution: Optional[str]) -> Optional[int]:
+    """Height from a "WxH" resolution, 0 if unparsable, None if unknown."""
+    if not resolution:
+        return None
+    parts = resolution.split("x")
+    if len(parts) != 2:
+        return 0
+    try:
+        return int(parts[1])
+    except ValueError:
+        return 0
+
+
+def parse_fps(fps: Optional[str]) -> Optional[float]:
+    """Frame rate from the stored fps text, 0.0 if unparsable, None if unknown."""
+    if not fps:
+        return None
+    try:
+        return float(fps)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def effective_bitrate(video_bitrate: Optional[int], bitrate: Optional[int]) -> Optional[int]:
+    """Bitrate used for sorting: measured/video bitrate first, overall bitrate second."""
+    return video_bitrate or bitrate
+
+
+def materialize_sort_columns(stats) -> None:
+    """Fill a StreamStats row's sort_* columns from its current metadata."""
+    stats.sort_height = parse_height(stats.resolution)
+    stats.sort_fps = parse_fps(stats.fps)
+    stats.sort_bitrate = effective_bitrate(stats.video_bitrate, stats.bitrate)
+
+
+def _get(stat, name: str):
+    """Read a field from a StreamStats row or its to_dict() form."""
+    if isinstance(stat, dict):
+        return stat.get(name)
+    return getattr(stat, name, None)
+
+
+def stream_sort_key(
+    stat,
+    m3u_priority: int,
+    active_criteria: list[str],
+    deprioritize_failed: bool = True,
+) -> tuple:
+    """
+    Sort key for one stream; lower sorts first.
+
+    Args:
+        stat: StreamStats row or dict (None if never probed)
+        m3u_priority: Priority of the stream's M3U account (higher first)
+        active_criteria: Enabled criteria in priority order
+        deprioritize_failed: Sort failed/timeout/pending/unprobed streams last
+    """
+    status = _get(stat, "probe_status") if stat is not None else None
+    if deprioritize_failed and (stat is None or status in DEPRIORITIZED_STATUSES):
+        return (1,) + (0,) * len(active_criteria)
+
+    if status != "success":
+        # M3U priority does not need probe data
+        return (0,) + tuple(-m3u_priority if c == "m3u_priority" else 0 for c in active_criteria)
+
+    values = [0]
+    for criterion in active_criteria:
+        if criterion == "resolution":
+            height = _get(stat, "sort_height")
+            if height is None:
+                height = parse_height(_get(stat, "resolution"))
+            values.append(-(height or 0))
+        elif criterion == "bitrate":
+            bitrate = _get(stat, "sort_bitrate")
+            if bitrate is None:
+                bitrate = effective_bitrate(_get(stat, "video_bitrate"), _get(stat, "bitrate"))
+            values.append(-(bitrate or 0))
+        elif criterion == "framerate":
+            fps = _get(stat, "sort_fps")
+            if fps is None:
+                fps = parse_fps(_get(stat, "fps"))
+            values.append(-(fps or 0))
+        elif criterion == "m3u_priority":
+            values.append(-m3u_priority)
+        elif criterion == "audio_channels":
+            values.append(-(_get(stat, "audio_channels") or 0))
+    return tuple(values)
+
+
+def rank_channels(
+    channels: Iterable[list[int]],
+    stats_map: dict,
+    stream_m3u_map: Optional[dict] = None,
+    active_criteria: Optional[list[str]] = None,
+    m3u_account_priorities: Optional[dict[str, int]] = None,
+    deprioritize_failed: bool = True,
+) -> list[list[int]]:
+    """
+    Sort the streams of many channels in one pass.
+
+    Args:
+        channels: Stream ID lists, one per channel
+        stats_map: stream_id -> StreamStats row or dict
+        stream_m3u_map: stream_id -> m3u_account_id (for m3u_priority)
+        active_criteria: Enabled criteria in priority order
+        m3u_account_priorities: M3U account priorities (account_id_str -> priority)
+        deprioritize_failed: Sort failed/timeout/pending/unprobed streams last
+
+    Returns:
+        Sorted stream ID lists in the order of channels (sort is stable)
+    """
+    stream_m3u_map = stream_m3u_map or {}
+    m3u_account_priorities = m3u_account_priorities or {}
+    if active_criteria is None:
+        active_criteria = [c for c in DEFAULT_SORT_PRIORITY if DEFAULT_SORT_ENABLED.get(c)]
+
+    keys = {}
+    channels = [list(stream_ids) for stream_ids in channels]
+    for stream_ids in channels:
+        for stream_id in stream_ids:
+            if stream_id in keys:
+                continue
+            m3u_account_id = stream_m3u_map.get(stream_id)
+            m3u_priority = m3u_account_priorities.get(str(m3u_account_id), 0) if m3u_account_id is not None else 0
+            keys[stream_id] = stream_sort_key(
+                stats_map.get(stream_id), m3u_priority, active_criteria, deprioritize_failed,
+            )
+    return [sorted(stream_ids, key=keys.__getitem__) for stream_ids in channels]
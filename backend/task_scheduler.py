@@ -17,6 +17,8 @@ from enum import Enum
 from typing import Optional
 from zoneinfo import ZoneInfo
 
+from dispatcharr_limiter import Priority, request_priority
+
 logger = logging.getLogger(__name__)
 
 
@@ -546,8 +548,9 @@ class TaskScheduler(ABC):
             # Create progress notification
             await self._create_progress_notification()
 
-            # Execute the task
-            result = await self.execute()
+            # Execute the task (Dispatcharr requests yield to interactive UI traffic)
+            with request_priority(Priority.BACKGROUND):
+                result = await self.execute()
             result.started_at = self._progress.started_at
             result.completed_at = datetime.utcnow()
 
@@ -50,6 +50,8 @@ class StreamProbeTask(TaskScheduler):
         self._batch_size_override: Optional[int] = None
         self._timeout_override: Optional[int] = None
         self._max_concurrent_override: Optional[int] = None
+        self._delta: bool = False  # Only probe new, changed, failing or stale streams
+        self._delta_ttl_hours: Optional[int] = None
 
     def get_config(self) -> dict:
         """Get stream probe configuration."""
@@ -59,6 +61,8 @@ class StreamProbeTask(TaskScheduler):
             "batch_size": self._batch_size_override,
             "timeout": self._timeout_override,
             "max_concurrent": self._max_concurrent_override,
+            "delta": self._delta,
+            "delta_ttl_hours": self._delta_ttl_hours,
         }
 
     def update_config(self, config: dict) -> None:
@@ -69,6 +73,8 @@ class StreamProbeTask(TaskScheduler):
         - batch_size: int - number of streams per batch
         - timeout: int - probe timeout in seconds
         - max_concurrent: int - max concurrent probe operations
+        - delta: bool - only probe new, changed, failing or stale streams
+        - delta_ttl_hours: int - re-probe interval for unwatched streams in delta mode
         """
         if "channel_groups" in config:
             # Preserve distinction: None = not configured, [] = explicitly empty
@@ -82,10 +88,14 @@ class StreamProbeTask(TaskScheduler):
             self._timeout_override = config["timeout"]
         if "max_concurrent" in config:
             self._max_concurrent_override = config["max_concurrent"]
+        if "delta" in config:
+            self._delta = bool(config["delta"])
+        if "delta_ttl_hours" in config:
+            self._delta_ttl_hours = config["delta_ttl_hours"]
 
-        logger.info("[%s] Config updated: channel_groups=%s, auto_sync_groups=%s, batch_size=%s, timeout=%s, max_concurrent=%s",
+        logger.info("[%s] Config updated: channel_groups=%s, auto_sync_groups=%s, batch_size=%s, timeout=%s, max_concurrent=%s, delta=%s",
                    self.task_id, self._channel_groups, self._auto_sync_groups,
-                   self._batch_size_override, self._timeout_override, self._max_concurrent_override)
+                   self._batch_size_override, self._timeout_override, self._max_concurrent_override, self._delta)
 
     def set_prober(self, prober):
         """Set the StreamProber instance to delegate to.
@@ -189,7 +199,10 @@ class StreamProbeTask(TaskScheduler):
                     logger.warning("[%s] Failed to validate channel groups: %s", self.task_id, e)
 
             # Start the probe in background so we can poll for progress
-            logger.info("[%s] Starting stream probe (groups: %s)", self.task_id, channel_groups)
+            logger.info("[%s] Starting stream probe (groups: %s, delta: %s)", self.task_id, channel_groups, self._delta)
+            delta_kwargs = {}
+            if self._delta_ttl_hours:
+                delta_kwargs["delta_ttl_hours"] = self._delta_ttl_hours
 
             import asyncio
             # Run probe_all_streams as a background task
@@ -197,6 +210,8 @@ class StreamProbeTask(TaskScheduler):
                 self._prober.probe_all_streams(
                     channel_groups_override=channel_groups,
                     skip_m3u_refresh=False,  # Scheduled probes should refresh
+                    delta=self._delta,
+                    **delta_kwargs,
                 )
             )
 
@@ -3,7 +3,9 @@ Pytest configuration and shared fixtures for backend tests.
 """
 import os
 import sys
+from contextlib import ExitStack
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from sqlalchemy import create_engine
@@ -69,6 +71,28 @@ def override_get_session(test_session):
     return _get_test_session
 
 
+@pytest.fixture(scope="function")
+def session_modules():
+    """
+    Modules whose get_session the session_factory fixture replaces.
+    Override this fixture in a test module (or parametrize it) to list the modules under test.
+    """
+    return []
+
+
+@pytest.fixture(scope="function")
+def session_factory(test_engine, session_modules):
+    """
+    Session factory bound to the test engine, patched in as get_session of each module in session_modules.
+    For code that opens its own sessions (write-behind workers, background tasks).
+    """
+    factory = sessionmaker(bind=test_engine, expire_on_commit=False)
+    with ExitStack() as stack:
+        for module in session_modules:
+            stack.enter_context(patch.object(module, "get_session", factory))
+        yield factory
+
+
 @pytest.fixture(scope="function")
 async def async_client(test_session, test_engine):
     """
@@ -0,0 +1,36 @@
+"""
+Stubs for StreamProber tests.
+"""
+import inspect
+from unittest.mock import MagicMock
+
+from stream_prober import StreamProber
+
+
+def stub_save_probe_result(prober: StreamProber) -> MagicMock:
+    """
+    Replace prober._save_probe_result with a mock that skips the database.
+
+    Arguments are bound to the real method's signature, so the stub follows
+    any parameters added to it. Returns a dict with stream_id, stream_name,
+    probe_status, error_message, data (the ffprobe output), bitrate and
+    fields (probed_fields reused from another stream).
+    """
+    signature = inspect.signature(StreamProber._save_probe_result)
+
+    def save(*args, **kwargs):
+        bound = signature.bind(prober, *args, **kwargs)
+        bound.apply_defaults()
+        values = bound.arguments
+        return {
+            "stream_id": values["stream_id"],
+            "stream_name": values["stream_name"],
+            "probe_status": values["status"],
+            "error_message": values["error_message"],
+            "data": values["ffprobe_data"],
+            "bitrate": values["measured_bitrate"],
+            "fields": values["probed_fields"],
+        }
+
+    prober._save_probe_result = MagicMock(side_effect=save)
+    return prober._save_probe_result
@@ -10,7 +10,7 @@ Mocks: ffmpeg_builder modules (probe, validation, command_generator).
 """
 import json
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from models import FFmpegProfile
 
@@ -63,7 +63,7 @@ class TestProbeSource:
         mock_result.bit_rate = 5000000
         mock_result.size = 0
 
-        with patch("routers.ffmpeg.probe_source", return_value=mock_result):
+        with patch("routers.ffmpeg.probe_source_async", AsyncMock(return_value=mock_result)):
             response = await async_client.post("/api/ffmpeg/probe", json={
                 "path": "http://example.com/stream.ts",
             })
@@ -80,7 +80,7 @@ class TestProbeSource:
         mock_result.success = False
         mock_result.error = "Connection refused"
 
-        with patch("routers.ffmpeg.probe_source", return_value=mock_result):
+        with patch("routers.ffmpeg.probe_source_async", AsyncMock(return_value=mock_result)):
             response = await async_client.post("/api/ffmpeg/probe", json={
                 "path": "http://unreachable/stream.ts",
             })
@@ -43,6 +43,14 @@ class TestHealthCheck:
             assert data["release_channel"] == "beta"
             assert data["git_commit"] == "abc123"
 
+    @pytest.mark.asyncio
+    async def test_health_includes_pool_stats(self, async_client):
+        """GET /api/health reports Dispatcharr connection pool usage."""
+        stats = {"connections_open": 3, "requests_in_flight": 1}
+        with patch("routers.health.get_pool_stats", return_value=stats):
+            response = await async_client.get("/api/health")
+            assert response.json()["dispatcharr_pool"] == stats
+
 
 class TestCacheStats:
     """Tests for GET /api/cache/stats endpoint."""
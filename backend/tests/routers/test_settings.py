@@ -55,6 +55,21 @@ def _mock_settings(**overrides):
         "probe_retry_count": 0,
         "probe_retry_delay": 5,
         "stream_fetch_page_limit": 100,
+        "probe_cache_minutes": 60,
+        "probe_preflight_enabled": False,
+        "probe_single_connection": False,
+        "media_process_budget": 0,
+        "dispatcharr_page_concurrency": 4,
+        "dispatcharr_max_connections": 50,
+        "dispatcharr_max_keepalive_connections": 20,
+        "dispatcharr_keepalive_expiry": 30.0,
+        "dispatcharr_http2": False,
+        "dispatcharr_timeout": 30.0,
+        "dispatcharr_endpoint_timeouts": {"/api/epg/grid/": 120.0},
+        "dispatcharr_max_concurrent_requests": 16,
+        "dispatcharr_retry_attempts": 2,
+        "dispatcharr_circuit_failure_threshold": 5,
+        "dispatcharr_circuit_reset_seconds": 30.0,
         "stream_sort_priority": ["resolution"],
         "stream_sort_enabled": {"resolution": True},
         "m3u_account_priorities": {},
@@ -146,6 +161,40 @@ class TestUpdateSettings:
         assert response.status_code == 400
         assert "password" in response.json()["detail"].lower()
 
+    @pytest.mark.asyncio
+    async def test_url_change_clears_server_data_and_derived_rows(self, async_client, test_session):
+        """Viewer rollups and per-channel series go with the old server's rows; daily totals stay."""
+        from datetime import date, datetime
+        from models import BandwidthDaily, BandwidthRollup, BandwidthSample, UniqueViewerRollup
+
+        test_session.add_all([
+            BandwidthDaily(date=date(2026, 1, 1), bytes_transferred=5),
+            BandwidthRollup(period="all", period_start=date(1970, 1, 1), bytes_transferred=5),
+            UniqueViewerRollup(date=date(2026, 1, 1), channel_id="", channel_name="", ip_sketch=b"S", connection_count=1),
+            BandwidthSample(resolution=60, bucket_start=datetime(2026, 1, 1), channel_id=""),
+            BandwidthSample(resolution=60, bucket_start=datetime(2026, 1, 1), channel_id="uuid-1"),
+        ])
+        test_session.commit()
+        current = _mock_settings(url="http://old-server:8000")
+
+        with patch("routers.settings.get_settings", return_value=current), \
+             patch("routers.settings.save_settings"), \
+             patch("routers.settings.clear_settings_cache"), \
+             patch("routers.settings.reset_client"), \
+             patch("routers.settings.get_prober", return_value=None), \
+             patch("routers.settings.get_cache"):
+            response = await async_client.post("/api/settings", json={
+                "url": "http://new-server:8000",
+                "username": "admin",
+                "password": "secret",
+            })
+
+        assert response.status_code == 200
+        assert test_session.query(UniqueViewerRollup).count() == 0
+        assert [s.channel_id for s in test_session.query(BandwidthSample)] == [""]
+        assert test_session.query(BandwidthDaily).count() == 1
+        assert test_session.query(BandwidthRollup).count() == 1
+
 
 class TestTestConnection:
     """Tests for POST /api/settings/test."""
@@ -325,3 +374,28 @@ class TestResetStats:
         assert response.status_code == 200
         data = response.json()
         assert data["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_clears_only_series_derived_from_cleared_rows(self, async_client, test_session):
+        """Per-channel series go with the channel bandwidth; daily totals and viewer rollups stay."""
+        from datetime import date, datetime
+        from models import BandwidthDaily, BandwidthRollup, BandwidthSample, UniqueViewerRollup
+
+        test_session.add_all([
+            BandwidthDaily(date=date(2026, 1, 1), bytes_transferred=5),
+            BandwidthRollup(period="all", period_start=date(1970, 1, 1), bytes_transferred=5),
+            UniqueViewerRollup(date=date(2026, 1, 1), channel_id="", channel_name="", ip_sketch=b"S", connection_count=1),
+            BandwidthSample(resolution=60, bucket_start=datetime(2026, 1, 1), channel_id=""),
+            BandwidthSample(resolution=60, bucket_start=datetime(2026, 1, 1), channel_id="uuid-1"),
+        ])
+        test_session.commit()
+
+        response = await async_client.post("/api/settings/reset-stats")
+
+        assert response.status_code == 200
+        assert set(response.json()["details"]) == {
+            "hidden_groups", "watch_stats", "bandwidth_records", "stream_stats", "popularity_scores",
+        }
+        for model in (BandwidthDaily, BandwidthRollup, UniqueViewerRollup):
+            assert test_session.query(model).count() == 1
+        assert [s.channel_id for s in test_session.query(BandwidthSample)] == [""]
@@ -145,6 +145,62 @@ class TestBandwidthStats:
         assert "today" in response.json()
 
 
+class TestBandwidthSeries:
+    """Tests for GET /api/stats/bandwidth/series."""
+
+    @pytest.mark.asyncio
+    async def test_returns_stored_series(self, async_client):
+        """Queries the requested tier and labels the resolution."""
+        with patch("routers.stats.query_series", return_value={
+            "resolution": 3600, "channel_id": None, "points": [{"bytes_in": 1}],
+        }) as query:
+            response = await async_client.get("/api/stats/bandwidth/series?hours=48&resolution=1h")
+
+        assert response.status_code == 200
+        assert response.json()["resolution"] == "1h"
+        assert query.call_args.args[2] == 3600
+
+    @pytest.mark.asyncio
+    async def test_raw_reads_tracker_ring(self, async_client):
+        """Raw resolution comes from the tracker's in-memory samples."""
+        tracker = MagicMock()
+        tracker.samples.query.return_value = []
+        with patch("routers.stats.get_tracker", return_value=tracker):
+            response = await async_client.get("/api/stats/bandwidth/series?hours=1&resolution=raw&channel_id=abc")
+
+        assert response.status_code == 200
+        assert response.json() == {"resolution": "raw", "channel_id": "abc", "points": []}
+        assert tracker.samples.query.call_args.args[2] == "abc"
+
+    @pytest.mark.asyncio
+    async def test_rejects_bad_resolution(self, async_client):
+        """Unknown resolutions and oversized ranges are 400s."""
+        response = await async_client.get("/api/stats/bandwidth/series?resolution=5s")
+        assert response.status_code == 400
+
+        response = await async_client.get("/api/stats/bandwidth/series?hours=10000&resolution=1m")
+        assert response.status_code == 400
+
+
+class TestLiveStats:
+    """Tests for GET /api/stats/live."""
+
+    @pytest.mark.asyncio
+    async def test_streams_server_sent_events(self, async_client):
+        """Serves the hub's event stream as text/event-stream."""
+        async def stream():
+            yield 'event: channels\ndata: {"channels": []}\n\n'
+
+        hub = MagicMock()
+        hub.stream.return_value = stream()
+        with patch("routers.stats.get_live_stats", return_value=hub):
+            response = await async_client.get("/api/stats/live")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == 'event: channels\ndata: {"channels": []}\n\n'
+
+
 class TestTopWatched:
     """Tests for GET /api/stats/top-watched."""
 
@@ -5,6 +5,8 @@ Tests: GET /api/stream-preview/{stream_id}, GET /api/channel-preview/{channel_id
 Mocks: get_client(), get_settings(), subprocess, httpx.
 Focus on error paths and setup logic (streaming responses tested via status codes).
 """
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -186,3 +188,53 @@ class TestChannelPreview:
 
         assert response.status_code == 500
         assert "FFmpeg" in response.json()["detail"]
+
+
+def fake_ffmpeg(chunks: list[bytes]) -> MagicMock:
+    """Popen stand-in that runs until terminated."""
+    process = MagicMock()
+    process.stdout.read.side_effect = chunks + [b""]
+    exit_codes = []
+    process.poll.side_effect = lambda: exit_codes[0] if exit_codes else None
+    process.terminate.side_effect = lambda: exit_codes.append(-15)
+    return process
+
+
+class TestPreviewProcess:
+    """Tests for the PREVIEW slot held by a preview FFmpeg process."""
+
+    @pytest.fixture
+    def manager(self):
+        from media_processes import MediaProcessManager
+        manager = MediaProcessManager(budget=2)
+        with patch("routers.stream_preview.get_media_processes", return_value=manager), \
+             patch("routers.stream_preview.PREVIEW_EXIT_POLL_INTERVAL", 0.01):
+            yield manager
+
+    @pytest.mark.asyncio
+    async def test_dropped_response_stops_ffmpeg_and_releases_slot(self, manager):
+        """A client gone before the first chunk does not leak FFmpeg or its slot."""
+        from routers.stream_preview import start_preview_process
+
+        process = fake_ffmpeg([b"ts"])
+        with patch("subprocess.Popen", return_value=process), \
+             patch("routers.stream_preview.PREVIEW_START_TIMEOUT", 0.05):
+            await start_preview_process(["ffmpeg"])
+            assert manager.running == 1
+            await asyncio.sleep(0.2)
+
+        process.terminate.assert_called_once()
+        assert manager.running == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_released_once_after_exit(self, manager):
+        from routers.stream_preview import start_preview_process
+
+        process = fake_ffmpeg([b"a", b"b"])
+        with patch("subprocess.Popen", return_value=process):
+            preview = await start_preview_process(["ffmpeg"])
+            assert [chunk async for chunk in preview.chunks()] == [b"a", b"b"]
+            await asyncio.sleep(0.05)
+            preview.release()
+
+        assert manager.running == 0
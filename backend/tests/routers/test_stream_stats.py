@@ -203,7 +203,7 @@ class TestComputeSort:
         mock_settings.deprioritize_failed_streams = False
 
         with patch("routers.stream_stats.get_settings", return_value=mock_settings), \
-             patch("stream_prober.smart_sort_streams", return_value=[10, 20]) as mock_sort:
+             patch("stream_prober.sort_channel_streams", return_value=[[10, 20]]) as mock_sort:
             response = await async_client.post("/api/stream-stats/compute-sort", json={
                 "channels": [{"channel_id": 1, "stream_ids": [20, 10]}],
                 "mode": "smart",
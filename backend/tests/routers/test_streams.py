@@ -170,22 +170,45 @@ class TestGetProviders:
             {"id": 1, "name": "Provider A"},
             {"id": 2, "name": "Provider B"},
         ]
+        mock_cache = MagicMock()
+        mock_cache.get.return_value = None
 
-        with patch("routers.streams.get_client", return_value=mock_client):
+        with patch("routers.streams.get_client", return_value=mock_client), \
+             patch("routers.streams.get_cache", return_value=mock_cache):
             response = await async_client.get("/api/providers")
 
         assert response.status_code == 200
         data = response.json()
         assert len(data) == 2
         assert data[0]["name"] == "Provider A"
+        mock_cache.set.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_returns_cached_providers(self, async_client):
+        """Returns cached (possibly stale) providers without calling Dispatcharr."""
+        mock_client = AsyncMock()
+        mock_cache = MagicMock()
+        mock_cache.get.return_value = [{"id": 1, "name": "Cached Provider"}]
+
+        with patch("routers.streams.get_client", return_value=mock_client), \
+             patch("routers.streams.get_cache", return_value=mock_cache):
+            response = await async_client.get("/api/providers")
+
+        assert response.status_code == 200
+        assert response.json()[0]["name"] == "Cached Provider"
+        mock_client.get_m3u_accounts.assert_not_called()
+        assert mock_cache.get.call_args.kwargs["revalidate"] is not None
 
     @pytest.mark.asyncio
     async def test_client_error_returns_500(self, async_client):
         """Returns 500 when client fails."""
         mock_client = AsyncMock()
         mock_client.get_m3u_accounts.side_effect = Exception("Timeout")
+        mock_cache = MagicMock()
+        mock_cache.get.return_value = None
 
-        with patch("routers.streams.get_client", return_value=mock_client):
+        with patch("routers.streams.get_client", return_value=mock_client), \
+             patch("routers.streams.get_cache", return_value=mock_cache):
             response = await async_client.get("/api/providers")
 
         assert response.status_code == 500
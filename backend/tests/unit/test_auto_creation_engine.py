@@ -88,9 +88,18 @@ class TestAutoCreationEngineLoadData:
 
         assert len(self.engine._existing_channels) == 2
         assert len(self.engine._existing_groups) == 2
-        self.client.get_channels.assert_called_once_with(page=1, page_size=100)
+        self.client.get_channels.assert_called_once_with(page=1, page_size=500)
         self.client.get_channel_groups.assert_called_once()
 
+    def test_load_existing_data_reloads_channels(self):
+        """Each run reads channels from Dispatcharr, not a cached catalogue copy."""
+        for _ in range(2):
+            asyncio.get_event_loop().run_until_complete(
+                self.engine._load_existing_data()
+            )
+
+        assert self.client.get_channels.call_count == 2
+
     def test_load_existing_data_api_failure(self):
         """Load existing data handles API failures gracefully."""
         self.client.get_channels = AsyncMock(side_effect=Exception("API error"))
@@ -0,0 +1,114 @@
+"""
+Unit tests for batched auto-reorder after a probe run.
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.orm import sessionmaker
+
+import stream_prober
+from models import StreamStats
+from stream_prober import StreamProber
+
+
+def create_client(channels, **update_kwargs):
+    """Client whose get_channel returns the current Dispatcharr copy of each channel."""
+    by_id = {channel["id"]: channel for channel in channels}
+    client = MagicMock()
+    client.get_channel = AsyncMock(side_effect=lambda channel_id: by_id[channel_id])
+    client.update_channel = AsyncMock(**update_kwargs)
+    return client
+
+
+def create_catalog(channels, streams):
+    catalog = MagicMock()
+    catalog.get_channels = AsyncMock(return_value=channels)
+    catalog.get_channel_groups = AsyncMock(return_value=[{"id": 1, "name": "Sports"}, {"id": 2, "name": "News"}])
+    catalog.get_streams_by_ids = AsyncMock(return_value=streams)
+    return catalog
+
+
+class TestAutoReorder:
+    """Tests for StreamProber._auto_reorder_channels."""
+
+    async def test_bulk_lookups_and_changed_channels_only(self, test_engine):
+        factory = sessionmaker(bind=test_engine, expire_on_commit=False)
+        session = factory()
+        session.add_all([
+            StreamStats(stream_id=1, probe_status="success", resolution="1280x720", bitrate=3000000),
+            StreamStats(stream_id=2, probe_status="success", resolution="1920x1080", bitrate=6000000),
+            StreamStats(stream_id=3, probe_status="success", resolution="1920x1080", bitrate=6000000),
+            StreamStats(stream_id=4, probe_status="success", resolution="1280x720", bitrate=3000000),
+        ])
+        session.commit()
+        session.close()
+
+        channels = [
+            {"id": 10, "name": "Needs reorder", "channel_group_id": 1, "streams": [1, 2]},
+            {"id": 11, "name": "Already sorted", "channel_group_id": 1, "streams": [3, 4]},
+            {"id": 12, "name": "Single stream", "channel_group_id": 1, "streams": [1]},
+            {"id": 13, "name": "Other group", "channel_group_id": 2, "streams": [4, 3]},
+        ]
+        streams = [{"id": i, "m3u_account": 1} for i in range(1, 5)]
+        catalog = create_catalog(channels, streams)
+        client = create_client(channels)
+        prober = StreamProber(client=client)
+
+        with patch.object(stream_prober, "get_session", factory), \
+                patch.object(stream_prober, "get_catalog", return_value=catalog):
+            reordered = await prober._auto_reorder_channels(["Sports"])
+
+        catalog.get_streams_by_ids.assert_awaited_once_with([1, 2, 3, 4])
+        client.update_channel.assert_awaited_once_with(10, {"streams": [2, 1]})
+        assert [r["channel_id"] for r in reordered] == [10]
+        assert [s["id"] for s in reordered[0]["streams_before"]] == [1, 2]
+        assert reordered[0]["streams_after"][0]["resolution"] == "1920x1080"
+
+    async def test_failed_updates_are_not_reported(self, test_engine):
+        factory = sessionmaker(bind=test_engine, expire_on_commit=False)
+        session = factory()
+        session.add_all([
+            StreamStats(stream_id=1, probe_status="failed"),
+            StreamStats(stream_id=2, probe_status="success", resolution="1920x1080"),
+        ])
+        session.commit()
+        session.close()
+
+        channels = [
+            {"id": 10, "name": "A", "channel_group_id": 1, "streams": [1, 2]},
+            {"id": 11, "name": "B", "channel_group_id": 1, "streams": [1, 2]},
+        ]
+        catalog = create_catalog(channels, [{"id": 1, "m3u_account": 1}, {"id": 2, "m3u_account": 1}])
+        client = create_client(channels, side_effect=[RuntimeError("boom"), None])
+        prober = StreamProber(client=client)
+
+        with patch.object(stream_prober, "get_session", factory), \
+                patch.object(stream_prober, "get_catalog", return_value=catalog):
+            reordered = await prober._auto_reorder_channels()
+
+        assert client.update_channel.await_count == 2
+        assert [r["channel_id"] for r in reordered] == [11]
+
+    async def test_streams_edited_during_run_are_not_overwritten(self, test_engine):
+        factory = sessionmaker(bind=test_engine, expire_on_commit=False)
+        session = factory()
+        session.add_all([
+            StreamStats(stream_id=1, probe_status="failed"),
+            StreamStats(stream_id=2, probe_status="success", resolution="1920x1080"),
+        ])
+        session.commit()
+        session.close()
+
+        cached = [{"id": 10, "name": "A", "channel_group_id": 1, "streams": [1, 2]}]
+        catalog = create_catalog(cached, [{"id": 1, "m3u_account": 1}, {"id": 2, "m3u_account": 1}])
+        # A stream was added in Dispatcharr after the catalogue was loaded
+        client = create_client([{"id": 10, "name": "A", "channel_group_id": 1, "streams": [1, 2, 5]}])
+        prober = StreamProber(client=client)
+
+        with patch.object(stream_prober, "get_session", factory), \
+                patch.object(stream_prober, "get_catalog", return_value=catalog):
+            reordered = await prober._auto_reorder_channels()
+
+        client.get_channel.assert_awaited_once_with(10)
+        client.update_channel.assert_not_awaited()
+        assert reordered == []
+
@@ -0,0 +1,102 @@
+"""
+Unit tests for the bandwidth time series store.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import bandwidth_timeseries
+import bandwidth_writer
+from bandwidth_timeseries import (
+    MAX_POINTS, TOTAL_SERIES, Sample, SampleRing, bucket_start, pick_resolution, purge_samples, query_series,
+)
+from bandwidth_writer import BandwidthBatch, write_bandwidth_batch
+from models import BandwidthSample
+
+
+NOW = datetime(2026, 3, 10, 12, 30, 45)
+
+
+@pytest.fixture
+def session_modules():
+    return [bandwidth_writer, bandwidth_timeseries]
+
+
+def sample(ts: datetime, bytes_in: int = 100, bitrate: int = 1000, channel_id: str = TOTAL_SERIES) -> Sample:
+    return Sample(ts, channel_id, bytes_in, bytes_in * 2, bitrate, bitrate * 2, clients=2, channels=1)
+
+
+def write_samples(*samples: Sample) -> None:
+    batch = BandwidthBatch()
+    for s in samples:
+        batch.add_sample(s)
+    write_bandwidth_batch(batch)
+
+
+class TestRollup:
+    """Tests for writing samples into every tier."""
+
+    def test_bucket_start(self):
+        assert bucket_start(NOW, 60) == datetime(2026, 3, 10, 12, 30)
+        assert bucket_start(NOW, 3600) == datetime(2026, 3, 10, 12)
+        assert bucket_start(NOW, 86400) == datetime(2026, 3, 10)
+
+    def test_samples_roll_up_across_flushes(self, session_factory):
+        write_samples(sample(NOW, 100, 1000), sample(NOW + timedelta(seconds=10), 50, 4000))
+        write_samples(sample(NOW + timedelta(minutes=1), 25, 2000))
+
+        minutes = query_series(NOW - timedelta(minutes=5), NOW + timedelta(minutes=5), resolution=60)["points"]
+        assert [(p["bytes_in"], p["peak_bitrate_in"]) for p in minutes] == [(150, 4000), (25, 2000)]
+        day = query_series(NOW - timedelta(days=1), NOW + timedelta(days=1), resolution=86400)["points"]
+        assert day[0]["bytes_in"] == 175
+        assert day[0]["bytes_out"] == 350
+        assert day[0]["peak_bitrate_out"] == 8000
+
+    def test_channels_are_separate_series(self, session_factory):
+        write_samples(sample(NOW, 100), sample(NOW, 40, channel_id="abc"))
+
+        result = query_series(NOW - timedelta(hours=1), NOW + timedelta(hours=1), resolution=3600, channel_id="abc")
+        assert result["channel_id"] == "abc"
+        assert [p["bytes_in"] for p in result["points"]] == [40]
+
+
+class TestQuery:
+    """Tests for resolution choice, bounds and retention."""
+
+    def test_pick_resolution(self):
+        assert pick_resolution(NOW - timedelta(hours=6), NOW, now=NOW) == 60
+        assert pick_resolution(NOW - timedelta(days=7), NOW, now=NOW) == 3600
+        assert pick_resolution(NOW - timedelta(days=365), NOW, now=NOW) == 86400
+
+    def test_rejects_oversized_range(self, session_factory):
+        with pytest.raises(ValueError):
+            query_series(NOW - timedelta(minutes=MAX_POINTS + 10), NOW, resolution=60)
+        with pytest.raises(ValueError):
+            query_series(NOW - timedelta(hours=1), NOW, resolution=5)
+
+    def test_purge_applies_per_tier_retention(self, session_factory):
+        write_samples(sample(NOW - timedelta(days=3)), sample(NOW))
+
+        purge_samples(now=NOW)
+
+        session = session_factory()
+        kept = {
+            (row.resolution, row.bucket_start)
+            for row in session.query(BandwidthSample).filter(BandwidthSample.bucket_start < NOW - timedelta(days=2))
+        }
+        session.close()
+        assert kept == {(3600, datetime(2026, 3, 7, 12)), (86400, datetime(2026, 3, 7))}
+
+
+class TestSampleRing:
+    """Tests for the in-memory per-poll buffer."""
+
+    def test_keeps_last_hour_of_polls(self):
+        ring = SampleRing(poll_interval=600)  # 6 polls per hour
+        for i in range(10):
+            ts = NOW + timedelta(minutes=10 * i)
+            ring.append([sample(ts, i), sample(ts, i, channel_id="abc")])
+
+        result = ring.query(NOW, NOW + timedelta(days=1))
+        assert [s.bytes_in for s in result] == [4, 5, 6, 7, 8, 9]
+        assert len(ring.query(NOW, NOW + timedelta(days=1), "abc")) == 6
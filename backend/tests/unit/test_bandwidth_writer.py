@@ -0,0 +1,202 @@
+"""
+Unit tests for batched bandwidth stat persistence.
+"""
+import asyncio
+import threading
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import bandwidth_tracker
+import bandwidth_writer
+from bandwidth_tracker import BandwidthTracker
+from bandwidth_writer import BandwidthBatch, WatchSession, write_bandwidth_batch
+from models import BandwidthDaily, ChannelBandwidth, ChannelWatchStats, UniqueClientConnection
+
+
+DAY = date(2026, 1, 1)
+
+
+class FakeClock(datetime):
+    """datetime whose now() advances 10 seconds per call to tick()."""
+    current = datetime(2026, 1, 1, 12)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+    @classmethod
+    def tick(cls):
+        cls.current += timedelta(seconds=10)
+
+
+@pytest.fixture
+def session_modules():
+    return [bandwidth_writer, bandwidth_tracker]
+
+
+@pytest.fixture(autouse=True)
+def no_journal():
+    with patch("journal.log_entry"):
+        yield
+
+
+def fetch_all(factory, model) -> list:
+    session = factory()
+    try:
+        return session.query(model).all()
+    finally:
+        session.close()
+
+
+def channel_stats(*channels: tuple[str, int, list[str]]) -> dict:
+    """Dispatcharr stats payload from (channel_id, total_bytes, client IPs) tuples."""
+    return {"channels": [
+        {
+            "channel_id": channel_id,
+            "channel_name": f"Name {channel_id}",
+            "total_bytes": total_bytes,
+            "client_count": len(ips),
+            "avg_bitrate_kbps": 1000,
+            "clients": [{"ip_address": ip} for ip in ips],
+        }
+        for channel_id, total_bytes, ips in channels
+    ]}
+
+
+class TestWriteBandwidthBatch:
+    """Tests for the batched UPSERT."""
+
+    def test_writes_accumulate_and_keep_peaks(self, session_factory):
+        for bytes_in, peak in ((100, 5), (50, 3)):
+            batch = BandwidthBatch()
+            batch.add_daily(DAY, bytes_transferred=bytes_in, bytes_in=bytes_in, peak_clients=peak)
+            batch.add_channel("a", "A", DAY, bytes_delta=bytes_in, clients=peak, watch_seconds=10, connections=1)
+            batch.add_watch("a", "A", datetime(2026, 1, 1, 12), watch_count=1, watch_seconds=10)
+            write_bandwidth_batch(batch)
+
+        daily = fetch_all(session_factory, BandwidthDaily)[0]
+        assert (daily.bytes_transferred, daily.bytes_in, daily.peak_clients) == (150, 150, 5)
+        channel = fetch_all(session_factory, ChannelBandwidth)[0]
+        assert (channel.bytes_transferred, channel.peak_clients, channel.total_watch_seconds, channel.connection_count) == (150, 5, 20, 2)
+        watch = fetch_all(session_factory, ChannelWatchStats)[0]
+        assert (watch.watch_count, watch.total_watch_seconds) == (2, 20)
+
+    def test_sessions_inserted_once_then_updated(self, session_factory):
+        start = datetime(2026, 1, 1, 12)
+        ws = WatchSession("a", "A", "1.1.1.1", DAY, connected_at=start, last_seen=start)
+
+        write_bandwidth_batch(BandwidthBatch(), [ws])
+        assert ws.connection_id is not None
+        ws.last_seen = start + timedelta(seconds=90)
+        write_bandwidth_batch(BandwidthBatch(), [ws])
+
+        rows = fetch_all(session_factory, UniqueClientConnection)
+        assert [(r.id, r.watch_seconds, r.disconnected_at) for r in rows] == [(ws.connection_id, 90, None)]
+
+        ws.disconnected_at = start + timedelta(seconds=100)
+        batch = BandwidthBatch()
+        batch.closed_sessions.append(ws)
+        write_bandwidth_batch(batch)
+
+        assert fetch_all(session_factory, UniqueClientConnection)[0].disconnected_at == ws.disconnected_at
+
+    def test_merge_matches_single_batch(self):
+        older, newer = BandwidthBatch(), BandwidthBatch()
+        older.add_daily(DAY, bytes_out=10, peak_channels=4)
+        older.add_channel("a", "Old", DAY, bytes_delta=10, clients=4)
+        newer.add_daily(DAY, bytes_out=5, peak_channels=2)
+        newer.add_channel("a", "New", DAY, bytes_delta=5, clients=2)
+
+        newer.merge(older)
+
+        assert newer.daily[DAY]["bytes_out"] == 15
+        assert newer.daily[DAY]["peak_channels"] == 4
+        assert newer.channels[("a", DAY)]["channel_name"] == "New"
+
+
+class TestTrackerBatching:
+    """Tests for polling into memory and flushing every N polls."""
+
+    async def test_polls_write_only_on_flush(self, session_factory):
+        client = MagicMock()
+        client.get_channel_stats = AsyncMock(side_effect=[
+            channel_stats(("a", 1000, ["1.1.1.1"])),
+            channel_stats(("a", 3000, ["1.1.1.1", "2.2.2.2"])),
+            channel_stats(("a", 6000, ["2.2.2.2"])),
+        ])
+        tracker = BandwidthTracker(client, poll_interval=10, flush_polls=3)
+
+        with patch.object(bandwidth_tracker, "datetime", FakeClock):
+            for _ in range(2):
+                await tracker._collect_stats()
+                FakeClock.tick()
+            assert fetch_all(session_factory, ChannelBandwidth) == []
+            assert fetch_all(session_factory, UniqueClientConnection) == []  # Sessions are held in memory
+
+            await tracker._collect_stats()
+
+        channel = fetch_all(session_factory, ChannelBandwidth)[0]
+        assert channel.bytes_transferred == 5000
+        assert channel.connection_count == 2
+        assert channel.total_watch_seconds == 10 * (1 + 2 + 1)
+        watch = fetch_all(session_factory, ChannelWatchStats)[0]
+        assert (watch.watch_count, watch.total_watch_seconds) == (1, 20)
+        connections = {c.ip_address: c for c in fetch_all(session_factory, UniqueClientConnection)}
+        assert connections["1.1.1.1"].watch_seconds == 10  # Seen at the first two polls
+        assert connections["1.1.1.1"].disconnected_at is not None  # Left mid-stream
+        assert connections["2.2.2.2"].watch_seconds == 10  # Checkpointed while still open
+        assert connections["2.2.2.2"].disconnected_at is None
+
+    async def test_stop_flushes_pending_stats(self, session_factory):
+        client = MagicMock()
+        client.get_channel_stats = AsyncMock(return_value=channel_stats(("a", 1000, ["1.1.1.1"])))
+        tracker = BandwidthTracker(client, flush_polls=100)
+
+        await tracker._collect_stats()
+        await tracker.stop()
+
+        assert fetch_all(session_factory, BandwidthDaily)[0].peak_clients == 1
+        assert not tracker._batch
+
+    async def test_failed_flush_keeps_totals(self, session_factory):
+        tracker = BandwidthTracker(MagicMock())
+        tracker._batch.add_daily(DAY, bytes_transferred=100)
+
+        with patch.object(bandwidth_tracker, "write_bandwidth_batch", side_effect=RuntimeError("locked")):
+            await tracker.flush()
+        await tracker.flush()
+
+        assert fetch_all(session_factory, BandwidthDaily)[0].bytes_transferred == 100
+
+    async def test_cancelled_flush_finishes_before_next(self, session_factory):
+        """stop() during a write waits for it instead of inserting sessions twice."""
+        client = MagicMock()
+        client.get_channel_stats = AsyncMock(return_value=channel_stats(("a", 1000, ["1.1.1.1"])))
+        tracker = BandwidthTracker(client, flush_polls=100)
+        await tracker._collect_stats()
+
+        started, release, finished = threading.Event(), threading.Event(), threading.Event()
+
+        def slow_write(batch, sessions):
+            if started.is_set():
+                return write_bandwidth_batch(batch, sessions)
+            # The first write reads the sessions, then stalls mid-transaction
+            snapshot = [replace(session) for session in sessions]
+            started.set()
+            release.wait(5)
+            write_bandwidth_batch(batch, snapshot)
+            for session, written in zip(sessions, snapshot):
+                session.connection_id, session.written_seconds = written.connection_id, written.written_seconds
+            finished.set()
+
+        with patch.object(bandwidth_tracker, "write_bandwidth_batch", side_effect=slow_write):
+            tracker._task = asyncio.create_task(tracker.flush())
+            await asyncio.to_thread(started.wait, 5)
+            asyncio.get_running_loop().call_later(0.1, release.set)
+            await tracker.stop()
+            await asyncio.to_thread(finished.wait, 5)
+
+        assert len(fetch_all(session_factory, UniqueClientConnection)) == 1
@@ -1,6 +1,7 @@
 """
 Unit tests for the Cache module.
 """
+import asyncio
 import time
 import pytest
 
@@ -233,3 +234,146 @@ class TestGetCache:
         """Global cache has 300 second default TTL."""
         cache = get_cache()
         assert cache._default_ttl == 300
+
+
+class TestCacheBounds:
+    """Tests for LRU eviction, tags and expiry sweeps."""
+
+    def test_evicts_least_recently_used_over_entry_limit(self):
+        """The least recently read entry is evicted first."""
+        cache = Cache(default_ttl=60, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats()["evictions"] == 1
+
+    def test_evicts_over_byte_budget(self):
+        """Entries are evicted once the byte budget is exceeded."""
+        cache = Cache(default_ttl=60, max_bytes=20_000)
+        for i in range(10):
+            cache.set(f"key{i}", "x" * 5_000)
+
+        stats = cache.stats()
+        assert stats["size_bytes"] <= 20_000
+        assert stats["entry_count"] < 10
+        assert cache.get("key9") is not None
+
+    def test_invalidate_tag_removes_only_tagged_entries(self):
+        """Tagged entries are dropped together; others remain."""
+        cache = Cache(default_ttl=60)
+        cache.set("streams:p1:m5", [1], tags=["m3u_account:5"])
+        cache.set("streams:p2:m5", [2], tags=["m3u_account:5"])
+        cache.set("streams:p1:m6", [3], tags=["m3u_account:6"])
+
+        assert cache.invalidate_tag("m3u_account:5") == 2
+        assert cache.get("streams:p1:m6") == [3]
+        assert cache.stats()["tag_count"] == 1
+
+    def test_per_entry_ttl(self):
+        """An entry's own TTL overrides the default."""
+        cache = Cache(default_ttl=60)
+        cache.set("short", 1, ttl=10)
+        cache._cache["short"].cached_at = time.time() - 20
+
+        assert cache.get("short") is None
+
+    def test_sweep_removes_expired_entries(self):
+        """sweep() removes expired entries without them being read."""
+        cache = Cache(default_ttl=60)
+        cache.set("old", 1)
+        cache.set("new", 2)
+        cache._cache["old"].cached_at = time.time() - 100
+
+        assert cache.sweep() == 1
+        assert list(cache._cache) == ["new"]
+        assert cache.stats()["size_bytes"] == cache._cache["new"].size
+
+    async def test_background_sweeper(self):
+        """The sweeper task expires entries periodically."""
+        cache = Cache(default_ttl=60, sweep_interval=0.01)
+        cache.set("old", 1)
+        cache._cache["old"].cached_at = time.time() - 100
+
+        cache.start_sweeper()
+        await asyncio.sleep(0.05)
+        await cache.stop_sweeper()
+
+        assert len(cache._cache) == 0
+
+
+class TestStaleWhileRevalidate:
+    """Tests for soft/hard TTL entries."""
+
+    def _stale_cache(self):
+        cache = Cache(default_ttl=60)
+        cache.set("key", "old", ttl=600, soft_ttl=10)
+        cache._cache["key"].cached_at = time.time() - 30
+        return cache
+
+    async def test_serves_stale_and_refreshes_once(self):
+        """A stale entry is returned at once and refreshed in the background once."""
+        cache = self._stale_cache()
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "new"
+
+        assert cache.get("key", revalidate=loader) == "old"
+        assert cache.get("key", revalidate=loader) == "old"
+        await asyncio.sleep(0.05)
+
+        assert len(calls) == 1
+        assert cache.get("key") == "new"
+        assert cache._cache["key"].soft_ttl == 10
+        assert cache.stats()["stale_hits"] == 2
+
+    def test_stale_without_loader_is_a_miss(self):
+        """Readers that cannot revalidate do not get stale data."""
+        cache = self._stale_cache()
+
+        assert cache.get("key") is None
+        assert "key" in cache._cache
+
+    async def test_hard_ttl_is_never_exceeded(self):
+        """Past the hard TTL the entry is gone even with a loader."""
+        cache = self._stale_cache()
+        cache._cache["key"].cached_at = time.time() - 1000
+
+        async def loader():
+            return "new"
+
+        assert cache.get("key", revalidate=loader) is None
+
+    async def test_failed_refresh_keeps_stale_value(self):
+        """A failing loader leaves the stale value in place."""
+        cache = self._stale_cache()
+
+        async def loader():
+            raise RuntimeError("Dispatcharr down")
+
+        cache.get("key", revalidate=loader)
+        await asyncio.sleep(0.01)
+
+        assert cache.get("key", revalidate=loader) == "old"
+        assert cache.stats()["refresh_failures"] >= 1
+
+    async def test_invalidated_entry_not_resurrected(self):
+        """An entry invalidated during its refresh stays invalidated."""
+        cache = self._stale_cache()
+
+        async def loader():
+            await asyncio.sleep(0.01)
+            return "new"
+
+        cache.get("key", revalidate=loader)
+        cache.invalidate("key")
+        await asyncio.sleep(0.05)
+
+        assert "key" not in cache._cache
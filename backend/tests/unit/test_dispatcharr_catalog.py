@@ -0,0 +1,193 @@
+"""
+Unit tests for the Dispatcharr catalogue service.
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from dispatcharr_catalog import DispatcharrCatalog, get_catalog
+
+
+def _page(results, next_url=None):
+    return {"count": len(results), "results": results, "next": next_url}
+
+
+@pytest.fixture
+def client():
+    """Mock Dispatcharr client with two accounts and three streams."""
+    client = MagicMock()
+    client.get_channels = AsyncMock(return_value=_page([
+        {"id": 1, "name": "ESPN", "channel_group_id": 10},
+        {"id": 2, "name": "CNN", "channel_group_id": 20},
+    ]))
+    client.get_channel_groups = AsyncMock(return_value=[
+        {"id": 10, "name": "Sports"},
+        {"id": 20, "name": "News"},
+    ])
+    client.get_m3u_accounts = AsyncMock(return_value=[
+        {"id": 1, "name": "Provider A", "updated_at": "t1"},
+        {"id": 2, "name": "Provider B", "updated_at": "t1"},
+    ])
+    all_streams = [
+        {"id": 100, "name": "ESPN HD", "m3u_account": 1},
+        {"id": 101, "name": "CNN HD", "m3u_account": 1},
+        {"id": 200, "name": "ESPN FHD", "m3u_account": 2},
+    ]
+
+    async def get_streams(page=1, page_size=100, m3u_account=None, **kwargs):
+        streams = [s for s in all_streams if m3u_account is None or s["m3u_account"] == m3u_account]
+        return _page(streams)
+
+    client.get_streams = AsyncMock(side_effect=get_streams)
+    client.get_streams_by_ids = AsyncMock(return_value=[{"id": 999, "name": "Unlisted"}])
+    return client
+
+
+@pytest.fixture
+def catalog(client):
+    return DispatcharrCatalog(client)
+
+
+class TestCatalogPagination:
+    """Tests for paginated loads."""
+
+    async def test_follows_next_until_exhausted(self, client, catalog):
+        """Pages are walked until Dispatcharr stops returning a next link."""
+        client.get_channels = AsyncMock(side_effect=[
+            _page([{"id": 1}], next_url="page2"),
+            _page([{"id": 2}]),
+        ])
+
+        channels = await catalog.get_channels()
+
+        assert [c["id"] for c in channels] == [1, 2]
+        assert client.get_channels.call_count == 2
+
+
+class TestCatalogChannels:
+    """Tests for channel freshness and write-through."""
+
+    async def test_channels_served_from_memory_within_sync_interval(self, client, catalog):
+        """Repeated reads do not hit Dispatcharr again."""
+        await catalog.get_channels()
+        await catalog.get_channel_map()
+
+        assert client.get_channels.call_count == 1
+
+    async def test_count_change_triggers_reload(self, client, catalog):
+        """A changed upstream count after the sync interval forces a reload."""
+        catalog.sync_interval = 0
+        await catalog.get_channels()
+        client.get_channels.return_value = _page([{"id": 1}, {"id": 2}, {"id": 3}])
+
+        channels = await catalog.get_channels()
+
+        assert len(channels) == 3
+
+    async def test_fresh_read_sees_same_count_edits(self, client, catalog):
+        """fresh=True reloads even when the count did not change."""
+        await catalog.get_channels()
+        client.get_channels.return_value = _page([{"id": 1, "channel_group_id": 20}, {"id": 2, "channel_group_id": 20}])
+
+        assert (await catalog.get_channel_map())[1]["channel_group_id"] == 10
+        assert (await catalog.get_channel_map(fresh=True))[1]["channel_group_id"] == 20
+
+    async def test_apply_write_updates_in_place(self, client, catalog):
+        """Single-channel writes are applied without reloading."""
+        await catalog.get_channels()
+        catalog.apply_write("channels", "update", {"id": 1, "name": "ESPN 2"})
+        catalog.apply_write("channels", "delete", 2)
+
+        channel_map = await catalog.get_channel_map()
+
+        assert channel_map == {1: {"id": 1, "name": "ESPN 2"}}
+        assert client.get_channels.call_count == 1
+
+    async def test_bulk_write_marks_dirty(self, client, catalog):
+        """Bulk writes force a reload on the next read."""
+        await catalog.get_channels()
+        catalog.apply_write("channels", "bulk", [1, 2])
+        await catalog.get_channels()
+
+        assert client.get_channels.call_count == 2
+
+
+class TestCatalogStreams:
+    """Tests for partitioned stream loading."""
+
+    async def test_full_load_partitions_by_account(self, catalog):
+        """The full list is split into per-account partitions."""
+        streams = await catalog.get_streams()
+        account_1 = await catalog.get_streams(m3u_account_id=1)
+
+        assert len(streams) == 3
+        assert {s["id"] for s in account_1} == {100, 101}
+
+    async def test_only_refreshed_account_is_reloaded(self, client, catalog):
+        """An account whose updated_at changes is re-fetched on its own."""
+        catalog.sync_interval = 0
+        await catalog.get_streams()
+        client.get_streams.reset_mock()
+        client.get_m3u_accounts.return_value = [
+            {"id": 1, "name": "Provider A", "updated_at": "t1"},
+            {"id": 2, "name": "Provider B", "updated_at": "t2"},
+        ]
+
+        await catalog.get_streams()
+
+        client.get_streams.assert_called_once()
+        assert client.get_streams.call_args.kwargs["m3u_account"] == 2
+
+    async def test_deleted_account_drops_streams(self, client, catalog):
+        """Streams of accounts removed upstream disappear from the index."""
+        catalog.sync_interval = 0
+        await catalog.get_streams()
+        client.get_m3u_accounts.return_value = [
+            {"id": 1, "name": "Provider A", "updated_at": "t1"},
+        ]
+
+        streams = await catalog.get_streams()
+
+        assert {s["id"] for s in streams} == {100, 101}
+
+    async def test_streams_by_ids_fetches_only_unknown(self, client, catalog):
+        """Known stream IDs are served locally; unknown ones go upstream."""
+        await catalog.get_streams()
+
+        streams = await catalog.get_streams_by_ids([100, 999])
+
+        assert {s["id"] for s in streams} == {100, 999}
+        client.get_streams_by_ids.assert_awaited_once_with([999])
+
+
+class TestGetCatalog:
+    """Tests for the global catalogue accessor."""
+
+    def test_rebinds_when_client_changes(self):
+        """A new catalogue is created for a different client."""
+        first = get_catalog(MagicMock())
+        second = get_catalog(MagicMock())
+
+        assert first is not second
+        assert get_catalog(second.client) is second
+
+
+class TestCachedStreams:
+    """Tests for the non-fetching stream view."""
+
+    async def test_none_until_loaded(self, client, catalog):
+        """Nothing is returned (or fetched) before streams are loaded."""
+        assert catalog.cached_streams() is None
+        assert catalog.cached_streams(m3u_account_id=1) is None
+        client.get_streams.assert_not_called()
+
+    async def test_returns_loaded_streams_until_invalidated(self, catalog):
+        """Fresh partitions are served; an invalidated account is not."""
+        await catalog.get_streams()
+
+        assert len(catalog.cached_streams()) == 3
+        assert {s["id"] for s in catalog.cached_streams(m3u_account_id=1)} == {100, 101}
+
+        catalog.invalidate_account(1)
+        assert catalog.cached_streams(m3u_account_id=1) is None
+        assert catalog.cached_streams() is None
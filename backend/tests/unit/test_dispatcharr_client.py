@@ -0,0 +1,507 @@
+"""
+Unit tests for DispatcharrClient helpers.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from config import DispatcharrSettings
+from dispatcharr_client import DispatcharrClient, fetch_pages, iter_pages
+from dispatcharr_limiter import CircuitOpenError, Priority, request_priority
+
+
+def make_fetch(total: int, page_size_override: int = None, delays: dict = None):
+    """Build a fake paginated getter over items 0..total-1.
+
+    Records requested pages and the peak number of concurrent requests.
+    """
+    state = {"pages": [], "in_flight": 0, "peak": 0}
+
+    async def fetch(page: int, page_size: int, **params):
+        state["pages"].append(page)
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep((delays or {}).get(page, 0))
+            size = page_size_override or page_size
+            start = (page - 1) * size
+            if start >= total and page > 1:
+                request = httpx.Request("GET", "http://dispatcharr.test/")
+                raise httpx.HTTPStatusError(
+                    "Invalid page", request=request, response=httpx.Response(404, request=request)
+                )
+            results = [{"id": i, **params} for i in range(start, min(start + size, total))]
+            return {
+                "count": total,
+                "results": results,
+                "next": "more" if start + size < total else None,
+            }
+        finally:
+            state["in_flight"] -= 1
+
+    return fetch, state
+
+
+class TestIterPages:
+    """Tests for concurrent page prefetch."""
+
+    async def test_yields_all_items_in_order(self):
+        """Pages finishing out of order are still yielded in page order."""
+        fetch, state = make_fetch(1050, delays={2: 0.02, 3: 0.0})
+
+        items = await fetch_pages(fetch, page_size=100, max_in_flight=4)
+
+        assert [item["id"] for item in items] == list(range(1050))
+        assert sorted(state["pages"]) == list(range(1, 12))
+
+    async def test_respects_in_flight_limit(self):
+        """No more than max_in_flight pages are requested at once."""
+        fetch, state = make_fetch(2000, delays={p: 0.005 for p in range(2, 21)})
+
+        await fetch_pages(fetch, page_size=100, max_in_flight=3)
+
+        assert state["peak"] == 3
+
+    async def test_passes_filters_through(self):
+        """Extra keyword arguments reach every page request."""
+        fetch, _ = make_fetch(250)
+
+        items = await fetch_pages(fetch, page_size=100, max_in_flight=2, m3u_account=7)
+
+        assert {item["m3u_account"] for item in items} == {7}
+
+    async def test_page_limit_truncates(self):
+        """page_limit caps the number of pages read."""
+        fetch, state = make_fetch(1000)
+
+        items = await fetch_pages(fetch, page_size=100, max_in_flight=4, page_limit=3)
+
+        assert len(items) == 300
+        assert max(state["pages"]) == 3
+
+    async def test_follows_next_when_count_missing(self):
+        """Without a count, pages are read sequentially via next links."""
+        pages = [
+            {"results": [{"id": 1}], "next": "p2"},
+            {"results": [{"id": 2}], "next": "p3"},
+            {"results": [{"id": 3}], "next": None},
+        ]
+
+        async def fetch(page, page_size, **params):
+            return pages[page - 1]
+
+        items = await fetch_pages(fetch, page_size=1, max_in_flight=4)
+
+        assert [item["id"] for item in items] == [1, 2, 3]
+
+    async def test_flat_list_response(self):
+        """Flat-list responses are returned without further paging."""
+        async def fetch(page, page_size, **params):
+            return [{"id": 1}, {"id": 2}]
+
+        items = await fetch_pages(fetch, page_size=100)
+
+        assert [item["id"] for item in items] == [1, 2]
+
+    async def test_collection_shrinking_mid_read_stops_cleanly(self):
+        """A 404 for a page past the end ends iteration instead of raising."""
+        fetch, _ = make_fetch(150, page_size_override=100)
+
+        async def shrinking_fetch(page, page_size, **params):
+            data = await fetch(page=page, page_size=page_size)
+            data["count"] = 500  # stale count claims more pages than exist
+            return data
+
+        items = await fetch_pages(shrinking_fetch, page_size=100, max_in_flight=4)
+
+        assert len(items) == 150
+
+    async def test_early_exit_cancels_outstanding_pages(self):
+        """Breaking out of iteration cancels prefetched requests."""
+        fetch, state = make_fetch(5000, delays={p: 0.05 for p in range(3, 51)})
+
+        gen = iter_pages(fetch, page_size=100, max_in_flight=4)
+        async for item in gen:
+            if item["id"] == 150:
+                break
+        await gen.aclose()
+
+        assert state["in_flight"] == 0
+        assert max(state["pages"]) <= 6
+
+
+def make_client(**overrides) -> DispatcharrClient:
+    settings = DispatcharrSettings(url="http://dispatcharr.test", username="u", password="p", **overrides)
+    return DispatcharrClient(settings)
+
+
+class TestConnectionPool:
+    """Tests for pool configuration, timeouts and usage counters."""
+
+    def test_endpoint_timeout_longest_prefix_wins(self):
+        """The most specific endpoint override is used."""
+        client = make_client(dispatcharr_endpoint_timeouts={"/api/epg/": 60.0, "/api/epg/grid/": 120.0})
+
+        assert client._timeout_for("/api/epg/grid/") == 120.0
+        assert client._timeout_for("/api/epg/epgdata/") == 60.0
+        assert client._timeout_for("/api/channels/channels/") is httpx.USE_CLIENT_DEFAULT
+
+    def test_http2_falls_back_without_h2(self):
+        """HTTP/2 is only enabled when the h2 package is importable."""
+        with patch.dict("sys.modules", {"h2": None}):
+            client = make_client(dispatcharr_http2=True)
+
+        assert client.http2_enabled is False
+
+    async def test_request_counters(self):
+        """Requests are counted and the in-flight gauge returns to zero."""
+        client = make_client(dispatcharr_max_connections=7)
+        client.access_token = "token"
+        client._client.request = AsyncMock(return_value=httpx.Response(200, json={}))
+
+        await client._request("GET", "/api/epg/grid/")
+
+        stats = client.pool_stats()
+        assert stats["max_connections"] == 7
+        assert stats["requests_total"] == 1
+        assert stats["requests_in_flight"] == 0
+        assert stats["peak_requests_in_flight"] == 1
+        assert client._client.request.call_args.kwargs["timeout"] == 120.0
+
+    async def test_timeouts_are_counted(self):
+        """Timeouts increment the timeout counter and still propagate."""
+        client = make_client(dispatcharr_retry_attempts=0)
+        client.access_token = "token"
+        client._client.request = AsyncMock(side_effect=httpx.PoolTimeout("pool exhausted"))
+
+        with pytest.raises(httpx.PoolTimeout):
+            await client._request("GET", "/api/channels/channels/")
+
+        stats = client.pool_stats()
+        assert stats["timeouts"] == 1
+        assert stats["pool_timeouts"] == 1
+        assert stats["requests_in_flight"] == 0
+
+
+class TestRetriesAndCircuitBreaker:
+    """Tests for request retries and fail-fast behaviour."""
+
+    @pytest.fixture(autouse=True)
+    def no_backoff(self):
+        with patch("dispatcharr_client._backoff_delay", return_value=0):
+            yield
+
+    async def test_get_retried_on_503(self):
+        """Idempotent requests are retried on overload responses."""
+        client = make_client(dispatcharr_retry_attempts=2)
+        client.access_token = "token"
+        client._client.request = AsyncMock(side_effect=[
+            httpx.Response(503),
+            httpx.Response(200, json={"ok": True}),
+        ])
+
+        response = await client._request("GET", "/api/channels/channels/")
+
+        assert response.status_code == 200
+        assert client._client.request.call_count == 2
+        assert client.pool_stats()["retries"] == 1
+
+    async def test_post_not_retried(self):
+        """Non-idempotent requests are sent once."""
+        client = make_client(dispatcharr_retry_attempts=2)
+        client.access_token = "token"
+        client._client.request = AsyncMock(return_value=httpx.Response(503))
+
+        response = await client._request("POST", "/api/channels/channels/", json={})
+
+        assert response.status_code == 503
+        assert client._client.request.call_count == 1
+
+    async def test_transport_errors_retried_then_raised(self):
+        """Connection errors are retried and re-raised once retries run out."""
+        client = make_client(dispatcharr_retry_attempts=1)
+        client.access_token = "token"
+        client._client.request = AsyncMock(side_effect=httpx.ConnectError("refused"))
+
+        with pytest.raises(httpx.ConnectError):
+            await client._request("GET", "/api/channels/channels/")
+
+        assert client._client.request.call_count == 2
+
+    async def test_circuit_opens_and_fails_fast(self):
+        """Once the breaker opens, requests fail without reaching Dispatcharr."""
+        client = make_client(dispatcharr_retry_attempts=0, dispatcharr_circuit_failure_threshold=2)
+        client.access_token = "token"
+        client._client.request = AsyncMock(return_value=httpx.Response(500))
+
+        await client._request("GET", "/api/channels/channels/")
+        await client._request("GET", "/api/channels/channels/")
+        with pytest.raises(CircuitOpenError):
+            await client._request("GET", "/api/channels/channels/")
+
+        assert client._client.request.call_count == 2
+        assert client.pool_stats()["circuit_state"] == "open"
+
+    async def test_cancelled_half_open_trial_releases_breaker(self):
+        """Cancelling the trial request lets the next request become the trial."""
+        client = make_client(
+            dispatcharr_retry_attempts=0,
+            dispatcharr_circuit_failure_threshold=1,
+            dispatcharr_circuit_reset_seconds=0,
+        )
+        client.access_token = "token"
+        client._breaker.record_failure()
+        started = asyncio.Event()
+
+        async def hang(*args, **kwargs):
+            started.set()
+            await asyncio.sleep(60)
+
+        client._client.request = AsyncMock(side_effect=hang)
+        trial = asyncio.create_task(client._request("POST", "/api/channels/channels/", json={}))
+        await started.wait()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        client._client.request = AsyncMock(return_value=httpx.Response(200, json={}))
+        response = await client._request("POST", "/api/channels/channels/", json={})
+        assert response.status_code == 200
+        assert client.pool_stats()["circuit_state"] == "closed"
+
+
+class TestStreamGroupCounts:
+    """Tests for aggregated stream group counts."""
+
+    @pytest.fixture
+    def client(self):
+        client = make_client()
+        client.get_stream_groups = AsyncMock(return_value=["Sports", "news", "Movies"])
+        client.get_channel_groups = AsyncMock(return_value=[
+            {"id": 1, "name": "Sports"},
+            {"id": 2, "name": "news"},
+            {"id": 3, "name": "Movies"},
+        ])
+        return client
+
+    async def test_counts_in_single_pass(self, client):
+        """Counts come from one walk of the stream list, not a query per group."""
+        client.get_streams = AsyncMock(return_value={
+            "count": 3,
+            "results": [
+                {"id": 1, "channel_group": 1},
+                {"id": 2, "channel_group": 1},
+                {"id": 3, "channel_group": 2},
+            ],
+            "next": None,
+        })
+
+        result = await client.get_stream_groups_with_counts(m3u_account_id=5)
+
+        assert result == [{"name": "news", "count": 1}, {"name": "Sports", "count": 2}]
+        client.get_streams.assert_awaited_once()
+        assert client.get_streams.call_args.kwargs["m3u_account"] == 5
+
+    async def test_counts_supplied_streams(self, client):
+        """Streams passed in (e.g. from the catalogue) are counted without reading Dispatcharr."""
+        client.get_streams = AsyncMock()
+
+        result = await client.get_stream_groups_with_counts(streams=[{"id": 1, "channel_group": 3}])
+
+        assert {r["name"]: r["count"] for r in result} == {"Movies": 1, "news": 0, "Sports": 0}
+        client.get_streams.assert_not_awaited()
+
+    async def test_falls_back_to_per_group_counts(self, client):
+        """A failed aggregated pass falls back to bounded per-group count queries."""
+        client.get_streams = AsyncMock(side_effect=httpx.ConnectError("refused"))
+        counts = {"Sports": 4, "news": 0, "Movies": 2}
+
+        async def count_request(method, path, params=None, **kwargs):
+            return httpx.Response(
+                200,
+                json={"count": counts[params["channel_group_name"]]},
+                request=httpx.Request(method, "http://dispatcharr.test" + path),
+            )
+
+        client._request = AsyncMock(side_effect=count_request)
+
+        result = await client.get_stream_groups_with_counts(m3u_account_id=5)
+
+        assert result == [{"name": "Movies", "count": 2}, {"name": "Sports", "count": 4}]
+        assert client._request.await_count == 3
+
+
+class TestRequestCoalescing:
+    """Tests for single-flight GET coalescing."""
+
+    @pytest.fixture
+    def client(self):
+        client = make_client()
+        client.access_token = "token"
+        release = asyncio.Event()
+
+        async def slow_request(method, url, **kwargs):
+            await release.wait()
+            return httpx.Response(200, json={"results": [1, 2]})
+
+        client._client.request = AsyncMock(side_effect=slow_request)
+        client.release = release
+        return client
+
+    async def test_identical_gets_share_one_request(self, client):
+        """Overlapping identical GETs send one upstream request."""
+        calls = [
+            asyncio.create_task(client._request("GET", "/api/channels/groups/", params={"a": 1, "b": 2}))
+            for _ in range(3)
+        ]
+        calls.append(asyncio.create_task(client._request("GET", "/api/channels/groups/", params={"b": 2, "a": 1})))
+        await asyncio.sleep(0.01)
+        client.release.set()
+
+        responses = await asyncio.gather(*calls)
+
+        assert client._client.request.call_count == 1
+        first, second = responses[0].json(), responses[1].json()
+        assert first == second and first is not second
+        assert client.pool_stats()["coalesced_requests"] == 3
+        assert client.pool_stats()["coalescing_in_flight"] == 0
+
+    async def test_different_params_and_writes_not_coalesced(self, client):
+        """Different queries and non-GET requests each go upstream."""
+        calls = [
+            asyncio.create_task(client._request("GET", "/api/channels/streams/", params={"page": 1})),
+            asyncio.create_task(client._request("GET", "/api/channels/streams/", params={"page": 2})),
+            asyncio.create_task(client._request("POST", "/api/channels/streams/", json={})),
+            asyncio.create_task(client._request("POST", "/api/channels/streams/", json={})),
+        ]
+        await asyncio.sleep(0.01)
+        client.release.set()
+        await asyncio.gather(*calls)
+
+        assert client._client.request.call_count == 4
+
+    async def test_priorities_not_coalesced(self, client):
+        """An interactive GET does not wait behind a background one."""
+        with request_priority(Priority.BACKGROUND):
+            background = asyncio.create_task(client._request("GET", "/api/channels/groups/"))
+        interactive = asyncio.create_task(client._request("GET", "/api/channels/groups/"))
+        await asyncio.sleep(0.01)
+        client.release.set()
+        await asyncio.gather(background, interactive)
+
+        assert client._client.request.call_count == 2
+        assert client.pool_stats()["coalesced_requests"] == 0
+
+    async def test_cancelled_caller_does_not_cancel_others(self, client):
+        """Cancelling the first caller leaves the shared request running."""
+        first = asyncio.create_task(client._request("GET", "/api/m3u/accounts/"))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(client._request("GET", "/api/m3u/accounts/"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        client.release.set()
+
+        response = await second
+
+        assert response.status_code == 200
+        assert client._client.request.call_count == 1
+
+
+def _response(status_code: int, **kwargs) -> httpx.Response:
+    return httpx.Response(status_code, request=httpx.Request("GET", "http://dispatcharr.test/"), **kwargs)
+
+
+class TestConditionalGets:
+    """Tests for revalidated rarely-changing collections."""
+
+    @pytest.fixture
+    def client(self):
+        client = make_client()
+        client.access_token = "token"
+        return client
+
+    async def test_etag_sent_and_304_reuses_data(self, client):
+        """A 304 returns the previously parsed data."""
+        client._client.request = AsyncMock(side_effect=[
+            _response(200, json=[{"id": 1, "name": "Sports"}], headers={"ETag": '"v1"'}),
+            _response(304),
+        ])
+
+        first = await client.get_channel_groups()
+        second = await client.get_channel_groups()
+
+        assert second == first and second is not first
+        assert second[0] is first[0]
+        sent = client._client.request.call_args.kwargs["headers"]
+        assert sent["If-None-Match"] == '"v1"'
+        assert client.response_cache_stats()["not_modified"] == 1
+
+    async def test_unchanged_body_not_reparsed(self, client):
+        """Without validators, an identical body reuses the parsed data."""
+        client._client.request = AsyncMock(side_effect=[
+            _response(200, json=[{"id": 1}]),
+            _response(200, json=[{"id": 1}]),
+            _response(200, json=[{"id": 2}]),
+        ])
+
+        first = await client.get_epg_sources()
+        with patch.object(httpx.Response, "json", side_effect=AssertionError("re-parsed")):
+            second = await client.get_epg_sources()
+        third = await client.get_epg_sources()
+
+        assert second[0] is first[0]
+        assert third == [{"id": 2}]
+        stats = client.response_cache_stats()
+        assert (stats["unchanged"], stats["changed"]) == (1, 2)
+
+    async def test_errors_still_raise(self, client):
+        """Error responses are not served from the validated copy."""
+        client._client.request = AsyncMock(side_effect=[
+            _response(200, json=[{"id": 1}]),
+            _response(404),
+        ])
+
+        await client.get_stream_profiles()
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_stream_profiles()
+
+
+class TestStreamingDecode:
+    """Tests for incrementally decoded EPG responses."""
+
+    def _client_with(self, handler) -> DispatcharrClient:
+        client = make_client()
+        client.access_token = "token"
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+
+    async def test_iter_epg_data_follows_pages(self):
+        """Paginated EPG data is streamed page by page."""
+        def handler(request):
+            page = int(request.url.params["page"])
+            return httpx.Response(200, json={
+                "count": 3,
+                "next": "more" if page == 1 else None,
+                "results": [{"id": page * 10}, {"id": page * 10 + 1}] if page == 1 else [{"id": 20}],
+            })
+
+        client = self._client_with(handler)
+
+        entries = [entry async for entry in client.iter_epg_data(epg_source=4)]
+
+        assert [e["id"] for e in entries] == [10, 11, 20]
+
+    async def test_epg_grid_unwraps_data(self):
+        """The grid's "data" array is returned as a list."""
+        client = self._client_with(lambda request: httpx.Response(200, json={"data": [{"id": 1}, {"id": 2}]}))
+
+        assert await client.get_epg_grid() == [{"id": 1}, {"id": 2}]
+
+    async def test_stream_errors_raise(self):
+        """Error statuses surface as HTTPStatusError before any item is yielded."""
+        client = self._client_with(lambda request: httpx.Response(404, json={"detail": "nope"}))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_epg_grid()
@@ -0,0 +1,177 @@
+"""
+Unit tests for Dispatcharr request traffic control.
+"""
+import asyncio
+import time
+
+import pytest
+
+from dispatcharr_limiter import (
+    AdaptiveLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    Priority,
+    current_priority,
+    request_priority,
+)
+
+
+class TestRequestPriority:
+    """Tests for the priority context."""
+
+    def test_defaults_to_interactive(self):
+        """Requests are interactive unless declared otherwise."""
+        assert current_priority() == Priority.INTERACTIVE
+
+    async def test_context_is_inherited_by_tasks(self):
+        """Tasks created inside the context keep its priority."""
+        with request_priority(Priority.BACKGROUND):
+            task = asyncio.create_task(asyncio.sleep(0, result=None))
+            inner = asyncio.create_task(self._read_priority())
+        await task
+
+        assert await inner == Priority.BACKGROUND
+        assert current_priority() == Priority.INTERACTIVE
+
+    @staticmethod
+    async def _read_priority():
+        return current_priority()
+
+
+class TestAdaptiveLimiter:
+    """Tests for the AIMD concurrency window."""
+
+    async def test_interactive_jumps_background_queue(self):
+        """Queued interactive requests are granted before earlier background ones."""
+        limiter = AdaptiveLimiter(max_limit=2, min_limit=2, initial_limit=2, interactive_reserve=0)
+        await limiter.acquire(Priority.BACKGROUND)
+        await limiter.acquire(Priority.BACKGROUND)
+        order = []
+
+        async def waiter(name, priority):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        background = asyncio.create_task(waiter("background", Priority.BACKGROUND))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(waiter("interactive", Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+
+        limiter.release()
+        await interactive
+        limiter.release()
+        await background
+
+        assert order == ["interactive", "background"]
+
+    async def test_background_cannot_use_reserved_slot(self):
+        """Background requests leave the reserved slots for interactive ones."""
+        limiter = AdaptiveLimiter(max_limit=3, min_limit=3, initial_limit=3, interactive_reserve=1)
+        await limiter.acquire(Priority.BACKGROUND)
+        await limiter.acquire(Priority.BACKGROUND)
+
+        blocked = asyncio.create_task(limiter.acquire(Priority.BACKGROUND))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(limiter.acquire(Priority.INTERACTIVE), timeout=1)
+
+        assert not blocked.done()
+        blocked.cancel()
+
+    def test_overload_halves_and_success_grows(self):
+        """The window halves on overload and grows additively on success."""
+        limiter = AdaptiveLimiter(max_limit=16, min_limit=2, initial_limit=8)
+
+        limiter.record_overload()
+        assert int(limiter.limit) == 4
+
+        for _ in range(10):
+            limiter.record_success(0.05)
+        assert 4 < limiter.limit <= 16
+
+    def test_window_respects_floor(self):
+        """Repeated overloads never go below min_limit."""
+        limiter = AdaptiveLimiter(max_limit=16, min_limit=2, initial_limit=8, decrease_cooldown=0)
+
+        for _ in range(10):
+            limiter.record_overload()
+
+        assert limiter.limit == 2
+
+    def test_latency_growth_shrinks_window(self):
+        """A sustained latency rise is treated as overload."""
+        limiter = AdaptiveLimiter(max_limit=16, min_limit=2, initial_limit=8, decrease_cooldown=0)
+        for _ in range(30):
+            limiter.record_success(0.05)
+        before = limiter.limit
+
+        for _ in range(5):
+            limiter.record_success(1.0)
+
+        assert limiter.limit < before
+
+    async def test_retry_after_pauses_queue(self):
+        """Retry-After holds new requests until the pause ends."""
+        limiter = AdaptiveLimiter(max_limit=4, min_limit=2, initial_limit=4)
+        limiter.record_overload(retry_after=0.05)
+
+        start = time.monotonic()
+        await limiter.acquire(Priority.INTERACTIVE)
+
+        assert time.monotonic() - start >= 0.04
+
+
+class TestCircuitBreaker:
+    """Tests for the circuit breaker."""
+
+    def test_opens_after_threshold(self):
+        """Consecutive failures open the circuit and requests fail fast."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+        for _ in range(3):
+            breaker.before_request()
+            breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+        assert breaker.stats()["circuit_state"] == "open"
+
+    def test_success_resets_failures(self):
+        """A success in between keeps the circuit closed."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        breaker.before_request()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_trial(self):
+        """After the reset timeout one trial request is let through."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        breaker.before_request()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_abandoned_trial_lets_next_request_through(self):
+        """A trial that ends without a result does not block later requests."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.before_request() is True
+        breaker.abandon_trial()
+        assert breaker.before_request() is True
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    def test_disabled_with_zero_threshold(self):
+        """A threshold of 0 never opens the circuit."""
+        breaker = CircuitBreaker(failure_threshold=0)
+        for _ in range(10):
+            breaker.record_failure()
+
+        breaker.before_request()
@@ -0,0 +1,71 @@
+"""
+Unit tests for incremental JSON array decoding.
+"""
+import json
+
+import pytest
+
+from json_stream import JsonArrayDecoder
+
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def _decode(document, chunk_size: int):
+    decoder = JsonArrayDecoder()
+    items = [item async for item in decoder.iter_items(_chunks(json.dumps(document).encode(), chunk_size))]
+    return items, decoder
+
+
+class TestJsonArrayDecoder:
+    """Tests for JsonArrayDecoder."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64, 100_000])
+    async def test_paginated_results(self, chunk_size):
+        """Items of "results" are yielded and the other fields become metadata."""
+        document = {
+            "count": 4,
+            "next": "http://x/?page=2",
+            "previous": 'tricky "[{" string',
+            "results": [{"id": 1, "name": "Café [HD]"}, 12345, -1.5e10, [1, [2]]],
+        }
+
+        items, decoder = await _decode(document, chunk_size)
+
+        assert items == document["results"]
+        assert decoder.metadata == {"count": 4, "next": "http://x/?page=2", "previous": 'tricky "[{" string'}
+        assert not decoder.is_list
+
+    @pytest.mark.parametrize("chunk_size", [1, 7])
+    async def test_top_level_list(self, chunk_size):
+        """A plain array is streamed item by item."""
+        items, decoder = await _decode([{"a": 1}, 2, True, None], chunk_size)
+
+        assert items == [{"a": 1}, 2, True, None]
+        assert decoder.is_list
+
+    async def test_nested_keys_are_ignored(self):
+        """Only top-level results/data arrays are streamed."""
+        document = {"meta": {"results": [0]}, "data": [1, 2], "after": {"k": [3]}}
+
+        items, decoder = await _decode(document, 5)
+
+        assert items == [1, 2]
+        assert decoder.metadata == {"meta": {"results": [0]}, "after": {"k": [3]}}
+
+    async def test_document_without_array(self):
+        """An object without a streamable array yields nothing."""
+        items, decoder = await _decode({"detail": "not found"}, 4)
+
+        assert items == []
+        assert decoder.metadata == {"detail": "not found"}
+
+    async def test_truncated_document_raises(self):
+        """A body cut off mid-item is an error, not a silent partial result."""
+        decoder = JsonArrayDecoder()
+
+        with pytest.raises(json.JSONDecodeError):
+            async for _ in decoder.iter_items(_chunks(b'{"results": [{"id": 1}, {"id"', 4)):
+                pass
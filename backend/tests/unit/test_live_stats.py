@@ -0,0 +1,107 @@
+"""
+Unit tests for the live stats push hub.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import bandwidth_tracker
+from live_stats import QUEUE_SIZE, LiveStatsHub, format_event
+
+
+def task_status(task_id: str, current: int) -> dict:
+    return {
+        "task_id": task_id, "task_name": task_id, "status": "running", "enabled": True,
+        "progress": {"current": current}, "last_run": None, "next_run": None, "config": {},
+    }
+
+
+@pytest.fixture
+def registry():
+    registry = MagicMock()
+    registry.get_all_task_statuses.return_value = []
+    with patch("task_registry.get_registry", return_value=registry), \
+            patch("stream_prober.get_prober", return_value=None):
+        yield registry
+
+
+class TestLiveStatsHub:
+    """Tests for LiveStatsHub."""
+
+    @pytest.mark.asyncio
+    async def test_fans_out_and_primes_new_subscribers(self, registry):
+        hub = LiveStatsHub(progress_interval=60)
+        first = hub.subscribe()
+        hub.publish("channels", {"channels": [1]})
+        second = hub.subscribe()
+
+        assert first.get_nowait() == ("channels", {"channels": [1]})
+        assert second.get_nowait() == ("channels", {"channels": [1]})
+        hub.unsubscribe(first)
+        hub.unsubscribe(second)
+        assert hub.subscriber_count == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_gets_latest_snapshots(self, registry):
+        hub = LiveStatsHub(progress_interval=60)
+        queue = hub.subscribe()
+        hub.publish("tasks", [{"task_id": "a"}], snapshot=[{"task_id": "a"}, {"task_id": "b"}])
+        for i in range(QUEUE_SIZE):
+            hub.publish("channels", i)
+
+        # The "tasks" delta is replaced by the full snapshot rather than lost
+        assert [queue.get_nowait() for _ in range(queue.qsize())] == [
+            ("tasks", [{"task_id": "a"}, {"task_id": "b"}]),
+            ("channels", QUEUE_SIZE - 1),
+        ]
+        hub.unsubscribe(queue)
+
+    def test_task_progress_deltas(self, registry):
+        hub = LiveStatsHub()
+        queue = asyncio.Queue()
+        hub._subscribers.add(queue)
+        registry.get_all_task_statuses.return_value = [task_status("a", 1), task_status("b", 1)]
+        hub.poll_progress()
+        registry.get_all_task_statuses.return_value = [task_status("a", 2), task_status("b", 1)]
+        hub.poll_progress()
+        hub.poll_progress()  # Nothing changed
+
+        assert [len(queue.get_nowait()[1]) for _ in range(queue.qsize())] == [2, 1]
+        assert [t["progress"]["current"] for t in hub.latest["tasks"]] == [2, 1]
+
+    def test_probe_progress_published_on_change(self, registry):
+        hub = LiveStatsHub()
+        queue = asyncio.Queue()
+        hub._subscribers.add(queue)
+        prober = MagicMock()
+        prober.get_probe_progress.return_value = {"in_progress": True, "current": 1}
+        with patch("stream_prober.get_prober", return_value=prober):
+            hub.poll_progress()
+            hub.poll_progress()
+
+        assert queue.qsize() == 1
+        assert hub.latest["probe"] == {"in_progress": True, "current": 1}
+
+    @pytest.mark.asyncio
+    async def test_stream_formats_events_and_unsubscribes(self, registry):
+        hub = LiveStatsHub(progress_interval=60)
+        hub.publish("bandwidth", {"today": 1})
+        stream = hub.stream()
+
+        assert await stream.__anext__() == format_event("bandwidth", {"today": 1})
+        assert hub.subscriber_count == 1
+        await stream.aclose()
+        assert hub.subscriber_count == 0
+
+
+@pytest.mark.asyncio
+async def test_tracker_poll_publishes_channels():
+    """The tracker's Dispatcharr poll is what subscribers receive."""
+    client = MagicMock()
+    client.get_channel_stats = AsyncMock(return_value={"channels": []})
+    hub = LiveStatsHub()
+    with patch.object(bandwidth_tracker, "get_live_stats", return_value=hub):
+        await bandwidth_tracker.BandwidthTracker(client, flush_polls=100)._collect_stats()
+
+    assert hub.latest["channels"] == {"channels": []}
@@ -0,0 +1,142 @@
+"""
+Unit tests for the shared media subprocess budget.
+"""
+import asyncio
+import logging
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import media_processes
+from media_processes import MediaProcessManager, Workload, configured_budget, default_budget
+
+
+def create_manager(budget: int = 3, reserve: int = 1, load: float = None) -> MediaProcessManager:
+    manager = MediaProcessManager(budget=budget, interactive_reserve=reserve)
+    manager.cores = 2
+    manager._load = load
+    manager._load_checked = float("inf")  # Keep the injected load average
+    return manager
+
+
+class TestScheduling:
+    """Tests for slot budget and workload priority."""
+
+    async def test_background_never_takes_reserved_slot(self):
+        manager = create_manager(budget=3, reserve=1)
+        await manager.acquire(Workload.PROBE)
+        await manager.acquire(Workload.PROBE)
+        probe = asyncio.create_task(manager.acquire(Workload.PROBE))
+        await asyncio.sleep(0)
+        assert not probe.done()
+
+        await asyncio.wait_for(manager.acquire(Workload.PREVIEW), 1)
+        assert manager.stats()["running"] == {"preview": 1, "interactive": 0, "probe": 2}
+        assert manager.stats()["queued"]["probe"] == 1
+
+        manager.release(Workload.PROBE)
+        await asyncio.sleep(0)
+        assert not probe.done()  # The preview still occupies the shared budget
+        manager.release(Workload.PREVIEW)
+        await asyncio.wait_for(probe, 1)
+
+    async def test_preview_jumps_probe_queue(self):
+        manager = create_manager(budget=1, reserve=0)
+        await manager.acquire(Workload.PROBE)
+        order = []
+
+        async def waiter(workload):
+            await manager.acquire(workload)
+            order.append(workload)
+
+        tasks = [asyncio.create_task(waiter(Workload.PROBE))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(waiter(Workload.INTERACTIVE)))
+        tasks.append(asyncio.create_task(waiter(Workload.PREVIEW)))
+        await asyncio.sleep(0)
+
+        for _ in range(3):
+            manager.release(order[-1] if order else Workload.PROBE)
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        assert order == [Workload.PREVIEW, Workload.INTERACTIVE, Workload.PROBE]
+
+    async def test_high_load_shrinks_background_share(self):
+        assert create_manager(budget=9, reserve=1, load=1.0).background_limit() == 8
+        assert create_manager(budget=9, reserve=1, load=8.0).background_limit() == 2
+        assert create_manager(budget=9, reserve=1, load=100.0).background_limit() == 1
+
+    async def test_popen_timeout_frees_nothing(self):
+        manager = create_manager(budget=1, reserve=0)
+        await manager.acquire(Workload.PREVIEW)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await manager.popen(["ffmpeg"], Workload.PREVIEW, timeout=0.01)
+        assert manager.running == 1
+        assert manager.stats()["queued"]["preview"] == 0
+
+    async def test_popen_failure_returns_slot(self):
+        manager = create_manager()
+        with patch("subprocess.Popen", side_effect=FileNotFoundError("ffmpeg")):
+            with pytest.raises(FileNotFoundError):
+                await manager.popen(["ffmpeg"], Workload.PREVIEW)
+        assert manager.running == 0
+
+
+class TestBudget:
+    """Tests for sizing the budget from settings."""
+
+    def test_default_budget_fits_max_concurrent_probes(self):
+        with patch.object(media_processes, "usable_cores", return_value=2):
+            assert default_budget() == 4
+            assert default_budget(max_concurrent_probes=8) == 9
+            assert default_budget(max_concurrent_probes=8, interactive_reserve=2) == 10
+
+    def test_configured_budget(self):
+        with patch.object(media_processes, "usable_cores", return_value=2):
+            assert configured_budget(MagicMock(media_process_budget=0, max_concurrent_probes=8)) == 9
+            assert configured_budget(MagicMock(media_process_budget=3, max_concurrent_probes=8)) == 3
+
+    async def test_raising_budget_starts_waiting_probes(self):
+        manager = create_manager(budget=2, reserve=1)
+        await manager.acquire(Workload.PROBE)
+        probe = asyncio.create_task(manager.acquire(Workload.PROBE))
+        await asyncio.sleep(0)
+        assert not probe.done()
+
+        manager.set_budget(3)
+        await asyncio.wait_for(probe, 1)
+        assert manager.background_limit() == 2
+
+    async def test_budget_bottleneck_is_logged_once_per_interval(self, caplog):
+        manager = create_manager(budget=9, reserve=1, load=8.0)
+        caplog.set_level(logging.INFO, logger="media_processes")
+        for _ in range(2):
+            await manager.acquire(Workload.PROBE)
+        waiters = [asyncio.create_task(manager.acquire(Workload.PROBE)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        messages = [r.getMessage() for r in caplog.records if "media process budget" in r.getMessage()]
+        assert len(messages) == 1
+        assert "limit 2" in messages[0] and "load average 8.0" in messages[0]
+        assert manager.stats()["probe_budget_waits"] == 2
+        for task in waiters:
+            task.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+
+class TestCommand:
+    """Tests for CPU/IO priority prefixes."""
+
+    def test_command_priorities(self):
+        manager = create_manager()
+        tools = {"nice": "/usr/bin/nice", "ionice": "/usr/bin/ionice"}
+        with patch.object(media_processes, "_priority_tool", tools.get):
+            assert manager.command(["ffprobe", "x"], Workload.PROBE) == [
+                "/usr/bin/ionice", "-c", "3", "/usr/bin/nice", "-n", "15", "ffprobe", "x",
+            ]
+            assert manager.command(["ffmpeg"], Workload.PREVIEW) == ["ffmpeg"]
+
+        with patch.object(media_processes, "_priority_tool", lambda name: None):
+            assert manager.command(["ffprobe"], Workload.PROBE) == ["ffprobe"]
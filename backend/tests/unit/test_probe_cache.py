@@ -0,0 +1,177 @@
+"""
+Unit tests for probe-result reuse across streams of the same upstream feed.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import stream_prober
+from models import StreamStats
+from probe_selection import url_fingerprint
+from stream_prober import StreamProber, normalize_probe_url
+
+from tests.fixtures.prober import stub_save_probe_result
+
+
+FFPROBE_DATA = {
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264", "width": 1920, "height": 1080},
+        {"codec_type": "audio", "codec_name": "aac", "channels": 2},
+        {"codec_type": "data", "codec_name": "bin_data"},
+    ],
+    "format": {"format_name": "mpegts", "bit_rate": "5000000", "filename": "http://x"},
+}
+
+
+@pytest.fixture
+def session_modules():
+    return [stream_prober]
+
+
+def create_prober(probe_cache_minutes: int = 60) -> StreamProber:
+    prober = StreamProber(client=MagicMock(), probe_cache_minutes=probe_cache_minutes)
+    prober._run_ffprobe = AsyncMock(return_value=FFPROBE_DATA)
+    prober._measure_stream_bitrate = AsyncMock(return_value=4000000)
+    stub_save_probe_result(prober)
+    return prober
+
+
+class TestNormalizeProbeUrl:
+    """Tests for the cache key."""
+
+    def test_cosmetic_differences_share_a_key(self):
+        assert normalize_probe_url("HTTP://Example.com:80/live/1.ts?b=2&a=1#x") == \
+            normalize_probe_url("http://example.com/live/1.ts?a=1&b=2")
+
+    def test_credentials_and_ports_are_kept(self):
+        assert normalize_probe_url("http://u:p@host:8080/s") == "http://u:p@host:8080/s"
+        assert normalize_probe_url("http://host/s?user=a") != normalize_probe_url("http://host/s?user=b")
+
+
+class TestProbeReuse:
+    """Tests for probe_stream result sharing."""
+
+    async def test_reuses_cached_result(self):
+        """A second stream of the same feed does not run ffprobe."""
+        prober = create_prober()
+        await prober.probe_stream(1, "http://host/a?x=1", "A", cache_url="http://host/a?x=1")
+        result = await prober.probe_stream(2, "http://host/a?x=1", "B", cache_url="http://HOST/a?x=1")
+
+        assert prober._run_ffprobe.await_count == 1
+        assert result["from_cache"] is True
+        assert result["fields"]["resolution"] == "1920x1080"
+        assert result["fields"]["audio_codec"] == "aac"
+        assert result["fields"]["video_bitrate"] == 4000000
+
+    async def test_profile_rewrite_does_not_change_key(self):
+        """Streams probed through different profiles share the upstream result."""
+        prober = create_prober()
+        await prober.probe_stream(1, "http://host/p1/a", "A", cache_url="http://host/a")
+        await prober.probe_stream(2, "http://host/p2/a", "B", cache_url="http://host/a")
+
+        assert prober._run_ffprobe.await_count == 1
+
+    async def test_concurrent_duplicates_share_one_probe(self):
+        """An identical probe in flight is awaited instead of started again."""
+        prober = create_prober()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_ffprobe(url):
+            started.set()
+            await release.wait()
+            return FFPROBE_DATA
+
+        prober._run_ffprobe = AsyncMock(side_effect=slow_ffprobe)
+        first = asyncio.create_task(prober.probe_stream(1, "http://host/a", "A", cache_url="http://host/a"))
+        await started.wait()
+        second = asyncio.create_task(prober.probe_stream(2, "http://host/a", "B", cache_url="http://host/a"))
+        await asyncio.sleep(0)
+        release.set()
+
+        await first
+        assert (await second)["from_cache"] is True
+        assert prober._run_ffprobe.await_count == 1
+
+    async def test_failures_are_not_shared(self):
+        """A failed probe is not reused; the next stream probes for itself."""
+        prober = create_prober()
+        prober._run_ffprobe = AsyncMock(side_effect=[RuntimeError("ffprobe failed: 503"), FFPROBE_DATA])
+        first = await prober.probe_stream(1, "http://host/a", "A", cache_url="http://host/a")
+        second = await prober.probe_stream(2, "http://host/a", "B", cache_url="http://host/a")
+
+        assert first["probe_status"] == "failed"
+        assert second["probe_status"] == "success"
+        assert "from_cache" not in second
+        assert prober._run_ffprobe.await_count == 2
+
+    async def test_disabled_or_uncached_calls_always_probe(self):
+        """No cache_url (single-stream probes) or a 0-minute TTL always runs ffprobe."""
+        prober = create_prober(probe_cache_minutes=0)
+        await prober.probe_stream(1, "http://host/a", "A", cache_url="http://host/a")
+        await prober.probe_stream(2, "http://host/a", "B", cache_url="http://host/a")
+        assert prober._run_ffprobe.await_count == 2
+
+        prober = create_prober()
+        await prober.probe_stream(1, "http://host/a", "A")
+        await prober.probe_stream(2, "http://host/a", "B")
+        assert prober._run_ffprobe.await_count == 2
+
+    async def test_expired_entries_are_probed_again(self):
+        prober = create_prober()
+        await prober.probe_stream(1, "http://host/a", "A", cache_url="http://host/a")
+        key = url_fingerprint(normalize_probe_url("http://host/a"))
+        _, fields = prober._probe_result_cache[key]
+        prober._probe_result_cache[key] = (0.0, fields)
+
+        await prober.probe_stream(2, "http://host/a", "B", cache_url="http://host/a")
+        assert prober._run_ffprobe.await_count == 2
+
+
+class TestStoredProbes:
+    """Tests for seeding the probe cache from stream_stats."""
+
+    def store(self, factory, stream_id: int, url: str, minutes_ago: float, status: str = "success", **fields):
+        session = factory()
+        session.add(StreamStats(
+            stream_id=stream_id, probe_status=status, url_hash=url_fingerprint(normalize_probe_url(url)),
+            last_probed=datetime.utcnow() - timedelta(minutes=minutes_ago), **fields,
+        ))
+        session.commit()
+        session.close()
+
+    async def test_stored_results_are_reused_after_restart(self, session_factory):
+        """A fresh stored result of the same feed replaces ffprobe in a new process."""
+        self.store(session_factory, 1, "http://host/a", minutes_ago=70, resolution="1280x720")
+        self.store(session_factory, 2, "http://host/a", minutes_ago=10, resolution="1920x1080", video_bitrate=4000000)
+        self.store(session_factory, 3, "http://host/b", minutes_ago=90, resolution="1920x1080")
+        self.store(session_factory, 4, "http://host/c", minutes_ago=5, status="failed")
+
+        prober = create_prober()
+        assert prober._load_stored_probes() == 1
+
+        result = await prober.probe_stream(5, "http://host/p1/a", "E", cache_url="http://HOST/a")
+        assert result["from_cache"] is True
+        assert result["fields"]["resolution"] == "1920x1080"
+        assert result["fields"]["video_bitrate"] == 4000000
+        assert prober._has_cached_probe("http://host/a")
+
+        await prober.probe_stream(6, "http://host/b", "F", cache_url="http://host/b")
+        await prober.probe_stream(7, "http://host/c", "G", cache_url="http://host/c")
+        assert prober._run_ffprobe.await_count == 2
+
+    async def test_reused_fields_are_saved_without_parsing(self, session_factory):
+        """probed_fields overwrite the row's previous probe values."""
+        self.store(session_factory, 1, "http://host/a", minutes_ago=1000, resolution="640x480", fps="25.0")
+
+        prober = StreamProber(client=MagicMock())
+        fields = dict.fromkeys(stream_prober.PROBED_FIELDS)
+        fields.update(resolution="1920x1080", video_bitrate=4000000)
+        saved = prober._save_probe_result(1, "A", None, "success", None, probed_fields=fields)
+
+        assert saved["resolution"] == "1920x1080"
+        assert saved["fps"] is None
+        assert saved["sort_height"] == 1080
+        assert saved["sort_bitrate"] == 4000000
@@ -0,0 +1,73 @@
+"""
+Unit tests for the HTTP pre-flight check run before ffprobe.
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+
+from stream_prober import StreamProber
+
+from tests.fixtures.prober import stub_save_probe_result
+
+
+FFPROBE_DATA = {"streams": [{"codec_type": "video", "codec_name": "h264"}], "format": {}}
+
+
+def create_prober(handler, enabled: bool = True) -> StreamProber:
+    prober = StreamProber(client=MagicMock(), probe_preflight_enabled=enabled)
+    prober._stream_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    prober._run_ffprobe = AsyncMock(return_value=FFPROBE_DATA)
+    prober._measure_stream_bitrate = AsyncMock(return_value=None)
+    stub_save_probe_result(prober)
+    return prober
+
+
+class TestPreflight:
+    """Tests for short-circuiting dead streams."""
+
+    async def test_dead_stream_skips_ffprobe(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(404)
+
+        prober = create_prober(handler)
+        result = await prober.probe_stream(1, "http://host/live/1.ts", "One")
+
+        assert result["probe_status"] == "failed"
+        assert result["error_message"] == "Pre-flight check failed: HTTP 404 Not Found"
+        assert requests[0].headers["Range"] == "bytes=0-0"
+        prober._run_ffprobe.assert_not_awaited()
+
+    async def test_live_stream_runs_ffprobe(self):
+        prober = create_prober(lambda request: httpx.Response(206, content=b"G"))
+        result = await prober.probe_stream(1, "http://host/live/1.ts", "One")
+
+        assert result["probe_status"] == "success"
+        prober._run_ffprobe.assert_awaited_once()
+
+    async def test_connection_refused_is_dead(self):
+        def handler(request):
+            raise httpx.ConnectError("[Errno 111] Connection refused")
+
+        prober = create_prober(handler)
+        assert await prober._preflight_check("http://host/live/1.ts") == "Connection refused"
+
+    async def test_inconclusive_results_defer_to_ffprobe(self):
+        """Timeouts and server errors may be transient; ffprobe decides."""
+        def timeout(request):
+            raise httpx.ReadTimeout("timed out")
+
+        assert await create_prober(timeout)._preflight_check("http://host/a") is None
+        assert await create_prober(lambda request: httpx.Response(503))._preflight_check("http://host/a") is None
+
+    async def test_skipped_when_disabled_or_not_applicable(self):
+        handler = MagicMock(return_value=httpx.Response(404))
+        prober = create_prober(handler, enabled=False)
+        await prober.probe_stream(1, "http://host/live/1.ts", "One")
+
+        prober.probe_preflight_enabled = True
+        assert await prober._preflight_check("rtsp://host/live") is None
+        assert await prober._preflight_check("http://192.168.1.50:5004/auto/v5.1") is None
+        handler.assert_not_called()
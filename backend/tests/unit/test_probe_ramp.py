@@ -0,0 +1,132 @@
+"""
+Unit tests for the per-account probe concurrency controller.
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import stream_prober
+from stream_prober import StreamProber
+
+
+@pytest.fixture
+def limits_file(tmp_path):
+    path = tmp_path / "probe_account_limits.json"
+    with patch.object(stream_prober, "PROBE_ACCOUNT_LIMITS_FILE", path), \
+            patch.object(stream_prober, "CONFIG_DIR", tmp_path):
+        yield path
+
+
+def create_prober() -> StreamProber:
+    return StreamProber(client=MagicMock())
+
+
+class TestAimd:
+    """Tests for additive increase / multiplicative decrease."""
+
+    def test_ramps_up_after_success_window(self, limits_file):
+        prober = create_prober()
+        prober._init_account_ramp(1)
+        for _ in range(stream_prober.RAMP_SUCCESS_WINDOW * 3):
+            prober._record_probe_success(1, 2.0)
+
+        assert prober._get_account_ramp_limit(1, 10, 0) == 4
+
+    def test_overload_halves_and_holds(self, limits_file):
+        prober = create_prober()
+        prober._init_account_ramp(1)
+        prober._account_ramp_state[1]["current_limit"] = 8.0
+
+        prober._record_probe_failure(1, "ffprobe failed: 503 Service Unavailable")
+
+        assert prober._get_account_ramp_limit(1, 10, 0) == 4
+        assert prober._is_account_held(1)
+
+    def test_decreases_are_rate_limited(self, limits_file):
+        """A burst of overload errors from one event only decreases once."""
+        prober = create_prober()
+        prober._init_account_ramp(1)
+        prober._account_ramp_state[1]["current_limit"] = 8.0
+
+        for _ in range(3):
+            prober._record_probe_failure(1, "HTTP 429 Too Many Requests")
+
+        assert prober._get_account_ramp_limit(1, 10, 0) == 4
+
+    def test_dead_streams_do_not_decrease(self, limits_file):
+        prober = create_prober()
+        prober._init_account_ramp(1)
+        prober._account_ramp_state[1]["current_limit"] = 4.0
+
+        prober._record_probe_failure(1, "ffprobe failed: 404 Not Found", 0.5)
+
+        assert prober._get_account_ramp_limit(1, 10, 0) == 4
+        assert not prober._is_account_held(1)
+
+    def test_rising_latency_decreases(self, limits_file):
+        """ffprobe slowing well past the account's baseline backs off before errors appear."""
+        prober = create_prober()
+        prober._init_account_ramp(1)
+        for _ in range(stream_prober.RAMP_LATENCY_MIN_SAMPLES):
+            prober._record_probe_success(1, 1.0)
+        limit = prober._account_ramp_state[1]["current_limit"]
+
+        for _ in range(5):
+            prober._record_probe_success(1, 6.0)
+
+        assert prober._account_ramp_state[1]["current_limit"] == max(1.0, limit * stream_prober.RAMP_DECREASE_FACTOR)
+
+    def test_limit_respects_account_capacity(self, limits_file):
+        prober = create_prober()
+        prober._init_account_ramp(1)
+        prober._account_ramp_state[1]["current_limit"] = 6.0
+
+        assert prober._get_account_ramp_limit(1, 3, 1) == 2
+        assert prober._get_account_ramp_limit(1, 0, 0) == stream_prober.RAMP_UNLIMITED_CAP
+
+    def test_increase_stops_at_account_capacity(self, limits_file):
+        """The learned limit does not grow past what the account can serve."""
+        prober = create_prober()
+        prober._init_account_ramp(1)
+        prober._get_account_ramp_limit(1, 2, 0)
+        for _ in range(stream_prober.RAMP_SUCCESS_WINDOW * 5):
+            prober._record_probe_success(1, 1.0)
+
+        assert prober._account_ramp_state[1]["current_limit"] == 2
+
+
+class TestPersistence:
+    """Tests for carrying learned limits across runs."""
+
+    def test_next_run_starts_at_learned_limit(self, limits_file):
+        prober = create_prober()
+        prober._init_account_ramp(7)
+        for _ in range(stream_prober.RAMP_SUCCESS_WINDOW * 4):
+            prober._record_probe_success(7, 1.5)
+        prober._persist_account_limits()
+
+        saved = json.loads(limits_file.read_text())
+        assert saved["7"]["limit"] == 5
+        assert saved["7"]["latency_slow"] == pytest.approx(1.5)
+
+        prober = create_prober()
+        prober._init_account_ramp(7)
+        prober._init_account_ramp(8)
+        assert prober._get_account_ramp_limit(7, 10, 0) == 5
+        assert prober._get_account_ramp_limit(8, 10, 0) == stream_prober.RAMP_INITIAL_LIMIT
+
+    def test_unused_accounts_keep_previous_values(self, limits_file):
+        limits_file.write_text(json.dumps({"3": {"limit": 6, "latency_fast": 2.0, "latency_slow": 2.0, "samples": 40}}))
+        prober = create_prober()
+        prober._init_account_ramp(3)
+        prober._persist_account_limits()
+
+        assert json.loads(limits_file.read_text())["3"]["limit"] == 6
+
+    def test_corrupt_file_is_ignored(self, limits_file):
+        limits_file.write_text("{not json")
+        prober = create_prober()
+
+        assert prober._account_learned == {}
+
@@ -0,0 +1,205 @@
+"""
+Unit tests for write-behind probe result persistence.
+"""
+import asyncio
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import database
+import probe_result_writer
+from models import StreamStats
+from probe_result_writer import ProbeResultWriter, write_probe_rows
+from stream_prober import StreamProber
+
+
+def make_row(stream_id: int, status: str = "success", **fields) -> dict:
+    row = {
+        "stream_id": stream_id,
+        "stream_name": f"Stream {stream_id}",
+        "probe_status": status,
+        "error_message": None if status == "success" else "boom",
+        "last_probed": datetime(2026, 1, 1),
+        "resolution": None,
+        "fps": None,
+        "video_codec": None,
+        "audio_codec": None,
+        "audio_channels": None,
+        "stream_type": None,
+        "bitrate": None,
+        "video_bitrate": None,
+    }
+    row.update(fields)
+    return row
+
+
+@pytest.fixture
+def session_modules():
+    return [probe_result_writer]
+
+
+def fetch(factory, stream_id: int) -> StreamStats:
+    session = factory()
+    try:
+        return session.query(StreamStats).filter_by(stream_id=stream_id).one()
+    finally:
+        session.close()
+
+
+class TestWriteProbeRows:
+    """Tests for the batched UPSERT."""
+
+    def test_inserts_new_rows(self, session_factory):
+        write_probe_rows([make_row(1, resolution="1920x1080"), make_row(2, "failed")])
+
+        assert fetch(session_factory, 1).resolution == "1920x1080"
+        assert fetch(session_factory, 1).consecutive_failures == 0
+        assert fetch(session_factory, 2).consecutive_failures == 1
+        assert fetch(session_factory, 2).created_at is not None
+
+    def test_updates_like_save_probe_result(self, session_factory):
+        """Failures keep metadata and count strikes; success resets them."""
+        session = session_factory()
+        session.add(StreamStats(
+            stream_id=1, probe_status="success", resolution="1280x720", video_codec="h264",
+            consecutive_failures=2, dismissed_at=datetime(2025, 1, 1),
+        ))
+        session.commit()
+        session.close()
+
+        write_probe_rows([make_row(1, "timeout")])
+        stats = fetch(session_factory, 1)
+        assert stats.probe_status == "timeout"
+        assert stats.resolution == "1280x720"
+        assert stats.consecutive_failures == 3
+        assert stats.dismissed_at is None
+
+        write_probe_rows([make_row(1, resolution="1920x1080")])
+        stats = fetch(session_factory, 1)
+        assert stats.resolution == "1920x1080"
+        assert stats.video_codec == "h264"
+        assert stats.consecutive_failures == 0
+
+    def test_sort_bitrate_follows_merged_bitrates(self, session_factory):
+        """A probe without a video bitrate keeps ranking by the stored one."""
+        session = session_factory()
+        session.add(StreamStats(
+            stream_id=1, probe_status="success", resolution="1280x720",
+            video_bitrate=8000000, bitrate=9000000, sort_height=720, sort_bitrate=8000000,
+        ))
+        session.commit()
+        session.close()
+
+        write_probe_rows([make_row(1, bitrate=5000000, sort_bitrate=5000000)])
+        stats = fetch(session_factory, 1)
+        assert stats.sort_bitrate == 8000000
+        assert stats.sort_height == 720
+
+
+class TestProbeResultWriter:
+    """Tests for queueing and flushing."""
+
+    async def test_flushes_on_batch_size(self):
+        writes = []
+        with patch.object(probe_result_writer, "write_probe_rows", writes.append):
+            writer = ProbeResultWriter(batch_size=2, flush_interval=60)
+            writer.start()
+            writer.submit(make_row(1))
+            await asyncio.sleep(0.05)
+            assert writes == []
+
+            writer.submit(make_row(2))
+            for _ in range(50):
+                if writes:
+                    break
+                await asyncio.sleep(0.01)
+            assert [len(batch) for batch in writes] == [2]
+            await writer.close()
+
+    async def test_flushes_on_interval_and_close(self):
+        writes = []
+        with patch.object(probe_result_writer, "write_probe_rows", writes.append):
+            writer = ProbeResultWriter(batch_size=100, flush_interval=0.01)
+            writer.start()
+            writer.submit(make_row(1))
+            await asyncio.sleep(0.1)
+            assert [len(batch) for batch in writes] == [1]
+
+            writer.submit(make_row(2))
+            await writer.close()
+            assert [len(batch) for batch in writes] == [1, 1]
+            assert writer.written == 2
+
+    async def test_write_errors_are_counted_not_raised(self):
+        def fail(rows):
+            raise RuntimeError("database is locked")
+
+        with patch.object(probe_result_writer, "write_probe_rows", fail):
+            writer = ProbeResultWriter()
+            writer.submit(make_row(1))
+            await writer.close()
+
+        assert writer.failed == 1
+
+    async def test_prober_queues_parsed_row(self):
+        """Bulk probes queue a complete row instead of opening a session."""
+        prober = StreamProber(client=MagicMock())
+        writer = ProbeResultWriter()
+        data = {
+            "streams": [{"codec_type": "video", "codec_name": "hevc", "width": 3840, "height": 2160}],
+            "format": {"format_name": "hls", "bit_rate": "9000000"},
+        }
+        with patch("stream_prober.get_session") as get_session:
+            result = prober._save_probe_result(5, "Five", data, "success", None, 8000000, writer=writer)
+        get_session.assert_not_called()
+
+        row = writer._pending[5]
+        assert row["resolution"] == "3840x2160"
+        assert row["video_bitrate"] == 8000000
+        assert row["bitrate"] == 9000000
+        assert result["probe_status"] == "success"
+
+
+@pytest.fixture
+def file_database(tmp_path):
+    saved = {name: getattr(database, name) for name in ("_engine", "_SessionLocal", "_worker_engine", "_WorkerSessionLocal")}
+    with patch.object(database, "CONFIG_DIR", tmp_path), \
+            patch.object(database, "JOURNAL_DB_FILE", tmp_path / "journal.db"):
+        database.init_db()
+        yield
+    database._engine.dispose()
+    database._worker_engine.dispose()
+    for name, value in saved.items():
+        setattr(database, name, value)
+
+
+class TestWorkerConnections:
+    """Worker-thread writes must not share the event loop's connection."""
+
+    async def test_main_thread_commit_does_not_commit_worker_rows(self, file_database):
+        flushed, main_committed = threading.Event(), threading.Event()
+
+        def worker():
+            session = database.get_session()
+            session.add(StreamStats(stream_id=1, stream_name="worker"))
+            session.flush()
+            flushed.set()
+            main_committed.wait(5)
+            session.rollback()
+            session.close()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        flushed.wait(5)
+        main = database.get_session()
+        assert main.query(StreamStats).count() == 0
+        main.commit()
+        main.close()
+        main_committed.set()
+        thread.join(5)
+
+        main = database.get_session()
+        assert main.query(StreamStats).count() == 0
+        main.close()
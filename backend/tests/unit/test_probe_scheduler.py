@@ -0,0 +1,138 @@
+"""
+Unit tests for the probe ready-queue scheduler.
+"""
+import asyncio
+
+from probe_scheduler import Admission, ProbeScheduler
+
+
+def drain(scheduler, admit):
+    return [(key, item, admission.action) for key, item, admission in scheduler.dispatch(admit)]
+
+
+class TestDispatch:
+    """Tests for dispatch order and capacity."""
+
+    async def test_dispatches_in_queue_order_across_accounts(self):
+        """Heads are started oldest first, interleaving accounts."""
+        scheduler = ProbeScheduler(max_concurrent=10)
+        for key, item in [(1, "a"), (2, "b"), (1, "c"), (None, "d")]:
+            scheduler.add(key, item)
+
+        started = drain(scheduler, lambda key, item: Admission.start())
+
+        assert [item for _, item, _ in started] == ["a", "b", "c", "d"]
+        assert scheduler.pending == 0
+        assert scheduler.active == 4
+        assert scheduler.active_for(1) == 2
+
+    async def test_global_cap_stops_dispatch(self):
+        """No more than max_concurrent probes hold a token."""
+        scheduler = ProbeScheduler(max_concurrent=2)
+        for item in "abc":
+            scheduler.add(1, item)
+
+        assert len(drain(scheduler, lambda key, item: Admission.start())) == 2
+        assert scheduler.pending == 1
+
+        scheduler.release(1)
+        assert [item for _, item, _ in drain(scheduler, lambda key, item: Admission.start())] == ["c"]
+
+    async def test_skip_does_not_take_a_token(self):
+        """Skipped streams leave the queue without consuming capacity."""
+        scheduler = ProbeScheduler(max_concurrent=1)
+        scheduler.add(1, "a")
+        scheduler.add(1, "b")
+
+        result = drain(scheduler, lambda key, item: Admission.skip("full") if item == "a" else Admission.start())
+
+        assert result == [(1, "a", Admission.SKIP), (1, "b", Admission.START)]
+        assert scheduler.active == 1
+
+    async def test_profile_tokens(self):
+        """Tokens are tracked per profile and returned on release."""
+        scheduler = ProbeScheduler(max_concurrent=4)
+        profile = {"id": 7}
+        scheduler.add(1, "a")
+        drain(scheduler, lambda key, item: Admission.start(profile))
+
+        assert scheduler.profile_counts == {7: 1}
+        scheduler.release(1, profile)
+        assert scheduler.profile_counts == {7: 0}
+
+
+class TestWaiting:
+    """Tests for parked accounts and wakeups."""
+
+    async def test_waiting_account_is_not_rescanned(self):
+        """A parked account is not offered again until one of its probes finishes."""
+        scheduler = ProbeScheduler(max_concurrent=10)
+        scheduler.add(1, "a")
+        scheduler.add(1, "b")
+        scheduler.add(2, "c")
+        calls = []
+
+        def one_per_account(key, item):
+            calls.append(item)
+            return Admission.wait() if scheduler.active_for(key) else Admission.start()
+
+        assert [item for _, item, _ in drain(scheduler, one_per_account)] == ["a", "c"]
+        assert drain(scheduler, one_per_account) == []
+        assert calls == ["a", "b", "c"]
+
+        scheduler.release(1)
+        assert [item for _, item, _ in drain(scheduler, one_per_account)] == ["b"]
+
+    async def test_release_wakes_waiter(self):
+        """Releasing a token wakes the probe loop."""
+        scheduler = ProbeScheduler(max_concurrent=1)
+        scheduler.add(1, "a")
+        drain(scheduler, lambda key, item: Admission.start())
+
+        waiter = asyncio.create_task(scheduler.wait())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        scheduler.release(1)
+        await asyncio.wait_for(waiter, timeout=1)
+
+    async def test_hold_timer_readmits_account(self):
+        """An account waiting with retry_after is offered again when the timer fires."""
+        scheduler = ProbeScheduler(max_concurrent=4)
+        scheduler.add(1, "a")
+        held = [True]
+
+        def admit(key, item):
+            return Admission.wait(0.01) if held[0] else Admission.start()
+
+        assert drain(scheduler, admit) == []
+        held[0] = False
+        await asyncio.wait_for(scheduler.wait(), timeout=1)
+
+        assert drain(scheduler, admit) == [(1, "a", Admission.START)]
+        scheduler.close()
+
+    async def test_idle_wait_uses_recheck_delay(self):
+        """Waiting with nothing of ours running is rechecked after recheck_delay."""
+        scheduler = ProbeScheduler(max_concurrent=4, recheck_delay=0.01)
+        scheduler.add(1, "a")
+        outcomes = iter([Admission.wait(), Admission.start()])
+
+        assert drain(scheduler, lambda key, item: next(outcomes)) == []
+        await asyncio.wait_for(scheduler.wait(), timeout=1)
+
+        assert drain(scheduler, lambda key, item: next(outcomes)) == [(1, "a", Admission.START)]
+
+    async def test_release_cooldown_delays_next_probe(self):
+        """A cooldown on release parks the account before its next probe."""
+        scheduler = ProbeScheduler(max_concurrent=4)
+        scheduler.add(1, "a")
+        scheduler.add(1, "b")
+        drain(scheduler, lambda key, item: Admission.start() if item == "a" else Admission.wait())
+
+        scheduler.release(1, cooldown=0.05)
+        assert drain(scheduler, lambda key, item: Admission.start()) == []
+
+        await asyncio.sleep(0.06)
+        assert drain(scheduler, lambda key, item: Admission.start()) == [(1, "b", Admission.START)]
+        scheduler.close()
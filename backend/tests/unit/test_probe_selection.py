@@ -0,0 +1,122 @@
+"""
+Unit tests for delta probe stream selection.
+"""
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import stream_prober
+from models import ChannelPopularityScore, M3UChangeLog, StreamStats
+from probe_selection import ProbeRecord, popularity_ttl, select_delta_streams, url_fingerprint
+from stream_prober import StreamProber, normalize_probe_url
+
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+def stream(stream_id: int, url: str = None, name: str = None, account=1) -> dict:
+    return {
+        "id": stream_id,
+        "name": name or f"Stream {stream_id}",
+        "url": url or f"http://host/{stream_id}",
+        "m3u_account": account,
+    }
+
+
+def fingerprint(s: dict) -> str:
+    return url_fingerprint(normalize_probe_url(s["url"]))
+
+
+def select(streams, records, added_at=None, popularity=None, ttl_hours=72):
+    selected, reasons = select_delta_streams(
+        streams, records, {s["id"]: fingerprint(s) for s in streams},
+        added_at or {}, popularity or {}, ttl_hours, now=NOW,
+    )
+    return [s["id"] for s in selected], dict(reasons)
+
+
+class TestSelectDeltaStreams:
+    """Tests for the selection rules."""
+
+    def test_fresh_successes_are_skipped(self):
+        s = stream(1)
+        records = {1: ProbeRecord("success", NOW - timedelta(hours=1), fingerprint(s))}
+
+        assert select([s], records) == ([], {})
+
+    def test_reasons(self):
+        streams = [stream(i) for i in range(1, 6)]
+        fresh = NOW - timedelta(hours=1)
+        records = {
+            2: ProbeRecord("success", fresh, fingerprint(stream(2, url="http://old/2"))),
+            3: ProbeRecord("timeout", fresh, fingerprint(streams[2])),
+            4: ProbeRecord("success", fresh, fingerprint(streams[3])),
+            5: ProbeRecord("success", NOW - timedelta(hours=100), fingerprint(streams[4])),
+        }
+        added_at = {(1, "Stream 4"): NOW - timedelta(minutes=30)}
+
+        ids, reasons = select(streams, records, added_at=added_at)
+
+        assert ids == [1, 2, 3, 4, 5]
+        assert reasons == {"new": 1, "changed": 1, "failing": 1, "m3u_change": 1, "due": 1}
+
+    def test_nested_m3u_account(self):
+        """Streams whose m3u_account is a nested object match the change log too."""
+        s = stream(1, account={"id": 1, "name": "Provider"})
+        records = {1: ProbeRecord("success", NOW - timedelta(hours=1), fingerprint(s))}
+        added_at = {(1, "Stream 1"): NOW - timedelta(minutes=30)}
+
+        assert select([s], records, added_at=added_at) == ([1], {"m3u_change": 1})
+
+    def test_rows_without_hash_are_not_treated_as_changed(self):
+        s = stream(1)
+        records = {1: ProbeRecord("success", NOW - timedelta(hours=1), None)}
+
+        assert select([s], records) == ([], {})
+
+    def test_popular_streams_are_due_sooner(self):
+        streams = [stream(1), stream(2)]
+        last_probed = NOW - timedelta(hours=24)
+        records = {s["id"]: ProbeRecord("success", last_probed, fingerprint(s)) for s in streams}
+
+        ids, _ = select(streams, records, popularity={1: 100.0, 2: 10.0})
+
+        assert ids == [1]
+        assert popularity_ttl(72, 100) == timedelta(hours=18)
+        assert popularity_ttl(72, None) == timedelta(hours=72)
+
+
+@pytest.fixture
+def session_modules():
+    return [stream_prober]
+
+
+class TestLoadDeltaInputs:
+    """Tests for StreamProber._select_delta_streams reading stored state."""
+
+    async def test_reads_stats_change_log_and_popularity(self, session_factory):
+        old = datetime.utcnow() - timedelta(hours=30)
+        streams = [stream(1), stream(2), stream(3)]
+        session = session_factory()
+        session.add_all([
+            StreamStats(stream_id=s["id"], probe_status="success", last_probed=old, url_hash=fingerprint(s))
+            for s in streams
+        ])
+        change = M3UChangeLog(m3u_account_id=1, change_type="streams_added", change_time=datetime.utcnow())
+        change.set_stream_names(["Stream 2"])
+        session.add(change)
+        session.add(ChannelPopularityScore(
+            channel_id="uuid-3", channel_name="Three", score=100.0, calculated_at=datetime.utcnow(),
+        ))
+        session.commit()
+        session.close()
+
+        catalog = MagicMock()
+        catalog.get_channels = AsyncMock(return_value=[{"uuid": "uuid-3", "streams": [3]}])
+        prober = StreamProber(client=MagicMock())
+        with patch.object(stream_prober, "get_catalog", return_value=catalog):
+            selected, reasons = await prober._select_delta_streams(streams, ttl_hours=72)
+
+        assert [s["id"] for s in selected] == [2, 3]
+        assert dict(reasons) == {"m3u_change": 1, "due": 1}
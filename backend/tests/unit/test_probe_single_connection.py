@@ -0,0 +1,93 @@
+"""
+Unit tests for single-connection probing (ffprobe fed from the bitrate download).
+"""
+import asyncio
+import os
+import stat
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from stream_prober import StreamProber
+
+from tests.fixtures.prober import stub_save_probe_result
+
+
+# Stand-in for ffprobe: reads 256KB of stdin, reports how much it got
+FAKE_FFPROBE = f"""#!{sys.executable}
+import json, sys
+data = sys.stdin.buffer.read(262144)
+print(json.dumps({{"streams": [{{"codec_type": "video", "codec_name": "h264"}}], "format": {{"size": str(len(data))}}}}))
+"""
+
+
+@pytest.fixture
+def fake_ffprobe(tmp_path, monkeypatch):
+    path = tmp_path / "ffprobe"
+    path.write_text(FAKE_FFPROBE)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    return path
+
+
+def create_prober(handler) -> StreamProber:
+    prober = StreamProber(client=MagicMock(), probe_single_connection=True)
+    prober.bitrate_sample_duration = 0.3  # Seconds; keeps the test fast
+    prober._stream_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return prober
+
+
+async def stream_body(chunks: int = 40, size: int = 65536, delay: float = 0.01):
+    for _ in range(chunks):
+        await asyncio.sleep(delay)
+        yield b"\x47" * size
+
+
+class TestSingleConnection:
+    """Tests for _run_ffprobe_with_bitrate."""
+
+    async def test_one_download_feeds_ffprobe_and_bitrate(self, fake_ffprobe):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, content=stream_body())
+
+        prober = create_prober(handler)
+        data, bitrate, ffprobe_seconds = await prober._run_ffprobe_with_bitrate("http://host/live/1.ts")
+
+        assert len(requests) == 1
+        assert data["format"]["size"] == "262144"
+        assert bitrate > 0
+        assert ffprobe_seconds <= 0.3 + 0.5
+
+    async def test_probe_stream_skips_separate_calls(self, fake_ffprobe):
+        prober = create_prober(lambda request: httpx.Response(200, content=stream_body()))
+        prober._run_ffprobe = AsyncMock()
+        prober._measure_stream_bitrate = AsyncMock()
+        stub_save_probe_result(prober)
+
+        result = await prober.probe_stream(1, "http://host/live/1.ts", "One")
+
+        assert result["probe_status"] == "success"
+        assert result["bitrate"] > 0
+        prober._run_ffprobe.assert_not_awaited()
+        prober._measure_stream_bitrate.assert_not_awaited()
+
+    async def test_http_errors_are_raised(self, fake_ffprobe):
+        prober = create_prober(lambda request: httpx.Response(404))
+
+        with pytest.raises(RuntimeError, match="Server returned 404 Not Found"):
+            await prober._run_ffprobe_with_bitrate("http://host/live/1.ts")
+
+    async def test_playlists_fall_back(self, fake_ffprobe):
+        """HLS needs ffprobe to fetch segments itself; the caller falls back."""
+        handler = MagicMock(return_value=httpx.Response(200, headers={"content-type": "application/vnd.apple.mpegurl"}))
+        prober = create_prober(handler)
+
+        assert await prober._run_ffprobe_with_bitrate("http://host/live/index.m3u8") is None
+        handler.assert_not_called()
+        assert await prober._run_ffprobe_with_bitrate("http://host/live/1") is None
+        assert await prober._run_ffprobe_with_bitrate("rtsp://host/live/1") is None
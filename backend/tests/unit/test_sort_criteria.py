@@ -37,6 +37,8 @@ def create_mock_stats(
     stats.fps = fps
     stats.audio_channels = audio_channels
     stats.probe_status = probe_status
+    # Not materialized (as for rows probed before the sort columns existed)
+    stats.sort_height = stats.sort_fps = stats.sort_bitrate = None
     return stats
 
 
@@ -0,0 +1,149 @@
+"""
+Unit tests for HyperLogLog sketches and the stats rollup tables.
+"""
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+
+import bandwidth_tracker
+import bandwidth_writer
+from bandwidth_tracker import BandwidthTracker
+from bandwidth_writer import BandwidthBatch, WatchSession, write_bandwidth_batch
+from database import _backfill_stats_rollups
+from hyperloglog import HyperLogLog
+from models import BandwidthDaily, UniqueClientConnection
+
+
+TODAY = date(2026, 3, 10)
+
+
+@pytest.fixture
+def session_modules():
+    return [bandwidth_writer, bandwidth_tracker]
+
+
+@pytest.fixture(autouse=True)
+def fixed_date():
+    with patch.object(bandwidth_tracker, "get_current_date", return_value=TODAY):
+        yield
+
+
+def watch(channel_id: str, ip: str, day: date = TODAY, seconds: int = 0) -> WatchSession:
+    start = datetime(day.year, day.month, day.day, 12)
+    return WatchSession(channel_id, f"Name {channel_id}", ip, day, start, start + timedelta(seconds=seconds))
+
+
+class TestHyperLogLog:
+    """Tests for the distinct-count sketch."""
+
+    def test_small_counts_are_exact_and_sparse(self):
+        sketch = HyperLogLog()
+        for i in range(50):
+            sketch.add(f"10.0.0.{i}")
+            sketch.add(f"10.0.0.{i}")  # Duplicates do not count
+
+        data = sketch.to_bytes()
+        assert HyperLogLog.from_bytes(data).count() == 50
+        assert len(data) < 200
+
+    def test_large_count_within_error(self):
+        sketch = HyperLogLog()
+        for i in range(20000):
+            sketch.add(f"ip-{i}")
+
+        assert abs(sketch.count() - 20000) < 20000 * 0.05
+        assert HyperLogLog.from_bytes(sketch.to_bytes()).count() == sketch.count()
+
+    def test_union(self):
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(30):
+            a.add(str(i))
+        for i in range(20, 60):
+            b.add(str(i))
+
+        assert HyperLogLog.union([a, b]).count() == 60
+
+
+class TestViewerRollups:
+    """Tests for viewer rollups maintained by the batched writer."""
+
+    def test_sessions_feed_unique_viewer_stats(self, session_factory):
+        sessions = [watch("a", "1.1.1.1"), watch("a", "2.2.2.2"), watch("b", "1.1.1.1"), watch("b", "3.3.3.3", TODAY - timedelta(days=1))]
+        write_bandwidth_batch(BandwidthBatch(), sessions)
+        # A checkpoint adds only the new watch seconds; the rows are not recounted
+        sessions[0].last_seen += timedelta(seconds=60)
+        sessions[2].last_seen += timedelta(seconds=30)
+        write_bandwidth_batch(BandwidthBatch(), sessions)
+        sessions[0].last_seen += timedelta(seconds=30)
+        write_bandwidth_batch(BandwidthBatch(), sessions)
+
+        summary = BandwidthTracker.get_unique_viewers_summary(days=7)
+        assert summary["total_unique_viewers"] == 3
+        assert summary["today_unique_viewers"] == 2
+        assert summary["total_connections"] == 4
+        assert summary["avg_watch_seconds"] == 60.0  # (90 + 30) / 2 watched connections
+        assert [d["unique_count"] for d in summary["daily_unique"]] == [1, 2]
+
+        by_channel = BandwidthTracker.get_unique_viewers_by_channel(days=7)
+        assert sorted((c["channel_id"], c["unique_viewers"], c["total_watch_seconds"]) for c in by_channel) == [
+            ("a", 2, 90), ("b", 2, 30),
+        ]
+
+    def test_matches_raw_connection_rows(self, session_factory):
+        write_bandwidth_batch(BandwidthBatch(), [watch("a", f"10.0.0.{i % 7}", seconds=i) for i in range(20)])
+
+        session = session_factory()
+        rows = session.query(UniqueClientConnection).all()
+        session.close()
+        by_channel = BandwidthTracker.get_unique_viewers_by_channel()[0]
+        assert by_channel["unique_viewers"] == len({r.ip_address for r in rows})
+        assert by_channel["total_connections"] == len(rows)
+        assert by_channel["total_watch_seconds"] == sum(r.watch_seconds for r in rows)
+
+
+class TestBandwidthRollups:
+    """Tests for month/year/all-time totals."""
+
+    def test_summary_reads_period_totals(self, session_factory):
+        for day, amount in ((date(2025, 12, 31), 1000), (date(2026, 2, 1), 100), (TODAY - timedelta(days=1), 10), (TODAY, 1)):
+            batch = BandwidthBatch()
+            batch.add_daily(day, bytes_transferred=amount, bytes_in=amount, bytes_out=amount * 2, peak_bitrate_in=amount)
+            write_bandwidth_batch(batch)
+
+        summary = BandwidthTracker.get_bandwidth_summary()
+        assert (summary["today"], summary["this_week"], summary["this_month"], summary["this_year"], summary["all_time"]) == (
+            1, 11, 11, 111, 1111,
+        )
+        assert summary["month_out"] == 22
+        assert summary["week_peak_bitrate_in"] == 10
+        assert len(summary["daily_history"]) == 2
+
+
+class TestBackfill:
+    """Tests for building rollups from existing rows on upgrade."""
+
+    def test_backfill_from_existing_rows(self, session_factory, test_engine):
+        session = session_factory()
+        session.add_all([
+            BandwidthDaily(date=date(2026, 1, 5), bytes_transferred=5, bytes_in=5, bytes_out=5),
+            BandwidthDaily(date=date(2026, 2, 5), bytes_transferred=7, bytes_in=7, bytes_out=7),
+            UniqueClientConnection(ip_address="1.1.1.1", channel_id="a", channel_name="A", date=TODAY,
+                                   connected_at=datetime(2026, 3, 10), watch_seconds=40),
+            UniqueClientConnection(ip_address="2.2.2.2", channel_id="a", channel_name="A", date=TODAY,
+                                   connected_at=datetime(2026, 3, 10), watch_seconds=0),
+        ])
+        session.commit()
+        session.close()
+
+        with test_engine.connect() as conn:
+            _backfill_stats_rollups(conn)
+            _backfill_stats_rollups(conn)  # Runs once: tables are no longer empty
+            totals = dict(conn.execute(text(
+                "SELECT period || ':' || period_start, bytes_transferred FROM bandwidth_rollups"
+            )).fetchall())
+
+        assert totals == {"month:2026-01-01": 5, "month:2026-02-01": 7, "year:2026-01-01": 12, "all:1970-01-01": 12}
+        summary = BandwidthTracker.get_unique_viewers_summary()
+        assert (summary["total_unique_viewers"], summary["total_connections"], summary["avg_watch_seconds"]) == (2, 2, 40.0)
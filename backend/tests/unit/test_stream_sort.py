@@ -0,0 +1,124 @@
+"""
+Unit tests for materialized sort columns and batch stream ranking.
+"""
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+import stream_prober
+import stream_sort
+from database import _add_stream_stats_sort_columns
+from models import StreamStats
+from stream_prober import StreamProber, smart_sort_streams, sort_channel_streams
+from stream_sort import materialize_sort_columns, parse_fps, parse_height, rank_channels
+
+
+ALL_CRITERIA = ["resolution", "bitrate", "framerate", "m3u_priority", "audio_channels"]
+
+
+def stats(stream_id: int, status: str = "success", **fields) -> StreamStats:
+    row = StreamStats(stream_id=stream_id, stream_name=f"Stream {stream_id}", probe_status=status, **fields)
+    materialize_sort_columns(row)
+    return row
+
+
+class TestSortColumns:
+    """Tests for deriving the numeric sort inputs."""
+
+    def test_parsing(self):
+        assert parse_height("1920x1080") == 1080
+        assert parse_height("garbage") == 0
+        assert parse_height(None) is None
+        assert parse_fps("29.97") == 29.97
+        assert parse_fps("n/a") == 0.0
+        assert parse_fps(None) is None
+
+    def test_materialize(self):
+        row = stats(1, resolution="1280x720", fps="59.94", bitrate=6000000, video_bitrate=4000000)
+
+        assert (row.sort_height, row.sort_fps, row.sort_bitrate) == (720, 59.94, 4000000)
+
+    def test_key_uses_materialized_columns(self):
+        """Ranking reads sort_* and never the text columns once they are set."""
+        a = stats(1, resolution="1280x720")
+        b = stats(2, resolution="1280x720")
+        b.sort_height = 2160
+
+        assert rank_channels([[1, 2]], {1: a, 2: b}, active_criteria=["resolution"]) == [[2, 1]]
+
+    def test_save_probe_result_fills_columns(self, test_engine):
+        factory = sessionmaker(bind=test_engine, expire_on_commit=False)
+        prober = StreamProber(client=MagicMock())
+        data = {
+            "streams": [{"codec_type": "video", "width": 1920, "height": 1080, "r_frame_rate": "50/1"}],
+            "format": {"bit_rate": "7000000"},
+        }
+        with patch.object(stream_prober, "get_session", factory):
+            result = prober._save_probe_result(1, "One", data, "success", None, measured_bitrate=5000000)
+
+        assert (result["sort_height"], result["sort_fps"], result["sort_bitrate"]) == (1080, 50.0, 5000000)
+
+    def test_migration_backfills_existing_rows(self, test_engine):
+        factory = sessionmaker(bind=test_engine, expire_on_commit=False)
+        session = factory()
+        session.add(StreamStats(stream_id=1, probe_status="success", resolution="1920x1080", fps="25", bitrate=3000000))
+        session.commit()
+        session.close()
+
+        with test_engine.connect() as conn:
+            conn.execute(text("ALTER TABLE stream_stats DROP COLUMN sort_height"))
+            conn.execute(text("ALTER TABLE stream_stats DROP COLUMN sort_fps"))
+            conn.execute(text("ALTER TABLE stream_stats DROP COLUMN sort_bitrate"))
+            conn.commit()
+            _add_stream_stats_sort_columns(conn)
+            row = conn.execute(text("SELECT sort_height, sort_fps, sort_bitrate FROM stream_stats")).one()
+
+        assert tuple(row) == (1080, 25.0, 3000000)
+
+
+class TestRankChannels:
+    """Tests for sorting many channels in one pass."""
+
+    def test_matches_per_channel_sort(self):
+        stats_map = {
+            1: stats(1, resolution="1280x720", bitrate=3000000, fps="30", audio_channels=2),
+            2: stats(2, resolution="1920x1080", bitrate=6000000, fps="25", audio_channels=6),
+            3: stats(3, resolution="1920x1080", bitrate=6000000, fps="50", audio_channels=2),
+            4: stats(4, "failed"),
+            5: stats(5, "pending"),
+        }
+        stream_m3u_map = {1: 1, 2: 2, 3: 1, 4: 2, 5: 1}
+        priorities = {"1": 10, "2": 20}
+        channels = [[1, 2, 3], [4, 1, 5, 3], [5, 4], [2], [6, 1]]
+
+        for deprioritize in (True, False):
+            batch = sort_channel_streams(
+                channels, stats_map, stream_m3u_map, ALL_CRITERIA,
+                {c: True for c in ALL_CRITERIA}, priorities, deprioritize,
+            )
+            single = [
+                smart_sort_streams(ids, stats_map, stream_m3u_map, ALL_CRITERIA,
+                                   {c: True for c in ALL_CRITERIA}, priorities, deprioritize)
+                for ids in channels
+            ]
+            assert batch == single
+        assert batch[1] == [3, 1, 4, 5]  # Unprobed streams still ranked by M3U priority
+
+    def test_dict_stats_from_to_dict(self):
+        """Auto-creation passes to_dict() rows; the same key applies."""
+        stats_map = {
+            1: stats(1, resolution="1280x720").to_dict(),
+            2: stats(2, resolution="1920x1080").to_dict(),
+            3: {"probe_status": "success", "resolution": "3840x2160"},  # No sort_* keys
+        }
+
+        assert rank_channels([[1, 2, 3]], stats_map, active_criteria=["resolution"]) == [[3, 2, 1]]
+
+    def test_each_stream_keyed_once(self):
+        stats_map = {i: stats(i, resolution=f"1920x{i}") for i in range(1, 4)}
+        with patch.object(stream_sort, "stream_sort_key", wraps=stream_sort.stream_sort_key) as key:
+            result = rank_channels([[1, 2, 3], [3, 2], [2, 1, 3]], stats_map, active_criteria=["resolution"])
+
+        assert result == [[3, 2, 1], [3, 2], [3, 2, 1]]
+        assert key.call_count == 3
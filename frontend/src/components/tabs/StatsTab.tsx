@@ -220,6 +220,7 @@ export function StatsTab() {
   const [refreshInterval, setRefreshInterval] = useState(30); // Default 30 seconds (was 5s - too aggressive)
   const refreshTimerRef = useRef<number | null>(null);
   const lastRefreshRef = useRef<Date>(new Date());
+  const liveConnectedRef = useRef(false);
 
   // Expanded channel state
   const [expandedChannels, setExpandedChannels] = useState<Set<string | number>>(new Set());
@@ -295,7 +296,62 @@ export function StatsTab() {
     }
   }, []);
 
-  // Fetch stats data
+  // Record a channel stats snapshot (polled or pushed) and its chart history
+  const applyChannelStats = useCallback((statsResult: ChannelStatsResponse) => {
+    // Accumulate historical data for charts
+    const now = Date.now();
+    const activeChannelIds = new Set<string>();
+
+    if (statsResult?.channels) {
+      for (const channel of statsResult.channels) {
+        const channelId = String(channel.channel_id);
+        activeChannelIds.add(channelId);
+
+        // Parse ffmpeg_speed (can be number or string like "1.02x")
+        let speed = 0;
+        if (channel.ffmpeg_speed !== undefined && channel.ffmpeg_speed !== null) {
+          speed = typeof channel.ffmpeg_speed === 'number'
+            ? channel.ffmpeg_speed
+            : parseFloat(String(channel.ffmpeg_speed));
+          if (isNaN(speed)) speed = 0;
+        }
+
+        // Get total bytes
+        const totalBytes = channel.total_bytes || 0;
+
+        // Create data point
+        const dataPoint: HistoricalDataPoint = {
+          timestamp: now,
+          ffmpegSpeed: speed,
+          totalBytes: totalBytes,
+          label: '', // Will be computed when rendering
+        };
+
+        // Add to history
+        const history = channelHistory.current.get(channelId) || [];
+        history.push(dataPoint);
+
+        // Trim to max points
+        if (history.length > MAX_HISTORY_POINTS) {
+          history.shift();
+        }
+
+        channelHistory.current.set(channelId, history);
+      }
+    }
+
+    // Clean up history for channels that are no longer active
+    for (const channelId of channelHistory.current.keys()) {
+      if (!activeChannelIds.has(channelId)) {
+        channelHistory.current.delete(channelId);
+      }
+    }
+
+    setChannelStats(statsResult);
+  }, []);
+
+  // Fetch stats data. While live stats are arriving, channel stats and the
+  // bandwidth summary are pushed and not polled.
   const fetchData = useCallback(async (showLoading = false) => {
     if (showLoading) setLoading(true);
     setRefreshing(true);
@@ -307,8 +363,9 @@ export function StatsTab() {
     try {
       logger.debug('Stats Tab: Fetching channel stats, events, bandwidth, and top watched channels');
 
+      const live = liveConnectedRef.current;
       const [statsResult, eventsResult, bandwidthResult, topWatchedResult] = await Promise.all([
-        api.getChannelStats()
+        live ? Promise.resolve(null) : api.getChannelStats()
           .then(result => {
             logger.debug(`Stats Tab: Channel stats fetched successfully (${result?.channels?.length || 0} channels)`);
             return result;
@@ -326,7 +383,7 @@ export function StatsTab() {
             logger.error('Stats Tab: Failed to fetch system events', err);
             throw new Error(`System events: ${err.message}`);
           }),
-        api.getBandwidthStats()
+        live ? Promise.resolve(null) : api.getBandwidthStats()
           .then(result => {
             logger.debug('Stats Tab: Bandwidth stats fetched successfully');
             return result;
@@ -346,59 +403,13 @@ export function StatsTab() {
           }),
       ]);
 
-      // Accumulate historical data for charts
-      const now = Date.now();
-      const activeChannelIds = new Set<string>();
-
-      if (statsResult?.channels) {
-        for (const channel of statsResult.channels) {
-          const channelId = String(channel.channel_id);
-          activeChannelIds.add(channelId);
-
-          // Parse ffmpeg_speed (can be number or string like "1.02x")
-          let speed = 0;
-          if (channel.ffmpeg_speed !== undefined && channel.ffmpeg_speed !== null) {
-            speed = typeof channel.ffmpeg_speed === 'number'
-              ? channel.ffmpeg_speed
-              : parseFloat(String(channel.ffmpeg_speed));
-            if (isNaN(speed)) speed = 0;
-          }
-
-          // Get total bytes
-          const totalBytes = channel.total_bytes || 0;
-
-          // Create data point
-          const dataPoint: HistoricalDataPoint = {
-            timestamp: now,
-            ffmpegSpeed: speed,
-            totalBytes: totalBytes,
-            label: '', // Will be computed when rendering
-          };
-
-          // Add to history
-          const history = channelHistory.current.get(channelId) || [];
-          history.push(dataPoint);
-
-          // Trim to max points
-          if (history.length > MAX_HISTORY_POINTS) {
-            history.shift();
-          }
-
-          channelHistory.current.set(channelId, history);
-        }
-      }
-
-      // Clean up history for channels that are no longer active
-      for (const channelId of channelHistory.current.keys()) {
-        if (!activeChannelIds.has(channelId)) {
-          channelHistory.current.delete(channelId);
-        }
+      if (statsResult) {
+        applyChannelStats(statsResult);
       }
 
       const elapsed = Date.now() - startTime;
       logger.debug(`Stats Tab: Data fetched successfully in ${elapsed}ms`);
 
-      setChannelStats(statsResult);
       setEvents(eventsResult.events || []);
       if (bandwidthResult) {
         setBandwidthStats(bandwidthResult);
@@ -418,7 +429,7 @@ export function StatsTab() {
       setLoading(false);
       setRefreshing(false);
     }
-  }, []);
+  }, [applyChannelStats]);
 
   // Fetch only top watched channels (for sort changes without full refresh)
   const fetchTopWatched = useCallback(async (sortBy: TopWatchedSortBy) => {
@@ -492,6 +503,24 @@ export function StatsTab() {
     loadLookups();
   }, [loadAllChannels, loadStreamProfiles, loadM3UAccounts, fetchData]);
 
+  // Live channel stats and bandwidth summary from GET /api/stats/live. Polling
+  // stops once pushed channel stats arrive and resumes while the stream reconnects.
+  useEffect(() => {
+    return api.subscribeLiveStats({
+      channels: (stats) => {
+        liveConnectedRef.current = true;
+        applyChannelStats(stats);
+      },
+      bandwidth: setBandwidthStats,
+      onConnectionChange: (connected) => {
+        if (!connected) {
+          liveConnectedRef.current = false;
+        }
+        logger.debug(`Stats Tab: Live stats ${connected ? 'connected' : 'disconnected, polling channel stats'}`);
+      },
+    });
+  }, [applyChannelStats]);
+
   // Auto-refresh timer (pauses when tab/window is not visible)
   useEffect(() => {
     if (refreshTimerRef.current) {
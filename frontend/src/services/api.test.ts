@@ -1,7 +1,7 @@
 /**
  * Unit tests for API service.
  */
-import { describe, it, expect, afterEach } from 'vitest';
+import { describe, it, expect, afterEach, vi } from 'vitest';
 import { server } from '../test/mocks/server';
 import { http, HttpResponse } from 'msw';
 import {
@@ -23,6 +23,7 @@ import {
   getChannelPopularity,
   getTrendingChannels,
   calculatePopularity,
+  subscribeLiveStats,
 } from './api';
 
 // Start/stop the mock server for these tests
@@ -834,4 +835,63 @@ describe('API Service', () => {
       await expect(computeSort([{ channel_id: 1, stream_ids: [1] }])).rejects.toThrow();
     });
   });
+
+  describe('subscribeLiveStats', () => {
+    class FakeEventSource {
+      static last: FakeEventSource;
+      url: string;
+      closed = false;
+      onopen: (() => void) | null = null;
+      onerror: (() => void) | null = null;
+      listeners = new Map<string, (event: MessageEvent) => void>();
+
+      constructor(url: string) {
+        this.url = url;
+        FakeEventSource.last = this;
+      }
+
+      addEventListener(type: string, listener: (event: MessageEvent) => void) {
+        this.listeners.set(type, listener);
+      }
+
+      close() {
+        this.closed = true;
+      }
+
+      emit(type: string, data: unknown) {
+        this.listeners.get(type)?.({ data: JSON.stringify(data) } as MessageEvent);
+      }
+    }
+
+    afterEach(() => {
+      vi.unstubAllGlobals();
+    });
+
+    it('passes parsed events to handlers and closes the stream', () => {
+      vi.stubGlobal('EventSource', FakeEventSource);
+      const channels = vi.fn();
+      const onConnectionChange = vi.fn();
+
+      const close = subscribeLiveStats({ channels, onConnectionChange });
+      const source = FakeEventSource.last;
+      source.onopen?.();
+      source.emit('channels', { channels: [], count: 0 });
+      source.onerror?.();
+      close();
+
+      expect(source.url).toBe('/api/stats/live');
+      expect(channels).toHaveBeenCalledWith({ channels: [], count: 0 });
+      expect(onConnectionChange.mock.calls).toEqual([[true], [false]]);
+      expect(source.closed).toBe(true);
+    });
+
+    it('reports no connection when EventSource is unavailable', () => {
+      vi.stubGlobal('EventSource', undefined);
+      const onConnectionChange = vi.fn();
+
+      subscribeLiveStats({ onConnectionChange })();
+
+      expect(onConnectionChange).toHaveBeenCalledWith(false);
+    });
+  });
 });
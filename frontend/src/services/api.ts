@@ -1526,6 +1526,44 @@ export async function getBandwidthStats(): Promise<import('../types').BandwidthS
   return fetchJson(`${API_BASE}/stats/bandwidth`);
 }
 
+/**
+ * Handlers for server-pushed stats. Each receives the event's JSON payload.
+ */
+export interface LiveStatsHandlers {
+  channels?: (stats: ChannelStatsResponse) => void;
+  bandwidth?: (summary: import('../types').BandwidthSummary) => void;
+  /** Called with true once the stream is open, false while the browser reconnects. */
+  onConnectionChange?: (connected: boolean) => void;
+}
+
+/**
+ * Subscribe to live channel stats and bandwidth summaries (Server-Sent Events).
+ * All open tabs share the backend's Dispatcharr poll instead of polling it each.
+ * Returns a function that closes the stream.
+ */
+export function subscribeLiveStats(handlers: LiveStatsHandlers): () => void {
+  if (typeof EventSource === 'undefined') {
+    handlers.onConnectionChange?.(false);
+    return () => {};
+  }
+  const source = new EventSource(`${API_BASE}/stats/live`);
+  const listen = <T,>(topic: string, handler?: (data: T) => void) => {
+    if (!handler) return;
+    source.addEventListener(topic, (event) => {
+      try {
+        handler(JSON.parse((event as MessageEvent<string>).data) as T);
+      } catch (err) {
+        logger.warn(`Live stats: failed to handle ${topic} event`, err);
+      }
+    });
+  };
+  listen('channels', handlers.channels);
+  listen('bandwidth', handlers.bandwidth);
+  source.onopen = () => handlers.onConnectionChange?.(true);
+  source.onerror = () => handlers.onConnectionChange?.(false);
+  return () => source.close();
+}
+
 /**
  * Get top watched channels by watch count or watch time.
  */